@@ -14,8 +14,10 @@ limitations under the License.
 ==============================================================================*/
 
 #include <algorithm>
+#include <atomic>
 #include <chrono>
 #include <fstream>
+#include <future>
 #include <ostream>
 #include <sstream>
 
@@ -27,11 +29,19 @@ limitations under the License.
 #include "absl/strings/str_cat.h"
 #include "absl/strings/string_view.h"
 #include "absl/strings/strip.h"
+#include "azure/core/http/policies/policy.hpp"
 #include "azure/storage/blobs/blob_container_client.hpp"
 #include "azure/storage/blobs/block_blob_client.hpp"
 #include "tensorflow/c/logging.h"
 #include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/cleanup.h"
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
 #include "tensorflow_io/core/filesystems/filesystem_plugins.h"
+#include "tensorflow_io/core/filesystems/mapped_memory_region.h"
+#include "tensorflow_io/core/filesystems/object_listing.h"
+#include "tensorflow_io/core/filesystems/read_hedging.h"
+#include "tensorflow_io/core/filesystems/stat_cache.h"
 
 namespace tensorflow {
 namespace io {
@@ -162,6 +172,83 @@ std::string CreateAzBlobUrl(const std::string& account,
   return blob_endpoint + "/" + container;
 }
 
+FilesystemMetrics* GetMetrics() {
+  static FilesystemMetrics* metrics = FilesystemMetrics::Get("az");
+  return metrics;
+}
+
+// Reads hedged against slow responses, as set by the `AZ_HEDGE_*` options.
+ReadHedger* GetReadHedger() {
+  static ReadHedger* hedger = new ReadHedger(GetMetrics());
+  return hedger;
+}
+
+// The key of the number of attempts of a blob service operation so far, which
+// `AzMetricsPolicy` adds to the context of every operation.
+const Azure::Core::Context::Key& GetAttemptsKey() {
+  static const Azure::Core::Context::Key* key = new Azure::Core::Context::Key();
+  return *key;
+}
+
+// Records every blob service operation in `GetMetrics()`, by HTTP method.
+// Operations are timed from the first attempt to the end of the last retry.
+class AzMetricsPolicy : public Azure::Core::Http::Policies::HttpPolicy {
+ public:
+  std::unique_ptr<Azure::Core::Http::RawResponse> Send(
+      Azure::Core::Http::Request& request,
+      Azure::Core::Http::Policies::NextHttpPolicy next_policy,
+      const Azure::Core::Context& context) const override {
+    const std::string type = request.GetMethod().ToString();
+    const uint64_t start_micros = GetMetrics()->StartRequest();
+    std::unique_ptr<Azure::Core::Http::RawResponse> response;
+    try {
+      response = next_policy.Send(
+          request,
+          context.WithValue(GetAttemptsKey(), std::make_shared<int>(0)));
+    } catch (...) {
+      GetMetrics()->EndRequest(type, start_micros, false);
+      throw;
+    }
+    GetMetrics()->EndRequest(type, start_micros,
+                             static_cast<int>(response->GetStatusCode()) < 400);
+    return response;
+  }
+
+  std::unique_ptr<Azure::Core::Http::Policies::HttpPolicy> Clone()
+      const override {
+    return std::make_unique<AzMetricsPolicy>(*this);
+  }
+};
+
+// Counts the retries of blob service operations in `GetMetrics()`. It runs
+// after the retry policy, so it sees every attempt, and counts all but the
+// first attempt of each operation.
+class AzRetryMetricsPolicy : public Azure::Core::Http::Policies::HttpPolicy {
+ public:
+  std::unique_ptr<Azure::Core::Http::RawResponse> Send(
+      Azure::Core::Http::Request& request,
+      Azure::Core::Http::Policies::NextHttpPolicy next_policy,
+      const Azure::Core::Context& context) const override {
+    std::shared_ptr<int> attempts;
+    if (context.TryGetValue(GetAttemptsKey(), attempts) && (*attempts)++ > 0) {
+      GetMetrics()->AddRetry();
+    }
+    return next_policy.Send(request, context);
+  }
+
+  std::unique_ptr<Azure::Core::Http::Policies::HttpPolicy> Clone()
+      const override {
+    return std::make_unique<AzRetryMetricsPolicy>(*this);
+  }
+};
+
+Azure::Storage::Blobs::BlobClientOptions CreateAzBlobClientOptions() {
+  Azure::Storage::Blobs::BlobClientOptions options;
+  options.PerOperationPolicies.push_back(std::make_unique<AzMetricsPolicy>());
+  options.PerRetryPolicies.push_back(std::make_unique<AzRetryMetricsPolicy>());
+  return options;
+}
+
 std::shared_ptr<Azure::Storage::Blobs::BlobContainerClient>
 CreateAzBlobClientWrapper(const std::string& account,
                           const std::string& container) {
@@ -176,7 +263,7 @@ CreateAzBlobClientWrapper(const std::string& account,
     const std::string url = CreateAzBlobUrl(account, container);
 
     return std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(
-        url, credential);
+        url, credential, CreateAzBlobClientOptions());
   }
 
   const std::string url = CreateAzBlobUrl(account, container);
@@ -188,21 +275,22 @@ CreateAzBlobClientWrapper(const std::string& account,
 
   if (const auto sas = std::getenv(sas_account_container_env.c_str())) {
     client = std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(
-        url + "?" + sas);
+        url + "?" + sas, CreateAzBlobClientOptions());
   } else if (const auto sas = std::getenv(sas_account_env.c_str())) {
     client = std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(
-        url + "?" + sas);
+        url + "?" + sas, CreateAzBlobClientOptions());
   } else if (const auto sas = std::getenv("TF_AZURE_STORAGE_SAS")) {
     client = std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(
-        url + "?" + sas);
+        url + "?" + sas, CreateAzBlobClientOptions());
   } else if (const auto account_key = std::getenv("TF_AZURE_STORAGE_KEY")) {
     auto credential =
         std::make_shared<Azure::Storage::StorageSharedKeyCredential>(
             account, account_key);
     client = std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(
-        url, credential);
+        url, credential, CreateAzBlobClientOptions());
   } else {
-    client = std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(url);
+    client = std::make_shared<Azure::Storage::Blobs::BlobContainerClient>(
+        url, CreateAzBlobClientOptions());
   }
 
   return client;
@@ -260,17 +348,217 @@ void ListResources(const std::string& dir, const std::string& delimiter,
   TF_SetStatus(status, TF_OK, "");
 }
 
+// The largest page size `ListBlobsByHierarchy` accepts.
+constexpr int32_t kAzListBlobsMaxResults = 5000;
+
+// Lists one level of `dir` with a delimited `ListBlobsByHierarchy`.
+void ListDirectory(const std::string& dir, DirectoryListing* listing,
+                   TF_Status* status) {
+  TF_VLog(1, "ListDirectory: %s\n", dir.c_str());
+  std::string account, container, object;
+  ParseAzBlobPath(dir, true, &account, &container, &object, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  if (container.empty()) {
+    const std::string error_message =
+        absl::StrCat("Cannot iterate containers in ", dir);
+    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+    return;
+  }
+
+  auto blob_container_client = CreateAzBlobClientWrapper(account, container);
+
+  if (!object.empty() && object.back() != '/') {
+    object += "/";
+  }
+
+  Azure::Storage::Blobs::ListBlobsOptions options;
+  options.Prefix = object;
+  options.PageSizeHint = kAzListBlobsMaxResults;
+
+  try {
+    for (auto response =
+             blob_container_client->ListBlobsByHierarchy("/", options);
+         response.HasPage(); response.MoveToNextPage()) {
+      for (const auto& list_blob_item : response.Blobs) {
+        // Remove the prefix from the name
+        auto blob_name = list_blob_item.Name.substr(object.size());
+        if (blob_name.empty()) {
+          continue;
+        }
+        // Blobs with a trailing slash are folder markers
+        if (blob_name.back() == '/') {
+          blob_name.pop_back();
+          listing->directories.push_back(blob_name);
+        } else {
+          listing->files.push_back(blob_name);
+        }
+      }
+      for (const auto& blob_prefix : response.BlobPrefixes) {
+        // Remove the prefix and the trailing slash from the name
+        auto prefix_name = blob_prefix.substr(object.size());
+        if (!prefix_name.empty() && prefix_name.back() == '/') {
+          prefix_name.pop_back();
+        }
+        if (!prefix_name.empty()) {
+          listing->directories.push_back(prefix_name);
+        }
+      }
+    }
+  } catch (const Azure::Storage::StorageException& e) {
+    const std::string error_message =
+        absl::StrCat("Failed to get blobs of ", dir, StorageExceptionInfo(e));
+    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+    return;
+  }
+
+  TF_SetStatus(status, TF_OK, "");
+}
+
+// Shared by all `az://` filesystems and writable files, which invalidate it.
+ObjectLister* GetObjectLister() {
+  static ObjectLister* lister = new ObjectLister(ListDirectory);
+  return lister;
+}
+
+// Caches `Stat` results, shared like the `ObjectLister` above.
+StatCache* GetStatCache() {
+  static StatCache* stat_cache = new StatCache("AZ", GetMetrics());
+  return stat_cache;
+}
+
+// Caches `PathExists` results, which only consider blobs and so differ from
+// `Stat` for virtual directories.
+StatCache* GetPathExistsCache() {
+  static StatCache* path_exists_cache = new StatCache("AZ", GetMetrics());
+  return path_exists_cache;
+}
+
+// Drops everything cached about `path` and its parents after a mutation.
+void InvalidateCaches(const std::string& path) {
+  GetObjectLister()->Invalidate(path);
+  GetStatCache()->Invalidate(path);
+  GetPathExistsCache()->Invalidate(path);
+}
+
+// Drops all cached metadata, after mutations of a whole tree.
+void ClearCaches() {
+  GetObjectLister()->Clear();
+  GetStatCache()->Clear();
+  GetPathExistsCache()->Clear();
+}
+
+// The number of blobs deleted concurrently.
+constexpr size_t kAzDeleteConcurrency = 16;
+
+// Deletes `blobs` of `dir`, several blobs at a time. Blobs that could not be
+// deleted are counted in `undeleted_files` and `undeleted_dirs`, and the first
+// error is returned in `status`.
+void DeleteBlobs(const std::string& dir,
+                 Azure::Storage::Blobs::BlobContainerClient& blob_client,
+                 const std::vector<std::string>& blobs,
+                 uint64_t* undeleted_files, uint64_t* undeleted_dirs,
+                 TF_Status* status) {
+  struct DeleteResult {
+    std::vector<std::string> undeleted;
+    std::string error_message;
+  };
+  std::atomic<size_t> next(0);
+  auto delete_blobs = [&]() {
+    DeleteResult result;
+    for (size_t i = next++; i < blobs.size(); i = next++) {
+      try {
+        blob_client.GetBlobClient(blobs[i]).Delete();
+      } catch (const Azure::Storage::StorageException& e) {
+        // The blob is already gone
+        if (e.StatusCode == Azure::Core::Http::HttpStatusCode::NotFound) {
+          continue;
+        }
+        result.undeleted.push_back(blobs[i]);
+        if (result.error_message.empty()) {
+          result.error_message = absl::StrCat("Failed to delete ", blobs[i],
+                                              StorageExceptionInfo(e));
+        }
+      }
+    }
+    return result;
+  };
+
+  TF_SetStatus(status, TF_OK, "");
+  std::vector<std::future<DeleteResult>> workers;
+  for (size_t i = 0; i < std::min(kAzDeleteConcurrency, blobs.size()); ++i) {
+    workers.push_back(std::async(std::launch::async, delete_blobs));
+  }
+  for (auto& worker : workers) {
+    DeleteResult result = worker.get();
+    for (const auto& blob : result.undeleted) {
+      if (blob.back() == '/') {
+        (*undeleted_dirs)++;
+      } else {
+        (*undeleted_files)++;
+      }
+    }
+    if (!result.error_message.empty() && TF_GetCode(status) == TF_OK) {
+      TF_SetStatus(status, TF_INTERNAL, result.error_message.c_str());
+    }
+  }
+}
+
+// Options settable with `set_configuration`, or the environment variables of
+// the same name. They apply to files opened afterwards, and 0 keeps the
+// defaults of the Azure SDK.
+//
+// The size in bytes of the ranges that downloads and uploads are split into.
+constexpr char kAzTransferChunkSize[] = "AZ_TRANSFER_CHUNK_SIZE";
+// The number of ranges that are transferred in parallel.
+constexpr char kAzTransferConcurrency[] = "AZ_TRANSFER_CONCURRENCY";
+
+// The transfer options of a file, read when the file is opened.
+struct AzTransferOptions {
+  AzTransferOptions()
+      : chunk_size(
+            GetFilesystemConfigurationOrDefault(kAzTransferChunkSize, 0)),
+        concurrency(
+            GetFilesystemConfigurationOrDefault(kAzTransferConcurrency, 0)) {}
+
+  // Sets the `TransferOptions` of `DownloadBlobToOptions` or
+  // `UploadBlockBlobFromOptions`.
+  template <typename T>
+  void Apply(T* options) const {
+    if (chunk_size > 0) options->TransferOptions.ChunkSize = chunk_size;
+    if (concurrency > 0) options->TransferOptions.Concurrency = concurrency;
+  }
+
+  int64_t chunk_size;
+  int32_t concurrency;
+};
+
 class AzBlobRandomAccessFile {
  public:
   AzBlobRandomAccessFile(const std::string& account,
                          const std::string& container,
                          const std::string& object)
-      : account_(account), container_(container), object_(object) {}
+      : account_(account),
+        container_(container),
+        object_(object),
+        hedging_(ReadHedger::GetOptions("AZ")) {}
   ~AzBlobRandomAccessFile() {}
   int64_t Read(uint64_t offset, size_t n, char* buffer,
                TF_Status* status) const {
     TF_VLog(1, "ReadFileFromAz az://%s/%s/%s from %u for n: %u\n",
             account_.c_str(), container_.c_str(), object_.c_str(), offset, n);
+    // A hedged attempt may outlive the file, so it reads with a copy of it.
+    auto read_range = [file = *this, offset, n](char* buffer,
+                                                TF_Status* status) {
+      return file.ReadRange(offset, n, buffer, status);
+    };
+    return GetReadHedger()->Read(hedging_, n, buffer, read_range, status);
+  }
+
+ private:
+  int64_t ReadRange(uint64_t offset, size_t n, char* buffer,
+                    TF_Status* status) const {
     // If n == 0, then return OkStatus()
     // otherwise, if bytes_read < n then return OutofRange
     if (n == 0) {
@@ -304,6 +592,7 @@ class AzBlobRandomAccessFile {
       download_options.Range = Azure::Core::Http::HttpRange();
       download_options.Range.Value().Offset = offset;
       download_options.Range.Value().Length = bytes_to_read;
+      transfer_options_.Apply(&download_options);
 
       try {
         blob_client.DownloadTo(reinterpret_cast<uint8_t*>(buffer),
@@ -315,6 +604,7 @@ class AzBlobRandomAccessFile {
         TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
         return 0;
       }
+      GetMetrics()->AddBytesRead(bytes_to_read);
     }
 
     if (bytes_to_read < n) {
@@ -325,19 +615,21 @@ class AzBlobRandomAccessFile {
     return bytes_to_read;
   }
 
- private:
   std::string account_;
   std::string container_;
   std::string object_;
+  const AzTransferOptions transfer_options_;
+  const ReadHedger::Options hedging_;
 };
 
 class AzBlobWritableFile {
  public:
   AzBlobWritableFile(const std::string& account, const std::string& container,
-                     const std::string& object)
+                     const std::string& object, const std::string& path)
       : account_(account),
         container_(container),
         object_(object),
+        path_(path),
         sync_needed_(true) {
     if (GetTmpFilename(&tmp_content_filename_)) {
       outfile_.open(tmp_content_filename_,
@@ -391,8 +683,10 @@ class AzBlobWritableFile {
     auto blob_container_client =
         CreateAzBlobClientWrapper(account_, container_);
     auto blob_client = blob_container_client->GetBlockBlobClient(object_);
+    Azure::Storage::Blobs::UploadBlockBlobFromOptions upload_options;
+    transfer_options_.Apply(&upload_options);
     try {
-      blob_client.UploadFrom(tmp_content_filename_);
+      blob_client.UploadFrom(tmp_content_filename_, upload_options);
     } catch (const Azure::Storage::StorageException& e) {
       const std::string error_message =
           absl::StrCat("Failed to upload to az://", account_, "/", container_,
@@ -400,6 +694,9 @@ class AzBlobWritableFile {
       TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
       return;
     }
+    // Every sync uploads the whole temporary file.
+    GetMetrics()->AddBytesWritten(static_cast<uint64_t>(outfile_.tellp()));
+    InvalidateCaches(path_);
     sync_needed_ = false;
     TF_SetStatus(status, TF_OK, "");
   }
@@ -420,47 +717,13 @@ class AzBlobWritableFile {
   std::string account_;
   std::string container_;
   std::string object_;
+  std::string path_;
+  const AzTransferOptions transfer_options_;
   std::string tmp_content_filename_;
   std::ofstream outfile_;
   bool sync_needed_;  // whether there is buffered data that needs to be synced
 };
 
-#if 0
-Status GetMatchingPaths(const std::string& pattern, std::vector<std::string>* results) {
-  const std::string& fixed_prefix =
-      pattern.substr(0, pattern.find_first_of("*?[\\"));
-
-  std::string account, container, object;
-  TF_RETURN_IF_ERROR(
-      ParseAzBlobPathClass(fixed_prefix, true, &account, &container, &object));
-
-  auto blob_client = CreateAzBlobClientWrapper(account, container);
-
-  std::vector<std::string> blobs;
-  TF_RETURN_IF_ERROR(ListResources(fixed_prefix, "", blob_client, &blobs));
-
-  std::string container_path;
-  if (pattern.find(kAzBlobEndpoint) != std::string::npos) {
-    container_path =
-        io::JoinPath("az://", account + kAzBlobEndpoint, container);
-  } else {
-    container_path = io::JoinPath("az://", account, container);
-  }
-
-  std::transform(std::begin(blobs), std::end(blobs), std::begin(blobs),
-                 [&container_path](const std::string& path) {
-                   return io::JoinPath(container_path, path);
-                 });
-
-  std::copy_if(std::begin(blobs), std::end(blobs), std::back_inserter(*results),
-               [&pattern](const std::string& full_path) {
-                 return Env::Default()->MatchPath(full_path, pattern);
-               });
-
-  return OkStatus();
-}
-#endif
-
 // SECTION 1. Implementation for `TF_RandomAccessFile`
 // ----------------------------------------------------------------------------
 namespace tf_random_access_file {
@@ -517,14 +780,8 @@ static void Close(const TF_WritableFile* file, TF_Status* status) {
 
 // SECTION 3. Implementation for `TF_ReadOnlyMemoryRegion`
 // ----------------------------------------------------------------------------
-namespace tf_read_only_memory_region {
-void Cleanup(TF_ReadOnlyMemoryRegion* region) {}
-
-const void* Data(const TF_ReadOnlyMemoryRegion* region) { return nullptr; }
-
-uint64_t Length(const TF_ReadOnlyMemoryRegion* region) { return 0; }
-
-}  // namespace tf_read_only_memory_region
+// Memory regions are `MappedMemoryRegion`s, see
+// `NewReadOnlyMemoryRegionFromFile`.
 
 // SECTION 4. Implementation for `TF_Filesystem`, the actual filesystem
 // ----------------------------------------------------------------------------
@@ -556,7 +813,7 @@ static void NewWritableFile(const TF_Filesystem* filesystem, const char* path,
   if (TF_GetCode(status) != TF_OK) {
     return;
   }
-  file->plugin_file = new AzBlobWritableFile(account, container, object);
+  file->plugin_file = new AzBlobWritableFile(account, container, object, path);
 
   TF_SetStatus(status, TF_OK, "");
 }
@@ -568,7 +825,7 @@ static void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
   if (TF_GetCode(status) != TF_OK) {
     return;
   }
-  file->plugin_file = new AzBlobWritableFile(account, container, object);
+  file->plugin_file = new AzBlobWritableFile(account, container, object, path);
 
   TF_SetStatus(status, TF_OK, "");
 }
@@ -577,13 +834,63 @@ static void NewReadOnlyMemoryRegionFromFile(const TF_Filesystem* filesystem,
                                             const char* path,
                                             TF_ReadOnlyMemoryRegion* region,
                                             TF_Status* status) {
-  TF_SetStatus(status, TF_UNIMPLEMENTED,
-               "NewReadOnlyMemoryRegionFromFile not implemented");
+  std::string account, container, object;
+  ParseAzBlobPath(path, false, &account, &container, &object, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+
+  auto blob_container_client = CreateAzBlobClientWrapper(account, container);
+  auto blob_client = blob_container_client->GetBlobClient(object);
+  int64_t size;
+  try {
+    size = blob_client.GetProperties().Value.BlobSize;
+  } catch (const Azure::Storage::StorageException& e) {
+    const std::string error_message = absl::StrCat(
+        "Failed to get properties of ", path, StorageExceptionInfo(e));
+    TF_SetStatus(status,
+                 e.StatusCode == Azure::Core::Http::HttpStatusCode::NotFound
+                     ? TF_NOT_FOUND
+                     : TF_INTERNAL,
+                 error_message.c_str());
+    return;
+  }
+  if (size == 0) {
+    TF_SetStatus(status, TF_INVALID_ARGUMENT, "File is empty");
+    return;
+  }
+
+  // The blob is downloaded straight into mapped memory, in chunks fetched
+  // concurrently as set by `AZ_TRANSFER_CHUNK_SIZE` and
+  // `AZ_TRANSFER_CONCURRENCY`.
+  auto data = MappedMemoryRegion::Allocate(size, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  Azure::Storage::Blobs::DownloadBlobToOptions download_options;
+  AzTransferOptions().Apply(&download_options);
+  try {
+    blob_client.DownloadTo(reinterpret_cast<uint8_t*>(data->data()), size,
+                           download_options);
+  } catch (const Azure::Storage::StorageException& e) {
+    const std::string error_message = absl::StrCat(
+        "Failed to get contents of ", path, StorageExceptionInfo(e));
+    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+    return;
+  }
+  GetMetrics()->AddBytesRead(size);
+  data->Seal(status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+
+  region->plugin_memory_region = data.release();
 }
 
 static void CreateDir(const TF_Filesystem* filesystem, const char* path,
                       TF_Status* status) {
   TF_VLog(1, "CreateDir %s\n", path);
+  auto invalidate_caches = MakeCleanup([path] { InvalidateCaches(path); });
   std::string account, container, object;
   ParseAzBlobPath(path, true, &account, &container, &object, status);
   if (TF_GetCode(status) != TF_OK) {
@@ -611,6 +918,7 @@ static void RecursivelyCreateDir(const TF_Filesystem* filesystem,
 static void DeleteFile(const TF_Filesystem* filesystem, const char* path,
                        TF_Status* status) {
   TF_VLog(1, "DeleteFile %s\n", path);
+  auto invalidate_caches = MakeCleanup([path] { InvalidateCaches(path); });
   std::string account, container, object;
   ParseAzBlobPath(path, false, &account, &container, &object, status);
   if (TF_GetCode(status) != TF_OK) {
@@ -635,6 +943,7 @@ static void DeleteFile(const TF_Filesystem* filesystem, const char* path,
 static void DeleteDir(const TF_Filesystem* filesystem, const char* path,
                       TF_Status* status) {
   TF_VLog(1, "DeleteDir %s\n", path);
+  auto invalidate_caches = MakeCleanup([] { ClearCaches(); });
 
   std::string account, container, object;
   ParseAzBlobPath(path, false, &account, &container, &object, status);
@@ -685,34 +994,91 @@ static void DeleteDir(const TF_Filesystem* filesystem, const char* path,
       return;
     }
 
-    for (const auto& child : children) {
-      auto child_client = blob_container_client->GetBlobClient(child);
-      try {
-        child_client.Delete();
-      } catch (const Azure::Storage::StorageException& e) {
-        const std::string error_message =
-            absl::StrCat("Failed to delete az://", account, "/", container, "/",
-                         child, StorageExceptionInfo(e));
-        TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
-        return;
-      }
+    uint64_t undeleted_files = 0, undeleted_dirs = 0;
+    DeleteBlobs(path, *blob_container_client, children, &undeleted_files,
+                &undeleted_dirs, status);
+    if (TF_GetCode(status) != TF_OK) {
+      return;
     }
   }
 
   TF_SetStatus(status, TF_OK, "");
 }
 
+static void PathExists(const TF_Filesystem* filesystem, const char* path,
+                       TF_Status* status);
+
 static void DeleteRecursively(const TF_Filesystem* filesystem, const char* path,
                               uint64_t* undeleted_files,
                               uint64_t* undeleted_dirs, TF_Status* status) {
+  TF_VLog(1, "DeleteRecursively %s\n", path);
+  auto invalidate_caches = MakeCleanup([] { ClearCaches(); });
   *undeleted_files = 0;
   *undeleted_dirs = 0;
-  DeleteDir(filesystem, path, status);
+
+  std::string account, container, object;
+  ParseAzBlobPath(path, true, &account, &container, &object, status);
+  if (TF_GetCode(status) != TF_OK) {
+    (*undeleted_dirs)++;
+    return;
+  }
+  if (container.empty() || object.empty()) {
+    // Deleting a container is a single request
+    DeleteDir(filesystem, path, status);
+    if (TF_GetCode(status) != TF_OK) {
+      (*undeleted_dirs)++;
+    }
+    return;
+  }
+
+  auto blob_container_client = CreateAzBlobClientWrapper(account, container);
+
+  std::string prefix = object;
+  if (prefix.back() != '/') {
+    prefix += "/";
+  }
+  std::vector<std::string> children;
+  try {
+    Azure::Storage::Blobs::ListBlobsOptions options;
+    options.Prefix = prefix;
+    options.PageSizeHint = kAzListBlobsMaxResults;
+
+    for (auto response = blob_container_client->ListBlobs(options);
+         response.HasPage(); response.MoveToNextPage()) {
+      for (auto const& list_blob_item : response.Blobs) {
+        children.push_back(list_blob_item.Name);
+      }
+    }
+  } catch (const Azure::Storage::StorageException& e) {
+    const std::string error_message =
+        absl::StrCat("Failed to list blobs in ", path, StorageExceptionInfo(e));
+    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+    (*undeleted_dirs)++;
+    return;
+  }
+
+  if (children.empty()) {
+    // Not a directory, a single file or nothing at all
+    PathExists(filesystem, path, status);
+    if (TF_GetCode(status) != TF_OK) {
+      (*undeleted_dirs)++;
+      return;
+    }
+    DeleteFile(filesystem, path, status);
+    if (TF_GetCode(status) != TF_OK) {
+      (*undeleted_files)++;
+    }
+    return;
+  }
+
+  DeleteBlobs(path, *blob_container_client, children, undeleted_files,
+              undeleted_dirs, status);
 }
 
 static void RenameFile(const TF_Filesystem* filesystem, const char* src,
                        const char* dst, TF_Status* status) {
   TF_VLog(1, "RenameFile from: %s to %s\n", src, dst);
+  auto invalidate_caches = MakeCleanup([] { ClearCaches(); });
   std::string src_account, src_container, src_object;
   ParseAzBlobPath(src, false, &src_account, &src_container, &src_object,
                   status);
@@ -805,7 +1171,7 @@ static void CopyFile(const TF_Filesystem* filesystem, const char* src,
     return;
   }
   std::unique_ptr<AzBlobWritableFile> dst_file(
-      new AzBlobWritableFile(dst_account, dst_container, dst_object));
+      new AzBlobWritableFile(dst_account, dst_container, dst_object, dst));
 
   uint64_t offset = 0;
   std::unique_ptr<char[]> buffer(new char[kCopyFileBufferSize]);
@@ -825,8 +1191,7 @@ static void CopyFile(const TF_Filesystem* filesystem, const char* src,
   dst_file->Close(status);
 }
 
-static void PathExists(const TF_Filesystem* filesystem, const char* path,
-                       TF_Status* status) {
+static void UncachedPathExists(const char* path, TF_Status* status) {
   TF_VLog(1, "PathExists on path: %s\n", path);
   std::string account, container, object;
   ParseAzBlobPath(path, false, &account, &container, &object, status);
@@ -856,6 +1221,17 @@ static void PathExists(const TF_Filesystem* filesystem, const char* path,
   TF_SetStatus(status, TF_OK, "");
 }
 
+static void PathExists(const TF_Filesystem* filesystem, const char* path,
+                       TF_Status* status) {
+  TF_FileStatistics stats;
+  GetPathExistsCache()->Stat(
+      path,
+      [](const std::string& path, TF_FileStatistics* stats, TF_Status* status) {
+        UncachedPathExists(path.c_str(), status);
+      },
+      &stats, status);
+}
+
 static bool IsDirectory(const TF_Filesystem* filesystem, const char* path,
                         TF_Status* status) {
   TF_VLog(1, "IsDirectory on path: %s\n", path);
@@ -926,8 +1302,8 @@ static bool IsDirectory(const TF_Filesystem* filesystem, const char* path,
   return true;
 }
 
-static void Stat(const TF_Filesystem* filesystem, const char* path,
-                 TF_FileStatistics* stats, TF_Status* status) {
+static void UncachedStat(const TF_Filesystem* filesystem, const char* path,
+                         TF_FileStatistics* stats, TF_Status* status) {
   TF_VLog(1, "Stat on path: %s\n", path);
 
   using namespace std::chrono;
@@ -947,7 +1323,7 @@ static void Stat(const TF_Filesystem* filesystem, const char* path,
     return;
   }
 
-  PathExists(filesystem, path, status);
+  UncachedPathExists(path, status);
   if (TF_GetCode(status) != TF_OK) {
     return;
   }
@@ -970,58 +1346,50 @@ static void Stat(const TF_Filesystem* filesystem, const char* path,
   TF_SetStatus(status, TF_OK, "");
 }
 
+static void Stat(const TF_Filesystem* filesystem, const char* path,
+                 TF_FileStatistics* stats, TF_Status* status) {
+  GetStatCache()->Stat(
+      path,
+      [filesystem](const std::string& path, TF_FileStatistics* stats,
+                   TF_Status* status) {
+        UncachedStat(filesystem, path.c_str(), stats, status);
+      },
+      stats, status);
+}
+
 static int GetChildren(const TF_Filesystem* filesystem, const char* path,
                        char*** entries, TF_Status* status) {
   TF_VLog(1, "GetChildren on path: %s\n", path);
-  std::string account, container, object;
-  ParseAzBlobPath(path, true, &account, &container, &object, status);
-  if (TF_GetCode(status) != TF_OK) {
-    return 0;
+  std::string dir = path;
+  if (dir.back() != '/') {
+    dir += "/";
   }
 
-  if (container.empty()) {
-    const std::string error_message =
-        absl::StrCat("Cannot iterate containers in ", path);
-    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+  std::vector<std::string> result;
+  GetObjectLister()->GetChildren(dir, &result, status);
+  if (TF_GetCode(status) != TF_OK) {
     return 0;
   }
 
-  auto blob_container_client = CreateAzBlobClientWrapper(account, container);
-
-  if (!object.empty() && object.back() != '/') {
-    object += "/";
+  int num_entries = result.size();
+  *entries = static_cast<char**>(
+      plugin_memory_allocate(num_entries * sizeof((*entries)[0])));
+  for (int i = 0; i < num_entries; i++) {
+    (*entries)[i] = static_cast<char*>(
+        plugin_memory_allocate(strlen(result[i].c_str()) + 1));
+    memcpy((*entries)[i], result[i].c_str(), strlen(result[i].c_str()) + 1);
   }
+  TF_SetStatus(status, TF_OK, "");
+  return num_entries;
+}
 
+static int GetMatchingPaths(const TF_Filesystem* filesystem,
+                            const char* pattern, char*** entries,
+                            TF_Status* status) {
   std::vector<std::string> result;
-  Azure::Storage::Blobs::ListBlobsOptions options;
-  options.Prefix = object;
-
-  for (auto response =
-           blob_container_client->ListBlobsByHierarchy("/", options);
-       response.HasPage(); response.MoveToNextPage()) {
-    std::transform(response.Blobs.begin(), response.Blobs.end(),
-                   std::back_inserter(result),
-                   [&object](auto const& list_blob_item) -> std::string {
-                     // Remove the prefix from the name
-                     auto blob_name = list_blob_item.Name;
-                     blob_name.erase(0, object.size());
-                     // Remove the trailing slash from folders
-                     if (blob_name.back() == '/') {
-                       blob_name.pop_back();
-                     }
-                     return blob_name;
-                   });
-    std::transform(response.BlobPrefixes.begin(), response.BlobPrefixes.end(),
-                   std::back_inserter(result),
-                   [&object](std::string blob_prefix) -> std::string {
-                     // Remove the prefix from the name
-                     blob_prefix.erase(0, object.size());
-                     // Remove the trailing slash from folders
-                     if (blob_prefix.back() == '/') {
-                       blob_prefix.pop_back();
-                     }
-                     return blob_prefix;
-                   });
+  GetObjectLister()->GetMatchingPaths(pattern, &result, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return 0;
   }
 
   int num_entries = result.size();
@@ -1064,6 +1432,15 @@ static char* TranslateName(const TF_Filesystem* filesystem, const char* uri) {
   return strdup(uri);
 }
 
+static void SetConfiguration(const TF_Filesystem* filesystem,
+                             const TF_Filesystem_Option* options,
+                             int num_options, TF_Status* status) {
+  std::vector<std::string> names = {kAzTransferChunkSize,
+                                    kAzTransferConcurrency};
+  for (const auto& name : ReadHedger::OptionNames("AZ")) names.push_back(name);
+  SetFilesystemConfiguration("az", names, options, num_options, status);
+}
+
 }  // namespace tf_az_filesystem
 
 }  // namespace
@@ -1088,10 +1465,9 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
 
   ops->read_only_memory_region_ops = static_cast<TF_ReadOnlyMemoryRegionOps*>(
       plugin_memory_allocate(TF_READ_ONLY_MEMORY_REGION_OPS_SIZE));
-  ops->read_only_memory_region_ops->cleanup =
-      tf_read_only_memory_region::Cleanup;
-  ops->read_only_memory_region_ops->data = tf_read_only_memory_region::Data;
-  ops->read_only_memory_region_ops->length = tf_read_only_memory_region::Length;
+  ops->read_only_memory_region_ops->cleanup = MappedMemoryRegion::Cleanup;
+  ops->read_only_memory_region_ops->data = MappedMemoryRegion::Data;
+  ops->read_only_memory_region_ops->length = MappedMemoryRegion::Length;
 
   ops->filesystem_ops = static_cast<TF_FilesystemOps*>(
       plugin_memory_allocate(TF_FILESYSTEM_OPS_SIZE));
@@ -1117,7 +1493,10 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
   ops->filesystem_ops->is_directory = tf_az_filesystem::IsDirectory;
   ops->filesystem_ops->get_file_size = tf_az_filesystem::GetFileSize;
   ops->filesystem_ops->get_children = tf_az_filesystem::GetChildren;
+  ops->filesystem_ops->get_matching_paths = tf_az_filesystem::GetMatchingPaths;
   ops->filesystem_ops->translate_name = tf_az_filesystem::TranslateName;
+  ops->filesystem_ops->set_filesystem_configuration =
+      tf_az_filesystem::SetConfiguration;
 }
 
 }  // namespace az
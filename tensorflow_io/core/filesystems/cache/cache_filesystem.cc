@@ -0,0 +1,720 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include <stdlib.h>
+#include <string.h>
+
+#include <algorithm>
+#include <cstdio>
+#include <fstream>
+#include <list>
+#include <map>
+#include <memory>
+#include <random>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include "absl/strings/match.h"
+#include "absl/strings/numbers.h"
+#include "absl/strings/str_cat.h"
+#include "absl/strings/str_split.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/env.h"
+#include "tensorflow/c/logging.h"
+#include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/filesystem_plugins.h"
+
+// A caching filesystem that wraps the other tfio filesystems. Files under
+// `tfiocache.<scheme>://...` are read from `<scheme>://...` once and kept as
+// blocks in a local directory, so that later reads (e.g. the following epochs
+// of a training job) are served from local disk. Cached blocks are validated
+// against the length and modification time reported by the wrapped
+// filesystem every time a file is opened. The scheme is read only, writes
+// should go through the wrapped scheme directly.
+namespace tensorflow {
+namespace io {
+namespace cache {
+namespace {
+
+// The prefix of every cache scheme, e.g. `tfiocache.s3`.
+constexpr char kSchemePrefix[] = "tfiocache.";
+
+// The environment variable that overrides the local directory used to store
+// cached blocks. Defaults to `tfio_cache` in the local temp directory.
+constexpr char kCacheDir[] = "TFIO_CACHE_DIR";
+// The environment variable that overrides the maximum number of bytes kept in
+// the cache directory. Specified in MB.
+constexpr char kMaxCacheSize[] = "TFIO_CACHE_MAX_SIZE_MB";
+constexpr uint64_t kDefaultMaxCacheSize = 10 * 1024;
+// The environment variable that overrides the size of cached blocks.
+// Specified in MB.
+constexpr char kBlockSize[] = "TFIO_CACHE_BLOCK_SIZE_MB";
+constexpr uint64_t kDefaultBlockSize = 16;
+
+constexpr char kBlockSuffix[] = ".blk";
+constexpr char kTempSuffix[] = ".tmp";
+
+uint64_t GetEnvOrDefault(const char* name, uint64_t default_value) {
+  const char* value_str = std::getenv(name);
+  uint64_t value;
+  if (value_str && absl::SimpleAtoi(value_str, &value)) {
+    return value;
+  }
+  return default_value;
+}
+
+// FNV-1a, so that block names stay stable across processes.
+uint64_t Fingerprint(const std::string& data) {
+  uint64_t hash = 14695981039346656037ULL;
+  for (unsigned char c : data) {
+    hash ^= c;
+    hash *= 1099511628211ULL;
+  }
+  return hash;
+}
+
+// Splits `tfiocache.s3://bucket/key` into `s3` and `s3://bucket/key`.
+bool ParseCachePath(const std::string& path, std::string* scheme,
+                    std::string* inner_path) {
+  if (!absl::StartsWith(path, kSchemePrefix)) return false;
+  std::string remaining = path.substr(strlen(kSchemePrefix));
+  size_t pos = remaining.find("://");
+  if (pos == std::string::npos || pos == 0) return false;
+  *scheme = remaining.substr(0, pos);
+  *inner_path = remaining;
+  return true;
+}
+
+void RecursivelyCreateLocalDir(const std::string& dir, TF_Status* status) {
+  std::string current;
+  for (const auto& part : absl::StrSplit(dir, '/')) {
+    absl::StrAppend(&current, part, "/");
+    if (part.empty()) continue;
+    TF_CreateDir(current.c_str(), status);
+    if (TF_GetCode(status) == TF_ALREADY_EXISTS) {
+      TF_SetStatus(status, TF_OK, "");
+    }
+    if (TF_GetCode(status) != TF_OK) return;
+  }
+  TF_SetStatus(status, TF_OK, "");
+}
+
+std::string DefaultCacheDir() {
+  std::string dir;
+  TF_StringStream* dirs = TF_GetLocalTempDirectories();
+  const char* temp_dir;
+  if (TF_StringStreamNext(dirs, &temp_dir)) dir = temp_dir;
+  TF_StringStreamDone(dirs);
+  if (dir.empty()) dir = "/tmp";
+  return absl::StrCat(dir, "/tfio_cache");
+}
+
+// \brief An LRU cache of file blocks stored as files in a local directory.
+//
+// Blocks are named `<file fingerprint>-<file signature>-<index>.blk`, so a
+// block of an outdated version of a file is never served. The index is kept in
+// memory and rebuilt from the directory (ordered by modification time) when
+// the process starts, so the cache survives restarts. One instance is shared by
+// all cache schemes so that the byte budget is global.
+class DiskBlockCache {
+ public:
+  DiskBlockCache(std::string dir, uint64_t block_size, uint64_t max_bytes)
+      : dir_(std::move(dir)),
+        block_size_(block_size),
+        max_bytes_(max_bytes),
+        random_(std::random_device()()) {
+    TF_Status* status = TF_NewStatus();
+    RecursivelyCreateLocalDir(dir_, status);
+    if (TF_GetCode(status) != TF_OK) {
+      TF_Log(TF_WARNING, "Cannot create cache directory %s: %s", dir_.c_str(),
+             TF_Message(status));
+      max_bytes_ = 0;
+    } else {
+      LoadIndex();
+    }
+    TF_DeleteStatus(status);
+    TF_VLog(1, "Disk cache %s: max size = %u ; block size = %u", dir_.c_str(),
+            max_bytes_, block_size_);
+  }
+
+  static DiskBlockCache* Get() {
+    // Leaked on purpose, the plugin is never unloaded.
+    static DiskBlockCache* cache = new DiskBlockCache(
+        std::getenv(kCacheDir) ? std::getenv(kCacheDir) : DefaultCacheDir(),
+        GetEnvOrDefault(kBlockSize, kDefaultBlockSize) * 1024 * 1024,
+        GetEnvOrDefault(kMaxCacheSize, kDefaultMaxCacheSize) * 1024 * 1024);
+    return cache;
+  }
+
+  uint64_t block_size() const { return block_size_; }
+  bool IsCacheEnabled() const { return block_size_ > 0 && max_bytes_ > 0; }
+
+  // Removes the blocks of every version of `file` other than `signature`.
+  void ValidateFileSignature(const std::string& file, uint64_t signature) {
+    absl::MutexLock l(&mu_);
+    auto it = signatures_.find(file);
+    if (it != signatures_.end() && it->second == signature) return;
+    // Blocks loaded from the directory may belong to an older version too.
+    const std::string prefix = absl::StrCat(file, "-");
+    const std::string current = absl::StrCat(prefix, signature, "-");
+    for (auto block = blocks_.begin(); block != blocks_.end();) {
+      if (absl::StartsWith(block->first, prefix) &&
+          !absl::StartsWith(block->first, current)) {
+        TF_VLog(1, "Removing outdated cache block %s", block->first.c_str());
+        block = RemoveBlockLocked(block);
+      } else {
+        ++block;
+      }
+    }
+    signatures_[file] = signature;
+  }
+
+  // Copies `n` bytes at `offset` of block `name` into `buffer`. Returns false
+  // if the block is not (or no longer) cached.
+  bool Read(const std::string& name, uint64_t offset, size_t n, char* buffer) {
+    {
+      absl::MutexLock l(&mu_);
+      auto block = blocks_.find(name);
+      if (block == blocks_.end() || offset + n > block->second.size) {
+        return false;
+      }
+      lru_list_.splice(lru_list_.begin(), lru_list_,
+                       block->second.lru_iterator);
+    }
+    std::ifstream stream(BlockPath(name), std::ios::binary);
+    stream.seekg(offset);
+    stream.read(buffer, n);
+    if (stream.gcount() != static_cast<std::streamsize>(n)) {
+      // Evicted by another process sharing the directory.
+      absl::MutexLock l(&mu_);
+      auto block = blocks_.find(name);
+      if (block != blocks_.end()) RemoveBlockLocked(block);
+      return false;
+    }
+    return true;
+  }
+
+  // Stores block `name`, evicting the least recently used blocks if the cache
+  // grows beyond `max_bytes_`.
+  void Insert(const std::string& name, const char* data, size_t n) {
+    if (n > max_bytes_) return;
+    {
+      absl::MutexLock l(&mu_);
+      if (blocks_.find(name) != blocks_.end()) return;
+    }
+    // Write to a temporary file first so that a reader never sees a partial
+    // block.
+    const std::string path = BlockPath(name);
+    const std::string temp_path =
+        absl::StrCat(path, ".", NextRandom(), kTempSuffix);
+    {
+      std::ofstream stream(temp_path, std::ios::binary | std::ios::trunc);
+      stream.write(data, n);
+      stream.close();
+      if (!stream) {
+        TF_Log(TF_WARNING, "Cannot write cache block %s", temp_path.c_str());
+        std::remove(temp_path.c_str());
+        return;
+      }
+    }
+    if (std::rename(temp_path.c_str(), path.c_str()) != 0) {
+      std::remove(temp_path.c_str());
+      return;
+    }
+    absl::MutexLock l(&mu_);
+    AddBlockLocked(name, n);
+  }
+
+ private:
+  typedef struct Block {
+    uint64_t size;
+    std::list<std::string>::iterator lru_iterator;
+  } Block;
+
+  std::string BlockPath(const std::string& name) const {
+    return absl::StrCat(dir_, "/", name, kBlockSuffix);
+  }
+
+  uint64_t NextRandom() {
+    absl::MutexLock l(&random_mu_);
+    return random_();
+  }
+
+  void AddBlockLocked(const std::string& name, uint64_t size)
+      ABSL_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (blocks_.find(name) != blocks_.end()) return;
+    lru_list_.push_front(name);
+    blocks_[name] = Block{size, lru_list_.begin()};
+    cache_size_ += size;
+    while (cache_size_ > max_bytes_ && !lru_list_.empty()) {
+      RemoveBlockLocked(blocks_.find(lru_list_.back()));
+    }
+  }
+
+  std::unordered_map<std::string, Block>::iterator RemoveBlockLocked(
+      std::unordered_map<std::string, Block>::iterator block)
+      ABSL_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    std::remove(BlockPath(block->first).c_str());
+    cache_size_ -= block->second.size;
+    lru_list_.erase(block->second.lru_iterator);
+    return blocks_.erase(block);
+  }
+
+  void LoadIndex() {
+    TF_Status* status = TF_NewStatus();
+    TF_StringStream* children = TF_GetChildren(dir_.c_str(), status);
+    if (TF_GetCode(status) != TF_OK) {
+      TF_DeleteStatus(status);
+      return;
+    }
+    std::vector<std::pair<int64_t, std::pair<std::string, uint64_t>>> found;
+    const char* child;
+    while (TF_StringStreamNext(children, &child)) {
+      const std::string path = absl::StrCat(dir_, "/", child);
+      if (absl::EndsWith(child, kTempSuffix)) {
+        // Left behind by a process that died while writing.
+        std::remove(path.c_str());
+        continue;
+      }
+      if (!absl::EndsWith(child, kBlockSuffix)) continue;
+      TF_FileStatistics stats;
+      TF_FileStat(path.c_str(), &stats, status);
+      if (TF_GetCode(status) != TF_OK) continue;
+      std::string name(child, strlen(child) - strlen(kBlockSuffix));
+      found.push_back({stats.mtime_nsec, {name, stats.length}});
+    }
+    TF_StringStreamDone(children);
+    TF_DeleteStatus(status);
+
+    // Oldest first, so that the most recently written block ends up at the
+    // front of the LRU list.
+    std::sort(found.begin(), found.end());
+    absl::MutexLock l(&mu_);
+    for (const auto& block : found) {
+      AddBlockLocked(block.second.first, block.second.second);
+    }
+    TF_VLog(1, "Loaded %u cached blocks (%u bytes) from %s", blocks_.size(),
+            cache_size_, dir_.c_str());
+  }
+
+  const std::string dir_;
+  const uint64_t block_size_;
+  uint64_t max_bytes_;
+
+  absl::Mutex random_mu_;
+  std::mt19937_64 random_ ABSL_GUARDED_BY(random_mu_);
+
+  absl::Mutex mu_;
+  // Block names ordered from most to least recently used.
+  std::list<std::string> lru_list_ ABSL_GUARDED_BY(mu_);
+  std::unordered_map<std::string, Block> blocks_ ABSL_GUARDED_BY(mu_);
+  uint64_t cache_size_ ABSL_GUARDED_BY(mu_) = 0;
+  // The last seen signature of each file fingerprint.
+  std::unordered_map<std::string, uint64_t> signatures_ ABSL_GUARDED_BY(mu_);
+};
+
+typedef void (*ProvideFilesystemSupportForFn)(TF_FilesystemPluginOps* ops,
+                                              const char* uri);
+
+ProvideFilesystemSupportForFn GetProvider(const std::string& scheme) {
+  if (scheme == "az") return az::ProvideFilesystemSupportFor;
+  if (scheme == "http" || scheme == "https") {
+    return http::ProvideFilesystemSupportFor;
+  }
+  if (scheme == "s3") return s3::ProvideFilesystemSupportFor;
+  if (scheme == "hdfs" || scheme == "viewfs" || scheme == "har") {
+    return hdfs::ProvideFilesystemSupportFor;
+  }
+#if !defined(_MSC_VER)
+  if (scheme == "oss") return oss::ProvideFilesystemSupportFor;
+#endif
+  return nullptr;
+}
+
+// A wrapped filesystem, created the first time its scheme is used.
+typedef struct InnerFileSystem {
+  TF_FilesystemPluginOps ops;
+  TF_Filesystem filesystem;
+  bool initialized = false;
+  ~InnerFileSystem() {
+    if (initialized) ops.filesystem_ops->cleanup(&filesystem);
+    plugin_memory_free(ops.random_access_file_ops);
+    plugin_memory_free(ops.writable_file_ops);
+    plugin_memory_free(ops.read_only_memory_region_ops);
+    plugin_memory_free(ops.filesystem_ops);
+    free(ops.scheme);
+  }
+} InnerFileSystem;
+
+typedef struct CacheFileSystem {
+  DiskBlockCache* cache;
+  absl::Mutex mu;
+  std::map<std::string, std::unique_ptr<InnerFileSystem>> inner
+      ABSL_GUARDED_BY(mu);
+  CacheFileSystem() : cache(DiskBlockCache::Get()) {}
+} CacheFileSystem;
+
+// Returns the filesystem wrapped by `path` and sets `inner_path` to the path
+// in that filesystem.
+InnerFileSystem* GetInnerFileSystem(const TF_Filesystem* filesystem,
+                                    const char* path, std::string* inner_path,
+                                    TF_Status* status) {
+  auto cache_fs = static_cast<CacheFileSystem*>(filesystem->plugin_filesystem);
+  std::string scheme;
+  if (!ParseCachePath(path, &scheme, inner_path)) {
+    TF_SetStatus(status, TF_INVALID_ARGUMENT,
+                 absl::StrCat("Not a cache path: ", path).c_str());
+    return nullptr;
+  }
+  absl::MutexLock l(&cache_fs->mu);
+  auto it = cache_fs->inner.find(scheme);
+  if (it != cache_fs->inner.end()) {
+    TF_SetStatus(status, TF_OK, "");
+    return it->second.get();
+  }
+  ProvideFilesystemSupportForFn provider = GetProvider(scheme);
+  if (provider == nullptr) {
+    TF_SetStatus(status, TF_UNIMPLEMENTED,
+                 absl::StrCat("Scheme ", scheme, " cannot be cached").c_str());
+    return nullptr;
+  }
+  std::unique_ptr<InnerFileSystem> inner(new InnerFileSystem());
+  provider(&inner->ops, scheme.c_str());
+  inner->ops.filesystem_ops->init(&inner->filesystem, status);
+  if (TF_GetCode(status) != TF_OK) return nullptr;
+  inner->initialized = true;
+  InnerFileSystem* result = inner.get();
+  cache_fs->inner[scheme] = std::move(inner);
+  return result;
+}
+
+}  // namespace
+
+// SECTION 1. Implementation for `TF_RandomAccessFile`
+// ----------------------------------------------------------------------------
+namespace tf_random_access_file {
+typedef struct CacheRandomAccessFile {
+  std::string path;
+  // `<file fingerprint>-<file signature>-`, the prefix of all block names.
+  std::string block_prefix;
+  uint64_t length;
+  DiskBlockCache* cache;
+  InnerFileSystem* inner;
+  absl::Mutex mu;
+  // Opened on the first cache miss.
+  std::unique_ptr<TF_RandomAccessFile> file ABSL_GUARDED_BY(mu);
+  CacheRandomAccessFile(std::string path, std::string block_prefix,
+                        uint64_t length, DiskBlockCache* cache,
+                        InnerFileSystem* inner)
+      : path(std::move(path)),
+        block_prefix(std::move(block_prefix)),
+        length(length),
+        cache(cache),
+        inner(inner) {}
+  ~CacheRandomAccessFile() {
+    absl::MutexLock l(&mu);
+    if (file != nullptr) inner->ops.random_access_file_ops->cleanup(file.get());
+  }
+} CacheRandomAccessFile;
+
+void Cleanup(TF_RandomAccessFile* file) {
+  auto cache_file = static_cast<CacheRandomAccessFile*>(file->plugin_file);
+  delete cache_file;
+}
+
+// Reads `n` bytes at `offset` from the wrapped filesystem, with read(2)
+// semantics.
+static int64_t ReadInner(CacheRandomAccessFile* cache_file, uint64_t offset,
+                         size_t n, char* buffer, TF_Status* status) {
+  const TF_RandomAccessFile* file;
+  {
+    absl::MutexLock l(&cache_file->mu);
+    if (cache_file->file == nullptr) {
+      std::unique_ptr<TF_RandomAccessFile> inner_file(
+          new TF_RandomAccessFile());
+      cache_file->inner->ops.filesystem_ops->new_random_access_file(
+          &cache_file->inner->filesystem, cache_file->path.c_str(),
+          inner_file.get(), status);
+      if (TF_GetCode(status) != TF_OK) return -1;
+      cache_file->file = std::move(inner_file);
+    }
+    file = cache_file->file.get();
+  }
+  return cache_file->inner->ops.random_access_file_ops->read(file, offset, n,
+                                                             buffer, status);
+}
+
+int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
+             char* buffer, TF_Status* status) {
+  auto cache_file = static_cast<CacheRandomAccessFile*>(file->plugin_file);
+  auto cache = cache_file->cache;
+  if (!cache->IsCacheEnabled()) {
+    return ReadInner(cache_file, offset, n, buffer, status);
+  }
+
+  const uint64_t block_size = cache->block_size();
+  const uint64_t length = cache_file->length;
+  char* dst = buffer;
+  int64_t read = 0;
+  std::vector<char> block;
+  while (n > 0 && offset < length) {
+    const uint64_t index = offset / block_size;
+    const uint64_t block_start = index * block_size;
+    const uint64_t block_length = (std::min)(block_size, length - block_start);
+    const size_t copy_size =
+        (std::min)(n, static_cast<size_t>(block_start + block_length - offset));
+    const std::string name = absl::StrCat(cache_file->block_prefix, index);
+    if (!cache->Read(name, offset - block_start, copy_size, dst)) {
+      block.resize(block_length);
+      int64_t block_read = ReadInner(cache_file, block_start, block_length,
+                                     block.data(), status);
+      // A short read means the file shrank since it was opened.
+      if (TF_GetCode(status) == TF_OUT_OF_RANGE) {
+        TF_SetStatus(status, TF_OK, "");
+      }
+      if (TF_GetCode(status) != TF_OK) return -1;
+      if (block_read == static_cast<int64_t>(block_length)) {
+        cache->Insert(name, block.data(), block_length);
+      }
+      const uint64_t offset_in_block = offset - block_start;
+      const size_t available =
+          block_read > static_cast<int64_t>(offset_in_block)
+              ? (std::min)(copy_size,
+                           static_cast<size_t>(block_read - offset_in_block))
+              : 0;
+      memcpy(dst, block.data() + offset_in_block, available);
+      if (available < copy_size) {
+        TF_SetStatus(status, TF_OUT_OF_RANGE, "Read less bytes than requested");
+        return read + available;
+      }
+    }
+    dst += copy_size;
+    n -= copy_size;
+    offset += copy_size;
+    read += copy_size;
+  }
+  if (n > 0) {
+    TF_SetStatus(status, TF_OUT_OF_RANGE, "Read less bytes than requested");
+  } else {
+    TF_SetStatus(status, TF_OK, "");
+  }
+  return read;
+}
+
+}  // namespace tf_random_access_file
+
+// SECTION 2. Implementation for `TF_WritableFile`
+// ----------------------------------------------------------------------------
+namespace tf_writable_file {
+
+void Cleanup(TF_WritableFile* file) {}
+
+void Append(const TF_WritableFile* file, const char* buffer, size_t n,
+            TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED, "Append not implemented");
+}
+
+int64_t Tell(const TF_WritableFile* file, TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED, "Tell not implemented");
+  return -1;
+}
+
+void Flush(const TF_WritableFile* file, TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED, "Flush not implemented");
+}
+
+void Sync(const TF_WritableFile* file, TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED, "Sync not implemented");
+}
+
+void Close(const TF_WritableFile* file, TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED, "Close not implemented");
+}
+
+}  // namespace tf_writable_file
+
+// SECTION 3. Implementation for `TF_ReadOnlyMemoryRegion`
+// ----------------------------------------------------------------------------
+namespace tf_read_only_memory_region {
+void Cleanup(TF_ReadOnlyMemoryRegion* region) {}
+
+const void* Data(const TF_ReadOnlyMemoryRegion* region) { return nullptr; }
+
+uint64_t Length(const TF_ReadOnlyMemoryRegion* region) { return 0; }
+
+}  // namespace tf_read_only_memory_region
+
+// SECTION 4. Implementation for `TF_Filesystem`, the actual filesystem
+// ----------------------------------------------------------------------------
+namespace tf_cache_filesystem {
+
+void Init(TF_Filesystem* filesystem, TF_Status* status) {
+  filesystem->plugin_filesystem = new CacheFileSystem();
+  TF_SetStatus(status, TF_OK, "");
+}
+
+void Cleanup(TF_Filesystem* filesystem) {
+  auto cache_fs = static_cast<CacheFileSystem*>(filesystem->plugin_filesystem);
+  delete cache_fs;
+}
+
+void Stat(const TF_Filesystem* filesystem, const char* path,
+          TF_FileStatistics* stats, TF_Status* status) {
+  std::string inner_path;
+  auto inner = GetInnerFileSystem(filesystem, path, &inner_path, status);
+  if (TF_GetCode(status) != TF_OK) return;
+  inner->ops.filesystem_ops->stat(&inner->filesystem, inner_path.c_str(), stats,
+                                  status);
+}
+
+void NewRandomAccessFile(const TF_Filesystem* filesystem, const char* path,
+                         TF_RandomAccessFile* file, TF_Status* status) {
+  auto cache_fs = static_cast<CacheFileSystem*>(filesystem->plugin_filesystem);
+  std::string inner_path;
+  auto inner = GetInnerFileSystem(filesystem, path, &inner_path, status);
+  if (TF_GetCode(status) != TF_OK) return;
+
+  // The length and modification time identify the version of the file, any
+  // block cached for another version is dropped.
+  TF_FileStatistics stats;
+  inner->ops.filesystem_ops->stat(&inner->filesystem, inner_path.c_str(),
+                                  &stats, status);
+  if (TF_GetCode(status) != TF_OK) return;
+  if (stats.is_directory) {
+    TF_SetStatus(status, TF_FAILED_PRECONDITION,
+                 absl::StrCat(path, " is a directory").c_str());
+    return;
+  }
+  const std::string file_key = absl::StrCat(Fingerprint(inner_path));
+  const uint64_t signature =
+      Fingerprint(absl::StrCat(stats.length, "/", stats.mtime_nsec));
+  cache_fs->cache->ValidateFileSignature(file_key, signature);
+
+  file->plugin_file = new tf_random_access_file::CacheRandomAccessFile(
+      inner_path, absl::StrCat(file_key, "-", signature, "-"), stats.length,
+      cache_fs->cache, inner);
+  TF_SetStatus(status, TF_OK, "");
+}
+
+void NewWritableFile(const TF_Filesystem* filesystem, const char* path,
+                     TF_WritableFile* file, TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED,
+               "NewWritableFile not implemented, the cache is read only");
+}
+
+void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
+                       TF_WritableFile* file, TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED,
+               "NewAppendableFile not implemented, the cache is read only");
+}
+
+void NewReadOnlyMemoryRegionFromFile(const TF_Filesystem* filesystem,
+                                     const char* path,
+                                     TF_ReadOnlyMemoryRegion* region,
+                                     TF_Status* status) {
+  TF_SetStatus(status, TF_UNIMPLEMENTED,
+               "NewReadOnlyMemoryRegionFromFile not implemented");
+}
+
+void PathExists(const TF_Filesystem* filesystem, const char* path,
+                TF_Status* status) {
+  TF_FileStatistics stats;
+  Stat(filesystem, path, &stats, status);
+}
+
+bool IsDirectory(const TF_Filesystem* filesystem, const char* path,
+                 TF_Status* status) {
+  TF_FileStatistics stats;
+  Stat(filesystem, path, &stats, status);
+  if (TF_GetCode(status) != TF_OK) return false;
+  if (!stats.is_directory) {
+    TF_SetStatus(status, TF_FAILED_PRECONDITION, "not a directory");
+    return false;
+  }
+  return true;
+}
+
+int64_t GetFileSize(const TF_Filesystem* filesystem, const char* path,
+                    TF_Status* status) {
+  TF_FileStatistics stats;
+  Stat(filesystem, path, &stats, status);
+  if (TF_GetCode(status) != TF_OK) return -1;
+  return stats.length;
+}
+
+int GetChildren(const TF_Filesystem* filesystem, const char* path,
+                char*** entries, TF_Status* status) {
+  std::string inner_path;
+  auto inner = GetInnerFileSystem(filesystem, path, &inner_path, status);
+  if (TF_GetCode(status) != TF_OK) return -1;
+  if (inner->ops.filesystem_ops->get_children == nullptr) {
+    TF_SetStatus(status, TF_UNIMPLEMENTED, "GetChildren not implemented");
+    return -1;
+  }
+  // Children are relative names, they are returned as is.
+  return inner->ops.filesystem_ops->get_children(
+      &inner->filesystem, inner_path.c_str(), entries, status);
+}
+
+}  // namespace tf_cache_filesystem
+
+void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
+  TF_SetFilesystemVersionMetadata(ops);
+  ops->scheme = strdup(uri);
+
+  ops->random_access_file_ops = static_cast<TF_RandomAccessFileOps*>(
+      plugin_memory_allocate(TF_RANDOM_ACCESS_FILE_OPS_SIZE));
+  ops->random_access_file_ops->cleanup = tf_random_access_file::Cleanup;
+  ops->random_access_file_ops->read = tf_random_access_file::Read;
+
+  ops->writable_file_ops = static_cast<TF_WritableFileOps*>(
+      plugin_memory_allocate(TF_WRITABLE_FILE_OPS_SIZE));
+  ops->writable_file_ops->cleanup = tf_writable_file::Cleanup;
+  ops->writable_file_ops->append = tf_writable_file::Append;
+  ops->writable_file_ops->tell = tf_writable_file::Tell;
+  ops->writable_file_ops->flush = tf_writable_file::Flush;
+  ops->writable_file_ops->sync = tf_writable_file::Sync;
+  ops->writable_file_ops->close = tf_writable_file::Close;
+
+  ops->read_only_memory_region_ops = static_cast<TF_ReadOnlyMemoryRegionOps*>(
+      plugin_memory_allocate(TF_READ_ONLY_MEMORY_REGION_OPS_SIZE));
+  ops->read_only_memory_region_ops->cleanup =
+      tf_read_only_memory_region::Cleanup;
+  ops->read_only_memory_region_ops->data = tf_read_only_memory_region::Data;
+  ops->read_only_memory_region_ops->length = tf_read_only_memory_region::Length;
+
+  ops->filesystem_ops = static_cast<TF_FilesystemOps*>(
+      plugin_memory_allocate(TF_FILESYSTEM_OPS_SIZE));
+  ops->filesystem_ops->init = tf_cache_filesystem::Init;
+  ops->filesystem_ops->cleanup = tf_cache_filesystem::Cleanup;
+  ops->filesystem_ops->new_random_access_file =
+      tf_cache_filesystem::NewRandomAccessFile;
+  ops->filesystem_ops->new_writable_file = tf_cache_filesystem::NewWritableFile;
+  ops->filesystem_ops->new_appendable_file =
+      tf_cache_filesystem::NewAppendableFile;
+  ops->filesystem_ops->new_read_only_memory_region_from_file =
+      tf_cache_filesystem::NewReadOnlyMemoryRegionFromFile;
+  ops->filesystem_ops->path_exists = tf_cache_filesystem::PathExists;
+  ops->filesystem_ops->stat = tf_cache_filesystem::Stat;
+  ops->filesystem_ops->is_directory = tf_cache_filesystem::IsDirectory;
+  ops->filesystem_ops->get_file_size = tf_cache_filesystem::GetFileSize;
+  ops->filesystem_ops->get_children = tf_cache_filesystem::GetChildren;
+}
+
+}  // namespace cache
+}  // namespace io
+}  // namespace tensorflow
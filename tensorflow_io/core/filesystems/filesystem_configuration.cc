@@ -0,0 +1,122 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cstdlib>
+#include <unordered_map>
+
+#include "absl/strings/numbers.h"
+#include "absl/strings/str_cat.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/logging.h"
+
+namespace tensorflow {
+namespace io {
+namespace {
+
+ABSL_CONST_INIT absl::Mutex configuration_mu(absl::kConstInit);
+std::atomic<uint64_t> configuration_generation(0);
+
+std::unordered_map<std::string, std::string>* GetConfigurations()
+    ABSL_EXCLUSIVE_LOCKS_REQUIRED(configuration_mu) {
+  static auto* configurations =
+      new std::unordered_map<std::string, std::string>();
+  return configurations;
+}
+
+}  // namespace
+
+bool GetFilesystemConfiguration(const std::string& name, std::string* value) {
+  {
+    absl::MutexLock l(&configuration_mu);
+    auto configurations = GetConfigurations();
+    auto it = configurations->find(name);
+    if (it != configurations->end()) {
+      *value = it->second;
+      return true;
+    }
+  }
+  const char* env = std::getenv(name.c_str());
+  if (env == nullptr) return false;
+  *value = env;
+  return true;
+}
+
+uint64_t GetFilesystemConfigurationGeneration() {
+  return configuration_generation.load();
+}
+
+uint64_t GetFilesystemConfigurationOrDefault(const std::string& name,
+                                             uint64_t default_value) {
+  std::string value_str;
+  uint64_t value;
+  if (GetFilesystemConfiguration(name, &value_str) &&
+      absl::SimpleAtoi(value_str, &value)) {
+    return value;
+  }
+  return default_value;
+}
+
+void SetFilesystemConfiguration(const std::string& scheme,
+                                const std::vector<std::string>& names,
+                                const TF_Filesystem_Option* options,
+                                int num_options, TF_Status* status) {
+  // Validate all options first so that a bad option leaves all unchanged.
+  for (int i = 0; i < num_options; i++) {
+    if (options[i].value->type_tag != TF_Filesystem_Option_Type_Buffer) {
+      TF_SetStatus(status, TF_INVALID_ARGUMENT,
+                   absl::StrCat("SetConfiguration only support buffer type "
+                                "values for ",
+                                scheme, " file system")
+                       .c_str());
+      return;
+    }
+    if (options[i].value->num_values != 1) {
+      TF_SetStatus(status, TF_INVALID_ARGUMENT,
+                   absl::StrCat("SetConfiguration only support single option "
+                                "value for ",
+                                scheme, " file system")
+                       .c_str());
+      return;
+    }
+    if (std::find(names.begin(), names.end(), options[i].name) == names.end()) {
+      const auto& buffer = options[i].value->values[0].buffer_val;
+      TF_SetStatus(
+          status, TF_UNIMPLEMENTED,
+          absl::StrCat("SetConfiguration not implemented for ", scheme,
+                       " file system: name = ", options[i].name,
+                       ", value = ", std::string(buffer.buf, buffer.buf_length))
+              .c_str());
+      return;
+    }
+  }
+
+  absl::MutexLock l(&configuration_mu);
+  for (int i = 0; i < num_options; i++) {
+    const auto& buffer = options[i].value->values[0].buffer_val;
+    std::string value(buffer.buf, buffer.buf_length);
+    TF_VLog(1, "SetConfiguration for %s file system: %s = %s", scheme.c_str(),
+            options[i].name, value.c_str());
+    (*GetConfigurations())[options[i].name] = std::move(value);
+  }
+  configuration_generation++;
+  TF_SetStatus(status, TF_OK, "");
+}
+
+}  // namespace io
+}  // namespace tensorflow
@@ -0,0 +1,58 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_IO_CORE_FILESYSTEMS_FILESYSTEM_CONFIGURATION_H_
+#define TENSORFLOW_IO_CORE_FILESYSTEMS_FILESYSTEM_CONFIGURATION_H_
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "tensorflow/c/experimental/filesystem/filesystem_interface.h"
+#include "tensorflow/c/tf_status.h"
+
+namespace tensorflow {
+namespace io {
+
+/// Returns in `value` the filesystem option `name`, as set at runtime with
+/// `SetFilesystemConfiguration`, or else the environment variable of the same
+/// name. Returns false if neither is set.
+bool GetFilesystemConfiguration(const std::string& name, std::string* value);
+
+/// Same as `GetFilesystemConfiguration`, parsed as an unsigned integer.
+/// Returns `default_value` if the option is unset or is not a number.
+uint64_t GetFilesystemConfigurationOrDefault(const std::string& name,
+                                             uint64_t default_value);
+
+/// Returns a counter that is incremented by every successful
+/// `SetFilesystemConfiguration`, so that filesystems which derive state from
+/// the options (e.g. a block cache) can tell when to rebuild it.
+uint64_t GetFilesystemConfigurationGeneration();
+
+/// Implements `set_filesystem_configuration` (i.e.
+/// `tfio.experimental.filesystem.set_configuration`) for the filesystem
+/// `scheme`, which accepts the options `names`. Each option takes a single
+/// string value. Values last for the lifetime of the process and override
+/// the environment variables of the same name. Filesystems read them when a
+/// file is opened, so a new value applies to files opened afterwards.
+void SetFilesystemConfiguration(const std::string& scheme,
+                                const std::vector<std::string>& names,
+                                const TF_Filesystem_Option* options,
+                                int num_options, TF_Status* status);
+
+}  // namespace io
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_IO_CORE_FILESYSTEMS_FILESYSTEM_CONFIGURATION_H_
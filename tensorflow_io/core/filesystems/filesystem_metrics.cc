@@ -0,0 +1,124 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
+
+#include <chrono>
+#include <memory>
+
+#include "absl/strings/str_cat.h"
+
+namespace tensorflow {
+namespace io {
+namespace {
+
+// The upper bounds of the latency histogram buckets, in milliseconds. The
+// last bucket holds all latencies above the last bound.
+constexpr uint64_t kLatencyBucketBoundsMs[] = {
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000};
+constexpr size_t kNumLatencyBuckets =
+    sizeof(kLatencyBucketBoundsMs) / sizeof(kLatencyBucketBoundsMs[0]) + 1;
+
+ABSL_CONST_INIT absl::Mutex metrics_mu(absl::kConstInit);
+
+std::map<std::string, std::unique_ptr<FilesystemMetrics>>* GetAllMetrics()
+    ABSL_EXCLUSIVE_LOCKS_REQUIRED(metrics_mu) {
+  static auto* metrics =
+      new std::map<std::string, std::unique_ptr<FilesystemMetrics>>();
+  return metrics;
+}
+
+uint64_t NowMicros() {
+  return std::chrono::duration_cast<std::chrono::microseconds>(
+             std::chrono::steady_clock::now().time_since_epoch())
+      .count();
+}
+
+}  // namespace
+
+FilesystemMetrics* FilesystemMetrics::Get(const std::string& scheme) {
+  absl::MutexLock l(&metrics_mu);
+  auto& metrics = (*GetAllMetrics())[scheme];
+  if (metrics == nullptr) metrics.reset(new FilesystemMetrics());
+  return metrics.get();
+}
+
+uint64_t FilesystemMetrics::StartRequest() {
+  in_flight_++;
+  return NowMicros();
+}
+
+void FilesystemMetrics::EndRequest(const std::string& type,
+                                   uint64_t start_micros, bool ok) {
+  const uint64_t latency_micros = NowMicros() - start_micros;
+  size_t bucket = 0;
+  while (bucket < kNumLatencyBuckets - 1 &&
+         latency_micros > kLatencyBucketBoundsMs[bucket] * 1000) {
+    bucket++;
+  }
+  {
+    absl::MutexLock l(&mu_);
+    auto& stats = requests_[type];
+    if (stats.latency_buckets.empty()) {
+      stats.latency_buckets.resize(kNumLatencyBuckets);
+    }
+    stats.count++;
+    if (!ok) stats.errors++;
+    stats.latency_micros_sum += latency_micros;
+    stats.latency_buckets[bucket]++;
+  }
+  in_flight_--;
+}
+
+std::string FilesystemMetrics::ToJson() {
+  std::string requests;
+  {
+    absl::MutexLock l(&mu_);
+    for (const auto& request : requests_) {
+      const RequestStats& stats = request.second;
+      std::string buckets;
+      for (size_t i = 0; i < kNumLatencyBuckets; i++) {
+        absl::StrAppend(&buckets, i > 0 ? "," : "", "[",
+                        i < kNumLatencyBuckets - 1
+                            ? absl::StrCat(kLatencyBucketBoundsMs[i])
+                            : std::string("null"),
+                        ",", stats.latency_buckets[i], "]");
+      }
+      absl::StrAppend(&requests, requests.empty() ? "" : ",", "\"",
+                      request.first, "\":{\"count\":", stats.count,
+                      ",\"errors\":", stats.errors,
+                      ",\"latency_ms_sum\":", stats.latency_micros_sum / 1000.0,
+                      ",\"latency_ms_buckets\":[", buckets, "]}");
+    }
+  }
+  return absl::StrCat(
+      "{\"bytes_read\":", bytes_read_.load(),
+      ",\"bytes_written\":", bytes_written_.load(),
+      ",\"retries\":", retries_.load(), ",\"cache_hits\":", cache_hits_.load(),
+      ",\"cache_misses\":", cache_misses_.load(),
+      ",\"hedged_reads\":", hedged_reads_.load(),
+      ",\"hedge_wins\":", hedge_wins_.load(),
+      ",\"in_flight\":", in_flight_.load(), ",\"requests\":{", requests, "}}");
+}
+
+FilesystemMetrics::Request::~Request() {
+  const TF_Code code = TF_GetCode(status_);
+  metrics_->EndRequest(
+      type_, start_micros_,
+      code == TF_OK || code == TF_NOT_FOUND || code == TF_OUT_OF_RANGE);
+}
+
+}  // namespace io
+}  // namespace tensorflow
@@ -0,0 +1,105 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_IO_CORE_FILESYSTEMS_FILESYSTEM_METRICS_H_
+#define TENSORFLOW_IO_CORE_FILESYSTEMS_FILESYSTEM_METRICS_H_
+
+#include <atomic>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "absl/base/thread_annotations.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/tf_status.h"
+
+namespace tensorflow {
+namespace io {
+
+/// \brief Counters and latency histograms of the requests that a filesystem
+/// sends to its store, read from Python with
+/// `tfio.experimental.filesystem.stats`.
+///
+/// This class is thread safe.
+class FilesystemMetrics {
+ public:
+  /// Returns the metrics of the filesystem `scheme`, e.g. "s3". They are
+  /// created on first use and live for the lifetime of the process.
+  static FilesystemMetrics* Get(const std::string& scheme);
+
+  void AddBytesRead(uint64_t bytes) { bytes_read_ += bytes; }
+  void AddBytesWritten(uint64_t bytes) { bytes_written_ += bytes; }
+  void AddRetry() { retries_++; }
+  void AddCacheHit() { cache_hits_++; }
+  void AddCacheMiss() { cache_misses_++; }
+  void AddHedgedRead() { hedged_reads_++; }
+  void AddHedgeWin() { hedge_wins_++; }
+
+  /// Counts a request as in flight until `EndRequest`. Returns its start
+  /// time, to pass to `EndRequest`.
+  uint64_t StartRequest();
+
+  /// Records the latency of a request of `type`, e.g. "GetObject", started at
+  /// `start_micros`.
+  void EndRequest(const std::string& type, uint64_t start_micros, bool ok);
+
+  /// Returns the metrics as a JSON object.
+  std::string ToJson();
+
+  /// \brief Times a request for the duration of its scope.
+  ///
+  /// The request is counted as failed if `status` ends up holding an error,
+  /// other than `TF_NOT_FOUND` or `TF_OUT_OF_RANGE` which are regular
+  /// answers of a store.
+  class Request {
+   public:
+    Request(FilesystemMetrics* metrics, const char* type, TF_Status* status)
+        : metrics_(metrics),
+          type_(type),
+          status_(status),
+          start_micros_(metrics->StartRequest()) {}
+    ~Request();
+
+   private:
+    FilesystemMetrics* metrics_;
+    const char* type_;
+    TF_Status* status_;
+    uint64_t start_micros_;
+  };
+
+ private:
+  struct RequestStats {
+    uint64_t count = 0;
+    uint64_t errors = 0;
+    uint64_t latency_micros_sum = 0;
+    std::vector<uint64_t> latency_buckets;
+  };
+
+  std::atomic<uint64_t> bytes_read_{0};
+  std::atomic<uint64_t> bytes_written_{0};
+  std::atomic<uint64_t> retries_{0};
+  std::atomic<uint64_t> cache_hits_{0};
+  std::atomic<uint64_t> cache_misses_{0};
+  std::atomic<uint64_t> hedged_reads_{0};
+  std::atomic<uint64_t> hedge_wins_{0};
+  std::atomic<int64_t> in_flight_{0};
+  absl::Mutex mu_;
+  std::map<std::string, RequestStats> requests_ ABSL_GUARDED_BY(mu_);
+};
+
+}  // namespace io
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_IO_CORE_FILESYSTEMS_FILESYSTEM_METRICS_H_
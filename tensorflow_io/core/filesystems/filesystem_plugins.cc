@@ -15,7 +15,10 @@ limitations under the License.
 
 #include "tensorflow_io/core/filesystems/filesystem_plugins.h"
 
+#include <cstring>
+
 #include "absl/strings/ascii.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
 
 #if defined(_MSC_VER)
 #define TFIO_PLUGIN_EXPORT __declspec(dllexport)
@@ -29,9 +32,9 @@ limitations under the License.
 TFIO_PLUGIN_EXPORT void TF_InitPlugin(TF_FilesystemPluginInfo* info) {
   info->plugin_memory_allocate = tensorflow::io::plugin_memory_allocate;
   info->plugin_memory_free = tensorflow::io::plugin_memory_free;
-  info->num_schemes = 7;
+  info->num_schemes = 14;
 #if !defined(_MSC_VER)
-  info->num_schemes = 8;
+  info->num_schemes = 16;
 #endif
   info->ops = static_cast<TF_FilesystemPluginOps*>(
       tensorflow::io::plugin_memory_allocate(info->num_schemes *
@@ -43,7 +46,38 @@ TFIO_PLUGIN_EXPORT void TF_InitPlugin(TF_FilesystemPluginInfo* info) {
   tensorflow::io::hdfs::ProvideFilesystemSupportFor(&info->ops[4], "hdfs");
   tensorflow::io::hdfs::ProvideFilesystemSupportFor(&info->ops[5], "viewfs");
   tensorflow::io::hdfs::ProvideFilesystemSupportFor(&info->ops[6], "har");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[7],
+                                                     "tfiocache.az");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[8],
+                                                     "tfiocache.http");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[9],
+                                                     "tfiocache.https");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[10],
+                                                     "tfiocache.s3");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[11],
+                                                     "tfiocache.hdfs");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[12],
+                                                     "tfiocache.viewfs");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[13],
+                                                     "tfiocache.har");
 #if !defined(_MSC_VER)
-  tensorflow::io::oss::ProvideFilesystemSupportFor(&info->ops[7], "oss");
+  tensorflow::io::oss::ProvideFilesystemSupportFor(&info->ops[14], "oss");
+  tensorflow::io::cache::ProvideFilesystemSupportFor(&info->ops[15],
+                                                     "tfiocache.oss");
 #endif
 }
+
+// Writes the metrics of the filesystem `scheme` as a null terminated JSON
+// object into `buffer`, if `size` is large enough to hold it, and returns the
+// length of the JSON object. Called from Python through ctypes, see
+// `tfio.experimental.filesystem.stats`.
+extern "C" TFIO_PLUGIN_EXPORT int64_t TFIO_FilesystemStats(const char* scheme,
+                                                           char* buffer,
+                                                           int64_t size) {
+  const std::string json =
+      tensorflow::io::FilesystemMetrics::Get(scheme)->ToJson();
+  if (buffer != nullptr && size > static_cast<int64_t>(json.size())) {
+    memcpy(buffer, json.c_str(), json.size() + 1);
+  }
+  return json.size();
+}
@@ -32,6 +32,12 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri);
 
 }  // namespace az
 
+namespace cache {
+
+void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri);
+
+}  // namespace cache
+
 namespace hdfs {
 
 void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri);
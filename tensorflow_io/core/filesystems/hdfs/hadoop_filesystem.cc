@@ -17,22 +17,27 @@ limitations under the License.
 #include <string.h>
 
 #include <functional>
+#include <future>
 #include <iostream>
 #include <map>
 #include <memory>
 #include <sstream>
 #include <string>
+#include <vector>
 #if defined(_MSC_VER)
 #include <Windows.h>
 #else
 #include <dlfcn.h>
 #endif
 
+#include "absl/strings/numbers.h"
 #include "absl/strings/str_cat.h"
 #include "absl/synchronization/mutex.h"
 #include "hdfs/hdfs.h"
 #include "tensorflow/c/logging.h"
 #include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
 #include "tensorflow_io/core/filesystems/filesystem_plugins.h"
 
 namespace tensorflow {
@@ -253,9 +258,32 @@ class LibHDFS {
   void* handle_;
 };
 
+// Shared by the hdfs, viewfs and har schemes, which are served by the same
+// libhdfs.
+static FilesystemMetrics* GetMetrics() {
+  static FilesystemMetrics* metrics = FilesystemMetrics::Get("hdfs");
+  return metrics;
+}
+
 // SECTION 1. Implementation for `TF_RandomAccessFile`
 // ----------------------------------------------------------------------------
 namespace tf_random_access_file {
+// Size of the per-file read buffer in KB. Reads smaller than the buffer are
+// served from a single `hdfsPread` of this size, so record readers issuing
+// many small sequential reads do not pay a DataNode round trip each. It is
+// off (0) by default, as small random reads would each fetch a whole buffer.
+constexpr char kReadBufferSizeKB[] = "HDFS_READ_BUFFER_SIZE_KB";
+constexpr size_t kDefaultReadBufferSizeKB = 0;
+// If set to 1, fetch the next buffer in the background once a read moves
+// past the current one, so sequential readers overlap I/O with processing.
+constexpr char kReadPrefetch[] = "HDFS_READ_PREFETCH";
+
+typedef struct PrefetchedBuffer {
+  uint64_t start;
+  std::vector<char> data;
+  TF_Code code;
+} PrefetchedBuffer;
+
 typedef struct HDFSRandomAccessFile {
   std::string path;
   std::string hdfs_path;
@@ -264,6 +292,12 @@ typedef struct HDFSRandomAccessFile {
   absl::Mutex mu;
   hdfsFile handle ABSL_GUARDED_BY(mu);
   bool disable_eof_retried;
+  size_t buffer_size;
+  bool prefetch;
+  absl::Mutex buffer_mu;
+  uint64_t buffer_start ABSL_GUARDED_BY(buffer_mu);
+  std::vector<char> buffer ABSL_GUARDED_BY(buffer_mu);
+  std::future<PrefetchedBuffer> prefetched ABSL_GUARDED_BY(buffer_mu);
   HDFSRandomAccessFile(std::string path, std::string hdfs_path, hdfsFS fs,
                        LibHDFS* libhdfs, hdfsFile handle)
       : path(std::move(path)),
@@ -271,7 +305,12 @@ typedef struct HDFSRandomAccessFile {
         fs(fs),
         libhdfs(libhdfs),
         mu(),
-        handle(handle) {
+        handle(handle),
+        buffer_size(kDefaultReadBufferSizeKB * 1024),
+        prefetch(false),
+        buffer_mu(),
+        buffer_start(0),
+        buffer() {
     const char* disable_eof_retried_str =
         getenv("HDFS_DISABLE_READ_EOF_RETRIED");
     if (disable_eof_retried_str && disable_eof_retried_str[0] == '1') {
@@ -279,11 +318,24 @@ typedef struct HDFSRandomAccessFile {
     } else {
       disable_eof_retried = false;
     }
+    buffer_size = GetFilesystemConfigurationOrDefault(
+                      kReadBufferSizeKB, kDefaultReadBufferSizeKB) *
+                  1024;
+    std::string prefetch_str;
+    if (GetFilesystemConfiguration(kReadPrefetch, &prefetch_str) &&
+        prefetch_str == "1") {
+      prefetch = true;
+    }
   }
 } HDFSRandomAccessFile;
 
 void Cleanup(TF_RandomAccessFile* file) {
   auto hdfs_file = static_cast<HDFSRandomAccessFile*>(file->plugin_file);
+  {
+    // An in-flight prefetch still uses the handle, wait for it first.
+    absl::MutexLock l(&hdfs_file->buffer_mu);
+    if (hdfs_file->prefetched.valid()) hdfs_file->prefetched.wait();
+  }
   {
     absl::MutexLock l(&hdfs_file->mu);
     if (hdfs_file->handle != nullptr) {
@@ -293,9 +345,8 @@ void Cleanup(TF_RandomAccessFile* file) {
   delete hdfs_file;
 }
 
-int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
-             char* buffer, TF_Status* status) {
-  auto hdfs_file = static_cast<HDFSRandomAccessFile*>(file->plugin_file);
+static int64_t ReadUnbuffered(HDFSRandomAccessFile* hdfs_file, uint64_t offset,
+                              size_t n, char* buffer, TF_Status* status) {
   auto libhdfs = hdfs_file->libhdfs;
   auto fs = hdfs_file->fs;
   auto hdfs_path = hdfs_file->hdfs_path.c_str();
@@ -318,13 +369,17 @@ int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
     // So we choose INT_MAX-8, which is the maximum "safe" number.
     size_t read_n =
         (std::min)(n, static_cast<size_t>(std::numeric_limits<int>::max() - 8));
+    const uint64_t start_micros = GetMetrics()->StartRequest();
     int64_t r = libhdfs->hdfsPread(fs, handle, static_cast<tOffset>(offset),
                                    dst, static_cast<tSize>(read_n));
+    const int pread_errno = errno;
+    GetMetrics()->EndRequest("read", start_micros, r >= 0);
     if (r > 0) {
       dst += r;
       n -= r;
       offset += r;
       read += r;
+      GetMetrics()->AddBytesRead(r);
     } else if (!eof_retried && r == 0) {
       // Always reopen the file upon reaching EOF to see if there's more data.
       // If writers are streaming contents while others are concurrently
@@ -346,12 +401,100 @@ int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
       eof_retried = true;
     } else if (eof_retried && r == 0) {
       TF_SetStatus(status, TF_OUT_OF_RANGE, "Read less bytes than requested");
-    } else if (errno == EINTR || errno == EAGAIN) {
+    } else if (pread_errno == EINTR || pread_errno == EAGAIN) {
       // hdfsPread may return EINTR too. Just retry.
+      GetMetrics()->AddRetry();
     } else {
-      TF_SetStatusFromIOError(status, errno, path);
+      TF_SetStatusFromIOError(status, pread_errno, path);
+    }
+  }
+  return read;
+}
+
+static PrefetchedBuffer FetchBuffer(HDFSRandomAccessFile* hdfs_file,
+                                    uint64_t start) {
+  PrefetchedBuffer fetched{start, std::vector<char>(hdfs_file->buffer_size),
+                           TF_OK};
+  TF_Status* status = TF_NewStatus();
+  int64_t read = ReadUnbuffered(hdfs_file, start, fetched.data.size(),
+                                fetched.data.data(), status);
+  fetched.code = TF_GetCode(status);
+  fetched.data.resize(read > 0 ? read : 0);
+  TF_DeleteStatus(status);
+  return fetched;
+}
+
+// Refills `buffer` so that it starts at `offset`, taking over the prefetched
+// buffer if it covers `offset`. Errors other than a short read at EOF are
+// reported through `status`.
+static void FillBuffer(HDFSRandomAccessFile* hdfs_file, uint64_t offset,
+                       TF_Status* status)
+    ABSL_EXCLUSIVE_LOCKS_REQUIRED(hdfs_file->buffer_mu) {
+  hdfs_file->buffer.clear();
+  if (hdfs_file->prefetched.valid()) {
+    PrefetchedBuffer fetched = hdfs_file->prefetched.get();
+    if (fetched.code == TF_OK && offset >= fetched.start &&
+        offset < fetched.start + fetched.data.size()) {
+      hdfs_file->buffer_start = fetched.start;
+      hdfs_file->buffer = std::move(fetched.data);
+      GetMetrics()->AddCacheHit();
+    }
+  }
+  if (hdfs_file->buffer.empty()) {
+    GetMetrics()->AddCacheMiss();
+    hdfs_file->buffer.resize(hdfs_file->buffer_size);
+    int64_t read = ReadUnbuffered(hdfs_file, offset, hdfs_file->buffer.size(),
+                                  hdfs_file->buffer.data(), status);
+    hdfs_file->buffer_start = offset;
+    hdfs_file->buffer.resize(read > 0 ? read : 0);
+    if (TF_GetCode(status) == TF_OUT_OF_RANGE) TF_SetStatus(status, TF_OK, "");
+    if (TF_GetCode(status) != TF_OK) return;
+  }
+  // Only a full buffer can be followed by more data worth prefetching.
+  if (hdfs_file->prefetch &&
+      hdfs_file->buffer.size() == hdfs_file->buffer_size) {
+    hdfs_file->prefetched =
+        std::async(std::launch::async, FetchBuffer, hdfs_file,
+                   hdfs_file->buffer_start + hdfs_file->buffer.size());
+  }
+}
+
+int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
+             char* buffer, TF_Status* status) {
+  auto hdfs_file = static_cast<HDFSRandomAccessFile*>(file->plugin_file);
+  if (n >= hdfs_file->buffer_size) {
+    return ReadUnbuffered(hdfs_file, offset, n, buffer, status);
+  }
+
+  absl::MutexLock l(&hdfs_file->buffer_mu);
+  if (offset >= hdfs_file->buffer_start &&
+      offset < hdfs_file->buffer_start + hdfs_file->buffer.size()) {
+    GetMetrics()->AddCacheHit();
+  }
+  char* dst = buffer;
+  int64_t read = 0;
+  while (n > 0) {
+    auto buffer_start = hdfs_file->buffer_start;
+    auto buffer_end = buffer_start + hdfs_file->buffer.size();
+    if (offset >= buffer_start && offset < buffer_end) {
+      size_t copy_size =
+          (std::min)(n, static_cast<size_t>(buffer_end - offset));
+      memcpy(dst, hdfs_file->buffer.data() + (offset - buffer_start),
+             copy_size);
+      dst += copy_size;
+      n -= copy_size;
+      offset += copy_size;
+      read += copy_size;
+      continue;
+    }
+    FillBuffer(hdfs_file, offset, status);
+    if (TF_GetCode(status) != TF_OK) return read;
+    if (hdfs_file->buffer.empty()) {
+      TF_SetStatus(status, TF_OUT_OF_RANGE, "Read less bytes than requested");
+      return read;
     }
   }
+  TF_SetStatus(status, TF_OK, "");
   return read;
 }
 
@@ -397,17 +540,22 @@ void Append(const TF_WritableFile* file, const char* buffer, size_t n,
       static_cast<size_t>(std::numeric_limits<tSize>::max() - 8);
   while (cur_pos < n) {
     write_len = (std::min)(n - cur_pos, max_len_once);
+    const uint64_t start_micros = GetMetrics()->StartRequest();
     tSize w = libhdfs->hdfsWrite(fs, handle, buffer + cur_pos,
                                  static_cast<tSize>(write_len));
+    const int write_errno = errno;
+    GetMetrics()->EndRequest("write", start_micros, w != -1);
     if (w == -1) {
-      if (!retry && (errno == EINTR || errno == EAGAIN)) {
+      if (!retry && (write_errno == EINTR || write_errno == EAGAIN)) {
         retry = true;
+        GetMetrics()->AddRetry();
       } else {
-        return TF_SetStatusFromIOError(status, errno,
+        return TF_SetStatusFromIOError(status, write_errno,
                                        hdfs_file->hdfs_path.c_str());
       }
     } else {
       cur_pos += w;
+      GetMetrics()->AddBytesWritten(w);
     }
   }
   TF_SetStatus(status, TF_OK, "");
@@ -919,6 +1067,15 @@ static char* TranslateName(const TF_Filesystem* filesystem, const char* uri) {
   return strdup(uri);
 }
 
+static void SetConfiguration(const TF_Filesystem* filesystem,
+                             const TF_Filesystem_Option* options,
+                             int num_options, TF_Status* status) {
+  SetFilesystemConfiguration("hdfs",
+                             {tf_random_access_file::kReadBufferSizeKB,
+                              tf_random_access_file::kReadPrefetch},
+                             options, num_options, status);
+}
+
 }  // namespace tf_hdfs_filesystem
 
 void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
@@ -968,6 +1125,8 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
   ops->filesystem_ops->stat = tf_hdfs_filesystem::Stat;
   ops->filesystem_ops->get_children = tf_hdfs_filesystem::GetChildren;
   ops->filesystem_ops->translate_name = tf_hdfs_filesystem::TranslateName;
+  ops->filesystem_ops->set_filesystem_configuration =
+      tf_hdfs_filesystem::SetConfiguration;
 }
 
 }  // namespace hdfs
@@ -15,16 +15,26 @@ limitations under the License.
 
 #include <curl/curl.h>
 
+#include <algorithm>
+#include <functional>
 #include <iostream>
+#include <memory>
 #include <string>
 #include <unordered_map>
+#include <vector>
 
 #include "absl/strings/ascii.h"
+#include "absl/strings/numbers.h"
 #include "absl/strings/str_cat.h"
 #include "absl/synchronization/mutex.h"
 #include "tensorflow/c/logging.h"
 #include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/expiring_lru_cache.h"
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
 #include "tensorflow_io/core/filesystems/filesystem_plugins.h"
+#include "tensorflow_io/core/filesystems/mapped_memory_region.h"
+#include "tensorflow_io/core/filesystems/ram_file_block_cache.h"
 
 namespace tensorflow {
 namespace io {
@@ -34,6 +44,44 @@ namespace {
 // Set to 1 to enable verbose debug output from curl.
 constexpr uint64_t kVerboseOutput = 0;
 
+// The environment variable that overrides the block size for aligned reads
+// through the block cache. Specified in MB.
+constexpr char kBlockSize[] = "HTTP_READ_CACHE_BLOCK_SIZE_MB";
+constexpr size_t kDefaultBlockSize = 16 * 1024 * 1024;
+// The environment variable that overrides the max size of the LRU cache of
+// blocks read over http(s). Specified in MB. The cache is disabled by default.
+constexpr char kMaxCacheSize[] = "HTTP_READ_CACHE_MAX_SIZE_MB";
+constexpr size_t kDefaultMaxCacheSize = 0;
+// The environment variable that overrides the maximum staleness of cached
+// blocks, in seconds. 0 means blocks are only evicted when the file signature
+// (`ETag`/`Last-Modified`) changes or when the cache is full.
+constexpr char kMaxStaleness[] = "HTTP_READ_CACHE_MAX_STALENESS";
+constexpr uint64_t kDefaultMaxStaleness = 0;
+
+// The environment variables that override the max age (in seconds) and the
+// max number of entries of the `Stat`/`GetFileSize` cache.
+constexpr char kStatCacheMaxAge[] = "HTTP_STAT_CACHE_MAX_AGE";
+constexpr uint64_t kStatCacheDefaultMaxAge = 5;
+constexpr char kStatCacheMaxEntries[] = "HTTP_STAT_CACHE_MAX_ENTRIES";
+constexpr size_t kStatCacheDefaultMaxEntries = 1024;
+
+// The environment variable that overrides the maximum number of idle curl
+// handles (and thereby kept-alive connections) pooled per host.
+constexpr char kMaxIdleHandlesPerHost[] = "HTTP_MAX_IDLE_CONNECTIONS_PER_HOST";
+constexpr size_t kDefaultMaxIdleHandlesPerHost = 8;
+
+// The environment variable that overrides the minimum size of a read that is
+// split into concurrent `Range:` requests. Specified in MB. 0 disables
+// parallel reads.
+constexpr char kParallelReadThreshold[] = "HTTP_PARALLEL_READ_THRESHOLD_MB";
+constexpr size_t kDefaultParallelReadThreshold = 32 * 1024 * 1024;
+// The environment variable that overrides the maximum number of concurrent
+// `Range:` requests issued for a single read.
+constexpr char kParallelReadConnections[] = "HTTP_PARALLEL_READ_CONNECTIONS";
+constexpr size_t kDefaultParallelReadConnections = 8;
+// Parallel reads are never split into ranges smaller than this.
+constexpr size_t kMinParallelReadPartSize = 4 * 1024 * 1024;
+
 static absl::Mutex mu;
 static bool initialized(false);
 void CurlInitialize() {
@@ -44,14 +92,128 @@ void CurlInitialize() {
   }
 }
 
-class CurlHttpRequest {
+// A curl share handle so that all requests reuse resolved host names and TLS
+// session ids, even when they are issued through different easy handles.
+class CurlShare {
+ public:
+  static CURLSH* Get() {
+    // Intentionally leaked, as curl handles may still refer to it during
+    // static destruction.
+    static CurlShare* share = new CurlShare();
+    return share->share_;
+  }
+
+ private:
+  CurlShare() {
+    CurlInitialize();
+    share_ = curl_share_init();
+    if (share_ == nullptr) return;
+    curl_share_setopt(share_, CURLSHOPT_LOCKFUNC, &CurlShare::Lock);
+    curl_share_setopt(share_, CURLSHOPT_UNLOCKFUNC, &CurlShare::Unlock);
+    curl_share_setopt(share_, CURLSHOPT_USERDATA, this);
+    curl_share_setopt(share_, CURLSHOPT_SHARE, CURL_LOCK_DATA_DNS);
+    curl_share_setopt(share_, CURLSHOPT_SHARE, CURL_LOCK_DATA_SSL_SESSION);
+  }
+
+  static void Lock(CURL* handle, curl_lock_data data, curl_lock_access access,
+                   void* userptr) {
+    static_cast<CurlShare*>(userptr)->mu_[data].Lock();
+  }
+
+  static void Unlock(CURL* handle, curl_lock_data data, void* userptr) {
+    static_cast<CurlShare*>(userptr)->mu_[data].Unlock();
+  }
+
+  CURLSH* share_ = nullptr;
+  absl::Mutex mu_[CURL_LOCK_DATA_LAST];
+};
+
+// Returns the `scheme://host:port` part of `uri`, used to key pooled handles.
+static std::string GetHostFromUri(const std::string& uri) {
+  size_t scheme_end = uri.find("://");
+  size_t host_start = (scheme_end == std::string::npos) ? 0 : scheme_end + 3;
+  size_t host_end = uri.find_first_of("/?#", host_start);
+  return uri.substr(0, host_end);
+}
+
+// A pool of curl easy handles, keyed by host. An easy handle keeps its
+// connection cache across `curl_easy_reset`, so reusing handles for the same
+// host reuses kept-alive TCP/TLS connections instead of paying a new handshake
+// for every request.
+class CurlHandlePool {
  public:
-  CurlHttpRequest() {}
-  ~CurlHttpRequest() {}
+  explicit CurlHandlePool(size_t max_idle_handles_per_host)
+      : max_idle_handles_per_host_(max_idle_handles_per_host) {}
+  ~CurlHandlePool() {
+    absl::MutexLock l(&mu_);
+    for (auto& entry : idle_handles_) {
+      for (CURL* curl : entry.second) curl_easy_cleanup(curl);
+    }
+  }
 
-  void Initialize(TF_Status* status) {
+  CURL* Acquire(const std::string& host) {
+    {
+      absl::MutexLock l(&mu_);
+      auto entry = idle_handles_.find(host);
+      if (entry != idle_handles_.end() && !entry->second.empty()) {
+        CURL* curl = entry->second.back();
+        entry->second.pop_back();
+        return curl;
+      }
+    }
     CurlInitialize();
-    curl_ = curl_easy_init();
+    return curl_easy_init();
+  }
+
+  void SetMaxIdleHandlesPerHost(size_t max_idle_handles_per_host) {
+    absl::MutexLock l(&mu_);
+    max_idle_handles_per_host_ = max_idle_handles_per_host;
+  }
+
+  void Release(const std::string& host, CURL* curl) {
+    curl_easy_reset(curl);
+    {
+      absl::MutexLock l(&mu_);
+      auto& handles = idle_handles_[host];
+      if (handles.size() < max_idle_handles_per_host_) {
+        handles.push_back(curl);
+        return;
+      }
+    }
+    curl_easy_cleanup(curl);
+  }
+
+ private:
+  absl::Mutex mu_;
+  size_t max_idle_handles_per_host_ ABSL_GUARDED_BY(mu_);
+  std::unordered_map<std::string, std::vector<CURL*>> idle_handles_
+      ABSL_GUARDED_BY(mu_);
+};
+
+class CurlHttpRequest {
+ public:
+  // If `pool` is not null, the curl handle is taken from and returned to it.
+  explicit CurlHttpRequest(CurlHandlePool* pool = nullptr) : pool_(pool) {}
+  ~CurlHttpRequest() {
+    if (curl_ != nullptr) {
+      if (pool_ != nullptr) {
+        pool_->Release(host_, curl_);
+      } else {
+        curl_easy_cleanup(curl_);
+      }
+    }
+    if (curl_headers_ != nullptr) curl_slist_free_all(curl_headers_);
+    if (resolve_list_ != nullptr) curl_slist_free_all(resolve_list_);
+  }
+
+  void Initialize(const std::string& uri, TF_Status* status) {
+    host_ = GetHostFromUri(uri);
+    if (pool_ != nullptr) {
+      curl_ = pool_->Acquire(host_);
+    } else {
+      CurlInitialize();
+      curl_ = curl_easy_init();
+    }
     if (curl_ == nullptr) {
       TF_SetStatus(status, TF_INTERNAL, "Couldn't initialize a curl session.");
       return;
@@ -59,6 +221,23 @@ class CurlHttpRequest {
 
     CURLcode s = CURLE_OK;
 
+    CURLSH* share = CurlShare::Get();
+    if (share != nullptr) {
+      if ((s = curl_easy_setopt(curl_, CURLOPT_SHARE, share)) != CURLE_OK) {
+        std::string error_message =
+            absl::StrCat("Unable to set CURLOPT_SHARE: ", s);
+        TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+        return;
+      }
+    }
+
+    if ((s = curl_easy_setopt(curl_, CURLOPT_TCP_KEEPALIVE, 1L)) != CURLE_OK) {
+      std::string error_message =
+          absl::StrCat("Unable to set CURLOPT_TCP_KEEPALIVE: ", s);
+      TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+      return;
+    }
+
     const char* ca_bundle = std::getenv("CURL_CA_BUNDLE");
     if (ca_bundle != nullptr) {
       if ((s = curl_easy_setopt(curl_, CURLOPT_CAINFO, ca_bundle)) !=
@@ -130,7 +309,7 @@ class CurlHttpRequest {
       return;
     }
 
-    TF_SetStatus(status, TF_OK, "");
+    SetUri(uri, status);
   }
 
   void SetUri(const std::string& uri, TF_Status* status) {
@@ -161,6 +340,19 @@ class CurlHttpRequest {
     TF_SetStatus(status, TF_OK, "");
   }
 
+  // Sends a HEAD request, i.e. only the response headers are transferred.
+  void SetHeadRequest(TF_Status* status) {
+    CURLcode s = CURLE_OK;
+    if ((s = curl_easy_setopt(curl_, CURLOPT_NOBODY, 1L)) != CURLE_OK) {
+      std::string error_message =
+          absl::StrCat("Unable to set CURLOPT_NOBODY: ", s);
+      TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+      return;
+    }
+
+    TF_SetStatus(status, TF_OK, "");
+  }
+
   void SetResultBuffer(TF_Status* status) {
     CURLcode s = CURLE_OK;
     response_buffer_.reserve(CURL_MAX_WRITE_SIZE);
@@ -207,12 +399,26 @@ class CurlHttpRequest {
     return direct_response_.bytes_transferred_;
   }
 
+  // Header names are case-insensitive.
   std::string GetResponseHeader(const std::string& name) {
-    const auto& header = response_headers_.find(name);
+    const auto& header = response_headers_.find(absl::AsciiStrToLower(name));
     return header != response_headers_.end() ? header->second : "";
   }
 
   void Send(TF_Status* status) {
+    Prepare(status);
+    if (TF_GetCode(status) != TF_OK) {
+      return;
+    }
+    Complete(curl_easy_perform(curl_), status);
+  }
+
+  // The underlying easy handle, so that the request can be driven by a curl
+  // multi handle between `Prepare` and `Complete` instead of `Send`.
+  CURL* handle() const { return curl_; }
+
+  // Applies the options that must be set right before the transfer starts.
+  void Prepare(TF_Status* status) {
     CURLcode s = CURLE_OK;
 
     if (curl_headers_) {
@@ -264,8 +470,8 @@ class CurlHttpRequest {
       return;
     }
 
-    char error_buffer[CURL_ERROR_SIZE] = {0};
-    if ((s = curl_easy_setopt(curl_, CURLOPT_ERRORBUFFER, error_buffer)) !=
+    error_buffer_[0] = 0;
+    if ((s = curl_easy_setopt(curl_, CURLOPT_ERRORBUFFER, error_buffer_)) !=
         CURLE_OK) {
       std::string error_message =
           absl::StrCat("Unable to set CURLOPT_ERRORBUFFER: ", s);
@@ -273,9 +479,16 @@ class CurlHttpRequest {
       return;
     }
 
-    if ((s = curl_easy_perform(curl_)) != CURLE_OK) {
+    TF_SetStatus(status, TF_OK, "");
+  }
+
+  // Translates the result `code` of the transfer and the HTTP response code
+  // into `status`.
+  void Complete(CURLcode code, TF_Status* status) {
+    CURLcode s = CURLE_OK;
+    if (code != CURLE_OK) {
       std::string error_message =
-          absl::StrCat("Unable to perform (", s, "): ", error_buffer);
+          absl::StrCat("Unable to perform (", code, "): ", error_buffer_);
       TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
       return;
     }
@@ -391,6 +604,9 @@ class CurlHttpRequest {
   }
 
  private:
+  CurlHandlePool* pool_;  // not owned
+  std::string host_;
+
   std::vector<char> response_buffer_;
 
   struct DirectResponseState {
@@ -407,6 +623,7 @@ class CurlHttpRequest {
 
   std::unordered_map<std::string, std::string> response_headers_;
   uint64_t response_code_ = 0;
+  char error_buffer_[CURL_ERROR_SIZE] = {0};
 
   std::string uri_;
 
@@ -534,7 +751,7 @@ class CurlHttpRequest {
     absl::string_view header(reinterpret_cast<const char*>(ptr), size * nmemb);
     absl::string_view::size_type p = header.find(": ");
     if (p != absl::string_view::npos) {
-      std::string name(header.substr(0, p));
+      std::string name = absl::AsciiStrToLower(header.substr(0, p));
       std::string value(header.substr(p + 2, -1));
       absl::StripTrailingAsciiWhitespace(&value);
       that->response_headers_[name] = value;
@@ -543,9 +760,330 @@ class CurlHttpRequest {
   }
 };
 
+typedef struct HTTPFileStat {
+  TF_FileStatistics base;
+  // A hash of the `ETag` and `Last-Modified` response headers, used to detect
+  // files that changed on the server since their blocks were cached.
+  int64_t signature;
+  // Whether the server advertised `Accept-Ranges: bytes`.
+  bool accept_ranges;
+} HTTPFileStat;
+
+typedef struct HTTPFileSystem {
+  CurlHandlePool handle_pool;
+  absl::Mutex mu;
+  // The configuration generation the options below were read at.
+  uint64_t configuration_generation ABSL_GUARDED_BY(mu);
+  // Reads of at least `parallel_read_threshold` bytes are split into at most
+  // `parallel_read_connections` concurrent range requests.
+  size_t parallel_read_threshold ABSL_GUARDED_BY(mu);
+  size_t parallel_read_connections ABSL_GUARDED_BY(mu);
+  // Files keep the block cache they were opened with, a new cache is only
+  // used by files opened after a configuration change.
+  std::shared_ptr<RamFileBlockCache> file_block_cache ABSL_GUARDED_BY(mu);
+  std::unique_ptr<ExpiringLRUCache<HTTPFileStat>> stat_cache;
+  HTTPFileSystem();
+  // Returns the block cache for a new file, after applying the options set
+  // since the last call.
+  std::shared_ptr<RamFileBlockCache> GetFileBlockCache();
+} HTTPFileSystem;
+
+static void StatForUri(HTTPFileSystem* http_fs, const std::string& uri,
+                       HTTPFileStat* stat, TF_Status* status);
+
+static FilesystemMetrics* GetMetrics() {
+  static FilesystemMetrics* metrics = FilesystemMetrics::Get("http");
+  return metrics;
+}
+
+// Reads `n` bytes at `offset` of `uri` into `buffer` with `num_parts`
+// concurrent range requests driven by a single curl multi handle. Each
+// response is written in place into its slice of `buffer`.
+static int64_t LoadBufferFromHTTPInParallel(HTTPFileSystem* http_fs,
+                                            const std::string& uri,
+                                            uint64_t offset, size_t n,
+                                            char* buffer, size_t num_parts,
+                                            TF_Status* status) {
+  const size_t part_size = (n + num_parts - 1) / num_parts;
+  TF_VLog(2, "Parallel read of %s @ %u of size %u in %u parts", uri.c_str(),
+          offset, n, num_parts);
+  CURLM* multi = curl_multi_init();
+  if (multi == nullptr) {
+    TF_SetStatus(status, TF_INTERNAL,
+                 "Couldn't initialize a curl multi handle.");
+    return -1;
+  }
+  std::vector<std::unique_ptr<CurlHttpRequest>> requests;
+  std::vector<uint64_t> start_micros;
+  for (size_t start = 0; start < n; start += part_size) {
+    size_t length = std::min(part_size, n - start);
+    requests.emplace_back(new CurlHttpRequest(&http_fs->handle_pool));
+    CurlHttpRequest* request = requests.back().get();
+    request->Initialize(uri, status);
+    if (TF_GetCode(status) == TF_OK) {
+      request->SetRange(offset + start, offset + start + length - 1, status);
+    }
+    if (TF_GetCode(status) == TF_OK) {
+      request->SetResultBufferDirect(buffer + start, length, status);
+    }
+    if (TF_GetCode(status) == TF_OK) {
+      request->Prepare(status);
+    }
+    if (TF_GetCode(status) == TF_OK &&
+        curl_multi_add_handle(multi, request->handle()) != CURLM_OK) {
+      TF_SetStatus(status, TF_INTERNAL,
+                   "Unable to add a request to the curl multi handle");
+    }
+    if (TF_GetCode(status) != TF_OK) {
+      requests.pop_back();
+      break;
+    }
+    start_micros.push_back(GetMetrics()->StartRequest());
+  }
+
+  std::unordered_map<CURL*, CURLcode> results;
+  if (TF_GetCode(status) == TF_OK) {
+    int running = 0;
+    do {
+      CURLMcode code = curl_multi_perform(multi, &running);
+      if (code == CURLM_OK && running > 0) {
+        code = curl_multi_wait(multi, nullptr, 0, 1000, nullptr);
+      }
+      if (code != CURLM_OK) {
+        std::string error_message =
+            absl::StrCat("Unable to perform parallel read (", code,
+                         "): ", curl_multi_strerror(code));
+        TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+        break;
+      }
+    } while (running > 0);
+    int remaining = 0;
+    while (CURLMsg* message = curl_multi_info_read(multi, &remaining)) {
+      if (message->msg == CURLMSG_DONE) {
+        results[message->easy_handle] = message->data.result;
+      }
+    }
+  }
+  for (size_t i = 0; i < requests.size(); i++) {
+    curl_multi_remove_handle(multi, requests[i]->handle());
+    auto result = results.find(requests[i]->handle());
+    GetMetrics()->EndRequest(
+        "GET", start_micros[i],
+        result != results.end() && result->second == CURLE_OK);
+  }
+  curl_multi_cleanup(multi);
+  if (TF_GetCode(status) != TF_OK) {
+    return -1;
+  }
+
+  // The result is the contiguous prefix of completely filled parts, plus the
+  // first short part (the one that reached EOF).
+  int64_t bytes_read = 0;
+  for (size_t i = 0; i < requests.size(); i++) {
+    auto result = results.find(requests[i]->handle());
+    requests[i]->Complete(
+        result != results.end() ? result->second : CURLE_RECV_ERROR, status);
+    if (TF_GetCode(status) != TF_OK) {
+      return -1;
+    }
+    size_t transferred = requests[i]->GetResultBufferDirectBytesTransferred();
+    GetMetrics()->AddBytesRead(transferred);
+    bytes_read += transferred;
+    if (transferred < std::min(part_size, n - i * part_size)) break;
+  }
+  return bytes_read;
+}
+
+// Reads up to `n` bytes at `offset` of `uri` into `buffer`. As with read(2),
+// `status` is `TF_OK` as long as the request succeeded, even if fewer than `n`
+// bytes are returned.
+static int64_t LoadBufferFromHTTP(HTTPFileSystem* http_fs,
+                                  const std::string& uri, uint64_t offset,
+                                  size_t n, char* buffer, TF_Status* status) {
+  size_t parallel_read_threshold, parallel_read_connections;
+  {
+    absl::ReaderMutexLock l(&http_fs->mu);
+    parallel_read_threshold = http_fs->parallel_read_threshold;
+    parallel_read_connections = http_fs->parallel_read_connections;
+  }
+  if (parallel_read_threshold > 0 && n >= parallel_read_threshold &&
+      parallel_read_connections > 1) {
+    // Only split reads for servers that honor range requests, and only over
+    // the part of the range that lies within the file.
+    HTTPFileStat stat;
+    StatForUri(http_fs, uri, &stat, status);
+    if (TF_GetCode(status) == TF_OK && stat.accept_ranges) {
+      if (offset >= static_cast<uint64_t>(stat.base.length)) return 0;
+      size_t length = std::min<uint64_t>(n, stat.base.length - offset);
+      size_t num_parts = std::min(
+          parallel_read_connections,
+          (length + kMinParallelReadPartSize - 1) / kMinParallelReadPartSize);
+      if (num_parts > 1) {
+        return LoadBufferFromHTTPInParallel(http_fs, uri, offset, length,
+                                            buffer, num_parts, status);
+      }
+    }
+  }
+  CurlHttpRequest request(&http_fs->handle_pool);
+  request.Initialize(uri, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return -1;
+  }
+  request.SetRange(offset, offset + n - 1, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return -1;
+  }
+  request.SetResultBufferDirect(buffer, n, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return -1;
+  }
+  {
+    FilesystemMetrics::Request timer(GetMetrics(), "GET", status);
+    request.Send(status);
+  }
+  if (TF_GetCode(status) != TF_OK) {
+    return -1;
+  }
+  const size_t bytes_read = request.GetResultBufferDirectBytesTransferred();
+  GetMetrics()->AddBytesRead(bytes_read);
+  return bytes_read;
+}
+
+static void UncachedStat(HTTPFileSystem* http_fs, const std::string& uri,
+                         HTTPFileStat* stat, TF_Status* status) {
+  CurlHttpRequest request(&http_fs->handle_pool);
+  request.Initialize(uri, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  request.SetHeadRequest(status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  request.SetResultBuffer(status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  {
+    FilesystemMetrics::Request timer(GetMetrics(), "HEAD", status);
+    request.Send(status);
+  }
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  std::string length_string = request.GetResponseHeader("Content-Length");
+  if (length_string == "") {
+    std::string error_message =
+        absl::StrCat("unable to check the Content-Length of the url: ", uri);
+    TF_SetStatus(status, TF_INVALID_ARGUMENT, error_message.c_str());
+    return;
+  }
+  int64_t length = 0;
+  if (!absl::SimpleAtoi<int64_t>(length_string, &length)) {
+    std::string error_message =
+        absl::StrCat("unable to parse the Content-Length of the url: ", uri,
+                     " [", length_string, "]");
+    TF_SetStatus(status, TF_INVALID_ARGUMENT, error_message.c_str());
+    return;
+  }
+
+  std::string accept_ranges_string = request.GetResponseHeader("Accept-Ranges");
+  std::string etag_string = request.GetResponseHeader("ETag");
+  std::string last_modified_string = request.GetResponseHeader("Last-Modified");
+
+  stat->base.length = length;
+  stat->base.mtime_nsec = 0;
+  stat->base.is_directory = false;
+  stat->accept_ranges = absl::AsciiStrToLower(accept_ranges_string) == "bytes";
+  stat->signature = static_cast<int64_t>(std::hash<std::string>()(
+      absl::StrCat(etag_string, "\n", last_modified_string)));
+  TF_SetStatus(status, TF_OK, "");
+}
+
+static void StatForUri(HTTPFileSystem* http_fs, const std::string& uri,
+                       HTTPFileStat* stat, TF_Status* status) {
+  bool computed = false;
+  http_fs->stat_cache->LookupOrCompute(
+      uri, stat,
+      [http_fs, &computed](const std::string& uri, HTTPFileStat* stat,
+                           TF_Status* status) {
+        computed = true;
+        UncachedStat(http_fs, uri, stat, status);
+      },
+      status);
+  if (computed) {
+    GetMetrics()->AddCacheMiss();
+  } else {
+    GetMetrics()->AddCacheHit();
+  }
+}
+
+HTTPFileSystem::HTTPFileSystem()
+    : handle_pool(kDefaultMaxIdleHandlesPerHost),
+      configuration_generation(0),
+      parallel_read_threshold(kDefaultParallelReadThreshold),
+      parallel_read_connections(kDefaultParallelReadConnections) {
+  stat_cache = std::make_unique<ExpiringLRUCache<HTTPFileStat>>(
+      GetFilesystemConfigurationOrDefault(kStatCacheMaxAge,
+                                          kStatCacheDefaultMaxAge),
+      GetFilesystemConfigurationOrDefault(kStatCacheMaxEntries,
+                                          kStatCacheDefaultMaxEntries));
+  GetFileBlockCache();
+}
+
+std::shared_ptr<RamFileBlockCache> HTTPFileSystem::GetFileBlockCache() {
+  const uint64_t generation = GetFilesystemConfigurationGeneration();
+  {
+    absl::ReaderMutexLock l(&mu);
+    if (file_block_cache != nullptr && configuration_generation == generation) {
+      return file_block_cache;
+    }
+  }
+
+  handle_pool.SetMaxIdleHandlesPerHost(GetFilesystemConfigurationOrDefault(
+      kMaxIdleHandlesPerHost, kDefaultMaxIdleHandlesPerHost));
+  size_t threshold = kDefaultParallelReadThreshold;
+  std::string threshold_mb;
+  size_t value;
+  if (GetFilesystemConfiguration(kParallelReadThreshold, &threshold_mb) &&
+      absl::SimpleAtoi(threshold_mb, &value)) {
+    threshold = value * 1024 * 1024;
+  }
+  size_t connections = GetFilesystemConfigurationOrDefault(
+      kParallelReadConnections, kDefaultParallelReadConnections);
+  size_t block_size = kDefaultBlockSize;
+  value = GetFilesystemConfigurationOrDefault(kBlockSize, 0);
+  if (value > 0) block_size = value * 1024 * 1024;
+  size_t max_bytes =
+      GetFilesystemConfigurationOrDefault(kMaxCacheSize, kDefaultMaxCacheSize);
+  if (max_bytes > 0) max_bytes = max_bytes * 1024 * 1024;
+  uint64_t max_staleness =
+      GetFilesystemConfigurationOrDefault(kMaxStaleness, kDefaultMaxStaleness);
+  TF_VLog(1, "HTTP cache max size = %u ; block size = %u ; max staleness = %u",
+          max_bytes, block_size, max_staleness);
+  auto cache = std::make_shared<RamFileBlockCache>(
+      block_size, max_bytes, max_staleness,
+      [this](const std::string& filename, size_t offset, size_t buffer_size,
+             char* buffer, TF_Status* status) {
+        return LoadBufferFromHTTP(this, filename, offset, buffer_size, buffer,
+                                  status);
+      },
+      TF_NowSeconds, GetMetrics());
+
+  absl::MutexLock l(&mu);
+  parallel_read_threshold = threshold;
+  parallel_read_connections = connections;
+  file_block_cache = std::move(cache);
+  configuration_generation = generation;
+  return file_block_cache;
+}
+
 class HTTPRandomAccessFile {
  public:
-  HTTPRandomAccessFile(const std::string& uri) : uri_(uri) {}
+  HTTPRandomAccessFile(const std::string& uri, HTTPFileSystem* http_fs)
+      : uri_(uri),
+        http_fs_(http_fs),
+        file_block_cache_(http_fs->GetFileBlockCache()) {}
   ~HTTPRandomAccessFile() {}
   int64_t Read(uint64_t offset, size_t n, char* buffer,
                TF_Status* status) const {
@@ -555,28 +1093,26 @@ class HTTPRandomAccessFile {
       TF_SetStatus(status, TF_OK, "");
       return 0;
     }
-    CurlHttpRequest request;
-    request.Initialize(status);
-    if (TF_GetCode(status) != TF_OK) {
-      return 0;
-    }
-    request.SetUri(uri_, status);
-    if (TF_GetCode(status) != TF_OK) {
-      return 0;
-    }
-    request.SetRange(offset, offset + n - 1, status);
-    if (TF_GetCode(status) != TF_OK) {
-      return 0;
-    }
-    request.SetResultBufferDirect(buffer, n, status);
-    if (TF_GetCode(status) != TF_OK) {
-      return 0;
+    int64_t bytes_to_read;
+    if (file_block_cache_->IsCacheEnabled()) {
+      HTTPFileStat stat;
+      StatForUri(http_fs_, uri_, &stat, status);
+      if (TF_GetCode(status) != TF_OK) {
+        return 0;
+      }
+      if (!file_block_cache_->ValidateAndUpdateFileSignature(uri_,
+                                                             stat.signature)) {
+        TF_VLog(1, "File signature has been changed. Refreshing the cache: %s",
+                uri_.c_str());
+      }
+      bytes_to_read = file_block_cache_->Read(uri_, offset, n, buffer, status);
+    } else {
+      bytes_to_read =
+          LoadBufferFromHTTP(http_fs_, uri_, offset, n, buffer, status);
     }
-    request.Send(status);
     if (TF_GetCode(status) != TF_OK) {
       return 0;
     }
-    size_t bytes_to_read = request.GetResultBufferDirectBytesTransferred();
     if (bytes_to_read < n) {
       TF_SetStatus(status, TF_OUT_OF_RANGE, "EOF reached");
       return bytes_to_read;
@@ -587,6 +1123,8 @@ class HTTPRandomAccessFile {
 
  private:
   std::string uri_;
+  HTTPFileSystem* http_fs_;  // not owned
+  std::shared_ptr<RamFileBlockCache> file_block_cache_;
 };
 
 // SECTION 1. Implementation for `TF_RandomAccessFile`
@@ -638,29 +1176,28 @@ static void Close(const TF_WritableFile* file, TF_Status* status) {
 
 // SECTION 3. Implementation for `TF_ReadOnlyMemoryRegion`
 // ----------------------------------------------------------------------------
-namespace tf_read_only_memory_region {
-void Cleanup(TF_ReadOnlyMemoryRegion* region) {}
-
-const void* Data(const TF_ReadOnlyMemoryRegion* region) { return nullptr; }
-
-uint64_t Length(const TF_ReadOnlyMemoryRegion* region) { return 0; }
-
-}  // namespace tf_read_only_memory_region
+// Memory regions are `MappedMemoryRegion`s, see
+// `NewReadOnlyMemoryRegionFromFile`.
 
 // SECTION 4. Implementation for `TF_Filesystem`, the actual filesystem
 // ----------------------------------------------------------------------------
 namespace tf_http_filesystem {
 
 static void Init(TF_Filesystem* filesystem, TF_Status* status) {
+  filesystem->plugin_filesystem = new HTTPFileSystem();
   TF_SetStatus(status, TF_OK, "");
 }
 
-static void Cleanup(TF_Filesystem* filesystem) {}
+static void Cleanup(TF_Filesystem* filesystem) {
+  auto http_fs = static_cast<HTTPFileSystem*>(filesystem->plugin_filesystem);
+  delete http_fs;
+}
 
 static void NewRandomAccessFile(const TF_Filesystem* filesystem,
                                 const char* path, TF_RandomAccessFile* file,
                                 TF_Status* status) {
-  file->plugin_file = new HTTPRandomAccessFile(path);
+  auto http_fs = static_cast<HTTPFileSystem*>(filesystem->plugin_filesystem);
+  file->plugin_file = new HTTPRandomAccessFile(path, http_fs);
 
   TF_SetStatus(status, TF_OK, "");
 }
@@ -679,8 +1216,42 @@ static void NewReadOnlyMemoryRegionFromFile(const TF_Filesystem* filesystem,
                                             const char* path,
                                             TF_ReadOnlyMemoryRegion* region,
                                             TF_Status* status) {
-  TF_SetStatus(status, TF_UNIMPLEMENTED,
-               "NewReadOnlyMemoryRegionFromFile not implemented");
+  auto http_fs = static_cast<HTTPFileSystem*>(filesystem->plugin_filesystem);
+  HTTPFileStat stat;
+  StatForUri(http_fs, path, &stat, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  const uint64_t size = stat.base.length;
+  if (size == 0) {
+    TF_SetStatus(status, TF_INVALID_ARGUMENT, "File is empty");
+    return;
+  }
+
+  // Servers that honor range requests are read with parallel connections,
+  // see `LoadBufferFromHTTP`.
+  auto data = MappedMemoryRegion::Allocate(size, status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  int64_t read =
+      LoadBufferFromHTTP(http_fs, path, 0, size, data->data(), status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+  if (read < static_cast<int64_t>(size)) {
+    TF_SetStatus(
+        status, TF_OUT_OF_RANGE,
+        absl::StrCat("Read ", read, " bytes of ", path, " but expected ", size)
+            .c_str());
+    return;
+  }
+  data->Seal(status);
+  if (TF_GetCode(status) != TF_OK) {
+    return;
+  }
+
+  region->plugin_memory_region = data.release();
 }
 
 static void CreateDir(const TF_Filesystem* filesystem, const char* path,
@@ -722,44 +1293,13 @@ static void CopyFile(const TF_Filesystem* filesystem, const char* src,
 
 static void Stat(const TF_Filesystem* filesystem, const char* path,
                  TF_FileStatistics* stats, TF_Status* status) {
-  CurlHttpRequest request;
-  request.Initialize(status);
+  auto http_fs = static_cast<HTTPFileSystem*>(filesystem->plugin_filesystem);
+  HTTPFileStat stat;
+  StatForUri(http_fs, path, &stat, status);
   if (TF_GetCode(status) != TF_OK) {
     return;
   }
-  request.SetResultBuffer(status);
-  if (TF_GetCode(status) != TF_OK) {
-    return;
-  }
-  request.SetUri(path, status);
-  if (TF_GetCode(status) != TF_OK) {
-    return;
-  }
-  request.Send(status);
-  if (TF_GetCode(status) != TF_OK) {
-    return;
-  }
-  std::string length_string = request.GetResponseHeader("Content-Length");
-  if (length_string == "") {
-    std::string error_message =
-        absl::StrCat("unable to check the Content-Length of the url: ", path);
-    TF_SetStatus(status, TF_INVALID_ARGUMENT, error_message.c_str());
-    return;
-  }
-  int64_t length = 0;
-  if (!absl::SimpleAtoi<int64_t>(length_string, &length)) {
-    std::string error_message =
-        absl::StrCat("unable to parse the Content-Length of the url: ", path,
-                     " [", length_string, "]");
-    TF_SetStatus(status, TF_INVALID_ARGUMENT, error_message.c_str());
-    return;
-  }
-
-  std::string last_modified_string = request.GetResponseHeader("Last-Modified");
-
-  stats->length = length;
-  stats->mtime_nsec = 0;
-  stats->is_directory = false;
+  *stats = stat.base;
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -813,6 +1353,27 @@ static char* TranslateName(const TF_Filesystem* filesystem, const char* uri) {
   return strdup(uri);
 }
 
+static void FlushCaches(const TF_Filesystem* filesystem) {
+  auto http_fs = static_cast<HTTPFileSystem*>(filesystem->plugin_filesystem);
+  {
+    absl::ReaderMutexLock l(&http_fs->mu);
+    if (http_fs->file_block_cache != nullptr) {
+      http_fs->file_block_cache->Flush();
+    }
+  }
+  http_fs->stat_cache->Clear();
+}
+
+static void SetConfiguration(const TF_Filesystem* filesystem,
+                             const TF_Filesystem_Option* options,
+                             int num_options, TF_Status* status) {
+  SetFilesystemConfiguration(
+      "http",
+      {kBlockSize, kMaxCacheSize, kMaxStaleness, kMaxIdleHandlesPerHost,
+       kParallelReadThreshold, kParallelReadConnections},
+      options, num_options, status);
+}
+
 }  // namespace tf_http_filesystem
 
 }  // namespace
@@ -837,10 +1398,9 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
 
   ops->read_only_memory_region_ops = static_cast<TF_ReadOnlyMemoryRegionOps*>(
       plugin_memory_allocate(TF_READ_ONLY_MEMORY_REGION_OPS_SIZE));
-  ops->read_only_memory_region_ops->cleanup =
-      tf_read_only_memory_region::Cleanup;
-  ops->read_only_memory_region_ops->data = tf_read_only_memory_region::Data;
-  ops->read_only_memory_region_ops->length = tf_read_only_memory_region::Length;
+  ops->read_only_memory_region_ops->cleanup = MappedMemoryRegion::Cleanup;
+  ops->read_only_memory_region_ops->data = MappedMemoryRegion::Data;
+  ops->read_only_memory_region_ops->length = MappedMemoryRegion::Length;
 
   ops->filesystem_ops = static_cast<TF_FilesystemOps*>(
       plugin_memory_allocate(TF_FILESYSTEM_OPS_SIZE));
@@ -868,6 +1428,9 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
   ops->filesystem_ops->get_file_size = tf_http_filesystem::GetFileSize;
   ops->filesystem_ops->get_children = tf_http_filesystem::GetChildren;
   ops->filesystem_ops->translate_name = tf_http_filesystem::TranslateName;
+  ops->filesystem_ops->flush_caches = tf_http_filesystem::FlushCaches;
+  ops->filesystem_ops->set_filesystem_configuration =
+      tf_http_filesystem::SetConfiguration;
 }
 
 }  // namespace http
@@ -0,0 +1,99 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow_io/core/filesystems/mapped_memory_region.h"
+
+#if defined(_MSC_VER)
+#include <Windows.h>
+#else
+#include <errno.h>
+#include <string.h>
+#include <sys/mman.h>
+#endif
+
+#include "absl/strings/str_cat.h"
+
+namespace tensorflow {
+namespace io {
+
+std::unique_ptr<MappedMemoryRegion> MappedMemoryRegion::Allocate(
+    uint64_t length, TF_Status* status) {
+#if defined(_MSC_VER)
+  void* data =
+      VirtualAlloc(nullptr, length, MEM_RESERVE | MEM_COMMIT, PAGE_READWRITE);
+  if (data == nullptr) {
+    std::string error_message = absl::StrCat("Unable to map ", length,
+                                             " bytes, error ", GetLastError());
+    TF_SetStatus(status, TF_RESOURCE_EXHAUSTED, error_message.c_str());
+    return nullptr;
+  }
+#else
+  void* data = mmap(nullptr, length, PROT_READ | PROT_WRITE,
+                    MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+  if (data == MAP_FAILED) {
+    std::string error_message =
+        absl::StrCat("Unable to map ", length, " bytes: ", strerror(errno));
+    TF_SetStatus(status, TF_RESOURCE_EXHAUSTED, error_message.c_str());
+    return nullptr;
+  }
+#endif
+  TF_SetStatus(status, TF_OK, "");
+  return std::unique_ptr<MappedMemoryRegion>(
+      new MappedMemoryRegion(static_cast<char*>(data), length));
+}
+
+MappedMemoryRegion::~MappedMemoryRegion() {
+#if defined(_MSC_VER)
+  VirtualFree(data_, 0, MEM_RELEASE);
+#else
+  munmap(data_, length_);
+#endif
+}
+
+void MappedMemoryRegion::Seal(TF_Status* status) {
+#if defined(_MSC_VER)
+  DWORD old_protect;
+  if (!VirtualProtect(data_, length_, PAGE_READONLY, &old_protect)) {
+    std::string error_message =
+        absl::StrCat("Unable to seal mapped memory, error ", GetLastError());
+    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+    return;
+  }
+#else
+  if (mprotect(data_, length_, PROT_READ) != 0) {
+    std::string error_message =
+        absl::StrCat("Unable to seal mapped memory: ", strerror(errno));
+    TF_SetStatus(status, TF_INTERNAL, error_message.c_str());
+    return;
+  }
+#endif
+  TF_SetStatus(status, TF_OK, "");
+}
+
+void MappedMemoryRegion::Cleanup(TF_ReadOnlyMemoryRegion* region) {
+  delete static_cast<MappedMemoryRegion*>(region->plugin_memory_region);
+}
+
+const void* MappedMemoryRegion::Data(const TF_ReadOnlyMemoryRegion* region) {
+  return static_cast<MappedMemoryRegion*>(region->plugin_memory_region)->data();
+}
+
+uint64_t MappedMemoryRegion::Length(const TF_ReadOnlyMemoryRegion* region) {
+  return static_cast<MappedMemoryRegion*>(region->plugin_memory_region)
+      ->length();
+}
+
+}  // namespace io
+}  // namespace tensorflow
@@ -0,0 +1,66 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_IO_CORE_FILESYSTEMS_MAPPED_MEMORY_REGION_H_
+#define TENSORFLOW_IO_CORE_FILESYSTEMS_MAPPED_MEMORY_REGION_H_
+
+#include <cstdint>
+#include <memory>
+
+#include "tensorflow/c/experimental/filesystem/filesystem_interface.h"
+#include "tensorflow/c/tf_status.h"
+
+namespace tensorflow {
+namespace io {
+
+/// \brief The memory of a `TF_ReadOnlyMemoryRegion` that holds a whole remote
+/// file.
+///
+/// The memory is an anonymous mapping, which a filesystem fills in place with
+/// its (parallel) reads and then seals read-only. Views into it are handed out
+/// without copies, and it is returned to the system in one piece when the
+/// region is cleaned up.
+class MappedMemoryRegion {
+ public:
+  /// Maps `length` bytes of writable memory. `length` must not be 0.
+  static std::unique_ptr<MappedMemoryRegion> Allocate(uint64_t length,
+                                                      TF_Status* status);
+  ~MappedMemoryRegion();
+
+  char* data() { return data_; }
+  const char* data() const { return data_; }
+  uint64_t length() const { return length_; }
+
+  /// Makes the memory read-only, once it is filled.
+  void Seal(TF_Status* status);
+
+  /// Implementations of `TF_ReadOnlyMemoryRegionOps` for regions whose
+  /// `plugin_memory_region` is a `MappedMemoryRegion`.
+  static void Cleanup(TF_ReadOnlyMemoryRegion* region);
+  static const void* Data(const TF_ReadOnlyMemoryRegion* region);
+  static uint64_t Length(const TF_ReadOnlyMemoryRegion* region);
+
+ private:
+  MappedMemoryRegion(char* data, uint64_t length)
+      : data_(data), length_(length) {}
+
+  char* const data_;
+  const uint64_t length_;
+};
+
+}  // namespace io
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_IO_CORE_FILESYSTEMS_MAPPED_MEMORY_REGION_H_
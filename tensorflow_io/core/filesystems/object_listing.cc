@@ -0,0 +1,327 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow_io/core/filesystems/object_listing.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cstdlib>
+#include <iterator>
+#include <thread>
+#include <utility>
+
+#include "absl/strings/numbers.h"
+#include "absl/strings/str_cat.h"
+#include "absl/strings/str_split.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/logging.h"
+
+namespace tensorflow {
+namespace io {
+namespace {
+
+// The environment variable that overrides the number of seconds a directory
+// listing is served from the cache. The cache is disabled by default, as other
+// processes may change the listed directories at any time.
+constexpr char kListCacheMaxAge[] = "TFIO_LIST_CACHE_MAX_AGE";
+constexpr uint64_t kDefaultListCacheMaxAge = 0;
+// The environment variable that overrides the maximum number of directory
+// listings kept in the cache.
+constexpr char kListCacheMaxEntries[] = "TFIO_LIST_CACHE_MAX_ENTRIES";
+constexpr uint64_t kDefaultListCacheMaxEntries = 4096;
+// The environment variable that overrides the maximum number of list requests
+// issued concurrently by `GetMatchingPaths`.
+constexpr char kListParallelism[] = "TFIO_LIST_PARALLELISM";
+constexpr uint64_t kDefaultListParallelism = 16;
+
+constexpr char kGlobCharacters[] = "*?[\\";
+
+uint64_t GetEnvOrDefault(const char* name, uint64_t default_value) {
+  const char* value_str = std::getenv(name);
+  uint64_t value;
+  if (value_str && absl::SimpleAtoi(value_str, &value)) {
+    return value;
+  }
+  return default_value;
+}
+
+// Matches the single (non `*`) pattern element starting at `pattern[*pos]`
+// against `c`, and advances `*pos` past the element.
+bool MatchElement(absl::string_view pattern, size_t* pos, char c) {
+  size_t p = *pos;
+  switch (pattern[p]) {
+    case '?':
+      *pos = p + 1;
+      return c != '/';
+    case '\\':
+      if (p + 1 < pattern.size()) {
+        *pos = p + 2;
+        return c == pattern[p + 1];
+      }
+      *pos = p + 1;
+      return c == '\\';
+    case '[': {
+      size_t i = p + 1;
+      bool negate = false;
+      if (i < pattern.size() && (pattern[i] == '!' || pattern[i] == '^')) {
+        negate = true;
+        ++i;
+      }
+      bool matched = false;
+      bool first = true;
+      while (i < pattern.size() && (first || pattern[i] != ']')) {
+        first = false;
+        char lo = pattern[i];
+        if (lo == '\\' && i + 1 < pattern.size()) lo = pattern[++i];
+        char hi = lo;
+        if (i + 2 < pattern.size() && pattern[i + 1] == '-' &&
+            pattern[i + 2] != ']') {
+          i += 2;
+          hi = pattern[i];
+          if (hi == '\\' && i + 1 < pattern.size()) hi = pattern[++i];
+        }
+        if (lo <= c && c <= hi) matched = true;
+        ++i;
+      }
+      if (i >= pattern.size()) {
+        // Unterminated class, `[` is a literal.
+        *pos = p + 1;
+        return c == '[';
+      }
+      *pos = i + 1;
+      return c != '/' && matched != negate;
+    }
+    default:
+      *pos = p + 1;
+      return c == pattern[p];
+  }
+}
+
+}  // namespace
+
+bool GlobMatch(absl::string_view pattern, absl::string_view name) {
+  size_t p = 0, n = 0;
+  size_t star_p = absl::string_view::npos, star_n = 0;
+  while (n < name.size()) {
+    if (p < pattern.size()) {
+      if (pattern[p] == '*') {
+        star_p = p++;
+        star_n = n;
+        continue;
+      }
+      size_t next_p = p;
+      if (MatchElement(pattern, &next_p, name[n])) {
+        p = next_p;
+        ++n;
+        continue;
+      }
+    }
+    // Backtrack: let the last `*` swallow one more character.
+    if (star_p == absl::string_view::npos || name[star_n] == '/') {
+      return false;
+    }
+    p = star_p + 1;
+    n = ++star_n;
+  }
+  while (p < pattern.size() && pattern[p] == '*') ++p;
+  return p == pattern.size();
+}
+
+ObjectLister::ObjectLister(ListFunc list_func)
+    : ObjectLister(
+          std::move(list_func),
+          GetEnvOrDefault(kListCacheMaxAge, kDefaultListCacheMaxAge),
+          GetEnvOrDefault(kListCacheMaxEntries, kDefaultListCacheMaxEntries),
+          GetEnvOrDefault(kListParallelism, kDefaultListParallelism)) {}
+
+ObjectLister::ObjectLister(ListFunc list_func, uint64_t max_age,
+                           size_t max_entries, size_t max_parallelism)
+    : list_func_(std::move(list_func)),
+      max_parallelism_(std::max<size_t>(max_parallelism, 1)),
+      cache_(max_age, max_entries) {}
+
+void ObjectLister::List(const std::string& dir, DirectoryListing* listing,
+                        TF_Status* status) {
+  // `ExpiringLRUCache::LookupOrCompute` holds the cache lock while computing,
+  // which would serialize the parallel listing below.
+  if (cache_.Lookup(dir, listing)) {
+    return TF_SetStatus(status, TF_OK, "");
+  }
+  uint64_t generation;
+  {
+    absl::MutexLock l(&mu_);
+    generation = generation_;
+  }
+  *listing = DirectoryListing();
+  list_func_(dir, listing, status);
+  if (TF_GetCode(status) == TF_OK) {
+    absl::MutexLock l(&mu_);
+    if (generation_ == generation) cache_.Insert(dir, *listing);
+  }
+}
+
+void ObjectLister::Invalidate(const std::string& path) {
+  absl::MutexLock l(&mu_);
+  generation_++;
+  const size_t scheme_end = path.find("://");
+  const size_t root_end = scheme_end == std::string::npos ? 0 : scheme_end + 3;
+  std::string dir = path;
+  while (dir.size() > root_end && dir.back() == '/') dir.pop_back();
+  // Listings are keyed by directory paths ending with `/`.
+  cache_.Delete(absl::StrCat(dir, "/"));
+  while (dir.size() > root_end) {
+    const size_t parent_end = dir.rfind('/');
+    if (parent_end == std::string::npos || parent_end < root_end) break;
+    dir.resize(parent_end + 1);
+    cache_.Delete(dir);
+    dir.pop_back();
+  }
+}
+
+void ObjectLister::Clear() {
+  absl::MutexLock l(&mu_);
+  generation_++;
+  cache_.Clear();
+}
+
+void ObjectLister::GetChildren(const std::string& dir,
+                               std::vector<std::string>* children,
+                               TF_Status* status) {
+  DirectoryListing listing;
+  List(dir, &listing, status);
+  if (TF_GetCode(status) != TF_OK) return;
+  children->clear();
+  children->reserve(listing.directories.size() + listing.files.size());
+  children->insert(children->end(), listing.directories.begin(),
+                   listing.directories.end());
+  children->insert(children->end(), listing.files.begin(), listing.files.end());
+}
+
+void ObjectLister::GetMatchingPaths(const std::string& pattern,
+                                    std::vector<std::string>* results,
+                                    TF_Status* status) {
+  TF_VLog(1, "GetMatchingPaths: %s\n", pattern.c_str());
+  results->clear();
+  // The scheme and the bucket are never globbed, the bucket part may carry
+  // credentials or options (e.g. `oss://bucket?id=...&key=.../`).
+  const size_t scheme_end = pattern.find("://");
+  const size_t root_end =
+      pattern.find('/', scheme_end == std::string::npos ? 0 : scheme_end + 3);
+  if (root_end == std::string::npos) {
+    return TF_SetStatus(status, TF_INVALID_ARGUMENT,
+                        absl::StrCat("Invalid pattern ", pattern).c_str());
+  }
+  // Start from the deepest directory that contains no wildcard.
+  const size_t dir_end =
+      pattern.rfind('/', pattern.find_first_of(kGlobCharacters, root_end));
+  const std::vector<std::string> components = absl::StrSplit(
+      absl::string_view(pattern).substr(dir_end + 1), '/', absl::SkipEmpty());
+  if (components.empty()) {
+    return TF_SetStatus(status, TF_OK, "");
+  }
+
+  std::vector<std::string> frontier = {pattern.substr(0, dir_end + 1)};
+  for (size_t level = 0; level < components.size(); ++level) {
+    const std::string& component = components[level];
+    const bool last = level + 1 == components.size();
+    if (!last &&
+        component.find_first_of(kGlobCharacters) == std::string::npos) {
+      // Missing directories simply produce empty listings at the next level.
+      for (auto& dir : frontier) absl::StrAppend(&dir, component, "/");
+      continue;
+    }
+
+    std::vector<std::vector<std::string>> matches(frontier.size());
+    ParallelFor(
+        frontier.size(),
+        [&](size_t i, TF_Status* status) {
+          DirectoryListing listing;
+          List(frontier[i], &listing, status);
+          if (TF_GetCode(status) == TF_NOT_FOUND) {
+            return TF_SetStatus(status, TF_OK, "");
+          }
+          if (TF_GetCode(status) != TF_OK) return;
+          for (const auto& name : listing.directories) {
+            if (GlobMatch(component, name)) {
+              matches[i].push_back(
+                  absl::StrCat(frontier[i], name, last ? "" : "/"));
+            }
+          }
+          if (!last) return;
+          for (const auto& name : listing.files) {
+            if (GlobMatch(component, name)) {
+              matches[i].push_back(absl::StrCat(frontier[i], name));
+            }
+          }
+        },
+        status);
+    if (TF_GetCode(status) != TF_OK) return;
+
+    frontier.clear();
+    for (auto& level_matches : matches) {
+      std::move(level_matches.begin(), level_matches.end(),
+                std::back_inserter(frontier));
+    }
+    if (frontier.empty()) break;
+  }
+
+  // An object and a directory marker may share a name.
+  std::sort(frontier.begin(), frontier.end());
+  frontier.erase(std::unique(frontier.begin(), frontier.end()), frontier.end());
+  *results = std::move(frontier);
+  TF_SetStatus(status, TF_OK, "");
+}
+
+void ObjectLister::ParallelFor(
+    size_t n, const std::function<void(size_t, TF_Status*)>& fn,
+    TF_Status* status) {
+  TF_SetStatus(status, TF_OK, "");
+  const size_t num_threads = std::min(max_parallelism_, n);
+  if (num_threads <= 1) {
+    for (size_t i = 0; i < n; ++i) {
+      fn(i, status);
+      if (TF_GetCode(status) != TF_OK) return;
+    }
+    return;
+  }
+
+  std::atomic<size_t> next(0);
+  std::atomic<bool> failed(false);
+  absl::Mutex mu;
+  auto worker = [&]() {
+    TF_Status* worker_status = TF_NewStatus();
+    for (size_t i = next++; i < n && !failed; i = next++) {
+      fn(i, worker_status);
+      if (TF_GetCode(worker_status) != TF_OK) {
+        absl::MutexLock lock(&mu);
+        if (!failed) {
+          TF_SetStatus(status, TF_GetCode(worker_status),
+                       TF_Message(worker_status));
+          failed = true;
+        }
+        break;
+      }
+    }
+    TF_DeleteStatus(worker_status);
+  };
+  std::vector<std::thread> threads;
+  threads.reserve(num_threads - 1);
+  for (size_t i = 1; i < num_threads; ++i) threads.emplace_back(worker);
+  worker();
+  for (auto& thread : threads) thread.join();
+}
+
+}  // namespace io
+}  // namespace tensorflow
@@ -0,0 +1,112 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_IO_CORE_FILESYSTEMS_OBJECT_LISTING_H_
+#define TENSORFLOW_IO_CORE_FILESYSTEMS_OBJECT_LISTING_H_
+
+#include <functional>
+#include <string>
+#include <vector>
+
+#include "absl/base/thread_annotations.h"
+#include "absl/strings/string_view.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/expiring_lru_cache.h"
+
+namespace tensorflow {
+namespace io {
+
+/// The children of one directory level of an object store, i.e. the result
+/// of a delimited list request. Names are relative to the listed directory
+/// and carry no trailing slash.
+struct DirectoryListing {
+  std::vector<std::string> directories;
+  std::vector<std::string> files;
+};
+
+/// Returns true if `name` matches the glob `pattern`. `*` matches any
+/// sequence of characters, `?` any single character, `[...]` a character
+/// class (negated with a leading `!` or `^`) and `\` escapes the next
+/// character. Neither wildcard matches `/`.
+bool GlobMatch(absl::string_view pattern, absl::string_view name);
+
+/// \brief Listing engine shared by the object store filesystems.
+///
+/// Wraps a filesystem specific delimited list function with a short lived
+/// cache of directory listings, and implements `GetMatchingPaths` natively by
+/// walking the pattern one path component at a time. Components without
+/// wildcards are descended into without listing, and all directories of one
+/// level are listed in parallel, so matching a pattern over a large shard set
+/// costs a handful of rounds of concurrent list requests instead of one
+/// sequential walk of the whole prefix.
+///
+/// This class is thread safe.
+class ObjectLister {
+ public:
+  /// Lists the direct children of `dir`, a full path ending with `/`.
+  /// Implementations should use the largest page size the service supports.
+  typedef std::function<void(const std::string& dir, DirectoryListing* listing,
+                             TF_Status* status)>
+      ListFunc;
+
+  /// Reads the cache age, cache size and parallelism from the environment.
+  explicit ObjectLister(ListFunc list_func);
+
+  ObjectLister(ListFunc list_func, uint64_t max_age, size_t max_entries,
+               size_t max_parallelism);
+
+  /// Lists the direct children of the directory `dir`, using the cached
+  /// listing if it is fresh enough.
+  void List(const std::string& dir, DirectoryListing* listing,
+            TF_Status* status);
+
+  /// Same as `List`, but returns directories and files in one vector, as
+  /// expected by `get_children`.
+  void GetChildren(const std::string& dir, std::vector<std::string>* children,
+                   TF_Status* status);
+
+  /// Returns the full paths matching the glob `pattern`, sorted.
+  void GetMatchingPaths(const std::string& pattern,
+                        std::vector<std::string>* results, TF_Status* status);
+
+  /// Drops the listings of `path` and all of its parent directories, as
+  /// creating or deleting an object also changes its implicit parents. Must
+  /// be called after every mutation done through the filesystem so that a
+  /// process sees its own writes.
+  void Invalidate(const std::string& path);
+
+  /// Drops all cached listings, e.g. after a rename or a recursive delete.
+  void Clear();
+
+ private:
+  /// Calls `fn(i, status)` for each `i` in `[0, n)` on up to
+  /// `max_parallelism_` threads, and stops at the first error.
+  void ParallelFor(size_t n, const std::function<void(size_t, TF_Status*)>& fn,
+                   TF_Status* status);
+
+  const ListFunc list_func_;
+  const size_t max_parallelism_;
+  ExpiringLRUCache<DirectoryListing> cache_;
+  // Incremented by every invalidation, so that a listing started before it
+  // does not insert its stale result afterwards.
+  absl::Mutex mu_;
+  uint64_t generation_ ABSL_GUARDED_BY(mu_) = 0;
+};
+
+}  // namespace io
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_IO_CORE_FILESYSTEMS_OBJECT_LISTING_H_
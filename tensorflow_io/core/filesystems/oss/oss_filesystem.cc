@@ -14,11 +14,15 @@ limitations under the License.
 #include <pwd.h>
 #include <unistd.h>
 
+#include <chrono>
 #include <cmath>
 #include <cstdlib>
 #include <ctime>
 #include <fstream>
+#include <functional>
+#include <future>
 #include <iostream>
+#include <map>
 #include <vector>
 
 #include "aos_string.h"
@@ -31,6 +35,9 @@ limitations under the License.
 #include "tensorflow/core/platform/file_system_helper.h"
 #include "tensorflow/core/platform/logging.h"
 #include "tensorflow/core/platform/thread_annotations.h"
+#include "tensorflow_io/core/filesystems/cleanup.h"
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
 #include "tensorflow_io/core/filesystems/filesystem_plugins.h"
 
 namespace tensorflow {
@@ -49,6 +56,34 @@ constexpr char kOSSHostKey[] = "host";
 constexpr char kDelim[] = "/";
 static char oss_user_agent[256] = "";
 
+// The environment variable that overrides the block size of the LRU cache of
+// blocks read from OSS, which is shared by all files. Specified in MB.
+constexpr char kBlockSize[] = "OSS_READ_CACHE_BLOCK_SIZE_MB";
+constexpr size_t kDefaultBlockSize = 16 * 1024 * 1024;
+// The environment variable that overrides the max size of the block cache.
+// Specified in MB. The cache is disabled by default, in which case each file
+// buffers `read_ahead_bytes_` past every read instead.
+constexpr char kMaxCacheSize[] = "OSS_READ_CACHE_MAX_SIZE_MB";
+constexpr size_t kDefaultMaxCacheSize = 0;
+// The environment variable that overrides the maximum staleness of cached
+// blocks, in seconds. 0 means blocks are only evicted when the `ETag` of the
+// object changes or when the cache is full.
+constexpr char kMaxStaleness[] = "OSS_READ_CACHE_MAX_STALENESS";
+constexpr uint64_t kDefaultMaxStaleness = 0;
+// The environment variable that overrides the number of blocks fetched into
+// the cache in the background after a sequential read. 0 disables it.
+constexpr char kReadAheadBlocks[] = "OSS_READ_AHEAD_BLOCKS";
+constexpr size_t kDefaultReadAheadBlocks = 2;
+// The environment variable that overrides the maximum number of idle
+// connections kept per endpoint.
+constexpr char kMaxIdleConnections[] = "OSS_MAX_IDLE_CONNECTIONS_PER_HOST";
+constexpr size_t kDefaultMaxIdleConnections = 8;
+
+static FilesystemMetrics* GetMetrics() {
+  static FilesystemMetrics* metrics = FilesystemMetrics::Get("oss");
+  return metrics;
+}
+
 void oss_initialize_with_throwable() {
   if (aos_http_io_initialize(NULL, 0) != AOSE_OK) {
     throw std::exception();
@@ -97,15 +132,12 @@ void oss_error_message(aos_status_s* status, std::string* msg) {
 class OSSConnection {
  public:
   OSSConnection(const std::string& endPoint, const std::string& accessKey,
-                const std::string& accessKeySecret) {
+                const std::string& accessKeySecret)
+      : _endPoint(endPoint),
+        _accessKey(accessKey),
+        _accessKeySecret(accessKeySecret) {
     aos_pool_create(&_pool, NULL);
-    _options = oss_request_options_create(_pool);
-    _options->config = oss_config_create(_options->pool);
-    aos_str_set(&_options->config->endpoint, endPoint.c_str());
-    aos_str_set(&_options->config->access_key_id, accessKey.c_str());
-    aos_str_set(&_options->config->access_key_secret, accessKeySecret.c_str());
-    _options->config->is_cname = 0;
-    _options->ctl = aos_http_controller_create(_options->pool, 0);
+    _createRequestOptions();
   }
 
   ~OSSConnection() {
@@ -118,26 +150,206 @@ class OSSConnection {
 
   aos_pool_t* getPool() { return _pool; }
 
+  // Frees everything allocated by the requests sent so far, while the pool
+  // keeps its memory for the next requests.
+  void reset() {
+    apr_pool_clear(_pool);
+    _createRequestOptions();
+  }
+
  private:
+  void _createRequestOptions() {
+    _options = oss_request_options_create(_pool);
+    _options->config = oss_config_create(_options->pool);
+    aos_str_set(&_options->config->endpoint, _endPoint.c_str());
+    aos_str_set(&_options->config->access_key_id, _accessKey.c_str());
+    aos_str_set(&_options->config->access_key_secret, _accessKeySecret.c_str());
+    _options->config->is_cname = 0;
+    _options->ctl = aos_http_controller_create(_options->pool, 0);
+  }
+
+  const std::string _endPoint;
+  const std::string _accessKey;
+  const std::string _accessKeySecret;
   aos_pool_t* _pool = NULL;
   oss_request_options_t* _options = NULL;
 };
 
+// Keeps idle `OSSConnection`s per endpoint and credentials, so that the reads
+// of a file do not each set up a new pool and request options. The TCP
+// connections themselves are kept alive by the curl handles that the OSS SDK
+// pools internally.
+class OSSConnectionPool {
+ public:
+  std::unique_ptr<OSSConnection> Get(const std::string& endPoint,
+                                     const std::string& accessKey,
+                                     const std::string& accessKeySecret) {
+    {
+      mutex_lock lock(mu_);
+      auto& idle = idle_[Key(endPoint, accessKey, accessKeySecret)];
+      if (!idle.empty()) {
+        std::unique_ptr<OSSConnection> conn = std::move(idle.back());
+        idle.pop_back();
+        return conn;
+      }
+    }
+    return std::make_unique<OSSConnection>(endPoint, accessKey,
+                                           accessKeySecret);
+  }
+
+  void Release(const std::string& endPoint, const std::string& accessKey,
+               const std::string& accessKeySecret,
+               std::unique_ptr<OSSConnection> conn) {
+    const size_t max_idle = GetFilesystemConfigurationOrDefault(
+        kMaxIdleConnections, kDefaultMaxIdleConnections);
+    conn->reset();
+    mutex_lock lock(mu_);
+    auto& idle = idle_[Key(endPoint, accessKey, accessKeySecret)];
+    if (idle.size() < max_idle) idle.push_back(std::move(conn));
+  }
+
+ private:
+  static std::string Key(const std::string& endPoint,
+                         const std::string& accessKey,
+                         const std::string& accessKeySecret) {
+    return endPoint + "\n" + accessKey + "\n" + accessKeySecret;
+  }
+
+  mutex mu_;
+  std::map<std::string, std::vector<std::unique_ptr<OSSConnection>>> idle_
+      TF_GUARDED_BY(mu_);
+};
+
+// Borrows an `OSSConnection` from the `OSSConnectionPool` for its scope.
+class PooledOSSConnection {
+ public:
+  PooledOSSConnection(const std::string& endPoint, const std::string& accessKey,
+                      const std::string& accessKeySecret)
+      : _endPoint(endPoint),
+        _accessKey(accessKey),
+        _accessKeySecret(accessKeySecret),
+        _conn(GetPool()->Get(endPoint, accessKey, accessKeySecret)) {}
+
+  ~PooledOSSConnection() {
+    GetPool()->Release(_endPoint, _accessKey, _accessKeySecret,
+                       std::move(_conn));
+  }
+
+  oss_request_options_t* getRequestOptions() {
+    return _conn->getRequestOptions();
+  }
+
+  aos_pool_t* getPool() { return _conn->getPool(); }
+
+ private:
+  static OSSConnectionPool* GetPool() {
+    static OSSConnectionPool* pool = new OSSConnectionPool();
+    return pool;
+  }
+
+  const std::string& _endPoint;
+  const std::string& _accessKey;
+  const std::string& _accessKeySecret;
+  std::unique_ptr<OSSConnection> _conn;
+
+  TF_DISALLOW_COPY_AND_ASSIGN(PooledOSSConnection);
+};
+
+// Reads up to `n` bytes at `offset` of `object` into `buffer` with a ranged
+// GetObject, and returns the number of bytes read in `bytes_read`. As with
+// read(2), fewer than `n` bytes are only returned at the end of the object.
+static Status LoadRangeFromOSS(const std::string& host,
+                               const std::string& access_id,
+                               const std::string& access_key,
+                               const std::string& bucket,
+                               const std::string& object, uint64 offset,
+                               size_t n, char* buffer, size_t* bytes_read) {
+  *bytes_read = 0;
+  if (n == 0) return OkStatus();
+  PooledOSSConnection conn(host, access_id, access_key);
+  aos_pool_t* pool = conn.getPool();
+  oss_request_options_t* options = conn.getRequestOptions();
+  aos_string_t oss_bucket;
+  aos_string_t oss_object;
+  aos_list_t tmp_buffer;
+  aos_table_t* resp_headers = NULL;
+
+  aos_list_init(&tmp_buffer);
+  aos_str_set(&oss_bucket, bucket.c_str());
+  aos_str_set(&oss_object, object.c_str());
+  aos_table_t* headers = aos_table_make(pool, 2);
+
+  std::string range("bytes=");
+  range.append(std::to_string(offset))
+      .append("-")
+      .append(std::to_string(offset + n - 1));
+  apr_table_set(headers, "Range", range.c_str());
+  // Without it, OSS answers a range that ends past the end of the object with
+  // the whole object, rather than with the bytes up to its end.
+  apr_table_set(headers, "x-oss-range-behavior", "standard");
+  VLOG(1) << "read " << object << " from OSS with " << range;
+
+  const uint64_t start_micros = GetMetrics()->StartRequest();
+  aos_status_t* s =
+      oss_get_object_to_buffer(options, &oss_bucket, &oss_object, headers, NULL,
+                               &tmp_buffer, &resp_headers);
+  if (s->code == 416) {
+    // The range starts past the end of the object.
+    GetMetrics()->EndRequest("GetObject", start_micros, true);
+    return OkStatus();
+  }
+  GetMetrics()->EndRequest("GetObject", start_micros, aos_status_is_ok(s));
+  if (!aos_status_is_ok(s)) {
+    string msg;
+    oss_error_message(s, &msg);
+    VLOG(0) << "read " << object << " failed, errMsg: " << msg;
+    return errors::Internal("read failed: ", object, " errMsg: ", msg);
+  }
+
+  aos_buf_t* content = NULL;
+  size_t pos = 0;
+  aos_list_for_each_entry(aos_buf_t, content, &tmp_buffer, node) {
+    size_t size = std::min<size_t>(aos_buf_size(content), n - pos);
+    memcpy(buffer + pos, content->pos, size);
+    pos += size;
+  }
+  GetMetrics()->AddBytesRead(pos);
+  *bytes_read = pos;
+  return OkStatus();
+}
+
+static Status FromTF_Status(TF_Status* status) {
+  return TF_GetCode(status) == TF_OK
+             ? OkStatus()
+             : Status(static_cast<absl::StatusCode>(TF_GetCode(status)),
+                      TF_Message(status));
+}
+
 class OSSRandomAccessFile : public RandomAccessFile {
  public:
   OSSRandomAccessFile(const std::string& endPoint, const std::string& accessKey,
                       const std::string& accessKeySecret,
                       const std::string& bucket, const std::string& object,
-                      size_t read_ahead_bytes, size_t file_length)
+                      size_t read_ahead_bytes, size_t file_length,
+                      const std::string& path,
+                      std::shared_ptr<RamFileBlockCache> block_cache,
+                      size_t read_ahead_blocks)
       : shost(endPoint),
         sak(accessKey),
         ssk(accessKeySecret),
         sbucket(bucket),
         sobject(object),
-        total_file_length_(file_length) {
+        total_file_length_(file_length),
+        path_(path),
+        block_cache_(std::move(block_cache)),
+        read_ahead_blocks_(read_ahead_blocks) {
     read_ahead_bytes_ = std::min(read_ahead_bytes, file_length);
   }
 
+  ~OSSRandomAccessFile() override {
+    if (read_ahead_.valid()) read_ahead_.wait();
+  }
+
   Status Read(uint64 offset, size_t n, StringPiece* result,
               char* scratch) const override {
     // offset is 0 based, so last offset should be
@@ -154,12 +366,76 @@ class OSSRandomAccessFile : public RandomAccessFile {
 
     VLOG(1) << "read " << sobject << " from " << offset << " to " << offset + n;
 
+    if (block_cache_->IsCacheEnabled()) {
+      TF_RETURN_IF_ERROR(ReadFromBlockCache(offset, n, result, scratch));
+    } else {
+      TF_RETURN_IF_ERROR(ReadFromBuffer(offset, n, result, scratch));
+    }
+
+    if (result->size() < n) {
+      // This is not an error per se. The RandomAccessFile interface expects
+      // that Read returns OutOfRange if fewer bytes were read than requested.
+      return errors::OutOfRange("EOF reached, ", result->size(),
+                                " bytes were read out of ", n,
+                                " bytes requested.");
+    }
+    return OkStatus();
+  }
+
+ private:
+  Status ReadFromBlockCache(uint64 offset, size_t n, StringPiece* result,
+                            char* scratch) const {
+    TF_Status* status = TF_NewStatus();
+    int64_t read = block_cache_->Read(path_, offset, n, scratch, status);
+    Status s = FromTF_Status(status);
+    TF_DeleteStatus(status);
+    TF_RETURN_IF_ERROR(s);
+    *result = StringPiece(scratch, read);
+    MaybeReadAhead(offset, offset + read);
+    return OkStatus();
+  }
+
+  /// Fetches the `read_ahead_blocks_` blocks that follow a sequential read,
+  /// i.e. one that starts where the previous read ended, into the block cache
+  /// in the background.
+  void MaybeReadAhead(uint64 start, uint64 end) const {
+    mutex_lock lock(mu_);
+    const bool sequential = start == last_read_end_;
+    last_read_end_ = end;
+    if (!sequential || read_ahead_blocks_ == 0) return;
+    // Let the previous read-ahead finish rather than piling up fetches.
+    if (read_ahead_.valid() && read_ahead_.wait_for(std::chrono::seconds(0)) !=
+                                   std::future_status::ready) {
+      return;
+    }
+    const size_t block_size = block_cache_->block_size();
+    const uint64 first = (end + block_size - 1) / block_size * block_size;
+    const uint64 last = std::min<uint64>(
+        first + read_ahead_blocks_ * block_size, total_file_length_);
+    if (first >= last) return;
+    read_ahead_ = std::async(
+        std::launch::async,
+        [block_cache = block_cache_, path = path_, first, last, block_size]() {
+          TF_Status* status = TF_NewStatus();
+          char byte;
+          for (uint64 offset = first; offset < last; offset += block_size) {
+            // Reading a single byte fetches the whole block.
+            block_cache->Read(path, offset, 1, &byte, status);
+            if (TF_GetCode(status) != TF_OK) break;
+          }
+          TF_DeleteStatus(status);
+        });
+  }
+
+  Status ReadFromBuffer(uint64 offset, size_t n, StringPiece* result,
+                        char* scratch) const {
     mutex_lock lock(mu_);
     const bool range_start_included = offset >= buffer_start_offset_;
     const bool range_end_included =
         offset + n <= buffer_start_offset_ + buffer_size_;
     if (range_start_included && range_end_included) {
       // The requested range can be filled from the buffer.
+      GetMetrics()->AddCacheHit();
       const size_t offset_in_buffer =
           std::min<uint64>(offset - buffer_start_offset_, buffer_size_);
       const auto copy_size = std::min(n, buffer_size_ - offset_in_buffer);
@@ -170,96 +446,24 @@ class OSSRandomAccessFile : public RandomAccessFile {
       *result = StringPiece(scratch, copy_size);
     } else {
       // Update the buffer content based on the new requested range.
+      GetMetrics()->AddCacheMiss();
       const size_t desired_buffer_size =
-          std::min(n + read_ahead_bytes_, total_file_length_);
-      if (n > buffer_.capacity() ||
-          desired_buffer_size > 2 * buffer_.capacity()) {
-        // Re-allocate only if buffer capacity increased significantly.
-        VLOG(1) << "reserve buffer to " << desired_buffer_size;
-        buffer_.reserve(desired_buffer_size);
-      }
-
+          std::min(n + read_ahead_bytes_, total_file_length_ - offset);
+      buffer_.resize(desired_buffer_size);
       buffer_start_offset_ = offset;
+      buffer_size_ = 0;
       VLOG(1) << "load buffer" << buffer_start_offset_;
-      TF_RETURN_IF_ERROR(LoadBufferFromOSS(desired_buffer_size));
+      TF_RETURN_IF_ERROR(LoadRangeFromOSS(shost, sak, ssk, sbucket, sobject,
+                                          offset, desired_buffer_size,
+                                          buffer_.data(), &buffer_size_));
 
       // Set the results.
       memcpy(scratch, buffer_.data(), std::min(buffer_size_, n));
       *result = StringPiece(scratch, std::min(buffer_size_, n));
     }
-
-    if (result->size() < n) {
-      // This is not an error per se. The RandomAccessFile interface expects
-      // that Read returns OutOfRange if fewer bytes were read than requested.
-      return errors::OutOfRange("EOF reached, ", result->size(),
-                                " bytes were read out of ", n,
-                                " bytes requested.");
-    }
     return OkStatus();
   }
 
- private:
-  /// A helper function to actually read the data from OSS. This function loads
-  /// buffer_ from OSS based on its current capacity.
-  Status LoadBufferFromOSS(size_t desired_buffer_size) const
-      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
-    size_t range_start = buffer_start_offset_;
-    size_t range_end = buffer_start_offset_ + std::min(buffer_.capacity() - 1,
-                                                       desired_buffer_size - 1);
-    range_end = std::min(range_end, total_file_length_ - 1);
-
-    OSSConnection conn(shost, sak, ssk);
-    aos_pool_t* _pool = conn.getPool();
-    oss_request_options_t* _options = conn.getRequestOptions();
-    aos_string_t bucket_;
-    aos_string_t object_;
-    aos_table_t* headers_;
-    aos_list_t tmp_buffer;
-    aos_table_t* resp_headers;
-
-    aos_list_init(&tmp_buffer);
-    aos_str_set(&_options->config->endpoint, shost.c_str());
-    aos_str_set(&_options->config->access_key_id, sak.c_str());
-    aos_str_set(&_options->config->access_key_secret, ssk.c_str());
-    _options->config->is_cname = 0;
-    _options->ctl = aos_http_controller_create(_options->pool, 0);
-    aos_str_set(&bucket_, sbucket.c_str());
-    aos_str_set(&object_, sobject.c_str());
-    headers_ = aos_table_make(_pool, 1);
-
-    std::string range("bytes=");
-    range.append(std::to_string(range_start))
-        .append("-")
-        .append(std::to_string(range_end));
-    apr_table_set(headers_, "Range", range.c_str());
-    VLOG(1) << "read from OSS with " << range.c_str();
-
-    aos_status_t* s =
-        oss_get_object_to_buffer(_options, &bucket_, &object_, headers_, NULL,
-                                 &tmp_buffer, &resp_headers);
-    if (aos_status_is_ok(s)) {
-      aos_buf_t* content = NULL;
-      int64_t size = 0;
-      int64_t pos = 0;
-      buffer_.clear();
-      buffer_size_ = 0;
-
-      // copy data to local buffer
-      aos_list_for_each_entry(aos_buf_t, content, &tmp_buffer, node) {
-        size = aos_buf_size(content);
-        std::copy(content->pos, content->pos + size, buffer_.begin() + pos);
-        pos += size;
-      }
-      buffer_size_ = pos;
-      return OkStatus();
-    } else {
-      string msg;
-      oss_error_message(s, &msg);
-      VLOG(0) << "read " << sobject << " failed, errMsg: " << msg;
-      return errors::Internal("read failed: ", sobject, " errMsg: ", msg);
-    }
-  }
-
   std::string shost;
   std::string sak;
   std::string ssk;
@@ -267,12 +471,19 @@ class OSSRandomAccessFile : public RandomAccessFile {
   std::string sobject;
   const size_t total_file_length_;
   size_t read_ahead_bytes_;
+  // The key of the file in `block_cache_`.
+  const std::string path_;
+  const std::shared_ptr<RamFileBlockCache> block_cache_;
+  const size_t read_ahead_blocks_;
 
   mutable mutex mu_;
   mutable std::vector<char> buffer_ TF_GUARDED_BY(mu_);
   // The original file offset of the first byte in the buffer.
   mutable size_t buffer_start_offset_ TF_GUARDED_BY(mu_) = 0;
   mutable size_t buffer_size_ TF_GUARDED_BY(mu_) = 0;
+  // The end offset of the last read through the block cache.
+  mutable uint64 last_read_end_ TF_GUARDED_BY(mu_) = 0;
+  mutable std::future<void> read_ahead_ TF_GUARDED_BY(mu_);
 };
 
 class OSSReadOnlyMemoryRegion : public ReadOnlyMemoryRegion {
@@ -291,13 +502,19 @@ class OSSWritableFile : public WritableFile {
  public:
   OSSWritableFile(const std::string& endPoint, const std::string& accessKey,
                   const std::string& accessKeySecret, const std::string& bucket,
-                  const std::string& object, size_t part_size)
+                  const std::string& object, size_t part_size,
+                  std::shared_ptr<ObjectLister> lister,
+                  std::shared_ptr<StatCache> stat_cache,
+                  const std::string& path)
       : shost(endPoint),
         sak(accessKey),
         ssk(accessKeySecret),
         sbucket(bucket),
         sobject(object),
         part_size_(part_size),
+        lister_(lister),
+        stat_cache_(stat_cache),
+        path_(path),
         is_closed_(false),
         part_number_(1) {
     InitAprPool();
@@ -368,6 +585,8 @@ class OSSWritableFile : public WritableFile {
                               " errMsg: ", msg);
     }
 
+    lister_->Invalidate(path_);
+    stat_cache_->Invalidate(path_);
     is_closed_ = true;
     return OkStatus();
   }
@@ -445,9 +664,13 @@ class OSSWritableFile : public WritableFile {
       _InitMultiUpload();
 
       aos_str_set(&uploadId, upload_id_.c_str());
+      const size_t part_length = CurrentBufferLength();
+      const uint64_t start_micros = GetMetrics()->StartRequest();
       status =
           oss_upload_part_from_buffer(options_, &bucket_, &object_, &uploadId,
                                       part_number_, &buffer_, &resp_headers);
+      GetMetrics()->EndRequest("UploadPart", start_micros,
+                               aos_status_is_ok(status));
 
       if (!aos_status_is_ok(status)) {
         string msg;
@@ -459,6 +682,7 @@ class OSSWritableFile : public WritableFile {
 
       VLOG(1) << " upload " << sobject << " with part" << part_number_
               << " succ";
+      GetMetrics()->AddBytesWritten(part_length);
       part_number_++;
       ReleaseAprPool();
       InitAprPool();
@@ -482,6 +706,9 @@ class OSSWritableFile : public WritableFile {
   std::string sbucket;
   std::string sobject;
   size_t part_size_;
+  std::shared_ptr<ObjectLister> lister_;
+  std::shared_ptr<StatCache> stat_cache_;
+  std::string path_;
 
   aos_pool_t* pool_ = NULL;
   oss_request_options_t* options_ = NULL;
@@ -496,7 +723,15 @@ class OSSWritableFile : public WritableFile {
   int64_t part_number_;
 };
 
-OSSFileSystem::OSSFileSystem() {}
+OSSFileSystem::OSSFileSystem()
+    : lister_(std::make_shared<ObjectLister>([this](const std::string& dir,
+                                                    DirectoryListing* listing,
+                                                    TF_Status* status) {
+        Status s = _ListDirectory(dir, listing);
+        TF_SetStatus(status, TF_Code(int(s.code())),
+                     string(s.message()).c_str());
+      })),
+      stat_cache_(std::make_shared<StatCache>("OSS", GetMetrics())) {}
 
 // Splits a oss path to endpoint bucket object and token
 // For example
@@ -575,15 +810,72 @@ Status OSSFileSystem::NewRandomAccessFile(
   TF_RETURN_IF_ERROR(
       _ParseOSSURIPath(filename, bucket, object, host, access_id, access_key));
   TF_FileStatistics stat;
-  OSSConnection conn(host, access_id, access_key);
-  TF_RETURN_IF_ERROR(_RetrieveObjectMetadata(
-      conn.getPool(), conn.getRequestOptions(), bucket, object, &stat));
-  result->reset(new OSSRandomAccessFile(host, access_id, access_key, bucket,
-                                        object, read_ahead_bytes_,
-                                        stat.length));
+  std::string etag;
+  {
+    PooledOSSConnection conn(host, access_id, access_key);
+    TF_RETURN_IF_ERROR(_RetrieveObjectMetadata(conn.getPool(),
+                                               conn.getRequestOptions(), bucket,
+                                               object, &stat, &etag));
+  }
+  auto block_cache = GetFileBlockCache();
+  if (block_cache->IsCacheEnabled() &&
+      !block_cache->ValidateAndUpdateFileSignature(
+          filename, static_cast<int64_t>(std::hash<std::string>()(etag)))) {
+    VLOG(1) << "ETag of " << object << " changed, refreshing the cache";
+  }
+  result->reset(new OSSRandomAccessFile(
+      host, access_id, access_key, bucket, object, read_ahead_bytes_,
+      stat.length, filename, std::move(block_cache),
+      GetFilesystemConfigurationOrDefault(kReadAheadBlocks,
+                                          kDefaultReadAheadBlocks)));
   return OkStatus();
 }
 
+std::shared_ptr<RamFileBlockCache> OSSFileSystem::GetFileBlockCache() {
+  const uint64_t generation = GetFilesystemConfigurationGeneration();
+  {
+    mutex_lock lock(mu_);
+    if (block_cache_ != nullptr && configuration_generation_ == generation) {
+      return block_cache_;
+    }
+  }
+
+  size_t block_size = kDefaultBlockSize;
+  size_t value = GetFilesystemConfigurationOrDefault(kBlockSize, 0);
+  if (value > 0) block_size = value * 1024 * 1024;
+  const size_t max_bytes =
+      GetFilesystemConfigurationOrDefault(kMaxCacheSize, kDefaultMaxCacheSize) *
+      1024 * 1024;
+  const uint64_t max_staleness =
+      GetFilesystemConfigurationOrDefault(kMaxStaleness, kDefaultMaxStaleness);
+  VLOG(1) << "OSS cache max size = " << max_bytes
+          << " ; block size = " << block_size
+          << " ; max staleness = " << max_staleness;
+  auto block_cache = std::make_shared<RamFileBlockCache>(
+      block_size, max_bytes, max_staleness,
+      [this](const std::string& filename, size_t offset, size_t n, char* buffer,
+             TF_Status* status) -> int64_t {
+        std::string object, bucket;
+        std::string host, access_id, access_key;
+        size_t bytes_read = 0;
+        Status s = _ParseOSSURIPath(filename, bucket, object, host, access_id,
+                                    access_key);
+        if (s.ok()) {
+          s = LoadRangeFromOSS(host, access_id, access_key, bucket, object,
+                               offset, n, buffer, &bytes_read);
+        }
+        TF_SetStatus(status, TF_Code(int(s.code())),
+                     string(s.message()).c_str());
+        return s.ok() ? bytes_read : -1;
+      },
+      TF_NowSeconds, GetMetrics());
+
+  mutex_lock lock(mu_);
+  block_cache_ = std::move(block_cache);
+  configuration_generation_ = generation;
+  return block_cache_;
+}
+
 Status OSSFileSystem::NewWritableFile(const std::string& fname,
                                       std::unique_ptr<WritableFile>* result) {
   TF_RETURN_IF_ERROR(oss_initialize());
@@ -593,7 +885,8 @@ Status OSSFileSystem::NewWritableFile(const std::string& fname,
       _ParseOSSURIPath(fname, bucket, object, host, access_id, access_key));
 
   result->reset(new OSSWritableFile(host, access_id, access_key, bucket, object,
-                                    upload_part_bytes_));
+                                    upload_part_bytes_, lister_, stat_cache_,
+                                    fname));
   return OkStatus();
 }
 
@@ -761,7 +1054,7 @@ Status OSSFileSystem::_StatInternal(aos_pool_t* pool,
 Status OSSFileSystem::_RetrieveObjectMetadata(
     aos_pool_t* pool, const oss_request_options_t* options,
     const std::string& bucket, const std::string& object,
-    TF_FileStatistics* stat) {
+    TF_FileStatistics* stat, std::string* etag) {
   aos_string_t oss_bucket;
   aos_string_t oss_object;
   aos_table_t* headers = NULL;
@@ -811,6 +1104,11 @@ Status OSSFileSystem::_RetrieveObjectMetadata(
       stat->is_directory = false;
     }
 
+    if (etag != nullptr) {
+      const char* etag_str = apr_table_get(resp_headers, "ETag");
+      *etag = etag_str != NULL ? etag_str : "";
+    }
+
     return OkStatus();
   } else {
     string msg;
@@ -822,12 +1120,29 @@ Status OSSFileSystem::_RetrieveObjectMetadata(
 }
 
 Status OSSFileSystem::Stat(const std::string& fname, TF_FileStatistics* stat) {
+  TF_Status* status = TF_NewStatus();
+  stat_cache_->Stat(
+      fname,
+      [this](const std::string& fname, TF_FileStatistics* stat,
+             TF_Status* status) {
+        Status s = _StatUncached(fname, stat);
+        TF_SetStatus(status, TF_Code(int(s.code())),
+                     string(s.message()).c_str());
+      },
+      stat, status);
+  Status s = FromTF_Status(status);
+  TF_DeleteStatus(status);
+  return s;
+}
+
+Status OSSFileSystem::_StatUncached(const std::string& fname,
+                                    TF_FileStatistics* stat) {
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string object, bucket;
   std::string host, access_id, access_key;
   TF_RETURN_IF_ERROR(
       _ParseOSSURIPath(fname, bucket, object, host, access_id, access_key));
-  OSSConnection oss(host, access_id, access_key);
+  PooledOSSConnection oss(host, access_id, access_key);
   oss_request_options_t* ossOptions = oss.getRequestOptions();
   aos_pool_t* pool = oss.getPool();
 
@@ -838,6 +1153,28 @@ Status OSSFileSystem::GetChildren(const std::string& dir,
                                   std::vector<std::string>* result) {
   result->clear();
   TF_RETURN_IF_ERROR(oss_initialize());
+  std::string path = dir;
+  if (path.back() != '/') path.push_back('/');
+  TF_Status* status = TF_NewStatus();
+  lister_->GetChildren(path, result, status);
+  Status s = FromTF_Status(status);
+  TF_DeleteStatus(status);
+  return s;
+}
+
+Status OSSFileSystem::GetMatchingPaths(const std::string& pattern,
+                                       std::vector<std::string>* results) {
+  TF_RETURN_IF_ERROR(oss_initialize());
+  TF_Status* status = TF_NewStatus();
+  lister_->GetMatchingPaths(pattern, results, status);
+  Status s = FromTF_Status(status);
+  TF_DeleteStatus(status);
+  return s;
+}
+
+// Lists one level of `dir`, separating objects from common prefixes.
+Status OSSFileSystem::_ListDirectory(const std::string& dir,
+                                     DirectoryListing* listing) {
   std::string object, bucket;
   std::string host, access_id, access_key;
   TF_RETURN_IF_ERROR(
@@ -846,8 +1183,60 @@ Status OSSFileSystem::GetChildren(const std::string& dir,
   oss_request_options_t* oss_options = oss.getRequestOptions();
   aos_pool_t* pool = oss.getPool();
   if (!object.empty() && object.back() != '/') object.push_back('/');
-  return _ListObjects(pool, oss_options, bucket, object, result, true, false,
-                      true, false, 1000);
+
+  aos_string_t bucket_;
+  aos_status_t* s = NULL;
+  oss_list_object_content_t* content = NULL;
+  oss_list_object_common_prefix_t* common_prefix = NULL;
+  const char* next_marker = "";
+
+  aos_str_set(&bucket_, bucket.c_str());
+  oss_list_object_params_t* params = oss_create_list_object_params(pool);
+  params->max_ret = 1000;
+  aos_str_set(&params->prefix, object.c_str());
+  aos_str_set(&params->marker, next_marker);
+  aos_str_set(&params->delimiter, "/");
+
+  do {
+    s = oss_list_object(oss_options, &bucket_, params, NULL);
+    if (!aos_status_is_ok(s)) {
+      string msg;
+      oss_error_message(s, &msg);
+      VLOG(0) << "can not list object " << object << " errMsg: " << msg;
+      return errors::NotFound("can not list object:", object, " errMsg: ", msg);
+    }
+
+    aos_list_for_each_entry(oss_list_object_content_t, content,
+                            &params->object_list, node) {
+      string child(content->key.data + object.length(),
+                   content->key.len - object.length());
+      if (child.empty()) continue;
+      // Objects with a trailing slash are directory markers.
+      if (child.back() == '/') {
+        child.pop_back();
+        listing->directories.push_back(child);
+      } else {
+        listing->files.push_back(child);
+      }
+    }
+
+    aos_list_for_each_entry(oss_list_object_common_prefix_t, common_prefix,
+                            &params->common_prefix_list, node) {
+      string child(common_prefix->prefix.data + object.length(),
+                   common_prefix->prefix.len - object.length());
+      if (!child.empty() && child.back() == '/') child.pop_back();
+      if (!child.empty()) listing->directories.push_back(child);
+    }
+
+    next_marker = apr_psprintf(pool, "%.*s", params->next_marker.len,
+                               params->next_marker.data);
+
+    aos_str_set(&params->marker, next_marker);
+    aos_list_init(&params->object_list);
+    aos_list_init(&params->common_prefix_list);
+  } while (params->truncated == AOS_TRUE);
+
+  return OkStatus();
 }
 
 Status OSSFileSystem::_DeleteObjectInternal(
@@ -873,6 +1262,10 @@ Status OSSFileSystem::_DeleteObjectInternal(
 }
 
 Status OSSFileSystem::DeleteFile(const std::string& fname) {
+  auto invalidate_caches = MakeCleanup([this, &fname] {
+    lister_->Invalidate(fname);
+    stat_cache_->Invalidate(fname);
+  });
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string object, bucket;
   std::string host, access_id, access_key;
@@ -885,6 +1278,10 @@ Status OSSFileSystem::DeleteFile(const std::string& fname) {
 }
 
 Status OSSFileSystem::CreateDir(const std::string& dirname) {
+  auto invalidate_caches = MakeCleanup([this, &dirname] {
+    lister_->Invalidate(dirname);
+    stat_cache_->Invalidate(dirname);
+  });
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string object, bucket;
   std::string host, access_id, access_key;
@@ -919,6 +1316,10 @@ Status OSSFileSystem::CreateDir(const std::string& dirname) {
 }
 
 Status OSSFileSystem::RecursivelyCreateDir(const string& dirname) {
+  auto invalidate_caches = MakeCleanup([this, &dirname] {
+    lister_->Invalidate(dirname);
+    stat_cache_->Invalidate(dirname);
+  });
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string object, bucket;
   std::string host, access_id, access_key;
@@ -998,6 +1399,10 @@ Status OSSFileSystem::_CreateDirInternal(aos_pool_t* pool,
 }
 
 Status OSSFileSystem::DeleteDir(const std::string& dirname) {
+  auto invalidate_caches = MakeCleanup([this, &dirname] {
+    lister_->Invalidate(dirname);
+    stat_cache_->Invalidate(dirname);
+  });
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string object, bucket;
   std::string host, access_id, access_key;
@@ -1034,6 +1439,10 @@ Status OSSFileSystem::GetFileSize(const std::string& fname, uint64* file_size) {
 
 Status OSSFileSystem::RenameFile(const std::string& src,
                                  const std::string& target) {
+  auto invalidate_caches = MakeCleanup([this] {
+    lister_->Clear();
+    stat_cache_->Clear();
+  });
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string sobject, sbucket;
   std::string host, access_id, access_key;
@@ -1250,6 +1659,10 @@ Status OSSFileSystem::DeleteRecursively(const std::string& dirname,
   }
   *undeleted_files = 0;
   *undeleted_dirs = 0;
+  auto invalidate_caches = MakeCleanup([this] {
+    lister_->Clear();
+    stat_cache_->Clear();
+  });
 
   TF_RETURN_IF_ERROR(oss_initialize());
   std::string object, bucket;
@@ -1302,6 +1715,10 @@ Status OSSFileSystem::DeleteRecursively(const std::string& dirname,
 }
 
 Status OSSFileSystem::CopyFile(const string& src, const string& target) {
+  auto invalidate_caches = MakeCleanup([this, &target] {
+    lister_->Invalidate(target);
+    stat_cache_->Invalidate(target);
+  });
   TF_RETURN_IF_ERROR(oss_initialize());
 
   std::string sobject, sbucket;
@@ -1560,6 +1977,19 @@ int GetChildren(const TF_Filesystem* filesystem, const char* path,
   return TF_GetCode(status) == TF_OK ? num_entries : -1;
 }
 
+int GetMatchingPaths(const TF_Filesystem* filesystem, const char* pattern,
+                     char*** entries, TF_Status* status) {
+  auto oss_fs = static_cast<OSSFileSystem*>(filesystem->plugin_filesystem);
+  std::vector<std::string> result;
+  ToTF_Status(oss_fs->GetMatchingPaths(pattern, &result), status);
+  int num_entries = result.size();
+  *entries = static_cast<char**>(
+      plugin_memory_allocate(num_entries * sizeof((*entries)[0])));
+  for (int i = 0; i < num_entries; i++)
+    (*entries)[i] = strdup(result[i].c_str());
+  return TF_GetCode(status) == TF_OK ? num_entries : -1;
+}
+
 int64_t GetFileSize(const TF_Filesystem* filesystem, const char* path,
                     TF_Status* status) {
   TF_FileStatistics stats;
@@ -1571,6 +2001,15 @@ char* TranslateName(const TF_Filesystem* filesystem, const char* uri) {
   return strdup(uri);
 }
 
+void SetConfiguration(const TF_Filesystem* filesystem,
+                      const TF_Filesystem_Option* options, int num_options,
+                      TF_Status* status) {
+  SetFilesystemConfiguration("oss",
+                             {kBlockSize, kMaxCacheSize, kMaxStaleness,
+                              kReadAheadBlocks, kMaxIdleConnections},
+                             options, num_options, status);
+}
+
 }  // namespace tf_oss_filesystem
 
 void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
@@ -1623,7 +2062,10 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
   ops->filesystem_ops->is_directory = tf_oss_filesystem::IsDirectory;
   ops->filesystem_ops->get_file_size = tf_oss_filesystem::GetFileSize;
   ops->filesystem_ops->get_children = tf_oss_filesystem::GetChildren;
+  ops->filesystem_ops->get_matching_paths = tf_oss_filesystem::GetMatchingPaths;
   ops->filesystem_ops->translate_name = tf_oss_filesystem::TranslateName;
+  ops->filesystem_ops->set_filesystem_configuration =
+      tf_oss_filesystem::SetConfiguration;
 }
 
 }  // end namespace oss
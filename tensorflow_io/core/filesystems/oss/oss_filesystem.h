@@ -14,6 +14,7 @@ limitations under the License.
 #define TENSORFLOW_IO_CORE_FILESYSTEMS_OSS_OSS_FILESYSTEM_H_
 
 #include <atomic>
+#include <memory>
 #include <mutex>
 #include <string>
 #include <vector>
@@ -29,6 +30,9 @@ limitations under the License.
 #include "tensorflow/core/lib/core/status.h"
 #include "tensorflow/core/platform/env.h"
 #include "tensorflow/core/platform/mutex.h"
+#include "tensorflow_io/core/filesystems/object_listing.h"
+#include "tensorflow_io/core/filesystems/ram_file_block_cache.h"
+#include "tensorflow_io/core/filesystems/stat_cache.h"
 
 namespace tensorflow {
 namespace io {
@@ -57,6 +61,8 @@ class OSSFileSystem {
 
   Status GetChildren(const string& dir, std::vector<string>* result);
 
+  Status GetMatchingPaths(const string& pattern, std::vector<string>* results);
+
   Status DeleteFile(const string& fname);
 
   Status CreateDir(const string& dirname);
@@ -88,10 +94,12 @@ class OSSFileSystem {
   Status _DeleteObjectInternal(const oss_request_options_t* options,
                                const string& bucket, const string& object);
 
+  // Also returns the `ETag` of the object in `etag`, if set.
   Status _RetrieveObjectMetadata(aos_pool_t* pool,
                                  const oss_request_options_t* options,
                                  const string& bucket, const string& object,
-                                 TF_FileStatistics* stat);
+                                 TF_FileStatistics* stat,
+                                 std::string* etag = nullptr);
 
   aos_status_t* _CopyFileInternal(const oss_request_options_t* oss_options,
                                   aos_pool_t* pool,
@@ -107,8 +115,16 @@ class OSSFileSystem {
                       bool should_remove_suffix = true, bool recursive = true,
                       int max_ret_per_iterator = 1000);
 
+  Status _ListDirectory(const string& dir, DirectoryListing* listing);
+
+  Status _StatUncached(const string& fname, TF_FileStatistics* stat);
+
   Status _InitOSSCredentials();
 
+  // Returns the block cache for a new file, after applying the options set
+  // since the last call.
+  std::shared_ptr<RamFileBlockCache> GetFileBlockCache();
+
   Status _ParseOSSURIPath(const StringPiece fname, std::string& bucket,
                           std::string& object, std::string& host,
                           std::string& access_id, std::string& access_key);
@@ -126,6 +142,18 @@ class OSSFileSystem {
 
   mutex mu_;
 
+  // Caches directory listings and implements `GetMatchingPaths`.
+  std::shared_ptr<ObjectLister> lister_;
+
+  // Caches `Stat` results, including missing paths.
+  std::shared_ptr<StatCache> stat_cache_;
+
+  // Caches blocks of the files read, shared by all files opened with the same
+  // configuration. Replaced when the configuration changes, while the files
+  // already open keep the previous one.
+  std::shared_ptr<RamFileBlockCache> block_cache_ TF_GUARDED_BY(mu_);
+  uint64_t configuration_generation_ TF_GUARDED_BY(mu_) = 0;
+
   TF_DISALLOW_COPY_AND_ASSIGN(OSSFileSystem);
 };
 
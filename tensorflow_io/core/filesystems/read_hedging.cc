@@ -0,0 +1,243 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow_io/core/filesystems/read_hedging.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cstring>
+#include <thread>
+
+#include "absl/strings/str_cat.h"
+#include "absl/time/time.h"
+#include "tensorflow/c/logging.h"
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+
+namespace tensorflow {
+namespace io {
+namespace {
+
+// The percentage of reads that may be hedged.
+constexpr uint64_t kDefaultHedgeBudgetPercent = 5;
+// The least time to wait before hedging a read, so that fast stores with a
+// low p95 are not hedged on noise.
+constexpr uint64_t kDefaultHedgeMinDelayMs = 20;
+// The p95 is computed over the latencies of this many recent reads, and
+// reads are not hedged before a fifth of them have been seen.
+constexpr size_t kLatencySamples = 500;
+constexpr size_t kMinLatencySamples = kLatencySamples / 5;
+// The p95 is recomputed after this many new latencies.
+constexpr size_t kLatencyRefreshInterval = 50;
+// The most hedges that can be saved up while reads are fast.
+constexpr double kMaxHedgeTokens = 10;
+// The most threads that run hedged reads. Reads beyond that are not hedged.
+constexpr int kMaxWorkers = 64;
+// Larger reads, e.g. of whole files, are neither hedged, as a duplicate would
+// double their download and memory, nor counted in the latencies, which are
+// those of ranged reads.
+constexpr size_t kMaxHedgedReadBytes = 8 * 1024 * 1024;
+
+uint64_t NowMicros() {
+  return std::chrono::duration_cast<std::chrono::microseconds>(
+             std::chrono::steady_clock::now().time_since_epoch())
+      .count();
+}
+
+bool IsReadOk(TF_Status* status) {
+  return TF_GetCode(status) == TF_OK || TF_GetCode(status) == TF_OUT_OF_RANGE;
+}
+
+}  // namespace
+
+// The state of a read shared by its attempts, which may outlive `Read` when
+// an attempt loses.
+struct ReadHedger::HedgedRead {
+  explicit HedgedRead(size_t n) : n(n) {}
+  ~HedgedRead() {
+    for (auto& attempt : attempts) {
+      if (attempt.status != nullptr) TF_DeleteStatus(attempt.status);
+    }
+  }
+
+  bool Done() const ABSL_EXCLUSIVE_LOCKS_REQUIRED(mu) {
+    return winner >= 0 || pending == 0;
+  }
+
+  struct Attempt {
+    std::unique_ptr<char[]> buffer;
+    int64_t read = -1;
+    TF_Status* status = nullptr;
+  };
+
+  const size_t n;
+  absl::Mutex mu;
+  Attempt attempts[2] ABSL_GUARDED_BY(mu);
+  int pending ABSL_GUARDED_BY(mu) = 0;
+  int winner ABSL_GUARDED_BY(mu) = -1;
+};
+
+ReadHedger::Options ReadHedger::GetOptions(const std::string& env_prefix) {
+  Options options;
+  options.enabled = GetFilesystemConfigurationOrDefault(
+                        absl::StrCat(env_prefix, "_HEDGE_READS"), 0) != 0;
+  options.budget_percent = GetFilesystemConfigurationOrDefault(
+      absl::StrCat(env_prefix, "_HEDGE_BUDGET_PERCENT"),
+      kDefaultHedgeBudgetPercent);
+  options.min_delay_ms = GetFilesystemConfigurationOrDefault(
+      absl::StrCat(env_prefix, "_HEDGE_MIN_DELAY_MS"), kDefaultHedgeMinDelayMs);
+  return options;
+}
+
+std::vector<std::string> ReadHedger::OptionNames(
+    const std::string& env_prefix) {
+  return {absl::StrCat(env_prefix, "_HEDGE_READS"),
+          absl::StrCat(env_prefix, "_HEDGE_BUDGET_PERCENT"),
+          absl::StrCat(env_prefix, "_HEDGE_MIN_DELAY_MS")};
+}
+
+int64_t ReadHedger::Read(const Options& options, size_t n, char* buffer,
+                         const ReadFn& read, TF_Status* status) {
+  if (!options.enabled || n > kMaxHedgedReadBytes) return read(buffer, status);
+
+  uint64_t delay_micros;
+  std::shared_ptr<HedgedRead> hedged_read;
+  if (StartRead(options, &delay_micros)) {
+    hedged_read = std::make_shared<HedgedRead>(n);
+    bool started;
+    {
+      absl::MutexLock l(&hedged_read->mu);
+      started = StartAttempt(hedged_read, 0, read);
+    }
+    // Only released once unlocked, as the lock lives in the read.
+    if (!started) hedged_read = nullptr;
+  }
+  if (hedged_read == nullptr) {
+    const uint64_t start_micros = NowMicros();
+    int64_t result = read(buffer, status);
+    if (IsReadOk(status)) AddLatency(NowMicros() - start_micros);
+    return result;
+  }
+
+  absl::MutexLock l(&hedged_read->mu);
+  const absl::Condition done(hedged_read.get(), &HedgedRead::Done);
+  if (!hedged_read->mu.AwaitWithTimeout(done,
+                                        absl::Microseconds(delay_micros))) {
+    bool hedge;
+    {
+      absl::MutexLock l(&mu_);
+      hedge = hedge_tokens_ >= 1;
+      if (hedge) hedge_tokens_ -= 1;
+    }
+    if (hedge && StartAttempt(hedged_read, 1, read)) {
+      TF_VLog(1, "Hedging a read of %u bytes after %u us", n, delay_micros);
+      metrics_->AddHedgedRead();
+    }
+  }
+  hedged_read->mu.Await(done);
+
+  // Without a winner all attempts failed, and the first attempt's error is
+  // returned.
+  const int winner = std::max(hedged_read->winner, 0);
+  if (winner > 0) metrics_->AddHedgeWin();
+  auto& attempt = hedged_read->attempts[winner];
+  if (attempt.read > 0) memcpy(buffer, attempt.buffer.get(), attempt.read);
+  TF_SetStatus(status, TF_GetCode(attempt.status), TF_Message(attempt.status));
+  return attempt.read;
+}
+
+// Requires `hedged_read->mu`.
+bool ReadHedger::StartAttempt(std::shared_ptr<HedgedRead> hedged_read,
+                              int attempt, const ReadFn& read) {
+  auto& state = hedged_read->attempts[attempt];
+  state.buffer.reset(new char[hedged_read->n]);
+  state.status = TF_NewStatus();
+  char* buffer = state.buffer.get();
+  TF_Status* status = state.status;
+  if (!Schedule([this, hedged_read, attempt, read, buffer, status]() {
+        const uint64_t start_micros = NowMicros();
+        int64_t result = read(buffer, status);
+        const bool ok = IsReadOk(status);
+        if (ok) AddLatency(NowMicros() - start_micros);
+
+        absl::MutexLock l(&hedged_read->mu);
+        hedged_read->attempts[attempt].read = result;
+        hedged_read->pending--;
+        if (ok && hedged_read->winner < 0) hedged_read->winner = attempt;
+      })) {
+    return false;
+  }
+  hedged_read->pending++;
+  return true;
+}
+
+bool ReadHedger::Schedule(std::function<void()> fn) {
+  absl::MutexLock l(&pool_mu_);
+  if (idle_workers_ <= static_cast<int>(tasks_.size())) {
+    if (workers_ >= kMaxWorkers) return false;
+    // The threads are never joined, as the hedger lives as long as the
+    // process.
+    workers_++;
+    std::thread(&ReadHedger::WorkerLoop, this).detach();
+  }
+  tasks_.push_back(std::move(fn));
+  return true;
+}
+
+void ReadHedger::WorkerLoop() {
+  absl::MutexLock l(&pool_mu_);
+  while (true) {
+    idle_workers_++;
+    pool_mu_.Await(absl::Condition(this, &ReadHedger::HasTasks));
+    idle_workers_--;
+    std::function<void()> fn = std::move(tasks_.front());
+    tasks_.pop_front();
+    pool_mu_.Unlock();
+    fn();
+    pool_mu_.Lock();
+  }
+}
+
+bool ReadHedger::StartRead(const Options& options, uint64_t* delay_micros) {
+  absl::MutexLock l(&mu_);
+  hedge_tokens_ =
+      std::min(kMaxHedgeTokens, hedge_tokens_ + options.budget_percent / 100.0);
+  if (latencies_.size() < kMinLatencySamples || hedge_tokens_ < 1) {
+    return false;
+  }
+  *delay_micros = std::max(p95_micros_, options.min_delay_ms * 1000);
+  return true;
+}
+
+void ReadHedger::AddLatency(uint64_t latency_micros) {
+  absl::MutexLock l(&mu_);
+  if (latencies_.size() < kLatencySamples) {
+    latencies_.push_back(latency_micros);
+  } else {
+    latencies_[next_latency_] = latency_micros;
+    next_latency_ = (next_latency_ + 1) % kLatencySamples;
+  }
+  if (++latencies_since_refresh_ < kLatencyRefreshInterval &&
+      latencies_.size() != kMinLatencySamples) {
+    return;
+  }
+  latencies_since_refresh_ = 0;
+  std::vector<uint64_t> sorted(latencies_);
+  auto p95 = sorted.begin() + sorted.size() * 95 / 100;
+  std::nth_element(sorted.begin(), p95, sorted.end());
+  p95_micros_ = *p95;
+}
+
+}  // namespace io
+}  // namespace tensorflow
@@ -16,6 +16,8 @@ limitations under the License.
 
 #include <aws/core/client/AsyncCallerContext.h>
 #include <aws/core/config/AWSProfileConfigLoader.h>
+#include <aws/core/monitoring/MonitoringFactory.h>
+#include <aws/core/monitoring/MonitoringInterface.h>
 #include <aws/core/utils/FileSystemUtils.h>
 #include <aws/core/utils/stream/PreallocatedStreamBuf.h>
 #include <aws/s3/model/AbortMultipartUploadRequest.h>
@@ -24,11 +26,14 @@ limitations under the License.
 #include <aws/s3/model/CompletedPart.h>
 #include <aws/s3/model/CopyObjectRequest.h>
 #include <aws/s3/model/CreateMultipartUploadRequest.h>
+#include <aws/s3/model/Delete.h>
 #include <aws/s3/model/DeleteObjectRequest.h>
+#include <aws/s3/model/DeleteObjectsRequest.h>
 #include <aws/s3/model/GetObjectRequest.h>
 #include <aws/s3/model/HeadBucketRequest.h>
 #include <aws/s3/model/HeadObjectRequest.h>
 #include <aws/s3/model/ListObjectsV2Request.h>
+#include <aws/s3/model/ObjectIdentifier.h>
 #include <aws/s3/model/UploadPartCopyRequest.h>
 #include <stdlib.h>
 #include <string.h>
@@ -38,7 +43,12 @@ limitations under the License.
 #include "absl/strings/str_cat.h"
 #include "tensorflow/c/logging.h"
 #include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/cleanup.h"
+#include "tensorflow_io/core/filesystems/filesystem_configuration.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
 #include "tensorflow_io/core/filesystems/filesystem_plugins.h"
+#include "tensorflow_io/core/filesystems/mapped_memory_region.h"
+#include "tensorflow_io/core/filesystems/read_hedging.h"
 #include "tensorflow_io/core/filesystems/s3/aws_logging.h"
 
 namespace tensorflow {
@@ -49,13 +59,28 @@ namespace s3 {
 constexpr char kS3FileSystemAllocationTag[] = "S3FileSystemAllocation";
 constexpr char kS3ClientAllocationTag[] = "S3ClientAllocation";
 constexpr int64_t kS3TimeoutMsec = 300000;  // 5 min
-constexpr int kS3GetChildrenMaxKeys = 100;
+// The largest page size `ListObjectsV2` accepts.
+constexpr int kS3GetChildrenMaxKeys = 1000;
+// The largest number of keys `DeleteObjects` accepts.
+constexpr int kS3DeleteObjectsMaxKeys = 1000;
+// The number of `DeleteObjects` requests `DeleteRecursively` keeps in flight.
+constexpr int kS3DeleteObjectsMaxInFlight = 16;
 
 constexpr char kExecutorTag[] = "TransferManagerExecutorAllocation";
+constexpr char kMonitoringTag[] = "TFIOMonitoringAllocation";
 constexpr int kExecutorPoolSize = 25;
 
 constexpr uint64_t kS3MultiPartUploadChunkSize = 50 * 1024 * 1024;    // 50 MB
 constexpr uint64_t kS3MultiPartDownloadChunkSize = 50 * 1024 * 1024;  // 50 MB
+// Options settable with `set_configuration`, or the environment variables of
+// the same name. They apply to files opened afterwards.
+constexpr char kExecutorPoolSizeOption[] = "S3_EXECUTOR_POOL_SIZE";
+constexpr char kMultiPartUploadChunkSizeOption[] =
+    "S3_MULTI_PART_UPLOAD_CHUNK_SIZE";
+constexpr char kMultiPartDownloadChunkSizeOption[] =
+    "S3_MULTI_PART_DOWNLOAD_CHUNK_SIZE";
+constexpr char kDisableMultiPartDownloadOption[] =
+    "S3_DISABLE_MULTI_PART_DOWNLOAD";
 constexpr size_t kDownloadRetries = 3;
 constexpr size_t kUploadRetries = 3;
 
@@ -126,6 +151,80 @@ void ParseS3Path(const Aws::String& fname, bool object_empty_ok,
   }
 }
 
+static FilesystemMetrics* GetMetrics() {
+  static FilesystemMetrics* metrics = FilesystemMetrics::Get("s3");
+  return metrics;
+}
+
+// Reads hedged against slow responses, as set by the `S3_HEDGE_*` options.
+static ReadHedger* GetReadHedger() {
+  static ReadHedger* hedger = new ReadHedger(GetMetrics());
+  return hedger;
+}
+
+// Records every request sent by the S3 clients, including the parts of
+// transfer manager uploads and downloads, in `GetMetrics()`. Requests are
+// timed from the first attempt to the end of the last retry.
+class S3Monitoring : public Aws::Monitoring::MonitoringInterface {
+ public:
+  void* OnRequestStarted(const Aws::String& service_name,
+                         const Aws::String& request_name,
+                         const std::shared_ptr<const Aws::Http::HttpRequest>&
+                             request) const override {
+    return new RequestContext{GetMetrics()->StartRequest(), true};
+  }
+
+  void OnRequestSucceeded(
+      const Aws::String& service_name, const Aws::String& request_name,
+      const std::shared_ptr<const Aws::Http::HttpRequest>& request,
+      const Aws::Client::HttpResponseOutcome& outcome,
+      const Aws::Monitoring::CoreMetricsCollection& metrics_from_core,
+      void* context) const override {
+    static_cast<RequestContext*>(context)->ok = true;
+  }
+
+  void OnRequestFailed(
+      const Aws::String& service_name, const Aws::String& request_name,
+      const std::shared_ptr<const Aws::Http::HttpRequest>& request,
+      const Aws::Client::HttpResponseOutcome& outcome,
+      const Aws::Monitoring::CoreMetricsCollection& metrics_from_core,
+      void* context) const override {
+    static_cast<RequestContext*>(context)->ok = false;
+  }
+
+  void OnRequestRetry(
+      const Aws::String& service_name, const Aws::String& request_name,
+      const std::shared_ptr<const Aws::Http::HttpRequest>& request,
+      void* context) const override {
+    GetMetrics()->AddRetry();
+  }
+
+  void OnFinish(const Aws::String& service_name,
+                const Aws::String& request_name,
+                const std::shared_ptr<const Aws::Http::HttpRequest>& request,
+                void* context) const override {
+    auto request_context = static_cast<RequestContext*>(context);
+    GetMetrics()->EndRequest(request_name.c_str(),
+                             request_context->start_micros,
+                             request_context->ok);
+    delete request_context;
+  }
+
+ private:
+  struct RequestContext {
+    uint64_t start_micros;
+    bool ok;
+  };
+};
+
+class S3MonitoringFactory : public Aws::Monitoring::MonitoringFactory {
+ public:
+  Aws::UniquePtr<Aws::Monitoring::MonitoringInterface>
+  CreateMonitoringInstance() const override {
+    return Aws::MakeUnique<S3Monitoring>(kMonitoringTag);
+  }
+};
+
 static Aws::Client::ClientConfiguration& GetDefaultClientConfig() {
   ABSL_CONST_INIT static absl::Mutex cfg_lock(absl::kConstInit);
   static bool init(false);
@@ -170,6 +269,8 @@ static void GetS3Client(tf_s3_filesystem::S3File* s3_file) {
     tf_s3_filesystem::AWSLogSystem::InitializeAWSLogging();
 
     Aws::SDKOptions options;
+    options.monitoringOptions.customizedMonitoringFactory_create_fn.push_back(
+        []() { return Aws::MakeUnique<S3MonitoringFactory>(kMonitoringTag); });
     Aws::InitAPI(options);
 
     // The creation of S3Client disables virtual addressing:
@@ -191,63 +292,92 @@ static void GetS3Client(tf_s3_filesystem::S3File* s3_file) {
           }
         });
 
-    const char* disable_multi_part_download =
-        getenv("S3_DISABLE_MULTI_PART_DOWNLOAD");
-    int temp_value;
-    if (disable_multi_part_download &&
-        absl::SimpleAtoi(disable_multi_part_download, &temp_value))
-      s3_file->use_multi_part_download = (temp_value != 1);
-
     const char* endpoint = getenv("S3_ENDPOINT");
     if (endpoint) s3_file->s3_client->OverrideEndpoint(endpoint);
   }
 }
 
+// Returns whether random access files read through the transfer manager.
+static bool UseMultiPartDownload() {
+  std::string disable_multi_part_download;
+  int temp_value;
+  return !(GetFilesystemConfiguration(kDisableMultiPartDownloadOption,
+                                      &disable_multi_part_download) &&
+           absl::SimpleAtoi(disable_multi_part_download, &temp_value) &&
+           temp_value == 1);
+}
+
+static uint64_t GetMultiPartChunkSize(
+    const Aws::Transfer::TransferDirection& direction) {
+  if (direction == Aws::Transfer::TransferDirection::UPLOAD)
+    return GetFilesystemConfigurationOrDefault(kMultiPartUploadChunkSizeOption,
+                                               kS3MultiPartUploadChunkSize);
+  return GetFilesystemConfigurationOrDefault(kMultiPartDownloadChunkSizeOption,
+                                             kS3MultiPartDownloadChunkSize);
+}
+
+// ApplyConfiguration drops the executor and the transfer managers whose
+// options changed with `set_configuration`, so that they are created again
+// for the next file. The caller must hold `initialization_lock`.
+static void ApplyConfiguration(tf_s3_filesystem::S3File* s3_file) {
+  const uint64_t generation = GetFilesystemConfigurationGeneration();
+  if (s3_file->configuration_generation == generation) return;
+  s3_file->configuration_generation = generation;
+
+  if (s3_file->executor.get() != nullptr &&
+      GetFilesystemConfigurationOrDefault(kExecutorPoolSizeOption,
+                                          kExecutorPoolSize) !=
+          s3_file->executor_pool_size) {
+    // Transfer managers of files opened before still run on the executor.
+    s3_file->retired_executors.push_back(std::move(s3_file->executor));
+    s3_file->executor = nullptr;
+    s3_file->transfer_managers.clear();
+    s3_file->multi_part_chunk_sizes.clear();
+  }
+  for (auto direction : {Aws::Transfer::TransferDirection::UPLOAD,
+                         Aws::Transfer::TransferDirection::DOWNLOAD}) {
+    auto it = s3_file->multi_part_chunk_sizes.find(direction);
+    if (it != s3_file->multi_part_chunk_sizes.end() &&
+        it->second != GetMultiPartChunkSize(direction)) {
+      s3_file->multi_part_chunk_sizes.erase(it);
+      s3_file->transfer_managers.erase(direction);
+    }
+  }
+}
+
 // GetExecutor initializes the executor in s3_file if it is not initialized.
+// The caller must hold `initialization_lock`.
 //
 // This function returns executor_pool_size that is used in initialization,
 // but the caller can ignore the return value.
 static int GetExecutor(tf_s3_filesystem::S3File* s3_file) {
-  absl::MutexLock l(&s3_file->initialization_lock);
-
-  int temp_value;
-  const char* executor_pool_size = getenv("S3_EXECUTOR_POOL_SIZE");
-  if (executor_pool_size == nullptr ||
-      !absl::SimpleAtoi(executor_pool_size, &temp_value))
-    temp_value = kExecutorPoolSize;
-
   if (s3_file->executor.get() == nullptr) {
+    s3_file->executor_pool_size = GetFilesystemConfigurationOrDefault(
+        kExecutorPoolSizeOption, kExecutorPoolSize);
     s3_file->executor =
         Aws::MakeShared<Aws::Utils::Threading::PooledThreadExecutor>(
-            kExecutorTag, temp_value);
+            kExecutorTag, s3_file->executor_pool_size);
   }
 
-  return temp_value;
+  return s3_file->executor_pool_size;
 }
 
-static void GetTransferManager(
+// GetTransferManager returns the transfer manager for `direction`, and the
+// part size it splits objects into in `chunk_size` if not null. Files keep
+// the transfer manager they were opened with, so that a configuration change
+// only applies to files opened afterwards.
+static std::shared_ptr<Aws::Transfer::TransferManager> GetTransferManager(
     const Aws::Transfer::TransferDirection& direction,
-    tf_s3_filesystem::S3File* s3_file) {
-  // These functions should be called before holding `initialization_lock`.
+    tf_s3_filesystem::S3File* s3_file, uint64_t* chunk_size = nullptr) {
+  // This function should be called before holding `initialization_lock`.
   GetS3Client(s3_file);
-  int executor_pool_size = GetExecutor(s3_file);
 
   absl::MutexLock l(&s3_file->initialization_lock);
+  ApplyConfiguration(s3_file);
+  int executor_pool_size = GetExecutor(s3_file);
 
   if (s3_file->transfer_managers.count(direction) == 0) {
-    uint64_t temp_value;
-    if (direction == Aws::Transfer::TransferDirection::UPLOAD) {
-      const char* upload_chunk_size = getenv("S3_MULTI_PART_UPLOAD_CHUNK_SIZE");
-      if (upload_chunk_size == nullptr ||
-          !absl::SimpleAtoi(upload_chunk_size, &temp_value))
-        temp_value = kS3MultiPartUploadChunkSize;
-    } else if (direction == Aws::Transfer::TransferDirection::DOWNLOAD) {
-      const char* download_chunk_size =
-          getenv("S3_MULTI_PART_DOWNLOAD_CHUNK_SIZE");
-      if (download_chunk_size == nullptr ||
-          !absl::SimpleAtoi(download_chunk_size, &temp_value))
-        temp_value = kS3MultiPartDownloadChunkSize;
-    }
+    uint64_t temp_value = GetMultiPartChunkSize(direction);
     s3_file->multi_part_chunk_sizes.emplace(direction, temp_value);
 
     Aws::Transfer::TransferManagerConfiguration config(s3_file->executor.get());
@@ -258,6 +388,9 @@ static void GetTransferManager(
     s3_file->transfer_managers.emplace(
         direction, Aws::Transfer::TransferManager::Create(config));
   }
+  if (chunk_size != nullptr)
+    *chunk_size = s3_file->multi_part_chunk_sizes[direction];
+  return s3_file->transfer_managers[direction];
 }
 
 // SECTION 1. Implementation for `TF_RandomAccessFile`
@@ -269,6 +402,7 @@ typedef struct S3File {
   std::shared_ptr<Aws::S3::S3Client> s3_client;
   std::shared_ptr<Aws::Transfer::TransferManager> transfer_manager;
   bool use_multi_part_download;
+  ReadHedger::Options hedging;
 } S3File;
 
 // AWS Streams destroy the buffer (buf) passed, so creating a new
@@ -335,6 +469,7 @@ static int64_t ReadS3TransferManager(S3File* s3_file, uint64_t offset, size_t n,
         1,
         "Retrying read of s3://%s/%s after failure. Current retry count: %u\n",
         s3_file->bucket.c_str(), s3_file->object.c_str(), retries);
+    GetMetrics()->AddRetry();
     s3_file->transfer_manager->RetryDownload(handle);
     handle->WaitUntilFinished();
   }
@@ -356,10 +491,17 @@ int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
   auto s3_file = static_cast<S3File*>(file->plugin_file);
   TF_VLog(1, "ReadFilefromS3 s3://%s/%s from %u for n: %u\n",
           s3_file->bucket.c_str(), s3_file->object.c_str(), offset, n);
-  if (s3_file->use_multi_part_download)
-    return ReadS3TransferManager(s3_file, offset, n, buffer, status);
-  else
-    return ReadS3Client(s3_file, offset, n, buffer, status);
+  // A hedged attempt may outlive the file, so it reads with a copy of it.
+  auto read_range = [s3_file = *s3_file, offset, n](char* buffer,
+                                                    TF_Status* status) mutable {
+    if (s3_file.use_multi_part_download)
+      return ReadS3TransferManager(&s3_file, offset, n, buffer, status);
+    return ReadS3Client(&s3_file, offset, n, buffer, status);
+  };
+  int64_t read =
+      GetReadHedger()->Read(s3_file->hedging, n, buffer, read_range, status);
+  if (read > 0) GetMetrics()->AddBytesRead(read);
+  return read;
 }
 
 }  // namespace tf_random_access_file
@@ -372,15 +514,23 @@ typedef struct S3File {
   Aws::String object;
   std::shared_ptr<Aws::S3::S3Client> s3_client;
   std::shared_ptr<Aws::Transfer::TransferManager> transfer_manager;
+  std::shared_ptr<ObjectLister> lister;
+  std::shared_ptr<StatCache> stat_cache;
+  std::string path;
   bool sync_needed;
   std::shared_ptr<Aws::Utils::TempFile> outfile;
   S3File(Aws::String bucket, Aws::String object,
          std::shared_ptr<Aws::S3::S3Client> s3_client,
-         std::shared_ptr<Aws::Transfer::TransferManager> transfer_manager)
+         std::shared_ptr<Aws::Transfer::TransferManager> transfer_manager,
+         std::shared_ptr<ObjectLister> lister,
+         std::shared_ptr<StatCache> stat_cache, std::string path)
       : bucket(bucket),
         object(object),
         s3_client(s3_client),
         transfer_manager(transfer_manager),
+        lister(lister),
+        stat_cache(stat_cache),
+        path(path),
         outfile(Aws::MakeShared<Aws::Utils::TempFile>(
             kS3FileSystemAllocationTag,
 #if defined(_MSC_VER)
@@ -458,14 +608,18 @@ void Sync(const TF_WritableFile* file, TF_Status* status) {
             "Retrying upload of s3://%s/%s after failure. Current retry count: "
             "%u\n",
             s3_file->bucket.c_str(), s3_file->object.c_str(), retries);
+    GetMetrics()->AddRetry();
     s3_file->transfer_manager->RetryUpload(s3_file->outfile, handle);
     handle->WaitUntilFinished();
   }
   if (handle->GetStatus() != Aws::Transfer::TransferStatus::COMPLETED)
     return TF_SetStatusFromAWSError(handle->GetLastError(), status);
+  GetMetrics()->AddBytesWritten(position);
   s3_file->outfile->clear();
   s3_file->outfile->seekp(position);
   s3_file->sync_needed = false;
+  s3_file->lister->Invalidate(s3_file->path);
+  s3_file->stat_cache->Invalidate(s3_file->path);
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -487,28 +641,8 @@ void Close(const TF_WritableFile* file, TF_Status* status) {
 
 // SECTION 3. Implementation for `TF_ReadOnlyMemoryRegion`
 // ----------------------------------------------------------------------------
-namespace tf_read_only_memory_region {
-typedef struct S3MemoryRegion {
-  std::unique_ptr<char[]> data;
-  uint64_t length;
-} S3MemoryRegion;
-
-void Cleanup(TF_ReadOnlyMemoryRegion* region) {
-  auto r = static_cast<S3MemoryRegion*>(region->plugin_memory_region);
-  delete r;
-}
-
-const void* Data(const TF_ReadOnlyMemoryRegion* region) {
-  auto r = static_cast<S3MemoryRegion*>(region->plugin_memory_region);
-  return reinterpret_cast<const void*>(r->data.get());
-}
-
-uint64_t Length(const TF_ReadOnlyMemoryRegion* region) {
-  auto r = static_cast<S3MemoryRegion*>(region->plugin_memory_region);
-  return r->length;
-}
-
-}  // namespace tf_read_only_memory_region
+// Memory regions are `MappedMemoryRegion`s, see
+// `NewReadOnlyMemoryRegionFromFile`.
 
 // SECTION 4. Implementation for `TF_Filesystem`, the actual filesystem
 // ----------------------------------------------------------------------------
@@ -518,10 +652,66 @@ S3File::S3File()
       executor(nullptr),
       transfer_managers(),
       multi_part_chunk_sizes(),
-      use_multi_part_download(true),
+      configuration_generation(0),
+      executor_pool_size(0),
+      retired_executors(),
       initialization_lock() {}
+
+// Lists one level of `dir` with a delimited `ListObjectsV2`.
+static void ListDirectory(S3File* s3_file, const std::string& dir,
+                          DirectoryListing* listing, TF_Status* status) {
+  TF_VLog(1, "ListDirectory: %s\n", dir.c_str());
+  Aws::String bucket, prefix;
+  ParseS3Path(dir.c_str(), true, &bucket, &prefix, status);
+  if (TF_GetCode(status) != TF_OK) return;
+  GetS3Client(s3_file);
+
+  Aws::S3::Model::ListObjectsV2Request list_objects_request;
+  list_objects_request.WithBucket(bucket)
+      .WithPrefix(prefix)
+      .WithMaxKeys(kS3GetChildrenMaxKeys)
+      .WithDelimiter("/");
+  list_objects_request.SetResponseStreamFactory(
+      []() { return Aws::New<Aws::StringStream>(kS3FileSystemAllocationTag); });
+
+  Aws::S3::Model::ListObjectsV2Result list_objects_result;
+  do {
+    auto list_objects_outcome =
+        s3_file->s3_client->ListObjectsV2(list_objects_request);
+    if (!list_objects_outcome.IsSuccess())
+      return TF_SetStatusFromAWSError(list_objects_outcome.GetError(), status);
+
+    list_objects_result = list_objects_outcome.GetResult();
+    for (const auto& object : list_objects_result.GetCommonPrefixes()) {
+      Aws::String s = object.GetPrefix();
+      s.erase(s.length() - 1);
+      Aws::String entry = s.substr(prefix.length());
+      if (entry.length() > 0) {
+        listing->directories.emplace_back(entry.c_str(), entry.length());
+      }
+    }
+    for (const auto& object : list_objects_result.GetContents()) {
+      Aws::String s = object.GetKey();
+      Aws::String entry = s.substr(prefix.length());
+      if (entry.length() > 0) {
+        listing->files.emplace_back(entry.c_str(), entry.length());
+      }
+    }
+    list_objects_request.SetContinuationToken(
+        list_objects_result.GetNextContinuationToken());
+  } while (list_objects_result.GetIsTruncated());
+  TF_SetStatus(status, TF_OK, "");
+}
+
 void Init(TF_Filesystem* filesystem, TF_Status* status) {
-  filesystem->plugin_filesystem = new S3File();
+  auto s3_file = new S3File();
+  s3_file->lister = std::make_shared<ObjectLister>(
+      [s3_file](const std::string& dir, DirectoryListing* listing,
+                TF_Status* status) {
+        ListDirectory(s3_file, dir, listing, status);
+      });
+  s3_file->stat_cache = std::make_shared<StatCache>("S3", GetMetrics());
+  filesystem->plugin_filesystem = s3_file;
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -538,11 +728,11 @@ void NewRandomAccessFile(const TF_Filesystem* filesystem, const char* path,
 
   auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
   GetS3Client(s3_file);
-  GetTransferManager(Aws::Transfer::TransferDirection::DOWNLOAD, s3_file);
+  auto transfer_manager =
+      GetTransferManager(Aws::Transfer::TransferDirection::DOWNLOAD, s3_file);
   file->plugin_file = new tf_random_access_file::S3File(
-      {bucket, object, s3_file->s3_client,
-       s3_file->transfer_managers[Aws::Transfer::TransferDirection::DOWNLOAD],
-       s3_file->use_multi_part_download});
+      {bucket, object, s3_file->s3_client, transfer_manager,
+       UseMultiPartDownload(), ReadHedger::GetOptions("S3")});
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -554,10 +744,11 @@ void NewWritableFile(const TF_Filesystem* filesystem, const char* path,
 
   auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
   GetS3Client(s3_file);
-  GetTransferManager(Aws::Transfer::TransferDirection::UPLOAD, s3_file);
+  auto transfer_manager =
+      GetTransferManager(Aws::Transfer::TransferDirection::UPLOAD, s3_file);
   file->plugin_file = new tf_writable_file::S3File(
-      bucket, object, s3_file->s3_client,
-      s3_file->transfer_managers[Aws::Transfer::TransferDirection::UPLOAD]);
+      bucket, object, s3_file->s3_client, transfer_manager, s3_file->lister,
+      s3_file->stat_cache, path);
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -569,7 +760,8 @@ void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
 
   auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
   GetS3Client(s3_file);
-  GetTransferManager(Aws::Transfer::TransferDirection::UPLOAD, s3_file);
+  auto transfer_manager =
+      GetTransferManager(Aws::Transfer::TransferDirection::UPLOAD, s3_file);
 
   // We need to delete `file->plugin_file` in case of errors. We set
   // `file->plugin_file` to `nullptr` in order to avoid segment fault when
@@ -582,8 +774,8 @@ void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
         }
       });
   writer->plugin_file = new tf_writable_file::S3File(
-      bucket, object, s3_file->s3_client,
-      s3_file->transfer_managers[Aws::Transfer::TransferDirection::UPLOAD]);
+      bucket, object, s3_file->s3_client, transfer_manager, s3_file->lister,
+      s3_file->stat_cache, path);
   TF_SetStatus(status, TF_OK, "");
 
   // Wraping inside a `std::unique_ptr` to prevent memory-leaking.
@@ -626,8 +818,8 @@ void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
   TF_SetStatus(status, TF_OK, "");
 }
 
-void Stat(const TF_Filesystem* filesystem, const char* path,
-          TF_FileStatistics* stats, TF_Status* status) {
+static void UncachedStat(const TF_Filesystem* filesystem, const char* path,
+                         TF_FileStatistics* stats, TF_Status* status) {
   TF_VLog(1, "Stat on path: %s\n", path);
   Aws::String bucket, object;
   ParseS3Path(path, true, &bucket, &object, status);
@@ -695,6 +887,18 @@ void Stat(const TF_Filesystem* filesystem, const char* path,
   TF_SetStatus(status, TF_OK, "");
 }
 
+void Stat(const TF_Filesystem* filesystem, const char* path,
+          TF_FileStatistics* stats, TF_Status* status) {
+  auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
+  s3_file->stat_cache->Stat(
+      path,
+      [filesystem](const std::string& path, TF_FileStatistics* stats,
+                   TF_Status* status) {
+        UncachedStat(filesystem, path.c_str(), stats, status);
+      },
+      stats, status);
+}
+
 void PathExists(const TF_Filesystem* filesystem, const char* path,
                 TF_Status* status) {
   TF_FileStatistics stats;
@@ -725,7 +929,10 @@ void NewReadOnlyMemoryRegionFromFile(const TF_Filesystem* filesystem,
   if (size == 0)
     return TF_SetStatus(status, TF_INVALID_ARGUMENT, "File is empty");
 
-  std::unique_ptr<char[]> data(new char[size]);
+  // The file is read straight into mapped memory, with the parallel part
+  // downloads of the transfer manager unless multi part download is disabled.
+  auto data = MappedMemoryRegion::Allocate(size, status);
+  if (TF_GetCode(status) != TF_OK) return;
   // Wraping inside a `std::unique_ptr` to prevent memory-leaking.
   std::unique_ptr<TF_RandomAccessFile, void (*)(TF_RandomAccessFile*)> reader(
       new TF_RandomAccessFile, [](TF_RandomAccessFile* file) {
@@ -740,13 +947,15 @@ void NewReadOnlyMemoryRegionFromFile(const TF_Filesystem* filesystem,
   reader->plugin_file = nullptr;
   NewRandomAccessFile(filesystem, path, reader.get(), status);
   if (TF_GetCode(status) != TF_OK) return;
-  auto read =
-      tf_random_access_file::Read(reader.get(), 0, size, data.get(), status);
+  // A whole file is never hedged, as a duplicate download would double it.
+  static_cast<tf_random_access_file::S3File*>(reader->plugin_file)
+      ->hedging.enabled = false;
+  tf_random_access_file::Read(reader.get(), 0, size, data->data(), status);
+  if (TF_GetCode(status) != TF_OK) return;
+  data->Seal(status);
   if (TF_GetCode(status) != TF_OK) return;
 
-  region->plugin_memory_region = new tf_read_only_memory_region::S3MemoryRegion(
-      {std::move(data), static_cast<uint64_t>(read)});
-  TF_SetStatus(status, TF_OK, "");
+  region->plugin_memory_region = data.release();
 }
 
 static void SimpleCopyFile(const Aws::String& source,
@@ -817,8 +1026,8 @@ static void MultiPartCopyCallback(
 static void MultiPartCopy(const Aws::String& source,
                           const Aws::String& bucket_dst,
                           const Aws::String& object_dst, const size_t num_parts,
-                          const uint64_t file_size, S3File* s3_file,
-                          TF_Status* status) {
+                          const uint64_t file_size, const uint64_t chunk_size,
+                          S3File* s3_file, TF_Status* status) {
   TF_VLog(1, "MultiPartCopy from %s to %s/%s\n", source.c_str(),
           bucket_dst.c_str(), object_dst.c_str());
   Aws::S3::Model::CreateMultipartUploadRequest create_multipart_upload_request;
@@ -843,9 +1052,6 @@ static void MultiPartCopy(const Aws::String& source,
   // Condition variable to be used with above mutex for synchronization.
   absl::CondVar multi_part_copy_cv;
 
-  auto chunk_size =
-      s3_file->multi_part_chunk_sizes[Aws::Transfer::TransferDirection::UPLOAD];
-
   TF_VLog(1, "Copying from %s in %u parts of size %u each\n", source.c_str(),
           num_parts, chunk_size);
   size_t retries = 0;
@@ -968,9 +1174,9 @@ void CopyFile(const TF_Filesystem* filesystem, const char* src, const char* dst,
   if (TF_GetCode(status) != TF_OK) return;
 
   auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
-  GetTransferManager(Aws::Transfer::TransferDirection::UPLOAD, s3_file);
-  auto chunk_size =
-      s3_file->multi_part_chunk_sizes[Aws::Transfer::TransferDirection::UPLOAD];
+  uint64_t chunk_size;
+  GetTransferManager(Aws::Transfer::TransferDirection::UPLOAD, s3_file,
+                     &chunk_size);
   size_t num_parts = 1;
   if (file_size > chunk_size) num_parts = ceil((float)file_size / chunk_size);
   if (num_parts == 1)
@@ -987,7 +1193,9 @@ void CopyFile(const TF_Filesystem* filesystem, const char* src, const char* dst,
             .c_str());
   else
     MultiPartCopy(copy_src, bucket_dst, object_dst, num_parts, file_size,
-                  s3_file, status);
+                  chunk_size, s3_file, status);
+  s3_file->lister->Invalidate(dst);
+  s3_file->stat_cache->Invalidate(dst);
 }
 
 void DeleteFile(const TF_Filesystem* filesystem, const char* path,
@@ -1003,12 +1211,129 @@ void DeleteFile(const TF_Filesystem* filesystem, const char* path,
   delete_object_request.WithBucket(bucket).WithKey(object);
   auto delete_object_outcome =
       s3_file->s3_client->DeleteObject(delete_object_request);
+  s3_file->lister->Invalidate(path);
+  s3_file->stat_cache->Invalidate(path);
   if (!delete_object_outcome.IsSuccess())
     TF_SetStatusFromAWSError(delete_object_outcome.GetError(), status);
   else
     TF_SetStatus(status, TF_OK, "");
 }
 
+void DeleteRecursively(const TF_Filesystem* filesystem, const char* path,
+                       uint64_t* undeleted_files, uint64_t* undeleted_dirs,
+                       TF_Status* status) {
+  TF_VLog(1, "DeleteRecursively: %s\n", path);
+  *undeleted_files = 0;
+  *undeleted_dirs = 0;
+  TF_FileStatistics stats;
+  Stat(filesystem, path, &stats, status);
+  if (TF_GetCode(status) != TF_OK) {
+    (*undeleted_dirs)++;
+    return;
+  }
+  if (!stats.is_directory) {
+    DeleteFile(filesystem, path, status);
+    if (TF_GetCode(status) != TF_OK) (*undeleted_files)++;
+    return;
+  }
+
+  Aws::String bucket, prefix;
+  ParseS3Path(path, true, &bucket, &prefix, status);
+  if (TF_GetCode(status) != TF_OK) return;
+  if (!prefix.empty() && prefix.back() != '/') prefix.push_back('/');
+  auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
+  GetS3Client(s3_file);
+  auto invalidate_caches = MakeCleanup([s3_file] {
+    s3_file->lister->Clear();
+    s3_file->stat_cache->Clear();
+  });
+
+  // Every page of the listing is deleted with one `DeleteObjects` request,
+  // issued asynchronously while the listing continues.
+  absl::Mutex delete_mutex;
+  absl::CondVar delete_cv;
+  int num_in_flight = 0;
+  auto count_undeleted = [&](const Aws::String& key) {
+    if (key.back() == '/')
+      (*undeleted_dirs)++;
+    else
+      (*undeleted_files)++;
+  };
+  auto callback =
+      [&](const Aws::S3::S3Client* client,
+          const Aws::S3::Model::DeleteObjectsRequest& request,
+          const Aws::S3::Model::DeleteObjectsOutcome& outcome,
+          const std::shared_ptr<const Aws::Client::AsyncCallerContext>&
+              context) {
+        absl::MutexLock l(&delete_mutex);
+        if (outcome.IsSuccess()) {
+          for (const auto& error : outcome.GetResult().GetErrors()) {
+            TF_Log(TF_WARNING, "Failed to delete s3://%s/%s: %s\n",
+                   bucket.c_str(), error.GetKey().c_str(),
+                   error.GetMessage().c_str());
+            count_undeleted(error.GetKey());
+          }
+        } else {
+          for (const auto& object : request.GetDelete().GetObjects())
+            count_undeleted(object.GetKey());
+          if (TF_GetCode(status) == TF_OK)
+            TF_SetStatusFromAWSError(outcome.GetError(), status);
+        }
+        num_in_flight--;
+        delete_cv.Signal();
+      };
+
+  Aws::S3::Model::ListObjectsV2Request list_objects_request;
+  list_objects_request.WithBucket(bucket).WithPrefix(prefix).WithMaxKeys(
+      kS3DeleteObjectsMaxKeys);
+  list_objects_request.SetResponseStreamFactory(
+      []() { return Aws::New<Aws::StringStream>(kS3FileSystemAllocationTag); });
+
+  Aws::S3::Model::ListObjectsV2Result list_objects_result;
+  do {
+    auto list_objects_outcome =
+        s3_file->s3_client->ListObjectsV2(list_objects_request);
+    if (!list_objects_outcome.IsSuccess()) {
+      absl::MutexLock l(&delete_mutex);
+      if (TF_GetCode(status) == TF_OK)
+        TF_SetStatusFromAWSError(list_objects_outcome.GetError(), status);
+      break;
+    }
+
+    list_objects_result = list_objects_outcome.GetResult();
+    Aws::S3::Model::Delete delete_objects;
+    for (const auto& object : list_objects_result.GetContents())
+      delete_objects.AddObjects(
+          Aws::S3::Model::ObjectIdentifier().WithKey(object.GetKey()));
+    if (!delete_objects.GetObjects().empty()) {
+      // Only errors are reported in quiet mode.
+      delete_objects.SetQuiet(true);
+      Aws::S3::Model::DeleteObjectsRequest delete_objects_request;
+      delete_objects_request.WithBucket(bucket).WithDelete(delete_objects);
+      {
+        absl::MutexLock l(&delete_mutex);
+        while (num_in_flight >= kS3DeleteObjectsMaxInFlight)
+          delete_cv.Wait(&delete_mutex);
+        num_in_flight++;
+      }
+      s3_file->s3_client->DeleteObjectsAsync(delete_objects_request, callback);
+    }
+    list_objects_request.SetContinuationToken(
+        list_objects_result.GetNextContinuationToken());
+  } while (list_objects_result.GetIsTruncated());
+
+  absl::MutexLock l(&delete_mutex);
+  while (num_in_flight > 0) delete_cv.Wait(&delete_mutex);
+  if (TF_GetCode(status) != TF_OK) return;
+  if (*undeleted_files > 0 || *undeleted_dirs > 0)
+    return TF_SetStatus(
+        status, TF_UNKNOWN,
+        absl::StrCat("Failed to delete ", *undeleted_files, " files and ",
+                     *undeleted_dirs, " directories under ", path)
+            .c_str());
+  TF_SetStatus(status, TF_OK, "");
+}
+
 void CreateDir(const TF_Filesystem* filesystem, const char* path,
                TF_Status* status) {
   TF_VLog(1, "CreateDir: %s\n", path);
@@ -1105,6 +1430,11 @@ void RenameFile(const TF_Filesystem* filesystem, const char* src,
 
   auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
   GetS3Client(s3_file);
+  // Some objects may be moved even if the rename fails halfway.
+  auto invalidate_caches = MakeCleanup([s3_file] {
+    s3_file->lister->Clear();
+    s3_file->stat_cache->Clear();
+  });
 
   if (object_src.back() == '/') {
     if (object_dst.back() != '/') {
@@ -1156,51 +1486,29 @@ void RenameFile(const TF_Filesystem* filesystem, const char* src,
 int GetChildren(const TF_Filesystem* filesystem, const char* path,
                 char*** entries, TF_Status* status) {
   TF_VLog(1, "GetChildren for path: %s\n", path);
-  Aws::String bucket, prefix;
-  ParseS3Path(path, true, &bucket, &prefix, status);
-  if (TF_GetCode(status) != TF_OK) return -1;
-  if (!prefix.empty() && prefix.back() != '/') prefix.push_back('/');
+  std::string dir = path;
+  if (dir.back() != '/') dir.push_back('/');
 
   auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
-  GetS3Client(s3_file);
-
-  Aws::S3::Model::ListObjectsV2Request list_objects_request;
-  list_objects_request.WithBucket(bucket)
-      .WithPrefix(prefix)
-      .WithMaxKeys(kS3GetChildrenMaxKeys)
-      .WithDelimiter("/");
-  list_objects_request.SetResponseStreamFactory(
-      []() { return Aws::New<Aws::StringStream>(kS3FileSystemAllocationTag); });
+  std::vector<std::string> result;
+  s3_file->lister->GetChildren(dir, &result, status);
+  if (TF_GetCode(status) != TF_OK) return -1;
 
-  Aws::S3::Model::ListObjectsV2Result list_objects_result;
-  std::vector<Aws::String> result;
-  do {
-    auto list_objects_outcome =
-        s3_file->s3_client->ListObjectsV2(list_objects_request);
-    if (!list_objects_outcome.IsSuccess()) {
-      TF_SetStatusFromAWSError(list_objects_outcome.GetError(), status);
-      return -1;
-    }
+  int num_entries = result.size();
+  *entries = static_cast<char**>(
+      plugin_memory_allocate(num_entries * sizeof((*entries)[0])));
+  for (int i = 0; i < num_entries; i++)
+    (*entries)[i] = strdup(result[i].c_str());
+  TF_SetStatus(status, TF_OK, "");
+  return num_entries;
+}
 
-    list_objects_result = list_objects_outcome.GetResult();
-    for (const auto& object : list_objects_result.GetCommonPrefixes()) {
-      Aws::String s = object.GetPrefix();
-      s.erase(s.length() - 1);
-      Aws::String entry = s.substr(prefix.length());
-      if (entry.length() > 0) {
-        result.push_back(entry);
-      }
-    }
-    for (const auto& object : list_objects_result.GetContents()) {
-      Aws::String s = object.GetKey();
-      Aws::String entry = s.substr(prefix.length());
-      if (entry.length() > 0) {
-        result.push_back(entry);
-      }
-    }
-    list_objects_request.SetContinuationToken(
-        list_objects_result.GetNextContinuationToken());
-  } while (list_objects_result.GetIsTruncated());
+int GetMatchingPaths(const TF_Filesystem* filesystem, const char* pattern,
+                     char*** entries, TF_Status* status) {
+  auto s3_file = static_cast<S3File*>(filesystem->plugin_filesystem);
+  std::vector<std::string> result;
+  s3_file->lister->GetMatchingPaths(pattern, &result, status);
+  if (TF_GetCode(status) != TF_OK) return -1;
 
   int num_entries = result.size();
   *entries = static_cast<char**>(
@@ -1215,6 +1523,16 @@ static char* TranslateName(const TF_Filesystem* filesystem, const char* uri) {
   return strdup(uri);
 }
 
+static void SetConfiguration(const TF_Filesystem* filesystem,
+                             const TF_Filesystem_Option* options,
+                             int num_options, TF_Status* status) {
+  std::vector<std::string> names = {
+      kExecutorPoolSizeOption, kMultiPartUploadChunkSizeOption,
+      kMultiPartDownloadChunkSizeOption, kDisableMultiPartDownloadOption};
+  for (const auto& name : ReadHedger::OptionNames("S3")) names.push_back(name);
+  SetFilesystemConfiguration("s3", names, options, num_options, status);
+}
+
 }  // namespace tf_s3_filesystem
 
 void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
@@ -1237,10 +1555,9 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
 
   ops->read_only_memory_region_ops = static_cast<TF_ReadOnlyMemoryRegionOps*>(
       plugin_memory_allocate(TF_READ_ONLY_MEMORY_REGION_OPS_SIZE));
-  ops->read_only_memory_region_ops->cleanup =
-      tf_read_only_memory_region::Cleanup;
-  ops->read_only_memory_region_ops->data = tf_read_only_memory_region::Data;
-  ops->read_only_memory_region_ops->length = tf_read_only_memory_region::Length;
+  ops->read_only_memory_region_ops->cleanup = MappedMemoryRegion::Cleanup;
+  ops->read_only_memory_region_ops->data = MappedMemoryRegion::Data;
+  ops->read_only_memory_region_ops->length = MappedMemoryRegion::Length;
 
   ops->filesystem_ops = static_cast<TF_FilesystemOps*>(
       plugin_memory_allocate(TF_FILESYSTEM_OPS_SIZE));
@@ -1258,13 +1575,17 @@ void ProvideFilesystemSupportFor(TF_FilesystemPluginOps* ops, const char* uri) {
       tf_s3_filesystem::RecursivelyCreateDir;
   ops->filesystem_ops->delete_file = tf_s3_filesystem::DeleteFile;
   ops->filesystem_ops->delete_dir = tf_s3_filesystem::DeleteDir;
+  ops->filesystem_ops->delete_recursively = tf_s3_filesystem::DeleteRecursively;
   ops->filesystem_ops->copy_file = tf_s3_filesystem::CopyFile;
   ops->filesystem_ops->rename_file = tf_s3_filesystem::RenameFile;
   ops->filesystem_ops->path_exists = tf_s3_filesystem::PathExists;
   ops->filesystem_ops->get_file_size = tf_s3_filesystem::GetFileSize;
   ops->filesystem_ops->stat = tf_s3_filesystem::Stat;
   ops->filesystem_ops->get_children = tf_s3_filesystem::GetChildren;
+  ops->filesystem_ops->get_matching_paths = tf_s3_filesystem::GetMatchingPaths;
   ops->filesystem_ops->translate_name = tf_s3_filesystem::TranslateName;
+  ops->filesystem_ops->set_filesystem_configuration =
+      tf_s3_filesystem::SetConfiguration;
 }
 
 }  // namespace s3
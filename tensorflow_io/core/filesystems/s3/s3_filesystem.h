@@ -18,6 +18,7 @@ limitations under the License.
 #include <aws/core/Aws.h>
 #include <aws/core/utils/StringUtils.h>
 #include <aws/core/utils/memory/stl/AWSMap.h>
+#include <aws/core/utils/memory/stl/AWSVector.h>
 #include <aws/core/utils/threading/Executor.h>
 #include <aws/s3/S3Client.h>
 #include <aws/transfer/TransferManager.h>
@@ -25,6 +26,8 @@ limitations under the License.
 #include "absl/synchronization/mutex.h"
 #include "tensorflow/c/experimental/filesystem/filesystem_interface.h"
 #include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/object_listing.h"
+#include "tensorflow_io/core/filesystems/stat_cache.h"
 
 namespace tensorflow {
 namespace io {
@@ -66,7 +69,18 @@ typedef struct S3File {
   // Sizes to split objects during multipart upload/download.
   Aws::UnorderedMap<Aws::Transfer::TransferDirection, uint64_t>
       multi_part_chunk_sizes;
-  bool use_multi_part_download;
+  // The configuration the executor and the transfer managers were created
+  // with, see `set_configuration`.
+  uint64_t configuration_generation;
+  int executor_pool_size;
+  // Executors replaced after a configuration change. Transfer managers of
+  // files opened before the change still run on them.
+  Aws::Vector<std::shared_ptr<Aws::Utils::Threading::PooledThreadExecutor>>
+      retired_executors;
+  // Caches directory listings and implements `GetMatchingPaths`.
+  std::shared_ptr<ObjectLister> lister;
+  // Caches `Stat` results, including missing paths.
+  std::shared_ptr<StatCache> stat_cache;
   absl::Mutex initialization_lock;
   S3File();
 } S3File;
@@ -91,12 +105,17 @@ void CreateDir(const TF_Filesystem* filesystem, const char* path,
                TF_Status* status);
 int GetChildren(const TF_Filesystem* filesystem, const char* path,
                 char*** entries, TF_Status* status);
+int GetMatchingPaths(const TF_Filesystem* filesystem, const char* pattern,
+                     char*** entries, TF_Status* status);
 void DeleteFile(const TF_Filesystem* filesystem, const char* path,
                 TF_Status* status);
 void Stat(const TF_Filesystem* filesystem, const char* path,
           TF_FileStatistics* stats, TF_Status* status);
 void DeleteDir(const TF_Filesystem* filesystem, const char* path,
                TF_Status* status);
+void DeleteRecursively(const TF_Filesystem* filesystem, const char* path,
+                       uint64_t* undeleted_files, uint64_t* undeleted_dirs,
+                       TF_Status* status);
 void CopyFile(const TF_Filesystem* filesystem, const char* src, const char* dst,
               TF_Status* status);
 void RenameFile(const TF_Filesystem* filesystem, const char* src,
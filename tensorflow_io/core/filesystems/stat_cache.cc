@@ -0,0 +1,115 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow_io/core/filesystems/stat_cache.h"
+
+#include <cstdlib>
+
+#include "absl/strings/numbers.h"
+#include "absl/strings/str_cat.h"
+
+namespace tensorflow {
+namespace io {
+namespace {
+
+constexpr char kStatCacheMaxAgeSuffix[] = "_STAT_CACHE_MAX_AGE";
+constexpr uint64_t kDefaultStatCacheMaxAge = 5;
+constexpr char kStatCacheMaxEntriesSuffix[] = "_STAT_CACHE_MAX_ENTRIES";
+constexpr uint64_t kDefaultStatCacheMaxEntries = 4096;
+constexpr char kStatCacheNegativeSuffix[] = "_STAT_CACHE_NEGATIVE";
+constexpr uint64_t kDefaultStatCacheNegative = 0;
+
+uint64_t GetEnvOrDefault(const std::string& name, uint64_t default_value) {
+  const char* value_str = std::getenv(name.c_str());
+  uint64_t value;
+  if (value_str && absl::SimpleAtoi(value_str, &value)) {
+    return value;
+  }
+  return default_value;
+}
+
+}  // namespace
+
+StatCache::StatCache(const std::string& env_prefix, FilesystemMetrics* metrics)
+    : StatCache(
+          GetEnvOrDefault(absl::StrCat(env_prefix, kStatCacheMaxAgeSuffix),
+                          kDefaultStatCacheMaxAge),
+          GetEnvOrDefault(absl::StrCat(env_prefix, kStatCacheMaxEntriesSuffix),
+                          kDefaultStatCacheMaxEntries),
+          GetEnvOrDefault(absl::StrCat(env_prefix, kStatCacheNegativeSuffix),
+                          kDefaultStatCacheNegative) != 0,
+          metrics) {}
+
+StatCache::StatCache(uint64_t max_age, size_t max_entries, bool cache_not_found,
+                     FilesystemMetrics* metrics)
+    : cache_(max_age, max_entries),
+      cache_not_found_(cache_not_found),
+      metrics_(metrics) {}
+
+void StatCache::Stat(const std::string& path, const StatFunc& stat_func,
+                     TF_FileStatistics* stats, TF_Status* status) {
+  Entry entry;
+  const bool hit = cache_.Lookup(path, &entry);
+  if (metrics_ != nullptr) {
+    if (hit) {
+      metrics_->AddCacheHit();
+    } else {
+      metrics_->AddCacheMiss();
+    }
+  }
+  if (!hit) {
+    uint64_t generation;
+    {
+      absl::MutexLock l(&mu_);
+      generation = generation_;
+    }
+    stat_func(path, &entry.stats, status);
+    entry.code = TF_GetCode(status);
+    if (entry.code != TF_OK &&
+        (entry.code != TF_NOT_FOUND || !cache_not_found_)) {
+      return;
+    }
+    entry.message = TF_Message(status);
+    absl::MutexLock l(&mu_);
+    if (generation_ == generation) cache_.Insert(path, entry);
+  }
+  *stats = entry.stats;
+  TF_SetStatus(status, entry.code, entry.message.c_str());
+}
+
+void StatCache::Invalidate(const std::string& path) {
+  absl::MutexLock l(&mu_);
+  generation_++;
+  const size_t scheme_end = path.find("://");
+  const size_t root_end = scheme_end == std::string::npos ? 0 : scheme_end + 3;
+  std::string dir = path;
+  while (dir.size() > root_end) {
+    while (dir.size() > root_end && dir.back() == '/') dir.pop_back();
+    cache_.Delete(dir);
+    cache_.Delete(absl::StrCat(dir, "/"));
+    const size_t parent_end = dir.rfind('/');
+    if (parent_end == std::string::npos || parent_end < root_end) break;
+    dir.resize(parent_end);
+  }
+}
+
+void StatCache::Clear() {
+  absl::MutexLock l(&mu_);
+  generation_++;
+  cache_.Clear();
+}
+
+}  // namespace io
+}  // namespace tensorflow
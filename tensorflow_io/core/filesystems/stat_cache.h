@@ -0,0 +1,90 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_IO_CORE_FILESYSTEMS_STAT_CACHE_H_
+#define TENSORFLOW_IO_CORE_FILESYSTEMS_STAT_CACHE_H_
+
+#include <cstdint>
+#include <functional>
+#include <string>
+
+#include "absl/base/thread_annotations.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/experimental/filesystem/filesystem_interface.h"
+#include "tensorflow/c/tf_status.h"
+#include "tensorflow_io/core/filesystems/expiring_lru_cache.h"
+#include "tensorflow_io/core/filesystems/filesystem_metrics.h"
+
+namespace tensorflow {
+namespace io {
+
+/// \brief An expiring cache of `Stat` results keyed by path, shared by the
+/// object store filesystems.
+///
+/// Successful results are cached, and `TF_NOT_FOUND` only if negative
+/// caching is enabled, as a path created by another writer would look missing
+/// until the entry expires. Other errors are never cached. A result is not
+/// cached if the cache was invalidated while it was being looked up.
+///
+/// This class is thread safe.
+class StatCache {
+ public:
+  typedef std::function<void(const std::string& path, TF_FileStatistics* stats,
+                             TF_Status* status)>
+      StatFunc;
+
+  /// Reads the max age (in seconds, 0 disables the cache), the max number
+  /// of entries and whether to cache `TF_NOT_FOUND` (0 or 1, off by default)
+  /// from `<env_prefix>_STAT_CACHE_MAX_AGE`,
+  /// `<env_prefix>_STAT_CACHE_MAX_ENTRIES` and
+  /// `<env_prefix>_STAT_CACHE_NEGATIVE`, e.g. `S3_STAT_CACHE_MAX_AGE`.
+  /// Hits and misses are counted in `metrics` if not null.
+  explicit StatCache(const std::string& env_prefix,
+                     FilesystemMetrics* metrics = nullptr);
+
+  StatCache(uint64_t max_age, size_t max_entries, bool cache_not_found,
+            FilesystemMetrics* metrics = nullptr);
+
+  /// Returns the cached result for `path`, or calls `stat_func` on a miss.
+  void Stat(const std::string& path, const StatFunc& stat_func,
+            TF_FileStatistics* stats, TF_Status* status);
+
+  /// Drops `path` and all of its parent directories, as creating or deleting
+  /// an object also creates or deletes its implicit parents.
+  void Invalidate(const std::string& path);
+
+  /// Drops all entries, e.g. after a rename or a recursive delete.
+  void Clear();
+
+ private:
+  struct Entry {
+    TF_Code code;
+    std::string message;
+    TF_FileStatistics stats;
+  };
+
+  ExpiringLRUCache<Entry> cache_;
+  const bool cache_not_found_;
+  FilesystemMetrics* metrics_;  // not owned
+  // Incremented by every invalidation, so that a lookup started before it
+  // does not insert its stale result afterwards.
+  absl::Mutex mu_;
+  uint64_t generation_ ABSL_GUARDED_BY(mu_) = 0;
+};
+
+}  // namespace io
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_IO_CORE_FILESYSTEMS_STAT_CACHE_H_
@@ -42,6 +42,12 @@ class ArrowRandomAccessFile : public ::arrow::io::RandomAccessFile {
     return arrow::Status::NotImplemented("Seek");
   }
   arrow::Result<int64_t> Read(int64_t nbytes, void* out) override {
+    std::shared_ptr<arrow::Buffer> prefetched = Prefetched(position_, nbytes);
+    if (prefetched != nullptr) {
+      memcpy(out, prefetched->data(), nbytes);
+      position_ += nbytes;
+      return nbytes;
+    }
     StringPiece result;
     Status status = file_->Read(position_, nbytes, &result, (char*)out);
     if (!(status.ok() || errors::IsOutOfRange(status))) {
@@ -66,6 +72,11 @@ class ArrowRandomAccessFile : public ::arrow::io::RandomAccessFile {
   bool supports_zero_copy() const override { return false; }
   arrow::Result<int64_t> ReadAt(int64_t position, int64_t nbytes,
                                 void* out) override {
+    std::shared_ptr<arrow::Buffer> prefetched = Prefetched(position, nbytes);
+    if (prefetched != nullptr) {
+      memcpy(out, prefetched->data(), nbytes);
+      return nbytes;
+    }
     StringPiece result;
     Status status = file_->Read(position, nbytes, &result, (char*)out);
     if (!(status.ok() || errors::IsOutOfRange(status))) {
@@ -75,6 +86,10 @@ class ArrowRandomAccessFile : public ::arrow::io::RandomAccessFile {
   }
   arrow::Result<std::shared_ptr<arrow::Buffer>> ReadAt(
       int64_t position, int64_t nbytes) override {
+    std::shared_ptr<arrow::Buffer> prefetched = Prefetched(position, nbytes);
+    if (prefetched != nullptr) {
+      return prefetched;
+    }
     string buffer;
     buffer.resize(nbytes);
     StringPiece result;
@@ -85,11 +100,51 @@ class ArrowRandomAccessFile : public ::arrow::io::RandomAccessFile {
     buffer.resize(result.size());
     return arrow::Buffer::FromString(std::move(buffer));
   }
+  // Fetches `ranges` with a single vectored read (see ReadRanges) and keeps
+  // them until the next call, so that the following reads of those ranges do
+  // not go to the file again.
+  arrow::Status WillNeed(
+      const std::vector<arrow::io::ReadRange>& ranges) override {
+    std::vector<FileReadRange> file_ranges;
+    for (const auto& range : ranges) {
+      file_ranges.push_back(FileReadRange{static_cast<uint64>(range.offset),
+                                          static_cast<size_t>(range.length)});
+    }
+    std::vector<string> results;
+    Status status = ReadRanges(file_, file_ranges, &results);
+    if (!status.ok()) {
+      return arrow::Status::IOError(status.message());
+    }
+    mutex_lock l(mu_);
+    prefetched_.clear();
+    for (size_t i = 0; i < ranges.size(); i++) {
+      prefetched_.emplace_back(
+          ranges[i].offset, arrow::Buffer::FromString(std::move(results[i])));
+    }
+    return arrow::Status::OK();
+  }
 
  private:
+  // Returns the prefetched bytes [position, position + nbytes), or nullptr if
+  // they were not prefetched by WillNeed.
+  std::shared_ptr<arrow::Buffer> Prefetched(int64_t position, int64_t nbytes) {
+    mutex_lock l(mu_);
+    for (const auto& prefetched : prefetched_) {
+      if (position >= prefetched.first &&
+          position + nbytes <= prefetched.first + prefetched.second->size()) {
+        return arrow::SliceBuffer(prefetched.second,
+                                  position - prefetched.first, nbytes);
+      }
+    }
+    return nullptr;
+  }
+
   tensorflow::RandomAccessFile* file_;
   int64 size_;
   int64 position_;
+  mutex mu_;
+  std::vector<std::pair<int64, std::shared_ptr<arrow::Buffer>>> prefetched_
+      TF_GUARDED_BY(mu_);
 };
 
 }  // namespace data
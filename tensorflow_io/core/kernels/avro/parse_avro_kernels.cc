@@ -133,20 +133,23 @@ std::map<string, Tensor> CreateTensorDefaults(const AvroParserConfig& config) {
   return defaults;
 }
 
+// Reads the datums of serialized[start, end), each after its first
+// `skip_bytes` bytes, e.g. the Schema Registry wire-format prefix.
 class StringDatumRangeReader {
  public:
   StringDatumRangeReader(const gtl::ArraySlice<tstring>& serialized,
-                         size_t start, size_t end)
+                         size_t start, size_t end, size_t skip_bytes)
       : serialized_(serialized),
         current_(start),
         end_(end),
+        skip_bytes_(skip_bytes),
         decoder_(avro::binaryDecoder()) {}
 
   bool read(avro::GenericDatum& datum) {
     if (current_ < end_) {
-      std::unique_ptr<avro::InputStream> in =
-          avro::memoryInputStream((const uint8_t*)serialized_[current_].data(),
-                                  serialized_[current_].length());
+      std::unique_ptr<avro::InputStream> in = avro::memoryInputStream(
+          (const uint8_t*)serialized_[current_].data() + skip_bytes_,
+          serialized_[current_].length() - skip_bytes_);
       decoder_->init(*in);
       avro::GenericReader::read(*decoder_, datum);
       current_++;
@@ -159,6 +162,7 @@ class StringDatumRangeReader {
   const gtl::ArraySlice<tstring>& serialized_;
   size_t current_;
   const size_t end_;
+  const size_t skip_bytes_;
   avro::DecoderPtr decoder_;
 };
 
@@ -169,7 +173,7 @@ class StringDatumRangeReader {
 Status ParseAvro(const AvroParserConfig& config,
                  const AvroParserTree& parser_tree,
                  const avro::ValidSchema& reader_schema,
-                 const gtl::ArraySlice<tstring>& serialized,
+                 const gtl::ArraySlice<tstring>& serialized, size_t skip_bytes,
                  thread::ThreadPool* thread_pool, AvroResult* result) {
   DCHECK(result != nullptr);
   using clock = std::chrono::system_clock;
@@ -252,7 +256,7 @@ Status ParseAvro(const AvroParserConfig& config,
   auto ProcessMiniBatch = [&](size_t minibatch) {
     size_t start = first_of_minibatch(minibatch);
     size_t end = first_of_minibatch(minibatch + 1);
-    StringDatumRangeReader range_reader(serialized, start, end);
+    StringDatumRangeReader range_reader(serialized, start, end, skip_bytes);
     auto read_value = [&](avro::GenericDatum& d) {
       return range_reader.read(d);
     };
@@ -411,6 +415,7 @@ class ParseAvroOp : public OpKernel {
     OP_REQUIRES_OK(ctx, ctx->GetAttr("dense_shapes", &dense_shapes_));
     OP_REQUIRES_OK(
         ctx, ctx->GetAttr("avro_num_minibatches", &avro_num_minibatches_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("skip_bytes", &skip_bytes_));
 
     OP_REQUIRES_OK(ctx, ctx->GetAttr("sparse_keys", &sparse_keys_));
     OP_REQUIRES_OK(ctx, ctx->GetAttr("dense_keys", &dense_keys_));
@@ -487,10 +492,17 @@ class ParseAvroOp : public OpKernel {
 
     auto serialized_t = serialized->flat<tstring>();
     gtl::ArraySlice<tstring> slice(serialized_t.data(), serialized_t.size());
+    for (size_t i = 0; i < slice.size(); ++i) {
+      OP_REQUIRES(
+          ctx, slice[i].size() >= skip_bytes_,
+          errors::InvalidArgument("serialized[", i, "] has ", slice[i].size(),
+                                  " bytes, expected at least ", skip_bytes_,
+                                  " bytes to skip"));
+    }
 
     AvroResult result;
     OP_REQUIRES_OK(
-        ctx, ParseAvro(config, parser_tree_, reader_schema_, slice,
+        ctx, ParseAvro(config, parser_tree_, reader_schema_, slice, skip_bytes_,
                        ctx->device()->tensorflow_cpu_worker_threads()->workers,
                        &result));
 
@@ -524,6 +536,7 @@ class ParseAvroOp : public OpKernel {
   size_t num_dense_;
   size_t num_sparse_;
   int64 avro_num_minibatches_;
+  int64 skip_bytes_;
 
  private:
   std::vector<std::pair<string, DataType>> CreateKeysAndTypes() {
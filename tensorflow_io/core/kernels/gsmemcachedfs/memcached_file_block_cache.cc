@@ -353,7 +353,7 @@ MemcachedFileBlockCache::MemcachedFileBlockCache(
     const std::vector<string>& options, BlockFetcher block_fetcher, Env* env)
     : block_size_(block_size),
       max_bytes_(max_bytes),
-      use_multi_get_(false),
+      use_multi_get_(true),
       block_fetcher_(std::move(block_fetcher)),
       env_(env),
       servers_(servers),
@@ -410,6 +410,7 @@ MemcachedFileBlockCache::~MemcachedFileBlockCache() {
     mutex_lock lock(throttler_mu_);
     stop_setter_thread_ = true;
   }
+  cache_buffer_cv_.notify_all();
   thread_.reset();
 }
 
@@ -452,11 +453,17 @@ Status MemcachedFileBlockCache::ConfigureMemcachedServers(
   std::copy(options.begin(), options.end(),
             inserter(unused_opts, unused_opts.begin()));
 
+  // Multi-get is on by default, "MGET" is still accepted for compatibility.
   auto opt = unused_opts.find("MGET");
   if (opt != unused_opts.end()) {
     unused_opts.erase(opt);
-    use_multi_get_ = true;
-    VLOG(1) << "Turned on use of multi-get (mget)";
+  }
+
+  opt = unused_opts.find("NO_MGET");
+  if (opt != unused_opts.end()) {
+    unused_opts.erase(opt);
+    use_multi_get_ = false;
+    VLOG(1) << "Turned off use of multi-get (mget)";
   }
 
   opt = unused_opts.find("NO_BLOCK");
@@ -575,7 +582,8 @@ Status MemcachedFileBlockCache::Read(const string& filename, size_t offset,
   }
 
   size_t total_bytes_transferred = 0;
-  bool multi_get = use_multi_get_ && !mini_read;
+  // Reads spanning several blocks look all of them up in one round trip.
+  bool multi_get = use_multi_get_ && !mini_read && keys.size() > 1;
 
   if (multi_get) {
     int64 client_index = 0;
@@ -760,18 +768,20 @@ int64 MemcachedFileBlockCache::AddToCacheBuffer(const string& memc_key,
     auto page = absl::make_unique<std::vector<char>>();
     page->assign(data->begin(), data->end());
     cache_buffer_map_.emplace(memc_key, page.release());
+    cache_buffer_cv_.notify_one();
   }
   return cache_buffer_keys_.size();
 }
 
 bool MemcachedFileBlockCache::ProcessCacheBuffer() {
   mutex_lock lock(throttler_mu_);
+  // Sleep until a reader queues a block rather than spinning on the mutex.
+  while (!stop_setter_thread_ && cache_buffer_keys_.empty()) {
+    cache_buffer_cv_.wait(lock);
+  }
   if (stop_setter_thread_) {
     return false;
   }
-  if (cache_buffer_keys_.empty()) {
-    return true;
-  }
 
   const string memc_key = cache_buffer_keys_.front();
   cache_buffer_keys_.pop_front();
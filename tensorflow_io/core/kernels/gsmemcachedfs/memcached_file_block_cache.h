@@ -32,13 +32,15 @@ limitations under the License.
 
 namespace tensorflow {
 
+// A small local cache of whole blocks, evicted in least recently used order.
 class MiniBlockCache {
  public:
   explicit MiniBlockCache(size_t max_size) : max_size_(max_size) {
     VLOG(1) << "MiniBlockCache max_size = " << max_size_;
   }
 
-  // Add block to the cache.
+  // Add block to the cache, evicting the least recently used blocks if the
+  // cache grows beyond `max_size_`.
   void Add(std::string key, size_t block_size, char* data)
       ABSL_LOCKS_EXCLUDED(mu_) {
     if (max_size_ == 0) {
@@ -47,20 +49,28 @@ class MiniBlockCache {
     mutex_lock lock(mu_);
     VLOG(3) << "MiniBlockCache Add: key = " << key
             << ", block_size = " << block_size
-            << ", to current_size = " << keys_fifo_.size();
-    if (!map_.contains(key)) {
-      if (max_size_ < (size_ + block_size) && !keys_fifo_.empty()) {
-        string pop_key = keys_fifo_.front();
-        VLOG(3) << "MiniBlockCache pop key = " << pop_key;
-        size_ -= map_[pop_key]->size();
-        map_.erase(pop_key);
-        keys_fifo_.pop();
-      }
-      keys_fifo_.push(key);
-      map_[key] = absl::make_unique<std::vector<char>>();
+            << ", to current_size = " << lru_list_.size();
+    auto entry = map_.find(key);
+    if (entry == map_.end()) {
+      lru_list_.push_front(key);
+      entry = map_.emplace(key, absl::make_unique<Block>()).first;
+      entry->second->lru_iterator = lru_list_.begin();
+    } else {
+      size_ -= entry->second->data.size();
+      lru_list_.splice(lru_list_.begin(), lru_list_,
+                       entry->second->lru_iterator);
+    }
+    entry->second->data.assign(data, data + block_size);
+    size_ += block_size;
+    // Never evict the block that was just added.
+    while (size_ > max_size_ && lru_list_.size() > 1) {
+      const string& pop_key = lru_list_.back();
+      VLOG(3) << "MiniBlockCache pop key = " << pop_key;
+      auto pop = map_.find(pop_key);
+      size_ -= pop->second->data.size();
+      map_.erase(pop);
+      lru_list_.pop_back();
     }
-    map_[key]->assign(data, data + block_size);
-    size_ += map_[key]->size();
   }
 
   // Peek map to check if the key is contained in it.
@@ -72,7 +82,7 @@ class MiniBlockCache {
     return map_.contains(key);
   }
 
-  // Get block from cache if it exists.
+  // Get block from cache if it exists, marking it as most recently used.
   bool Get(std::string key, int64 offset, size_t n, char* buffer,
            size_t* bytes_copied) ABSL_LOCKS_EXCLUDED(mu_) {
     if (max_size_ == 0) {
@@ -80,7 +90,8 @@ class MiniBlockCache {
       return false;
     }
     mutex_lock lock(mu_);
-    if (!map_.contains(key) || offset > map_[key]->size()) {
+    auto entry = map_.find(key);
+    if (entry == map_.end() || offset > entry->second->data.size()) {
       VLOG(3) << "MiniBlockCache MISS Get: key = " << key
               << ", offset = " << offset << ", n = " << n;
       *bytes_copied = 0;
@@ -88,13 +99,15 @@ class MiniBlockCache {
     }
     VLOG(3) << "MiniBlockCache HIT Get: key = " << key
             << ", offset = " << offset << ", n = " << n;
+    const std::vector<char>& data = entry->second->data;
+    lru_list_.splice(lru_list_.begin(), lru_list_, entry->second->lru_iterator);
 
     int64 bytes_to_copy = n;
-    if (offset + n > map_[key]->size()) {
-      bytes_to_copy = map_[key]->size() - offset;
+    if (offset + n > data.size()) {
+      bytes_to_copy = data.size() - offset;
     }
 
-    memcpy(buffer, map_[key]->data() + offset, bytes_to_copy);
+    memcpy(buffer, data.data() + offset, bytes_to_copy);
     *bytes_copied = bytes_to_copy;
     return true;
   }
@@ -122,9 +135,15 @@ class MiniBlockCache {
  private:
   const size_t max_size_;
   mutable mutex mu_;
+  struct Block {
+    std::vector<char> data;
+    // Position of the block's key in `lru_list_`.
+    std::list<string>::iterator lru_iterator;
+  };
   size_t size_ ABSL_GUARDED_BY(mu_) = 0;
-  std::queue<string> keys_fifo_ ABSL_GUARDED_BY(mu_);
-  absl::flat_hash_map<std::string, std::unique_ptr<std::vector<char>>> map_
+  // Keys ordered from most to least recently used.
+  std::list<string> lru_list_ ABSL_GUARDED_BY(mu_);
+  absl::flat_hash_map<std::string, std::unique_ptr<Block>> map_
       ABSL_GUARDED_BY(mu_);
   mutable mutex fetcher_mu_;
   absl::flat_hash_map<std::string, std::shared_ptr<condition_variable>>
@@ -325,7 +344,7 @@ class MemcachedFileBlockCache : public tsl::FileBlockCache {
   size_t block_size_;
   // The maximum number of bytes (sum of block sizes) allowed in the LRU cache.
   size_t max_bytes_;
-  // Whether to fetch keys with multi-get or not.
+  // Whether to fetch the blocks of multi-block reads with a single multi-get.
   bool use_multi_get_;
   // The callback to read a block from the underlying filesystem.
   const BlockFetcher block_fetcher_;
@@ -358,6 +377,8 @@ class MemcachedFileBlockCache : public tsl::FileBlockCache {
   // Map of keys in the queue to the block data to store.
   std::map<string, std::unique_ptr<std::vector<char>>> cache_buffer_map_
       ABSL_GUARDED_BY(throttler_mu_);
+  // Signalled when a block is queued or the setter thread should stop.
+  condition_variable cache_buffer_cv_;
   // Flags that thread_ should stop sending set requests. This is used during
   // destruction, to avoid destroying the thread and/or its resources while
   // it is still doing work. We can Join the thread after setting this to
@@ -16,6 +16,12 @@ limitations under the License.
 #ifndef TENSORFLOW_IO_CORE_KERNELS_STREAM_H_
 #define TENSORFLOW_IO_CORE_KERNELS_STREAM_H_
 
+#include <algorithm>
+#include <numeric>
+#include <vector>
+
+#include "tensorflow/core/lib/core/blocking_counter.h"
+#include "tensorflow/core/lib/core/threadpool.h"
 #include "tensorflow/core/lib/io/inputstream_interface.h"
 #include "tensorflow/core/lib/io/random_inputstream.h"
 
@@ -74,6 +80,99 @@ class SizedRandomAccessFile : public tensorflow::RandomAccessFile {
   Status size_status_;
 };
 
+// A byte range of a file requested through ReadRanges.
+struct FileReadRange {
+  uint64 offset;
+  size_t length;
+};
+
+// Ranges less than this many bytes apart are fetched with a single read.
+constexpr size_t kReadRangesHoleSizeLimit = 8 * 1024;
+// Merged ranges are not grown beyond this size.
+constexpr size_t kReadRangesRangeSizeLimit = 32 * 1024 * 1024;
+// Maximum number of merged ranges read concurrently.
+constexpr int kReadRangesThreads = 16;
+
+// Reads all `ranges` of `file` at once (a vectored read). Ranges closer than
+// `hole_size_limit` are merged into reads of at most `range_size_limit` bytes,
+// the merged reads are issued concurrently, and the bytes of `ranges[i]` are
+// scattered back into `(*results)[i]`. As with `Read`, a range that extends
+// past the end of the file yields fewer bytes.
+inline Status ReadRanges(const tensorflow::RandomAccessFile* file,
+                         const std::vector<FileReadRange>& ranges,
+                         std::vector<string>* results,
+                         size_t hole_size_limit = kReadRangesHoleSizeLimit,
+                         size_t range_size_limit = kReadRangesRangeSizeLimit) {
+  results->clear();
+  results->resize(ranges.size());
+
+  std::vector<size_t> order(ranges.size());
+  std::iota(order.begin(), order.end(), 0);
+  std::sort(order.begin(), order.end(), [&ranges](size_t a, size_t b) {
+    return ranges[a].offset < ranges[b].offset;
+  });
+  struct MergedRange {
+    uint64 offset;
+    uint64 end;
+    std::vector<size_t> members;
+  };
+  std::vector<MergedRange> merged;
+  for (size_t index : order) {
+    const FileReadRange& range = ranges[index];
+    if (range.length == 0) continue;
+    const uint64 end = range.offset + range.length;
+    if (!merged.empty() &&
+        range.offset <= merged.back().end + hole_size_limit &&
+        std::max(end, merged.back().end) - merged.back().offset <=
+            range_size_limit) {
+      merged.back().end = std::max(end, merged.back().end);
+      merged.back().members.push_back(index);
+      continue;
+    }
+    merged.push_back(MergedRange{range.offset, end, {index}});
+  }
+
+  std::vector<Status> statuses(merged.size());
+  auto read_merged = [&](size_t i) {
+    const MergedRange& range = merged[i];
+    string scratch;
+    scratch.resize(range.end - range.offset);
+    StringPiece result;
+    Status status =
+        file->Read(range.offset, scratch.size(), &result, &scratch[0]);
+    if (!(status.ok() || errors::IsOutOfRange(status))) {
+      statuses[i] = status;
+      return;
+    }
+    for (size_t member : range.members) {
+      const size_t start = ranges[member].offset - range.offset;
+      const size_t available =
+          result.size() > start
+              ? std::min(ranges[member].length, result.size() - start)
+              : 0;
+      (*results)[member].assign(result.data() + start, available);
+    }
+  };
+  if (merged.size() == 1) {
+    read_merged(0);
+  } else if (merged.size() > 1) {
+    static thread::ThreadPool* pool = new thread::ThreadPool(
+        Env::Default(), "tfio_read_ranges", kReadRangesThreads);
+    BlockingCounter counter(merged.size());
+    for (size_t i = 0; i < merged.size(); i++) {
+      pool->Schedule([&, i]() {
+        read_merged(i);
+        counter.DecrementCount();
+      });
+    }
+    counter.Wait();
+  }
+  for (const Status& status : statuses) {
+    TF_RETURN_IF_ERROR(status);
+  }
+  return OkStatus();
+}
+
 }  // namespace data
 }  // namespace tensorflow
 
@@ -13,6 +13,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 ==============================================================================*/
 
+#include <algorithm>
+#include <atomic>
+#include <deque>
+#include <functional>
+#include <map>
+#include <set>
+
+#include "rdkafka.h"
 #include "rdkafkacpp.h"
 #include "tensorflow/core/framework/resource_mgr.h"
 #include "tensorflow/core/framework/resource_op_kernel.h"
@@ -20,6 +28,22 @@ limitations under the License.
 namespace tensorflow {
 namespace io {
 namespace {
+
+// Messages consumed through the librdkafka C API, which the C++ API does not
+// offer batch consumption from.
+struct KafkaMessageDeleter {
+  void operator()(rd_kafka_message_t* message) const {
+    rd_kafka_message_destroy(message);
+  }
+};
+typedef std::unique_ptr<rd_kafka_message_t, KafkaMessageDeleter> KafkaMessage;
+
+struct KafkaQueueDeleter {
+  void operator()(rd_kafka_queue_t* queue) const {
+    rd_kafka_queue_destroy(queue);
+  }
+};
+
 class KafkaEventCb : public RdKafka::EventCb {
  public:
   KafkaEventCb() : run_(true) {}
@@ -61,6 +85,8 @@ class KafkaReadableResource : public ResourceBase {
  public:
   KafkaReadableResource(Env* env) : env_(env) {}
   virtual ~KafkaReadableResource() {
+    pending_.clear();
+    queue_.reset(nullptr);
     if (consumer_.get()) {
       consumer_->unassign();
       consumer_->close();
@@ -161,6 +187,8 @@ class KafkaReadableResource : public ResourceBase {
       return errors::Internal("failed to assign partition: ",
                               RdKafka::err2str(err));
     }
+    position_ = offset >= 0 ? offset : kUnknownPosition;
+    queue_.reset(rd_kafka_queue_get_consumer(consumer_->c_ptr()));
 
     return OkStatus();
   }
@@ -169,6 +197,8 @@ class KafkaReadableResource : public ResourceBase {
                                    Tensor** key)>
                   allocate_func) {
     mutex_lock l(mu_);
+    // The consumer moves past the position of `Read`.
+    position_ = kUnknownPosition;
     int64 total = 1024;
     std::vector<string> message_value, key_value;
     message_value.reserve(total);
@@ -237,49 +267,73 @@ class KafkaReadableResource : public ResourceBase {
           tail_offset + stop_offset - RdKafka::Consumer::OffsetTail(0);
     }
 
-    std::vector<string> message_value, key_value;
-
-    subscription_->set_offset(start);
-    RdKafka::ErrorCode err = consumer_->seek((*subscription_), timeout_);
-    if (err != RdKafka::ERR_NO_ERROR) {
-      return errors::Internal("failed to seek partition: ",
-                              RdKafka::err2str(err));
-    }
-    LOG(INFO) << "Kafka stream starts with current offset: "
-              << subscription_->offset();
-    int64 index = start;
-    std::unique_ptr<RdKafka::Message> message;
-    while (consumer_.get() != nullptr && index + 1 < stop_offset) {
-      if (!kafka_event_cb_.run()) {
-        return errors::Internal("failed to consume due to all brokers down");
+    // Chunks read in order continue where the consumer already is, so only
+    // random access seeks.
+    if (position_ == kUnknownPosition || start != position_) {
+      pending_.clear();
+      subscription_->set_offset(start);
+      RdKafka::ErrorCode err = consumer_->seek((*subscription_), timeout_);
+      if (err != RdKafka::ERR_NO_ERROR) {
+        position_ = kUnknownPosition;
+        return errors::Internal("failed to seek partition: ",
+                                RdKafka::err2str(err));
       }
-      message.reset(consumer_->consume(timeout_));
-      if (message->err() == RdKafka::ERR_NO_ERROR) {
-        // Produce the line as output.
-        message_value.emplace_back(string(
-            static_cast<const char*>(message->payload()), message->len()));
-        key_value.emplace_back(
-            (message->key() != nullptr) ? string(*message->key()) : "");
-        index = message->offset();
+      LOG(INFO) << "Kafka stream starts with current offset: "
+                << subscription_->offset();
+      position_ = start;
+    }
+
+    std::vector<KafkaMessage> messages;
+    messages.reserve(std::max<int64>(
+        0, std::min<int64>(stop_offset - start, kMaxConsumeBatchSize)));
+    while (position_ < stop_offset) {
+      if (pending_.empty()) {
+        TF_RETURN_IF_ERROR(ConsumeBatch(stop_offset - position_));
         continue;
-      } else if (message->err() == RdKafka::ERR__PARTITION_EOF) {
-        LOG(ERROR) << "EOF Message: " << message->errstr();
+      }
+      KafkaMessage message = std::move(pending_.front());
+      pending_.pop_front();
+      if (message->err == RD_KAFKA_RESP_ERR_NO_ERROR) {
+        if (message->offset >= stop_offset) {
+          // Offsets may have gaps, e.g. after compaction, so the message
+          // starts the next chunk instead.
+          pending_.push_front(std::move(message));
+          position_ = stop_offset;
+          break;
+        }
+        position_ = message->offset + 1;
+        messages.emplace_back(std::move(message));
+      } else if (message->err == RD_KAFKA_RESP_ERR__PARTITION_EOF) {
+        LOG(ERROR) << "EOF Message: " << rd_kafka_message_errstr(message.get());
+        // EOF is only reported again after a seek.
+        position_ = kUnknownPosition;
         break;
-      } else if (message->err() == RdKafka::ERR__TRANSPORT) {
+      } else if (message->err == RD_KAFKA_RESP_ERR__TRANSPORT) {
         // Not return error here because consumer will try re-connect.
-        LOG(ERROR) << "Broker transport failure: " << message->errstr();
-      } else if (message->err() != RdKafka::ERR__TIMED_OUT) {
-        LOG(ERROR) << "Failed to consume: " << message->errstr();
-        return errors::Internal("Failed to consume: ", message->errstr());
+        LOG(ERROR) << "Broker transport failure: "
+                   << rd_kafka_message_errstr(message.get());
+      } else {
+        LOG(ERROR) << "Failed to consume: "
+                   << rd_kafka_message_errstr(message.get());
+        position_ = kUnknownPosition;
+        return errors::Internal("Failed to consume: ",
+                                rd_kafka_message_errstr(message.get()));
       }
     }
-    TensorShape shape({static_cast<int64>(message_value.size())});
+
+    TensorShape shape({static_cast<int64>(messages.size())});
     Tensor* message_tensor;
     Tensor* key_tensor;
     TF_RETURN_IF_ERROR(allocate_func(shape, &message_tensor, &key_tensor));
-    for (size_t i = 0; i < message_value.size(); i++) {
-      message_tensor->flat<tstring>()(i) = message_value[i];
-      key_tensor->flat<tstring>()(i) = key_value[i];
+    auto message_flat = message_tensor->flat<tstring>();
+    auto key_flat = key_tensor->flat<tstring>();
+    for (size_t i = 0; i < messages.size(); i++) {
+      message_flat(i).assign(static_cast<const char*>(messages[i]->payload),
+                             messages[i]->len);
+      if (messages[i]->key != nullptr) {
+        key_flat(i).assign(static_cast<const char*>(messages[i]->key),
+                           messages[i]->key_len);
+      }
     }
     return OkStatus();
   }
@@ -324,12 +378,71 @@ class KafkaReadableResource : public ResourceBase {
 
     return OkStatus();
   }
+  // Resolves `timestamp`, in milliseconds since the epoch, into the offset of
+  // the earliest message at or after it, or into -1 (the end of the
+  // partition) if there is none.
+  Status OffsetForTime(const int64 timestamp, int64* offset) {
+    mutex_lock l(mu_);
+
+    std::vector<RdKafka::TopicPartition*> offsets = {
+        RdKafka::TopicPartition::create(subscription_->topic(),
+                                        subscription_->partition(), timestamp)};
+    RdKafka::ErrorCode err = consumer_->offsetsForTimes(offsets, timeout_);
+    if (err == RdKafka::ERR_NO_ERROR) {
+      err = offsets[0]->err();
+    }
+    *offset = offsets[0]->offset();
+    RdKafka::TopicPartition::destroy(offsets);
+    if (err != RdKafka::ERR_NO_ERROR) {
+      return errors::Internal("failed to get offset of timestamp ", timestamp,
+                              ": ", RdKafka::err2str(err));
+    }
+    return OkStatus();
+  }
+  Status Partitions(std::vector<int32>* partitions) {
+    mutex_lock l(mu_);
+
+    string errstr;
+    std::unique_ptr<RdKafka::Topic> topic(RdKafka::Topic::create(
+        consumer_.get(), subscription_->topic(), nullptr, errstr));
+    if (!topic.get()) {
+      return errors::Internal("failed to create topic ", subscription_->topic(),
+                              ": ", errstr);
+    }
+    RdKafka::Metadata* metadata_ptr = nullptr;
+    RdKafka::ErrorCode err =
+        consumer_->metadata(false, topic.get(), &metadata_ptr, timeout_);
+    std::unique_ptr<RdKafka::Metadata> metadata(metadata_ptr);
+    if (err != RdKafka::ERR_NO_ERROR) {
+      return errors::Internal("failed to get metadata of topic ",
+                              subscription_->topic(), ": ",
+                              RdKafka::err2str(err));
+    }
+    for (const auto* topic_metadata : *metadata->topics()) {
+      if (topic_metadata->topic() != subscription_->topic()) {
+        continue;
+      }
+      if (topic_metadata->err() != RdKafka::ERR_NO_ERROR) {
+        return errors::Internal("failed to get metadata of topic ",
+                                subscription_->topic(), ": ",
+                                RdKafka::err2str(topic_metadata->err()));
+      }
+      for (const auto* partition_metadata : *topic_metadata->partitions()) {
+        partitions->push_back(partition_metadata->id());
+      }
+    }
+    std::sort(partitions->begin(), partitions->end());
+    return OkStatus();
+  }
   string DebugString() const override { return "KafkaBaseResource"; }
 
  protected:
   Status Tail(int64* tail_offset) {
     // Resolve tail message
     int64 saved = subscription_->offset();
+    // The seeks below discard what was consumed for `Read`.
+    pending_.clear();
+    position_ = kUnknownPosition;
 
     subscription_->set_offset(RdKafka::Consumer::OffsetTail(1));
     RdKafka::ErrorCode err = consumer_->seek(*subscription_, timeout_);
@@ -357,12 +470,42 @@ class KafkaReadableResource : public ResourceBase {
 
     return OkStatus();
   }
+
+  // Appends up to `n` messages or errors of the partition to `pending_`,
+  // waiting at most `timeout_` for the first.
+  Status ConsumeBatch(int64 n) TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (!kafka_event_cb_.run()) {
+      return errors::Internal("failed to consume due to all brokers down");
+    }
+    std::vector<rd_kafka_message_t*> batch(
+        std::min<int64>(n, kMaxConsumeBatchSize));
+    ssize_t count = rd_kafka_consume_batch_queue(queue_.get(), timeout_,
+                                                 batch.data(), batch.size());
+    if (count < 0) {
+      return errors::Internal("failed to consume: ",
+                              rd_kafka_err2str(rd_kafka_last_error()));
+    }
+    for (ssize_t i = 0; i < count; i++) {
+      pending_.emplace_back(batch[i]);
+    }
+    return OkStatus();
+  }
+
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
   std::unique_ptr<RdKafka::TopicPartition> subscription_ TF_GUARDED_BY(mu_);
   std::unique_ptr<RdKafka::KafkaConsumer> consumer_ TF_GUARDED_BY(mu_);
+  // The consumer queue, read in batches by `Read`.
+  std::unique_ptr<rd_kafka_queue_t, KafkaQueueDeleter> queue_
+      TF_GUARDED_BY(mu_);
+  // The offset of the next message `Read` gets from the consumer, and the
+  // messages already consumed from there on.
+  int64 position_ TF_GUARDED_BY(mu_) = kUnknownPosition;
+  std::deque<KafkaMessage> pending_ TF_GUARDED_BY(mu_);
   KafkaEventCb kafka_event_cb_ = KafkaEventCb();
   static const int timeout_ = 5000;
+  static constexpr int64 kUnknownPosition = -1;
+  static constexpr int64 kMaxConsumeBatchSize = 1024;
 };
 
 class KafkaReadableInitOp : public ResourceOpKernel<KafkaReadableResource> {
@@ -521,6 +664,66 @@ class KafkaReadableSpecOp : public OpKernel {
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
 };
+class KafkaReadableOffsetForTimeOp : public OpKernel {
+ public:
+  explicit KafkaReadableOffsetForTimeOp(OpKernelConstruction* context)
+      : OpKernel(context) {
+    env_ = context->env();
+  }
+
+  void Compute(OpKernelContext* context) override {
+    KafkaReadableResource* resource;
+    OP_REQUIRES_OK(context,
+                   GetResourceFromContext(context, "input", &resource));
+    core::ScopedUnref unref(resource);
+
+    const Tensor* timestamp_tensor;
+    OP_REQUIRES_OK(context, context->input("timestamp", &timestamp_tensor));
+    const int64 timestamp = timestamp_tensor->scalar<int64>()();
+
+    int64 offset;
+    OP_REQUIRES_OK(context, resource->OffsetForTime(timestamp, &offset));
+
+    Tensor* offset_tensor = nullptr;
+    OP_REQUIRES_OK(
+        context, context->allocate_output(0, TensorShape({}), &offset_tensor));
+    offset_tensor->scalar<int64>()() = offset;
+  }
+
+ private:
+  mutable mutex mu_;
+  Env* env_ TF_GUARDED_BY(mu_);
+};
+class KafkaReadablePartitionsOp : public OpKernel {
+ public:
+  explicit KafkaReadablePartitionsOp(OpKernelConstruction* context)
+      : OpKernel(context) {
+    env_ = context->env();
+  }
+
+  void Compute(OpKernelContext* context) override {
+    KafkaReadableResource* resource;
+    OP_REQUIRES_OK(context,
+                   GetResourceFromContext(context, "input", &resource));
+    core::ScopedUnref unref(resource);
+
+    std::vector<int32> partitions;
+    OP_REQUIRES_OK(context, resource->Partitions(&partitions));
+
+    Tensor* partitions_tensor = nullptr;
+    OP_REQUIRES_OK(context,
+                   context->allocate_output(
+                       0, TensorShape({static_cast<int64>(partitions.size())}),
+                       &partitions_tensor));
+    for (size_t i = 0; i < partitions.size(); i++) {
+      partitions_tensor->flat<int32>()(i) = partitions[i];
+    }
+  }
+
+ private:
+  mutable mutex mu_;
+  Env* env_ TF_GUARDED_BY(mu_);
+};
 /*
 class KafkaIterableInitOp : public ResourceOpKernel<KafkaIterableResource> {
  public:
@@ -566,6 +769,37 @@ class KafkaIterableInitOp : public ResourceOpKernel<KafkaIterableResource> {
   Env* env_ TF_GUARDED_BY(mu_);
 };
 */
+// Records the first failed delivery of the messages produced. Delivery
+// reports are served by `poll` and `flush` of the producer, so the producer
+// never waits on a delivery to produce the next message.
+class KafkaDeliveryReportCb : public RdKafka::DeliveryReportCb {
+ public:
+  void dr_cb(RdKafka::Message& message) override {
+    if (message.err() != RdKafka::ERR_NO_ERROR) {
+      if (failed_++ == 0) {
+        error_ = strings::StrCat(message.topic_name(), "[", message.partition(),
+                                 "]: ", message.errstr());
+      }
+    }
+  }
+
+  // Returns the first delivery error, and the number of failed deliveries,
+  // since the last call.
+  Status TakeError() {
+    if (failed_ == 0) {
+      return OkStatus();
+    }
+    Status error = errors::Internal("failed to deliver message to ", error_,
+                                    " (", failed_, " message(s) failed)");
+    failed_ = 0;
+    return error;
+  }
+
+ private:
+  string error_;
+  int64 failed_ = 0;
+};
+
 class LayerKafkaResource : public ResourceBase {
  public:
   LayerKafkaResource(Env* env) : env_(env) {}
@@ -625,6 +859,11 @@ class LayerKafkaResource : public ResourceBase {
       LOG(INFO) << "Kafka default bootstrap server: " << bootstrap_servers;
     }
 
+    if ((result = conf->set("dr_cb", &delivery_report_cb_, errstr)) !=
+        RdKafka::Conf::CONF_OK) {
+      return errors::Internal("failed to set dr_cb:", errstr);
+    }
+
     producer_.reset(RdKafka::Producer::create(conf.get(), errstr));
     if (!(producer_.get() != nullptr)) {
       return errors::Internal("Failed to create producer:", errstr);
@@ -639,21 +878,42 @@ class LayerKafkaResource : public ResourceBase {
     partition_ = partition;
     return OkStatus();
   }
-  Status Write(const Tensor& content) {
+  // Produces the messages of `content`, keyed by `key` unless it is null.
+  // The messages are queued to be sent in batches as set by `linger.ms` and
+  // `batch.num.messages`, and only a full queue makes this wait. A failed
+  // delivery is returned by a later `Write` or `Sync`.
+  Status Write(const Tensor& content, const Tensor* key = nullptr) {
     mutex_lock l(mu_);
+    if (key != nullptr && key->NumElements() != content.NumElements()) {
+      return errors::InvalidArgument(
+          "key should have the same number of elements as message: ",
+          key->NumElements(), " vs. ", content.NumElements());
+    }
     for (int64 i = 0; i < content.NumElements(); i++) {
-      RdKafka::ErrorCode err = producer_->produce(
-          topic_.get(), partition_, RdKafka::Producer::RK_MSG_COPY,
-          (void*)content.flat<tstring>()(i).data(),
-          content.flat<tstring>()(i).size(), NULL, NULL);
+      const tstring& message = content.flat<tstring>()(i);
+      const tstring* message_key =
+          key != nullptr ? &key->flat<tstring>()(i) : nullptr;
+      RdKafka::ErrorCode err;
+      while ((err = producer_->produce(
+                  topic_.get(), partition_, RdKafka::Producer::RK_MSG_COPY,
+                  (void*)message.data(), message.size(),
+                  message_key != nullptr ? message_key->data() : nullptr,
+                  message_key != nullptr ? message_key->size() : 0, NULL)) ==
+             RdKafka::ERR__QUEUE_FULL) {
+        // Wait for the queued messages to be sent.
+        producer_->poll(kQueueFullPollMs);
+      }
       if (!(err == RdKafka::ERR_NO_ERROR)) {
         return errors::Internal("Failed to produce message:",
                                 RdKafka::err2str(err));
       }
     }
-    return OkStatus();
+    // Serve the delivery reports without blocking.
+    producer_->poll(0);
+    return delivery_report_cb_.TakeError();
   }
   Status Sync() {
+    mutex_lock l(mu_);
     if (producer_.get() != nullptr) {
       RdKafka::ErrorCode err = producer_->flush(timeout_);
       if (!(err == RdKafka::ERR_NO_ERROR)) {
@@ -661,7 +921,7 @@ class LayerKafkaResource : public ResourceBase {
                                 RdKafka::err2str(err));
       }
     }
-    return OkStatus();
+    return delivery_report_cb_.TakeError();
   }
   string DebugString() const override { return "LayerKafkaResource"; }
 
@@ -671,7 +931,9 @@ class LayerKafkaResource : public ResourceBase {
   std::unique_ptr<RdKafka::Producer> producer_ TF_GUARDED_BY(mu_);
   std::unique_ptr<RdKafka::Topic> topic_ TF_GUARDED_BY(mu_);
   int32 partition_ TF_GUARDED_BY(mu_);
+  KafkaDeliveryReportCb delivery_report_cb_ TF_GUARDED_BY(mu_);
   static const int timeout_ = 5000;
+  static const int kQueueFullPollMs = 100;
 };
 
 class LayerKafkaInitOp : public ResourceOpKernel<LayerKafkaResource> {
@@ -742,6 +1004,42 @@ class LayerKafkaCallOp : public OpKernel {
   Env* env_ TF_GUARDED_BY(mu_);
 };
 
+class LayerKafkaWriteOp : public OpKernel {
+ public:
+  explicit LayerKafkaWriteOp(OpKernelConstruction* context)
+      : OpKernel(context) {
+    env_ = context->env();
+  }
+
+  void Compute(OpKernelContext* context) override {
+    LayerKafkaResource* resource;
+    OP_REQUIRES_OK(context,
+                   GetResourceFromContext(context, "resource", &resource));
+    core::ScopedUnref unref(resource);
+
+    const Tensor* message_tensor;
+    OP_REQUIRES_OK(context, context->input("message", &message_tensor));
+
+    const Tensor* key_tensor;
+    OP_REQUIRES_OK(context, context->input("key", &key_tensor));
+
+    // An empty key writes the messages without keys.
+    OP_REQUIRES_OK(
+        context,
+        resource->Write(*message_tensor,
+                        key_tensor->NumElements() != 0 ? key_tensor : nullptr));
+
+    Tensor* count_tensor;
+    OP_REQUIRES_OK(context,
+                   context->allocate_output(0, TensorShape({}), &count_tensor));
+    count_tensor->scalar<int64>()() = message_tensor->NumElements();
+  }
+
+ private:
+  mutable mutex mu_;
+  Env* env_ TF_GUARDED_BY(mu_);
+};
+
 class LayerKafkaSyncOp : public OpKernel {
  public:
   explicit LayerKafkaSyncOp(OpKernelConstruction* context) : OpKernel(context) {
@@ -762,19 +1060,34 @@ class LayerKafkaSyncOp : public OpKernel {
 };
 
 static int64 partition_count = 0;
-static int64 eof_count = 0;
 class KafkaRebalanceCb : public RdKafka::RebalanceCb {
  public:
+  typedef std::function<void(RdKafka::KafkaConsumer* consumer,
+                             const std::vector<RdKafka::TopicPartition*>&)>
+      RevokeFunc;
+  typedef std::function<void(RdKafka::KafkaConsumer* consumer,
+                             std::vector<RdKafka::TopicPartition*>&)>
+      AssignFunc;
+
   KafkaRebalanceCb() : run_(true) {}
 
   bool run() { return run_; }
 
+  // Sets a function called with the partitions about to be revoked.
+  void set_revoke_func(RevokeFunc revoke_func) { revoke_func_ = revoke_func; }
+
+  // Sets a function called with the partitions about to be assigned, which
+  // may set the offsets to start them from.
+  void set_assign_func(AssignFunc assign_func) { assign_func_ = assign_func; }
+
+  // Sets a function called with the partitions once they are assigned.
+  void set_assigned_func(RevokeFunc assigned_func) {
+    assigned_func_ = assigned_func;
+  }
+
   void rebalance_cb(RdKafka::KafkaConsumer* consumer, RdKafka::ErrorCode err,
                     std::vector<RdKafka::TopicPartition*>& partitions) {
     LOG(ERROR) << "REBALANCE: " << RdKafka::err2str(err);
-    int timeout = 5000;  // milliseconds
-    LOG(ERROR) << "Retrieved committed offsets with status code: "
-               << consumer->committed(partitions, timeout);
 
     for (int partition = 0; partition < partitions.size(); partition++) {
       // OFFSET MAPPINGS:
@@ -800,25 +1113,85 @@ class KafkaRebalanceCb : public RdKafka::RebalanceCb {
       // configuration parameter.
 
       LOG(INFO) << "REBALANCE: Assigning partitions";
+      if (assign_func_) {
+        assign_func_(consumer, partitions);
+      }
       consumer->assign(partitions);
       partition_count = (int)partitions.size();
+      if (assigned_func_) {
+        assigned_func_(consumer, partitions);
+      }
     } else {
       LOG(INFO) << "REBALANCE: Unassigning partitions";
+      if (revoke_func_) {
+        revoke_func_(consumer, partitions);
+      }
       consumer->unassign();
       partition_count = 0;
     }
-    eof_count = 0;
   }
 
  private:
   mutable mutex mu_;
   bool run_ TF_GUARDED_BY(mu_) = true;
+  RevokeFunc revoke_func_;
+  AssignFunc assign_func_;
+  RevokeFunc assigned_func_;
+};
+
+class KafkaOffsetCommitCb : public RdKafka::OffsetCommitCb {
+ public:
+  // Returns whether a commit failed since the last call.
+  bool TakeFailed() { return failed_.exchange(false); }
+
+  // Returns whether a commit failed, without resetting it.
+  bool Failed() const { return failed_; }
+
+  void offset_commit_cb(RdKafka::ErrorCode err,
+                        std::vector<RdKafka::TopicPartition*>& offsets) {
+    if (err == RdKafka::ERR__NO_OFFSET) {
+      return;
+    }
+    if (err != RdKafka::ERR_NO_ERROR) {
+      LOG(ERROR) << "Failed to commit offsets: " << RdKafka::err2str(err);
+      failed_ = true;
+      return;
+    }
+    for (const auto* offset : offsets) {
+      if (offset->err() != RdKafka::ERR_NO_ERROR) {
+        LOG(ERROR) << "Failed to commit offset " << offset->offset() << " of "
+                   << offset->topic() << "[" << offset->partition()
+                   << "]: " << RdKafka::err2str(offset->err());
+        failed_ = true;
+      }
+    }
+  }
+
+ private:
+  std::atomic<bool> failed_{false};
 };
 
 class KafkaGroupReadableResource : public ResourceBase {
  public:
+  // How the offsets of the consumed messages are committed:
+  //   kAuto: by librdkafka, as set by `enable.auto.commit`.
+  //   kAsync: asynchronously, every `commit_batches` batches and/or
+  //     `commit_interval_ms` milliseconds, and synchronously when partitions
+  //     are revoked or the consumer is closed.
+  //   kCheckpoint: only by `Commit`, which the Python dataset calls once a
+  //     checkpoint is saved, so that a restarted consumer group replays
+  //     exactly the messages read after it. Not on rebalances either.
+  enum CommitMode { kAuto, kAsync, kCheckpoint };
+
   KafkaGroupReadableResource(Env* env) : env_(env) {}
   virtual ~KafkaGroupReadableResource() {
+    mutex_lock l(mu_);
+    if (consumer_.get() && commit_mode_ == kAsync) {
+      Status status = CommitLocked(true);
+      if (!status.ok()) {
+        LOG(ERROR) << status;
+      }
+    }
     if (consumer_.get()) {
       consumer_->unassign();
       consumer_->close();
@@ -827,9 +1200,35 @@ class KafkaGroupReadableResource : public ResourceBase {
   }
 
   virtual Status Init(const std::vector<std::string>& topics,
-                      const std::vector<std::string>& metadata) {
+                      const std::vector<std::string>& metadata,
+                      const string& commit_mode, const int64 commit_batches,
+                      const int64 commit_interval_ms,
+                      const int64 start_timestamp_ms,
+                      const int64 stop_timestamp_ms) {
     mutex_lock l(mu_);
 
+    start_timestamp_ms_ = start_timestamp_ms;
+    stop_timestamp_ms_ = stop_timestamp_ms;
+    if (start_timestamp_ms_ >= 0) {
+      kafka_rebalance_cb_.set_assign_func(
+          [this](RdKafka::KafkaConsumer* consumer,
+                 std::vector<RdKafka::TopicPartition*>& partitions) {
+            StartPartitions(consumer, partitions);
+          });
+    }
+
+    if (commit_mode == "auto") {
+      commit_mode_ = kAuto;
+    } else if (commit_mode == "async") {
+      commit_mode_ = kAsync;
+    } else if (commit_mode == "checkpoint") {
+      commit_mode_ = kCheckpoint;
+    } else {
+      return errors::InvalidArgument("invalid commit mode: ", commit_mode);
+    }
+    commit_batches_ = commit_batches;
+    commit_interval_ms_ = commit_interval_ms;
+
     std::unique_ptr<RdKafka::Conf> conf(
         RdKafka::Conf::create(RdKafka::Conf::CONF_GLOBAL));
     std::unique_ptr<RdKafka::Conf> conf_topic(
@@ -935,6 +1334,30 @@ class KafkaGroupReadableResource : public ResourceBase {
       return errors::Internal("failed to set rebalance_cb:", errstr);
     }
 
+    if (commit_mode_ != kAuto) {
+      // The offsets are committed by the resource instead.
+      if ((result = conf->set("enable.auto.commit", "false", errstr)) !=
+          RdKafka::Conf::CONF_OK) {
+        return errors::Internal("failed to set enable.auto.commit=false :",
+                                errstr);
+      }
+      if ((result = conf->set("offset_commit_cb", &kafka_offset_commit_cb_,
+                              errstr)) != RdKafka::Conf::CONF_OK) {
+        return errors::Internal("failed to set offset_commit_cb:", errstr);
+      }
+      last_commit_micros_ = env_->NowMicros();
+    }
+    kafka_rebalance_cb_.set_revoke_func(
+        [this](RdKafka::KafkaConsumer* consumer,
+               const std::vector<RdKafka::TopicPartition*>& partitions) {
+          RevokePartitions(consumer, partitions);
+        });
+    kafka_rebalance_cb_.set_assigned_func(
+        [this](RdKafka::KafkaConsumer* consumer,
+               const std::vector<RdKafka::TopicPartition*>& partitions) {
+          AssignedPartitions(consumer, partitions);
+        });
+
     LOG(INFO) << "Creating the kafka consumer";
     consumer_.reset(RdKafka::KafkaConsumer::create(conf.get(), errstr));
     if (!consumer_.get()) {
@@ -975,13 +1398,26 @@ class KafkaGroupReadableResource : public ResourceBase {
             "failed to consume messages due to broker issue");
       }
       message.reset(consumer_->consume(message_poll_timeout));
-      if (message->err() == RdKafka::ERR_NO_ERROR) {
+      if (message->err() == RdKafka::ERR_NO_ERROR && stop_timestamp_ms_ >= 0 &&
+          message->timestamp().timestamp >= stop_timestamp_ms_) {
+        // The partition is done, as if it reached its end.
+        if (StopPartition(*message) && FinishPartition(*message)) {
+          LOG(INFO) << "Stop timestamp reached for all " << partition_count
+                    << " partition(s)";
+          break;
+        }
+      } else if (message->err() == RdKafka::ERR_NO_ERROR) {
         // Produce the line as output.
         message_value.emplace_back(string(
             static_cast<const char*>(message->payload()), message->len()));
         key_value.emplace_back(
             (message->key() != nullptr) ? string(*message->key()) : "");
         num_messages++;
+        if (commit_mode_ != kAuto) {
+          positions_[{message->topic_name(), message->partition()}] =
+              message->offset() + 1;
+          uncommitted_ = true;
+        }
         // Once a message has been successfully retrieved, the
         // `stream_timeout_polls_` is reset to 0. This allows the dataset
         // to wait for the entire `stream_timeout` duration when a data
@@ -992,7 +1428,7 @@ class KafkaGroupReadableResource : public ResourceBase {
         LOG(ERROR) << "Broker transport failure: " << message->errstr();
 
       } else if (message->err() == RdKafka::ERR__PARTITION_EOF) {
-        if (++eof_count == partition_count) {
+        if (FinishPartition(*message)) {
           LOG(INFO) << "EOF reached for all " << partition_count
                     << " partition(s)";
           break;
@@ -1022,20 +1458,241 @@ class KafkaGroupReadableResource : public ResourceBase {
       key_tensor->flat<tstring>()(i) = key_value[i];
     }
 
+    if (commit_mode_ == kAsync) {
+      batches_since_commit_++;
+      const bool interval_elapsed =
+          commit_interval_ms_ > 0 &&
+          env_->NowMicros() - last_commit_micros_ >= commit_interval_ms_ * 1000;
+      if ((commit_batches_ > 0 && batches_since_commit_ >= commit_batches_) ||
+          interval_elapsed || kafka_offset_commit_cb_.Failed()) {
+        // Reading goes on after a failed commit, which is retried with the
+        // next batch.
+        Status status = CommitLocked(false);
+        if (!status.ok()) {
+          LOG(ERROR) << status;
+        }
+      }
+    }
+
     return OkStatus();
   }
 
+  // Commits the offsets of the messages returned so far, synchronously.
+  Status Commit() {
+    mutex_lock l(mu_);
+    if (consumer_.get() == nullptr) {
+      return errors::FailedPrecondition("consumer is not initialized");
+    }
+    if (commit_mode_ == kAuto) {
+      RdKafka::ErrorCode err = consumer_->commitSync();
+      if (err != RdKafka::ERR_NO_ERROR && err != RdKafka::ERR__NO_OFFSET) {
+        return errors::Internal("failed to commit offsets: ",
+                                RdKafka::err2str(err));
+      }
+      return OkStatus();
+    }
+    return CommitLocked(true);
+  }
+
   string DebugString() const override { return "KafkaBaseResource"; }
 
+ private:
+  Status CommitLocked(bool sync) TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    // An asynchronous commit that failed is retried with the next commit.
+    if (!kafka_offset_commit_cb_.TakeFailed() && !uncommitted_) {
+      batches_since_commit_ = 0;
+      last_commit_micros_ = env_->NowMicros();
+      return OkStatus();
+    }
+    std::vector<RdKafka::TopicPartition*> offsets;
+    for (const auto& position : positions_) {
+      offsets.push_back(RdKafka::TopicPartition::create(
+          position.first.first, position.first.second, position.second));
+    }
+    RdKafka::ErrorCode err =
+        sync ? consumer_->commitSync(offsets) : consumer_->commitAsync(offsets);
+    if (err == RdKafka::ERR_NO_ERROR && sync) {
+      for (const auto* offset : offsets) {
+        if (offset->err() != RdKafka::ERR_NO_ERROR) {
+          err = offset->err();
+          break;
+        }
+      }
+    }
+    RdKafka::TopicPartition::destroy(offsets);
+    if (err != RdKafka::ERR_NO_ERROR && err != RdKafka::ERR__NO_OFFSET) {
+      uncommitted_ = true;
+      return errors::Internal("failed to commit offsets: ",
+                              RdKafka::err2str(err));
+    }
+    uncommitted_ = false;
+    batches_since_commit_ = 0;
+    last_commit_micros_ = env_->NowMicros();
+    return OkStatus();
+  }
+
+  // Starts the partitions assigned for the first time from the start
+  // timestamp. Partitions assigned again after a rebalance resume from their
+  // committed offsets.
+  //
+  // This runs in the rebalance callback, within `consume` in `Next`, which
+  // holds `mu_`.
+  void StartPartitions(RdKafka::KafkaConsumer* consumer,
+                       std::vector<RdKafka::TopicPartition*>& partitions)
+      TF_NO_THREAD_SAFETY_ANALYSIS {
+    std::vector<RdKafka::TopicPartition*> offsets;
+    for (auto* partition : partitions) {
+      if (started_.insert({partition->topic(), partition->partition()})
+              .second) {
+        partition->set_offset(start_timestamp_ms_);
+        offsets.push_back(partition);
+      }
+    }
+    if (offsets.empty()) {
+      return;
+    }
+    // The offsets are resolved in place.
+    RdKafka::ErrorCode err = consumer->offsetsForTimes(offsets, timeout_);
+    for (auto* partition : offsets) {
+      if (err != RdKafka::ERR_NO_ERROR ||
+          partition->err() != RdKafka::ERR_NO_ERROR) {
+        LOG(ERROR) << "Failed to get offset of start timestamp for "
+                   << partition->topic() << "[" << partition->partition()
+                   << "], resuming from the committed offset: "
+                   << RdKafka::err2str(err != RdKafka::ERR_NO_ERROR
+                                           ? err
+                                           : partition->err());
+        partition->set_offset(RdKafka::Topic::OFFSET_INVALID);
+      }
+    }
+  }
+
+  // Pauses the partition of `message`, whose timestamp is past the stop
+  // timestamp. Returns false if the partition was already stopped.
+  bool StopPartition(const RdKafka::Message& message)
+      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (!stopped_.insert({message.topic_name(), message.partition()}).second) {
+      return false;
+    }
+    std::vector<RdKafka::TopicPartition*> partitions = {
+        RdKafka::TopicPartition::create(message.topic_name(),
+                                        message.partition())};
+    RdKafka::ErrorCode err = consumer_->pause(partitions);
+    if (err != RdKafka::ERR_NO_ERROR) {
+      LOG(ERROR) << "Failed to pause " << message.topic_name() << "["
+                 << message.partition() << "]: " << RdKafka::err2str(err);
+    }
+    RdKafka::TopicPartition::destroy(partitions);
+    return true;
+  }
+
+  // Marks the partition of `message` as finished, at its end or at the stop
+  // timestamp. Returns true once all the assigned partitions are finished.
+  bool FinishPartition(const RdKafka::Message& message)
+      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    return finished_.insert({message.topic_name(), message.partition()})
+               .second &&
+           static_cast<int64>(finished_.size()) == partition_count;
+  }
+
+  // Pauses again the assigned partitions that were stopped before, as a
+  // rebalance resumes all partitions, and forgets the others. The partitions
+  // that reached their end report it again once assigned.
+  //
+  // This runs in the rebalance callback, within `consume` in `Next`, which
+  // holds `mu_`.
+  void AssignedPartitions(RdKafka::KafkaConsumer* consumer,
+                          const std::vector<RdKafka::TopicPartition*>&
+                              partitions) TF_NO_THREAD_SAFETY_ANALYSIS {
+    std::set<std::pair<string, int32>> assigned;
+    for (const auto* partition : partitions) {
+      assigned.insert({partition->topic(), partition->partition()});
+    }
+    finished_.clear();
+    std::vector<RdKafka::TopicPartition*> paused;
+    for (auto it = stopped_.begin(); it != stopped_.end();) {
+      if (assigned.count(*it) == 0) {
+        it = stopped_.erase(it);
+        continue;
+      }
+      finished_.insert(*it);
+      paused.push_back(RdKafka::TopicPartition::create(it->first, it->second));
+      ++it;
+    }
+    if (paused.empty()) {
+      return;
+    }
+    RdKafka::ErrorCode err = consumer->pause(paused);
+    if (err != RdKafka::ERR_NO_ERROR) {
+      LOG(ERROR) << "Failed to pause stopped partitions: "
+                 << RdKafka::err2str(err);
+    }
+    RdKafka::TopicPartition::destroy(paused);
+  }
+
+  // Forgets whether revoked partitions are finished, and their positions,
+  // committing the positions first in async mode as the next owner of the
+  // partitions starts from them. In checkpoint mode the next owner replays from
+  // the last `Commit` instead. Stopped partitions are kept until the next
+  // assignment, which pauses them again if they are assigned back.
+  //
+  // This runs in the rebalance callback, within `consume` in `Next` or within
+  // `close` in the destructor, both of which hold `mu_`.
+  void RevokePartitions(RdKafka::KafkaConsumer* consumer,
+                        const std::vector<RdKafka::TopicPartition*>& partitions)
+      TF_NO_THREAD_SAFETY_ANALYSIS {
+    std::vector<RdKafka::TopicPartition*> offsets;
+    for (const auto* partition : partitions) {
+      finished_.erase({partition->topic(), partition->partition()});
+      auto position =
+          positions_.find({partition->topic(), partition->partition()});
+      if (position == positions_.end()) {
+        continue;
+      }
+      if (commit_mode_ == kAsync) {
+        offsets.push_back(RdKafka::TopicPartition::create(
+            position->first.first, position->first.second, position->second));
+      }
+      positions_.erase(position);
+    }
+    if (!offsets.empty()) {
+      RdKafka::ErrorCode err = consumer->commitSync(offsets);
+      if (err != RdKafka::ERR_NO_ERROR) {
+        LOG(ERROR) << "Failed to commit offsets of revoked partitions: "
+                   << RdKafka::err2str(err);
+      }
+      RdKafka::TopicPartition::destroy(offsets);
+    }
+  }
+
+ public:
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
   // std::unique_ptr<RdKafka::TopicPartition> subscription_ TF_GUARDED_BY(mu_);
   std::unique_ptr<RdKafka::KafkaConsumer> consumer_ TF_GUARDED_BY(mu_);
   KafkaEventCb kafka_event_cb_ = KafkaEventCb();
   KafkaRebalanceCb kafka_rebalance_cb_ = KafkaRebalanceCb();
+  KafkaOffsetCommitCb kafka_offset_commit_cb_;
   int max_stream_timeout_polls_ = -1;
   int stream_timeout_polls_ = -1;
   int batch_num_messages_ = 1024;
+  CommitMode commit_mode_ TF_GUARDED_BY(mu_) = kAuto;
+  int64 commit_batches_ TF_GUARDED_BY(mu_) = 0;
+  int64 commit_interval_ms_ TF_GUARDED_BY(mu_) = 0;
+  // The offsets of the next messages to read, by topic and partition.
+  std::map<std::pair<string, int32>, int64> positions_ TF_GUARDED_BY(mu_);
+  bool uncommitted_ TF_GUARDED_BY(mu_) = false;
+  int64 batches_since_commit_ TF_GUARDED_BY(mu_) = 0;
+  uint64 last_commit_micros_ TF_GUARDED_BY(mu_) = 0;
+  // The timestamps, in milliseconds since the epoch, to start and stop the
+  // partitions at, or -1.
+  int64 start_timestamp_ms_ TF_GUARDED_BY(mu_) = -1;
+  int64 stop_timestamp_ms_ TF_GUARDED_BY(mu_) = -1;
+  std::set<std::pair<string, int32>> started_ TF_GUARDED_BY(mu_);
+  std::set<std::pair<string, int32>> stopped_ TF_GUARDED_BY(mu_);
+  // The assigned partitions that reached their end or the stop timestamp.
+  std::set<std::pair<string, int32>> finished_ TF_GUARDED_BY(mu_);
+  static const int timeout_ = 5000;
 };
 
 class KafkaGroupReadableInitOp
@@ -1044,6 +1701,15 @@ class KafkaGroupReadableInitOp
   explicit KafkaGroupReadableInitOp(OpKernelConstruction* context)
       : ResourceOpKernel<KafkaGroupReadableResource>(context) {
     env_ = context->env();
+    OP_REQUIRES_OK(context, context->GetAttr("commit_mode", &commit_mode_));
+    OP_REQUIRES_OK(context,
+                   context->GetAttr("commit_batches", &commit_batches_));
+    OP_REQUIRES_OK(
+        context, context->GetAttr("commit_interval_ms", &commit_interval_ms_));
+    OP_REQUIRES_OK(
+        context, context->GetAttr("start_timestamp_ms", &start_timestamp_ms_));
+    OP_REQUIRES_OK(context,
+                   context->GetAttr("stop_timestamp_ms", &stop_timestamp_ms_));
   }
 
  private:
@@ -1064,7 +1730,10 @@ class KafkaGroupReadableInitOp
       metadata.push_back(metadata_tensor->flat<tstring>()(i));
     }
 
-    OP_REQUIRES_OK(context, resource_->Init(topics, metadata));
+    OP_REQUIRES_OK(context,
+                   resource_->Init(topics, metadata, commit_mode_,
+                                   commit_batches_, commit_interval_ms_,
+                                   start_timestamp_ms_, stop_timestamp_ms_));
   }
   Status CreateResource(KafkaGroupReadableResource** resource)
       TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) override {
@@ -1075,6 +1744,11 @@ class KafkaGroupReadableInitOp
  private:
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
+  string commit_mode_;
+  int64 commit_batches_;
+  int64 commit_interval_ms_;
+  int64 start_timestamp_ms_;
+  int64 stop_timestamp_ms_;
 };
 
 class KafkaGroupReadableNextOp : public OpKernel {
@@ -1124,6 +1798,27 @@ class KafkaGroupReadableNextOp : public OpKernel {
   Env* env_ TF_GUARDED_BY(mu_);
 };
 
+class KafkaGroupReadableCommitOp : public OpKernel {
+ public:
+  explicit KafkaGroupReadableCommitOp(OpKernelConstruction* context)
+      : OpKernel(context) {
+    env_ = context->env();
+  }
+
+  void Compute(OpKernelContext* context) override {
+    KafkaGroupReadableResource* resource;
+    OP_REQUIRES_OK(context,
+                   GetResourceFromContext(context, "input", &resource));
+    core::ScopedUnref unref(resource);
+
+    OP_REQUIRES_OK(context, resource->Commit());
+  }
+
+ private:
+  mutable mutex mu_;
+  Env* env_ TF_GUARDED_BY(mu_);
+};
+
 REGISTER_KERNEL_BUILDER(Name("IO>KafkaReadableInit").Device(DEVICE_CPU),
                         KafkaReadableInitOp);
 REGISTER_KERNEL_BUILDER(Name("IO>KafkaReadableNext").Device(DEVICE_CPU),
@@ -1132,16 +1827,25 @@ REGISTER_KERNEL_BUILDER(Name("IO>KafkaReadableRead").Device(DEVICE_CPU),
                         KafkaReadableReadOp);
 REGISTER_KERNEL_BUILDER(Name("IO>KafkaReadableSpec").Device(DEVICE_CPU),
                         KafkaReadableSpecOp);
+REGISTER_KERNEL_BUILDER(Name("IO>KafkaReadablePartitions").Device(DEVICE_CPU),
+                        KafkaReadablePartitionsOp);
+REGISTER_KERNEL_BUILDER(
+    Name("IO>KafkaReadableOffsetForTime").Device(DEVICE_CPU),
+    KafkaReadableOffsetForTimeOp);
 REGISTER_KERNEL_BUILDER(Name("IO>LayerKafkaInit").Device(DEVICE_CPU),
                         LayerKafkaInitOp);
 REGISTER_KERNEL_BUILDER(Name("IO>LayerKafkaCall").Device(DEVICE_CPU),
                         LayerKafkaCallOp);
+REGISTER_KERNEL_BUILDER(Name("IO>LayerKafkaWrite").Device(DEVICE_CPU),
+                        LayerKafkaWriteOp);
 REGISTER_KERNEL_BUILDER(Name("IO>LayerKafkaSync").Device(DEVICE_CPU),
                         LayerKafkaSyncOp);
 REGISTER_KERNEL_BUILDER(Name("IO>KafkaGroupReadableInit").Device(DEVICE_CPU),
                         KafkaGroupReadableInitOp);
 REGISTER_KERNEL_BUILDER(Name("IO>KafkaGroupReadableNext").Device(DEVICE_CPU),
                         KafkaGroupReadableNextOp);
+REGISTER_KERNEL_BUILDER(Name("IO>KafkaGroupReadableCommit").Device(DEVICE_CPU),
+                        KafkaGroupReadableCommitOp);
 }  // namespace
 }  // namespace io
 }  // namespace tensorflow
@@ -21,6 +21,7 @@ limitations under the License.
 #include <aws/core/utils/crypto/Hash.h>
 #include <aws/core/utils/crypto/HashResult.h>
 #include <aws/kinesis/KinesisClient.h>
+#include <aws/kinesis/KinesisErrors.h>
 #include <aws/kinesis/model/DescribeStreamRequest.h>
 #include <aws/kinesis/model/GetRecordsRequest.h>
 #include <aws/kinesis/model/GetShardIteratorRequest.h>
@@ -29,6 +30,8 @@ limitations under the License.
 #include <openssl/hmac.h>
 #include <openssl/sha.h>
 
+#include <algorithm>
+
 #include "tensorflow/core/framework/resource_mgr.h"
 #include "tensorflow/core/framework/resource_op_kernel.h"
 
@@ -38,6 +41,15 @@ namespace {
 
 static const char* AWSCryptoAllocationTag = "AWSCryptoAllocation";
 
+// The most records returned by one GetRecords call, which is also the limit
+// of the Kinesis API.
+constexpr int64 kMaxRecordsLimit = 10000;
+// The time to wait before polling a shard again after an empty or throttled
+// GetRecords call. It doubles with every such call in a row, up to the max,
+// as Kinesis only allows 5 GetRecords calls per second and shard.
+constexpr int64 kMinReadIntervalMicros = 100000;
+constexpr int64 kMaxReadIntervalMicros = 2000000;
+
 class AWSSHA256Factory : public Aws::Utils::Crypto::HashFactory {
  public:
   std::shared_ptr<Aws::Utils::Crypto::Hash> CreateImplementation()
@@ -253,10 +265,36 @@ void ShutdownClient(Aws::Kinesis::KinesisClient* client) {
   }
 }
 
+// Lists all shards of `stream`, following the pages of DescribeStream.
+Status DescribeShards(Aws::Kinesis::KinesisClient* client, const string& stream,
+                      Aws::Vector<Aws::Kinesis::Model::Shard>* shards) {
+  Aws::Kinesis::Model::DescribeStreamRequest request;
+  request.SetStreamName(stream.c_str());
+  while (true) {
+    auto outcome = client->DescribeStream(request);
+    if (!outcome.IsSuccess()) {
+      return errors::Unknown(outcome.GetError().GetExceptionName(), ": ",
+                             outcome.GetError().GetMessage());
+    }
+    const auto& description = outcome.GetResult().GetStreamDescription();
+    shards->insert(shards->end(), description.GetShards().begin(),
+                   description.GetShards().end());
+    if (!description.GetHasMoreShards() || description.GetShards().empty()) {
+      return OkStatus();
+    }
+    request.SetExclusiveStartShardId(
+        description.GetShards().back().GetShardId());
+  }
+}
+
 class KinesisReadableResource : public ResourceBase {
  public:
   KinesisReadableResource(Env* env)
-      : env_(env), client_(nullptr, ShutdownClient), interval_(100000) {}
+      : env_(env),
+        client_(nullptr, ShutdownClient),
+        limit_(kMaxRecordsLimit),
+        idle_timeout_(-1),
+        interval_(kMinReadIntervalMicros) {}
   virtual ~KinesisReadableResource() {}
 
   Status Init(const string& input, const std::vector<string>& metadata) {
@@ -272,41 +310,42 @@ class KinesisReadableResource : public ResourceBase {
                                          metadata[i]);
         }
         shard_ = parts[1];
+      } else if (metadata[i].find("limit=") == 0) {
+        std::vector<string> parts = str_util::Split(metadata[i], "=");
+        if (parts.size() != 2 || !strings::safe_strto64(parts[1], &limit_) ||
+            limit_ <= 0 || limit_ > kMaxRecordsLimit) {
+          return errors::InvalidArgument("invalid configuration: ", metadata[i],
+                                         ", limit must be between 1 and ",
+                                         kMaxRecordsLimit);
+        }
+      } else if (metadata[i].find("idle_timeout=") == 0) {
+        std::vector<string> parts = str_util::Split(metadata[i], "=");
+        if (parts.size() != 2 ||
+            !strings::safe_strto64(parts[1], &idle_timeout_)) {
+          return errors::InvalidArgument("invalid configuration: ",
+                                         metadata[i]);
+        }
       }
     }
 
     AwsInitAPI();
     client_.reset(new Aws::Kinesis::KinesisClient(GetDefaultClientConfig()));
 
-    Aws::Kinesis::Model::DescribeStreamRequest request;
-    auto outcome =
-        client_->DescribeStream(request.WithStreamName(stream_.c_str()));
-    if (!outcome.IsSuccess()) {
-      return errors::Unknown(outcome.GetError().GetExceptionName(), ": ",
-                             outcome.GetError().GetMessage());
-    }
+    Aws::Vector<Aws::Kinesis::Model::Shard> shards;
+    TF_RETURN_IF_ERROR(DescribeShards(client_.get(), stream_, &shards));
     Aws::String shard;
     Aws::String sequence;
     if (shard_ == "") {
-      if (outcome.GetResult().GetStreamDescription().GetShards().size() != 1) {
+      if (shards.size() != 1) {
         return errors::InvalidArgument(
             "shard has to be provided unless the stream only have one "
             "shard, there are ",
-            outcome.GetResult().GetStreamDescription().GetShards().size(),
-            " shards in stream ", stream_);
+            shards.size(), " shards in stream ", stream_);
       }
-      shard = outcome.GetResult()
-                  .GetStreamDescription()
-                  .GetShards()[0]
-                  .GetShardId();
-      sequence = outcome.GetResult()
-                     .GetStreamDescription()
-                     .GetShards()[0]
-                     .GetSequenceNumberRange()
-                     .GetStartingSequenceNumber();
+      shard = shards[0].GetShardId();
+      sequence = shards[0].GetSequenceNumberRange().GetStartingSequenceNumber();
     } else {
-      for (const auto& entry :
-           outcome.GetResult().GetStreamDescription().GetShards()) {
+      for (const auto& entry : shards) {
         if (entry.GetShardId() == shard_.c_str()) {
           shard = entry.GetShardId();
           sequence = entry.GetSequenceNumberRange().GetStartingSequenceNumber();
@@ -333,57 +372,74 @@ class KinesisReadableResource : public ResourceBase {
     iterator_ = iterator_outcome.GetResult().GetShardIterator();
     return OkStatus();
   }
-  Status Read(
-      std::function<Status(const TensorShape& shape, Tensor** timestamp_tensor,
-                           Tensor** data_tensor, Tensor** partition_tensor,
-                           Tensor** sequence_tensor)>
-          allocate_func) {
+  // Returns the next batch of records. An empty batch is returned once no
+  // records arrived for `idle_timeout` milliseconds, if set, or with
+  // `continue_fetch` set to 0 once the shard is closed and read to its end.
+  Status Read(std::function<
+              Status(const TensorShape& shape, Tensor** timestamp_tensor,
+                     Tensor** data_tensor, Tensor** partition_tensor,
+                     Tensor** sequence_tensor, Tensor** continue_fetch_tensor)>
+                  allocate_func) {
     mutex_lock l(mu_);
+    Tensor* timestamp_tensor;
+    Tensor* data_tensor;
+    Tensor* partition_tensor;
+    Tensor* sequence_tensor;
+    Tensor* continue_fetch_tensor;
+    int64 idle_micros = 0;
     do {
+      if (iterator_.empty() ||
+          (idle_timeout_ >= 0 && idle_micros >= idle_timeout_ * 1000)) {
+        // Either the shard was closed, e.g. by resharding, and has been read
+        // to its end, or nothing is available at the moment.
+        TF_RETURN_IF_ERROR(allocate_func(
+            TensorShape({0}), &timestamp_tensor, &data_tensor,
+            &partition_tensor, &sequence_tensor, &continue_fetch_tensor));
+        continue_fetch_tensor->scalar<int64>()() = iterator_.empty() ? 0 : 1;
+        return OkStatus();
+      }
       Aws::Kinesis::Model::GetRecordsRequest request;
       auto outcome = client_->GetRecords(
-          request.WithShardIterator(iterator_).WithLimit(1));
+          request.WithShardIterator(iterator_).WithLimit(limit_));
       if (!outcome.IsSuccess()) {
+        if (outcome.GetError().GetErrorType() ==
+            Aws::Kinesis::KinesisErrors::PROVISIONED_THROUGHPUT_EXCEEDED) {
+          idle_micros += Backoff();
+          continue;
+        }
         return errors::Unknown(outcome.GetError().GetExceptionName(), ": ",
                                outcome.GetError().GetMessage());
       }
-      if (outcome.GetResult().GetRecords().size() == 0) {
-        // TODO: break if option provided, as no records were returned then
-        // nothing is available at the moment.
-
-        // Otherwise continue the loop after a period of time.
-        env_->SleepForMicroseconds(interval_);
+      iterator_ = outcome.GetResult().GetNextShardIterator();
+      const auto& records = outcome.GetResult().GetRecords();
+      if (records.size() == 0) {
+        // Continue the loop after a period of time.
+        if (!iterator_.empty()) {
+          idle_micros += Backoff();
+        }
         continue;
       }
-      if (outcome.GetResult().GetRecords().size() != 1) {
-        return errors::Unknown("invalid number of records ",
-                               outcome.GetResult().GetRecords().size(),
-                               " returned");
+      interval_ = kMinReadIntervalMicros;
+
+      TF_RETURN_IF_ERROR(
+          allocate_func(TensorShape({static_cast<int64>(records.size())}),
+                        &timestamp_tensor, &data_tensor, &partition_tensor,
+                        &sequence_tensor, &continue_fetch_tensor));
+      continue_fetch_tensor->scalar<int64>()() = 1;
+      for (size_t i = 0; i < records.size(); i++) {
+        const auto& timestamp = records[i].GetApproximateArrivalTimestamp();
+        const auto& data = records[i].GetData();
+        const auto& partition = records[i].GetPartitionKey();
+        const auto& sequence = records[i].GetSequenceNumber();
+        timestamp_tensor->flat<int64>()(i) = timestamp.Millis();
+        data_tensor->flat<tstring>()(i) =
+            string(reinterpret_cast<const char*>(data.GetUnderlyingData()),
+                   data.GetLength());
+        partition_tensor->flat<tstring>()(i) =
+            string(partition.c_str(), partition.size());
+        sequence_tensor->flat<tstring>()(i) =
+            string(sequence.c_str(), sequence.size());
       }
-      iterator_ = outcome.GetResult().GetNextShardIterator();
-
-      Tensor* timestamp_tensor;
-      Tensor* data_tensor;
-      Tensor* partition_tensor;
-      Tensor* sequence_tensor;
-      TF_RETURN_IF_ERROR(allocate_func(TensorShape({1}), &timestamp_tensor,
-                                       &data_tensor, &partition_tensor,
-                                       &sequence_tensor));
-      const auto& timestamp =
-          outcome.GetResult().GetRecords()[0].GetApproximateArrivalTimestamp();
-      const auto& data = outcome.GetResult().GetRecords()[0].GetData();
-      const auto& partition =
-          outcome.GetResult().GetRecords()[0].GetPartitionKey();
-      const auto& sequence =
-          outcome.GetResult().GetRecords()[0].GetSequenceNumber();
-      timestamp_tensor->flat<int64>()(0) = timestamp.Millis();
-      data_tensor->flat<tstring>()(0) =
-          string(reinterpret_cast<const char*>(data.GetUnderlyingData()),
-                 data.GetLength());
-      partition_tensor->flat<tstring>()(0) =
-          string(partition.c_str(), partition.size());
-      sequence_tensor->flat<tstring>()(0) =
-          string(sequence.c_str(), sequence.size());
       return OkStatus();
     } while (true);
     return OkStatus();
@@ -394,6 +450,15 @@ class KinesisReadableResource : public ResourceBase {
   }
 
  protected:
+  // Waits before polling the shard again, twice as long as the last time,
+  // and returns the time waited.
+  int64 Backoff() TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    const int64 interval = interval_;
+    env_->SleepForMicroseconds(interval);
+    interval_ = std::min(interval_ * 2, kMaxReadIntervalMicros);
+    return interval;
+  }
+
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
   string stream_ TF_GUARDED_BY(mu_);
@@ -401,6 +466,8 @@ class KinesisReadableResource : public ResourceBase {
   Aws::String iterator_ TF_GUARDED_BY(mu_);
   std::unique_ptr<Aws::Kinesis::KinesisClient, decltype(&ShutdownClient)>
       client_ TF_GUARDED_BY(mu_);
+  int64 limit_ TF_GUARDED_BY(mu_);
+  int64 idle_timeout_ TF_GUARDED_BY(mu_);
   int64 interval_ TF_GUARDED_BY(mu_);
 };
 
@@ -456,7 +523,8 @@ class KinesisReadableReadOp : public OpKernel {
         context,
         resource->Read([&](const TensorShape& shape, Tensor** timestamp_tensor,
                            Tensor** data_tensor, Tensor** partition_tensor,
-                           Tensor** sequence_tensor) -> Status {
+                           Tensor** sequence_tensor,
+                           Tensor** continue_fetch_tensor) -> Status {
           TF_RETURN_IF_ERROR(
               context->allocate_output(0, shape, timestamp_tensor));
           TF_RETURN_IF_ERROR(context->allocate_output(1, shape, data_tensor));
@@ -464,6 +532,8 @@ class KinesisReadableReadOp : public OpKernel {
               context->allocate_output(2, shape, partition_tensor));
           TF_RETURN_IF_ERROR(
               context->allocate_output(3, shape, sequence_tensor));
+          TF_RETURN_IF_ERROR(context->allocate_output(4, TensorShape({}),
+                                                      continue_fetch_tensor));
           return OkStatus();
         }));
   }
@@ -472,10 +542,41 @@ class KinesisReadableReadOp : public OpKernel {
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
 };
+class KinesisReadableShardsOp : public OpKernel {
+ public:
+  explicit KinesisReadableShardsOp(OpKernelConstruction* context)
+      : OpKernel(context) {}
+
+  void Compute(OpKernelContext* context) override {
+    const Tensor* input_tensor;
+    OP_REQUIRES_OK(context, context->input("input", &input_tensor));
+    const string& input = input_tensor->scalar<tstring>()();
+
+    AwsInitAPI();
+    std::unique_ptr<Aws::Kinesis::KinesisClient, decltype(&ShutdownClient)>
+        client(new Aws::Kinesis::KinesisClient(GetDefaultClientConfig()),
+               ShutdownClient);
+
+    Aws::Vector<Aws::Kinesis::Model::Shard> shards;
+    OP_REQUIRES_OK(context, DescribeShards(client.get(), input, &shards));
+
+    Tensor* shards_tensor = nullptr;
+    OP_REQUIRES_OK(context,
+                   context->allocate_output(
+                       0, TensorShape({static_cast<int64>(shards.size())}),
+                       &shards_tensor));
+    for (size_t i = 0; i < shards.size(); i++) {
+      const auto& shard = shards[i].GetShardId();
+      shards_tensor->flat<tstring>()(i) = string(shard.c_str(), shard.size());
+    }
+  }
+};
 REGISTER_KERNEL_BUILDER(Name("IO>KinesisReadableInit").Device(DEVICE_CPU),
                         KinesisReadableInitOp);
 REGISTER_KERNEL_BUILDER(Name("IO>KinesisReadableRead").Device(DEVICE_CPU),
                         KinesisReadableReadOp);
+REGISTER_KERNEL_BUILDER(Name("IO>KinesisReadableShards").Device(DEVICE_CPU),
+                        KinesisReadableShardsOp);
 
 }  // namespace
 }  // namespace data
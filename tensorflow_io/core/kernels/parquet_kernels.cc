@@ -139,6 +139,9 @@ class ParquetReadableResource : public ResourceBase {
     int64 element_start = start[0];
     int64 element_stop = start[0] + shape.dim_size(0);
 
+    TF_RETURN_IF_ERROR(
+        PrefetchColumn(column_index, element_start, element_stop));
+
     int64 row_group_offset = 0;
     for (int row_group = 0; row_group < parquet_metadata_->num_row_groups();
          row_group++) {
@@ -284,6 +287,48 @@ class ParquetReadableResource : public ResourceBase {
   string DebugString() const override { return "ParquetReadableResource"; }
 
  protected:
+  // Fetches the chunks of `column_index` in all row groups overlapping
+  // [element_start, element_stop) with one vectored read, so that the row
+  // groups are downloaded concurrently rather than one after another.
+  Status PrefetchColumn(int64 column_index, int64 element_start,
+                        int64 element_stop) TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    std::vector<arrow::io::ReadRange> ranges;
+    int64 row_group_offset = 0;
+    for (int row_group = 0; row_group < parquet_metadata_->num_row_groups();
+         row_group++) {
+      std::unique_ptr<parquet::RowGroupMetaData> row_group_metadata =
+          parquet_metadata_->RowGroup(row_group);
+      const int64 num_rows = row_group_metadata->num_rows();
+      if (row_group_offset + num_rows >= element_start &&
+          row_group_offset < element_stop) {
+        std::unique_ptr<parquet::ColumnChunkMetaData> column_metadata =
+            row_group_metadata->ColumnChunk(column_index);
+        // Same range as parquet's ComputeColumnChunkRange, including the
+        // padding some writers need to read the dictionary page header.
+        int64 column_start = column_metadata->data_page_offset();
+        if (column_metadata->has_dictionary_page() &&
+            column_metadata->dictionary_page_offset() > 0 &&
+            column_metadata->dictionary_page_offset() < column_start) {
+          column_start = column_metadata->dictionary_page_offset();
+        }
+        int64 column_length = column_metadata->total_compressed_size() + 100;
+        if (column_start + column_length > static_cast<int64>(file_size_)) {
+          column_length = file_size_ - column_start;
+        }
+        ranges.push_back(arrow::io::ReadRange{column_start, column_length});
+      }
+      row_group_offset += num_rows;
+    }
+    if (ranges.size() < 2) {
+      return OkStatus();
+    }
+    arrow::Status status = parquet_file_->WillNeed(ranges);
+    if (!status.ok()) {
+      return errors::Internal(status.ToString());
+    }
+    return OkStatus();
+  }
+
   mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
   std::unique_ptr<SizedRandomAccessFile> file_ TF_GUARDED_BY(mu_);
@@ -21,6 +21,10 @@ limitations under the License.
 #include <Windows.h>
 #undef OPTIONAL
 #endif
+#include <algorithm>
+#include <chrono>
+#include <vector>
+
 #include "absl/time/clock.h"
 #include "google/pubsub/v1/pubsub.grpc.pb.h"
 #include "tensorflow/core/framework/resource_mgr.h"
@@ -31,15 +35,46 @@ namespace data {
 namespace {
 
 using google::pubsub::v1::AcknowledgeRequest;
+using google::pubsub::v1::ModifyAckDeadlineRequest;
 using google::pubsub::v1::PullRequest;
 using google::pubsub::v1::PullResponse;
+using google::pubsub::v1::ReceivedMessage;
+using google::pubsub::v1::StreamingPullRequest;
+using google::pubsub::v1::StreamingPullResponse;
 using google::pubsub::v1::Subscriber;
 using grpc::ClientContext;
 
+// The most messages returned by one pull, by default.
+constexpr int64 kDefaultMaxMessages = 1000;
+// The ack deadline, in seconds, that messages still in the input pipeline
+// are kept extended to.
+constexpr int64 kDefaultAckDeadlineSeconds = 60;
+// The most ack ids sent in one Acknowledge or ModifyAckDeadline request.
+constexpr size_t kMaxAckIds = 2500;
+// The interval at which pending acks are sent.
+constexpr int64 kAckIntervalMs = 100;
+// The interval at which the ack deadline of outstanding messages is extended,
+// half of the shortest ack deadline of a subscription.
+constexpr uint64 kAckExtensionIntervalMicros = 5000000;
+
 class PubSubReadableResource : public ResourceBase {
  public:
   PubSubReadableResource(Env* env) : env_(env) {}
-  ~PubSubReadableResource() {}
+  ~PubSubReadableResource() {
+    if (ack_thread_ != nullptr) {
+      {
+        mutex_lock l(ack_mu_);
+        stopping_ = true;
+        ack_cv_.notify_all();
+      }
+      // Joins the thread once the pending acks are sent.
+      ack_thread_.reset();
+    }
+    if (stream_ != nullptr) {
+      stream_context_->TryCancel();
+      stream_->Finish();
+    }
+  }
 
   Status Init(const string& input, const std::vector<string>& metadata) {
     mutex_lock l(mu_);
@@ -47,6 +82,9 @@ class PubSubReadableResource : public ResourceBase {
     endpoint_ = "";
     subscription_ = input;
     timeout_ = 10 * 1000;
+    max_messages_ = kDefaultMaxMessages;
+    ack_deadline_ = kDefaultAckDeadlineSeconds;
+    streaming_ = false;
     for (size_t i = 0; i < metadata.size(); i++) {
       if (metadata[i].find("endpoint=") == 0) {
         std::vector<string> parts = str_util::Split(metadata[i], "=");
@@ -61,6 +99,30 @@ class PubSubReadableResource : public ResourceBase {
           return errors::InvalidArgument("invalid configuration: ",
                                          metadata[i]);
         }
+      } else if (metadata[i].find("max_messages=") == 0) {
+        std::vector<string> parts = str_util::Split(metadata[i], "=");
+        if (parts.size() != 2 ||
+            !strings::safe_strto64(parts[1], &max_messages_) ||
+            max_messages_ <= 0) {
+          return errors::InvalidArgument("invalid configuration: ",
+                                         metadata[i]);
+        }
+      } else if (metadata[i].find("ack_deadline=") == 0) {
+        std::vector<string> parts = str_util::Split(metadata[i], "=");
+        if (parts.size() != 2 ||
+            !strings::safe_strto64(parts[1], &ack_deadline_) ||
+            ack_deadline_ < 10 || ack_deadline_ > 600) {
+          return errors::InvalidArgument(
+              "invalid configuration: ", metadata[i],
+              ", ack deadline must be between 10 and 600 seconds");
+        }
+      } else if (metadata[i].find("streaming=") == 0) {
+        std::vector<string> parts = str_util::Split(metadata[i], "=");
+        if (parts.size() != 2 || (parts[1] != "true" && parts[1] != "false")) {
+          return errors::InvalidArgument("invalid configuration: ",
+                                         metadata[i]);
+        }
+        streaming_ = (parts[1] == "true");
       }
     }
     string endpoint = endpoint_;
@@ -74,63 +136,64 @@ class PubSubReadableResource : public ResourceBase {
     }
     stub_ = Subscriber::NewStub(grpc::CreateChannel(endpoint, creds));
 
+    ack_thread_.reset(env_->StartThread(ThreadOptions(), "pubsub_acknowledge",
+                                        [this]() { AckLoop(); }));
+
     return OkStatus();
   }
   Status Read(std::function<Status(const TensorShape& shape, Tensor** id_tensor,
                                    Tensor** data_tensor, Tensor** time_tensor)>
                   allocate_func) {
     mutex_lock l(mu_);
-    if (stub_.get() == nullptr) {
+    if (eof_) {
       return errors::OutOfRange("EOF reached");
     }
-    ClientContext context;
-    if (timeout_ > 0) {
-      std::chrono::system_clock::time_point deadline =
-          std::chrono::system_clock::now() +
-          std::chrono::milliseconds(timeout_);
-      context.set_deadline(deadline);
+    {
+      // The messages of the last batch have been handed to the input
+      // pipeline by now, so they are acknowledged.
+      mutex_lock ack_l(ack_mu_);
+      ack_ids_.insert(ack_ids_.end(), outstanding_ack_ids_.begin(),
+                      outstanding_ack_ids_.end());
+      outstanding_ack_ids_.clear();
+      ack_cv_.notify_all();
     }
     Tensor* id_tensor;
     Tensor* data_tensor;
     Tensor* time_tensor;
     while (true) {
-      PullRequest request;
-      request.set_subscription(subscription_);
-      request.set_max_messages(1);
-      PullResponse response;
-      auto status = stub_->Pull(&context, request, &response);
-      if (!status.ok()) {
-        return errors::Internal("Failed to receive message: ",
-                                status.error_message());
+      google::protobuf::RepeatedPtrField<ReceivedMessage> messages;
+      if (streaming_) {
+        TF_RETURN_IF_ERROR(StreamingPull(&messages));
+      } else {
+        TF_RETURN_IF_ERROR(Pull(&messages));
       }
-      if (response.received_messages().size() == 0 && timeout_ > 0) {
+      if (messages.size() == 0 && timeout_ > 0) {
         // break subscription if there is a timeout, and no message.
         TF_RETURN_IF_ERROR(allocate_func(TensorShape({0}), &id_tensor,
                                          &data_tensor, &time_tensor));
-        stub_.reset(nullptr);
+        eof_ = true;
         return OkStatus();
       }
-      if (response.received_messages().size() != 0) {
-        TF_RETURN_IF_ERROR(allocate_func(TensorShape({1}), &id_tensor,
-                                         &data_tensor, &time_tensor));
-        id_tensor->scalar<tstring>()() =
-            std::string((response.received_messages(0).message().message_id()));
-        data_tensor->scalar<tstring>()() =
-            std::string((response.received_messages(0).message().data()));
-        time_tensor->scalar<int64>()() =
-            response.received_messages(0).message().publish_time().seconds() *
-                1000 +
-            response.received_messages(0).message().publish_time().nanos() /
-                1000000;
-
-        // Acknowledge
-        AcknowledgeRequest acknowledge;
-        acknowledge.add_ack_ids(response.received_messages(0).ack_id());
-        acknowledge.set_subscription(subscription_);
-        google::protobuf::Empty empty;
-        ClientContext ack_context;
-        status = stub_->Acknowledge(&ack_context, acknowledge, &empty);
+      if (messages.size() != 0) {
+        TF_RETURN_IF_ERROR(allocate_func(TensorShape({messages.size()}),
+                                         &id_tensor, &data_tensor,
+                                         &time_tensor));
+        std::vector<string> ack_ids;
+        for (int i = 0; i < messages.size(); i++) {
+          const auto& message = messages.Get(i).message();
+          id_tensor->flat<tstring>()(i) = message.message_id();
+          data_tensor->flat<tstring>()(i) = message.data();
+          time_tensor->flat<int64>()(i) =
+              message.publish_time().seconds() * 1000 +
+              message.publish_time().nanos() / 1000000;
+          ack_ids.push_back(messages.Get(i).ack_id());
+        }
 
+        // Acknowledged by the next read, in the meantime the ack deadline
+        // of the messages is extended.
+        mutex_lock ack_l(ack_mu_);
+        outstanding_ack_ids_ = std::move(ack_ids);
+        outstanding_micros_ = env_->NowMicros();
         return OkStatus();
       }
     }
@@ -142,15 +205,163 @@ class PubSubReadableResource : public ResourceBase {
   }
 
  protected:
+  Status Pull(google::protobuf::RepeatedPtrField<ReceivedMessage>* messages)
+      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    ClientContext context;
+    if (timeout_ > 0) {
+      std::chrono::system_clock::time_point deadline =
+          std::chrono::system_clock::now() +
+          std::chrono::milliseconds(timeout_);
+      context.set_deadline(deadline);
+    }
+    PullRequest request;
+    request.set_subscription(subscription_);
+    request.set_max_messages(max_messages_);
+    PullResponse response;
+    auto status = stub_->Pull(&context, request, &response);
+    if (!status.ok()) {
+      return errors::Internal("Failed to receive message: ",
+                              status.error_message());
+    }
+    messages->Swap(response.mutable_received_messages());
+    return OkStatus();
+  }
+
+  // Receives the next messages of the stream, or none if none arrived within
+  // the timeout.
+  Status StreamingPull(
+      google::protobuf::RepeatedPtrField<ReceivedMessage>* messages)
+      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (stream_ == nullptr) {
+      stream_context_.reset(new ClientContext());
+      stream_ = stub_->StreamingPull(stream_context_.get());
+      StreamingPullRequest request;
+      request.set_subscription(subscription_);
+      request.set_stream_ack_deadline_seconds(ack_deadline_);
+      if (!stream_->Write(request)) {
+        return errors::Internal("Failed to start streaming pull: ",
+                                stream_->Finish().error_message());
+      }
+    }
+    {
+      // The read is cancelled by the ack thread once the timeout expires.
+      mutex_lock ack_l(ack_mu_);
+      if (timeout_ > 0) {
+        stream_read_context_ = stream_context_.get();
+        stream_read_deadline_micros_ = env_->NowMicros() + timeout_ * 1000;
+      }
+      stream_timed_out_ = false;
+    }
+    StreamingPullResponse response;
+    const bool ok = stream_->Read(&response);
+    bool timed_out;
+    {
+      mutex_lock ack_l(ack_mu_);
+      stream_read_context_ = nullptr;
+      timed_out = stream_timed_out_;
+    }
+    if (!ok) {
+      auto status = stream_->Finish();
+      stream_.reset();
+      stream_context_.reset();
+      if (timed_out) {
+        return OkStatus();
+      }
+      return errors::Internal("Failed to receive message: ",
+                              status.error_message());
+    }
+    messages->Swap(response.mutable_received_messages());
+    return OkStatus();
+  }
+
+  // Sends the pending acks in batches, and extends the ack deadline of the
+  // outstanding messages, until the resource is destroyed.
+  void AckLoop() TF_NO_THREAD_SAFETY_ANALYSIS {
+    bool stopping = false;
+    while (!stopping) {
+      std::vector<string> ack_ids;
+      std::vector<string> extend_ack_ids;
+      {
+        mutex_lock l(ack_mu_);
+        if (!stopping_ && ack_ids_.size() < kMaxAckIds) {
+          WaitForMilliseconds(&l, &ack_cv_, kAckIntervalMs);
+        }
+        stopping = stopping_;
+        const uint64 now = env_->NowMicros();
+        if (stream_read_context_ != nullptr &&
+            now >= stream_read_deadline_micros_) {
+          stream_read_context_->TryCancel();
+          stream_read_context_ = nullptr;
+          stream_timed_out_ = true;
+        }
+        ack_ids.swap(ack_ids_);
+        if (!outstanding_ack_ids_.empty() &&
+            now - outstanding_micros_ >= kAckExtensionIntervalMicros) {
+          extend_ack_ids = outstanding_ack_ids_;
+          outstanding_micros_ = now;
+        }
+      }
+      for (size_t i = 0; i < ack_ids.size(); i += kMaxAckIds) {
+        AcknowledgeRequest request;
+        request.set_subscription(subscription_);
+        for (size_t j = i; j < std::min(ack_ids.size(), i + kMaxAckIds); j++) {
+          request.add_ack_ids(ack_ids[j]);
+        }
+        google::protobuf::Empty empty;
+        ClientContext context;
+        auto status = stub_->Acknowledge(&context, request, &empty);
+        if (!status.ok()) {
+          LOG(ERROR) << "Failed to acknowledge " << request.ack_ids_size()
+                     << " messages: " << status.error_message();
+        }
+      }
+      for (size_t i = 0; i < extend_ack_ids.size(); i += kMaxAckIds) {
+        ModifyAckDeadlineRequest request;
+        request.set_subscription(subscription_);
+        request.set_ack_deadline_seconds(ack_deadline_);
+        for (size_t j = i; j < std::min(extend_ack_ids.size(), i + kMaxAckIds);
+             j++) {
+          request.add_ack_ids(extend_ack_ids[j]);
+        }
+        google::protobuf::Empty empty;
+        ClientContext context;
+        auto status = stub_->ModifyAckDeadline(&context, request, &empty);
+        if (!status.ok()) {
+          LOG(ERROR) << "Failed to extend the ack deadline of "
+                     << request.ack_ids_size()
+                     << " messages: " << status.error_message();
+        }
+      }
+    }
+  }
+
   mutable mutex mu_;
   Env* env_ TF_GUARDED_BY(mu_);
   string subscription_ TF_GUARDED_BY(mu_);
   string endpoint_ TF_GUARDED_BY(mu_);
   int64 timeout_ TF_GUARDED_BY(mu_);
+  int64 max_messages_ TF_GUARDED_BY(mu_);
+  int64 ack_deadline_ TF_GUARDED_BY(mu_);
+  bool streaming_ TF_GUARDED_BY(mu_);
+  bool eof_ TF_GUARDED_BY(mu_) = false;
   std::unique_ptr<Subscriber::Stub> stub_ TF_GUARDED_BY(mu_);
-  string message_id_ TF_GUARDED_BY(mu_);
-  string message_data_ TF_GUARDED_BY(mu_);
-  int64 message_time_ TF_GUARDED_BY(mu_);
+  std::unique_ptr<ClientContext> stream_context_ TF_GUARDED_BY(mu_);
+  std::unique_ptr<
+      grpc::ClientReaderWriter<StreamingPullRequest, StreamingPullResponse>>
+      stream_ TF_GUARDED_BY(mu_);
+
+  // The acks are sent by `ack_thread_`, which only reads the fields above
+  // that are set once in `Init`.
+  mutex ack_mu_;
+  condition_variable ack_cv_;
+  std::vector<string> ack_ids_ TF_GUARDED_BY(ack_mu_);
+  std::vector<string> outstanding_ack_ids_ TF_GUARDED_BY(ack_mu_);
+  uint64 outstanding_micros_ TF_GUARDED_BY(ack_mu_) = 0;
+  ClientContext* stream_read_context_ TF_GUARDED_BY(ack_mu_) = nullptr;
+  uint64 stream_read_deadline_micros_ TF_GUARDED_BY(ack_mu_) = 0;
+  bool stream_timed_out_ TF_GUARDED_BY(ack_mu_) = false;
+  bool stopping_ TF_GUARDED_BY(ack_mu_) = false;
+  std::unique_ptr<Thread> ack_thread_;
 };
 
 class PubSubReadableInitOp : public ResourceOpKernel<PubSubReadableResource> {
@@ -13,6 +13,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 ==============================================================================*/
 
+#include <map>
+#include <memory>
+
 #include "pulsar/Client.h"
 #include "tensorflow/core/framework/resource_mgr.h"
 #include "tensorflow/core/framework/resource_op_kernel.h"
@@ -44,14 +47,26 @@ class PulsarResourceBase : public ResourceBase {
 class PulsarReadableResource final : public PulsarResourceBase {
  public:
   Status Init(const std::string& service_url, const std::string& topic,
-              const std::string& subscription, int64 ack_grouping_time) {
+              const std::string& subscription, int64 ack_grouping_time,
+              int64 max_messages, int64 max_bytes, int64 receive_timeout,
+              const std::string& ack_mode) {
     mutex_lock l(mu_);
     PulsarResourceBase::Init(service_url);
+    cumulative_ack_ = (ack_mode == "cumulative");
 
     pulsar::ConsumerConfiguration conf;
     conf.setConsumerType(pulsar::ConsumerFailover);
     conf.setSubscriptionInitialPosition(pulsar::InitialPositionEarliest);
     conf.setAckGroupingTimeMs(ack_grouping_time);
+    // A batch is received once it holds `max_messages` messages or
+    // `max_bytes` bytes, or after `receive_timeout` milliseconds. A
+    // `max_bytes` of 0 does not limit the size of a batch.
+    conf.setBatchReceivePolicy(pulsar::BatchReceivePolicy(
+        max_messages, max_bytes > 0 ? max_bytes : -1, receive_timeout));
+    // The batches are bounded by the receiver queue.
+    if (max_messages > conf.getReceiverQueueSize()) {
+      conf.setReceiverQueueSize(max_messages);
+    }
 
     auto result = client_->subscribe(topic, subscription, conf, consumer_);
     if (result != pulsar::ResultOk) {
@@ -71,37 +86,23 @@ class PulsarReadableResource final : public PulsarResourceBase {
                   allocate_func) {
     mutex_lock l(mu_);
 
-    constexpr size_t max_num_messages = 1024;
-    std::vector<std::string> values;
-    std::vector<std::string> keys;
-    values.reserve(max_num_messages);
-    keys.reserve(max_num_messages);
-
+    // Every batch receive waits for up to the receive timeout of the batch
+    // receive policy, which is `poll_timeout`.
+    pulsar::Messages messages;
     int32 elapsed_time = 0;
-    int num_messages = 0;
-    while (elapsed_time < timeout && num_messages < max_num_messages) {
-      pulsar::Message message;
-      auto result = consumer_.receive(message, poll_timeout);
-      if (result == pulsar::ResultOk) {
-        keys.emplace_back(message.hasPartitionKey() ? message.getPartitionKey()
-                                                    : "");
-        values.emplace_back(message.getDataAsString());
-        num_messages++;
-        elapsed_time = 0;  // reset the current timeout
-        consumer_.acknowledgeAsync(message, [&](pulsar::Result result) {
-          if (result != pulsar::ResultOk) {
-            LOG(ERROR) << "Failed to acknowledge " << message.getMessageId();
-          }
-        });
-      } else if (result == pulsar::ResultTimeout) {
-        elapsed_time += poll_timeout;
-      } else {
+    while (elapsed_time < timeout) {
+      auto result = consumer_.batchReceive(messages);
+      if (result != pulsar::ResultOk && result != pulsar::ResultTimeout) {
         return errors::Internal("failed to receive messages, error: ",
                                 pulsar::strResult(result));
       }
+      if (!messages.empty()) {
+        break;
+      }
+      elapsed_time += poll_timeout;
     }
 
-    TensorShape shape({static_cast<int32>(values.size())});
+    TensorShape shape({static_cast<int64>(messages.size())});
     Tensor* value_tensor;
     Tensor* key_tensor;
     Tensor* continue_fetch_tensor;
@@ -110,25 +111,69 @@ class PulsarReadableResource final : public PulsarResourceBase {
 
     // If no messages were received when timeout exceeded, we treat it as a
     // failure and don't continue receiving messages.
-    continue_fetch_tensor->scalar<int64>()() = (values.empty() ? 0 : 1);
-    for (size_t i = 0; i < values.size(); i++) {
-      value_tensor->flat<tstring>()(i) = values[i];
-      key_tensor->flat<tstring>()(i) = keys[i];
+    continue_fetch_tensor->scalar<int64>()() = (messages.empty() ? 0 : 1);
+    for (size_t i = 0; i < messages.size(); i++) {
+      value_tensor->flat<tstring>()(i) = messages[i].getDataAsString();
+      key_tensor->flat<tstring>()(i) =
+          messages[i].hasPartitionKey() ? messages[i].getPartitionKey() : "";
     }
 
+    if (!messages.empty()) {
+      Acknowledge(messages);
+    }
     return OkStatus();
   }
 
   std::string DebugString() const override { return "PulsarReadableResource"; }
 
  private:
+  // Acknowledges a batch of messages asynchronously, either every message or,
+  // with cumulative acks, the last message of every topic partition.
+  void Acknowledge(const pulsar::Messages& messages)
+      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (cumulative_ack_) {
+      std::map<std::string, pulsar::MessageId> last_ids;
+      for (const auto& message : messages) {
+        last_ids[message.getTopicName()] = message.getMessageId();
+      }
+      for (const auto& entry : last_ids) {
+        consumer_.acknowledgeCumulativeAsync(
+            entry.second, [id = entry.second](pulsar::Result result) {
+              if (result != pulsar::ResultOk) {
+                LOG(ERROR) << "Failed to acknowledge messages up to " << id
+                           << ": " << pulsar::strResult(result);
+              }
+            });
+      }
+      return;
+    }
+    pulsar::MessageIdList ids;
+    ids.reserve(messages.size());
+    for (const auto& message : messages) {
+      ids.push_back(message.getMessageId());
+    }
+    consumer_.acknowledgeAsync(ids, [size = ids.size()](pulsar::Result result) {
+      if (result != pulsar::ResultOk) {
+        LOG(ERROR) << "Failed to acknowledge " << size
+                   << " messages: " << pulsar::strResult(result);
+      }
+    });
+  }
+
   pulsar::Consumer consumer_;
+  bool cumulative_ack_ = false;
 };
 
 class PulsarReadableInitOp : public ResourceOpKernel<PulsarReadableResource> {
  public:
   explicit PulsarReadableInitOp(OpKernelConstruction* context)
-      : ResourceOpKernel<PulsarReadableResource>(context) {}
+      : ResourceOpKernel<PulsarReadableResource>(context) {
+    OP_REQUIRES_OK(context, context->GetAttr("max_messages", &max_messages_));
+    OP_REQUIRES_OK(context, context->GetAttr("max_bytes", &max_bytes_));
+    OP_REQUIRES_OK(context,
+                   context->GetAttr("receive_timeout", &receive_timeout_));
+    OP_REQUIRES_OK(context, context->GetAttr("ack_mode", &ack_mode_));
+  }
 
  private:
   void Compute(OpKernelContext* context) override {
@@ -153,8 +198,10 @@ class PulsarReadableInitOp : public ResourceOpKernel<PulsarReadableResource> {
                                            &ack_grouping_time_tensor));
     const int64 ack_grouping_time = ack_grouping_time_tensor->scalar<int64>()();
 
-    OP_REQUIRES_OK(context, resource_->Init(service_url, topic, subscription,
-                                            ack_grouping_time));
+    OP_REQUIRES_OK(context,
+                   resource_->Init(service_url, topic, subscription,
+                                   ack_grouping_time, max_messages_, max_bytes_,
+                                   receive_timeout_, ack_mode_));
   }
 
   Status CreateResource(PulsarReadableResource** resource)
@@ -165,6 +212,10 @@ class PulsarReadableInitOp : public ResourceOpKernel<PulsarReadableResource> {
 
  private:
   mutable mutex mu_;
+  int64 max_messages_;
+  int64 max_bytes_;
+  int64 receive_timeout_;
+  std::string ack_mode_;
 };
 
 class PulsarReadableNextOp : public OpKernel {
@@ -207,14 +258,43 @@ class PulsarReadableNextOp : public OpKernel {
 
 class PulsarWritableResource final : public PulsarResourceBase {
  public:
-  Status Init(const std::string& service_url, const std::string& topic) {
+  Status Init(const std::string& service_url, const std::string& topic,
+              int64 batching_max_messages, int64 batching_max_publish_delay_ms,
+              const std::string& compression, int64 max_pending_messages) {
     mutex_lock l(mu_);
     PulsarResourceBase::Init(service_url);
     index_ = 0;
+    send_error_ = std::make_shared<SendError>();
 
     pulsar::ProducerConfiguration conf;
     conf.setPartitionsRoutingMode(
         pulsar::ProducerConfiguration::RoundRobinDistribution);
+    // The options left at -1 (or 0 for `max_pending_messages`) keep the
+    // defaults of the pulsar client.
+    if (batching_max_messages >= 0) {
+      conf.setBatchingEnabled(batching_max_messages > 1);
+      if (batching_max_messages > 1) {
+        conf.setBatchingMaxMessages(batching_max_messages);
+      }
+    }
+    if (batching_max_publish_delay_ms >= 0) {
+      conf.setBatchingMaxPublishDelayMs(batching_max_publish_delay_ms);
+    }
+    if (compression == "lz4") {
+      conf.setCompressionType(pulsar::CompressionLZ4);
+    } else if (compression == "zlib") {
+      conf.setCompressionType(pulsar::CompressionZLib);
+    } else if (compression == "zstd") {
+      conf.setCompressionType(pulsar::CompressionZSTD);
+    } else if (compression == "snappy") {
+      conf.setCompressionType(pulsar::CompressionSNAPPY);
+    }
+    // Once `max_pending_messages` messages wait for their receipt, sending
+    // blocks rather than fails.
+    if (max_pending_messages > 0) {
+      conf.setMaxPendingMessages(max_pending_messages);
+      conf.setBlockIfQueueFull(true);
+    }
 
     auto result = client_->createProducer(topic, conf, producer_);
     if (result != pulsar::ResultOk) {
@@ -228,27 +308,19 @@ class PulsarWritableResource final : public PulsarResourceBase {
 
   Status WriteAsync(const std::string& value, const std::string& key) {
     mutex_lock l(mu_);
-    pulsar::MessageBuilder builder;
-    if (!key.empty()) {
-      builder.setPartitionKey(key);
-    }
-    auto send_async_result = pulsar::ResultOk;
-    producer_.sendAsync(
-        builder.setContent(value).build(),
-        [index = index_, &send_async_result](pulsar::Result result,
-                                             const pulsar::MessageId& id) {
-          if (result != pulsar::ResultOk) {
-            LOG(ERROR) << "failed to send message-" << index << ": " << result;
-          }
-          send_async_result = result;
-        });
-    // sendAsync may fail immediately caused by queue is full
-    if (send_async_result != pulsar::ResultOk) {
-      return errors::Internal("sendAsync failed for index: ", index_,
-                              " error: ", pulsar::strResult(send_async_result));
+    SendAsync(value, key);
+    return send_error_->Get();
+  }
+
+  // Sends every value, with the key of the same index if `keys` is not empty,
+  // asynchronously.
+  Status WriteBatchAsync(const Tensor& values, const Tensor& keys) {
+    mutex_lock l(mu_);
+    for (int64 i = 0; i < values.NumElements(); i++) {
+      SendAsync(values.flat<tstring>()(i),
+                keys.NumElements() > 0 ? keys.flat<tstring>()(i) : "");
     }
-    index_++;
-    return OkStatus();
+    return send_error_->Get();
   }
 
   Status Flush() {
@@ -257,20 +329,73 @@ class PulsarWritableResource final : public PulsarResourceBase {
     if (result != pulsar::ResultOk) {
       return errors::Internal("failed to flush: ", pulsar::strResult(result));
     }
-    return OkStatus();
+    return send_error_->Get();
   }
 
   std::string DebugString() const override { return "PulsarWritableResource"; }
 
  private:
+  // The first failure of the messages sent asynchronously, shared with their
+  // send callbacks which may outlive the resource.
+  class SendError {
+   public:
+    void Set(unsigned long index, pulsar::Result result) {
+      mutex_lock l(mu_);
+      if (result_ == pulsar::ResultOk) {
+        index_ = index;
+        result_ = result;
+      }
+    }
+    Status Get() {
+      mutex_lock l(mu_);
+      if (result_ == pulsar::ResultOk) {
+        return OkStatus();
+      }
+      return errors::Internal("sendAsync failed for index: ", index_,
+                              " error: ", pulsar::strResult(result_));
+    }
+
+   private:
+    mutex mu_;
+    unsigned long index_ TF_GUARDED_BY(mu_) = 0;
+    pulsar::Result result_ TF_GUARDED_BY(mu_) = pulsar::ResultOk;
+  };
+
+  void SendAsync(const std::string& value, const std::string& key)
+      TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    pulsar::MessageBuilder builder;
+    if (!key.empty()) {
+      builder.setPartitionKey(key);
+    }
+    producer_.sendAsync(
+        builder.setContent(value).build(),
+        [index = index_, send_error = send_error_](
+            pulsar::Result result, const pulsar::MessageId& id) {
+          if (result != pulsar::ResultOk) {
+            LOG(ERROR) << "failed to send message-" << index << ": " << result;
+            send_error->Set(index, result);
+          }
+        });
+    index_++;
+  }
+
   pulsar::Producer producer_;
   unsigned long index_;
+  std::shared_ptr<SendError> send_error_;
 };
 
 class PulsarWritableInitOp : public ResourceOpKernel<PulsarWritableResource> {
  public:
   explicit PulsarWritableInitOp(OpKernelConstruction* context)
-      : ResourceOpKernel<PulsarWritableResource>(context) {}
+      : ResourceOpKernel<PulsarWritableResource>(context) {
+    OP_REQUIRES_OK(context, context->GetAttr("batching_max_messages",
+                                             &batching_max_messages_));
+    OP_REQUIRES_OK(context, context->GetAttr("batching_max_publish_delay_ms",
+                                             &batching_max_publish_delay_ms_));
+    OP_REQUIRES_OK(context, context->GetAttr("compression", &compression_));
+    OP_REQUIRES_OK(context, context->GetAttr("max_pending_messages",
+                                             &max_pending_messages_));
+  }
 
  private:
   void Compute(OpKernelContext* context) override {
@@ -284,7 +409,10 @@ class PulsarWritableInitOp : public ResourceOpKernel<PulsarWritableResource> {
     OP_REQUIRES_OK(context, context->input("topic", &topic_tensor));
     const std::string topic = topic_tensor->flat<tstring>()(0);
 
-    OP_REQUIRES_OK(context, resource_->Init(service_url, topic));
+    OP_REQUIRES_OK(context,
+                   resource_->Init(service_url, topic, batching_max_messages_,
+                                   batching_max_publish_delay_ms_, compression_,
+                                   max_pending_messages_));
   }
 
   Status CreateResource(PulsarWritableResource** resource)
@@ -295,6 +423,10 @@ class PulsarWritableInitOp : public ResourceOpKernel<PulsarWritableResource> {
 
  private:
   mutable mutex mu_;
+  int64 batching_max_messages_;
+  int64 batching_max_publish_delay_ms_;
+  std::string compression_;
+  int64 max_pending_messages_;
 };
 
 class PulsarWritableWriteOp : public OpKernel {
@@ -322,6 +454,42 @@ class PulsarWritableWriteOp : public OpKernel {
   }
 };
 
+class PulsarWritableWriteBatchOp : public OpKernel {
+ public:
+  explicit PulsarWritableWriteBatchOp(OpKernelConstruction* context)
+      : OpKernel(context) {}
+
+ private:
+  void Compute(OpKernelContext* context) override {
+    PulsarWritableResource* resource;
+
+    OP_REQUIRES_OK(context,
+                   GetResourceFromContext(context, "input", &resource));
+    core::ScopedUnref unref(resource);
+
+    const Tensor* values_tensor;
+    OP_REQUIRES_OK(context, context->input("values", &values_tensor));
+
+    const Tensor* keys_tensor;
+    OP_REQUIRES_OK(context, context->input("keys", &keys_tensor));
+    OP_REQUIRES(context,
+                keys_tensor->NumElements() == 0 ||
+                    keys_tensor->NumElements() == values_tensor->NumElements(),
+                errors::InvalidArgument(
+                    "keys must be empty or have as many elements as values (",
+                    values_tensor->NumElements(), "), got ",
+                    keys_tensor->NumElements()));
+
+    OP_REQUIRES_OK(context,
+                   resource->WriteBatchAsync(*values_tensor, *keys_tensor));
+
+    Tensor* count_tensor = nullptr;
+    OP_REQUIRES_OK(context,
+                   context->allocate_output(0, TensorShape({}), &count_tensor));
+    count_tensor->scalar<int64>()() = values_tensor->NumElements();
+  }
+};
+
 class PulsarWritableFlushOp : public OpKernel {
  public:
   explicit PulsarWritableFlushOp(OpKernelConstruction* context)
@@ -347,6 +515,8 @@ REGISTER_KERNEL_BUILDER(Name("IO>PulsarWritableInit").Device(DEVICE_CPU),
                         PulsarWritableInitOp);
 REGISTER_KERNEL_BUILDER(Name("IO>PulsarWritableWrite").Device(DEVICE_CPU),
                         PulsarWritableWriteOp);
+REGISTER_KERNEL_BUILDER(Name("IO>PulsarWritableWriteBatch").Device(DEVICE_CPU),
+                        PulsarWritableWriteBatchOp);
 REGISTER_KERNEL_BUILDER(Name("IO>PulsarWritableFlush").Device(DEVICE_CPU),
                         PulsarWritableFlushOp);
 
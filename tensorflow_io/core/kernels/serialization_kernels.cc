@@ -13,6 +13,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 ==============================================================================*/
 
+#include <algorithm>
+
 #include "api/Compiler.hh"
 #include "api/DataFile.hh"
 #include "api/Generic.hh"
@@ -35,7 +37,14 @@ class DecodeJSONOp : public OpKernel {
   void Compute(OpKernelContext* context) override {
     const Tensor* input_tensor;
     OP_REQUIRES_OK(context, context->input("input", &input_tensor));
-    const string& input = input_tensor->scalar<tstring>()();
+    OP_REQUIRES(context, input_tensor->dims() <= 1,
+                errors::InvalidArgument("input must be a scalar or a vector: ",
+                                        input_tensor->shape().DebugString()));
+    // The values of a batch (1-D) input are stacked along a leading
+    // dimension. Entries of different lengths are padded to the largest with
+    // zeros (or empty strings).
+    const bool batch = input_tensor->dims() == 1;
+    const int64 count = input_tensor->NumElements();
 
     const Tensor* names_tensor;
     OP_REQUIRES_OK(context, context->input("names", &names_tensor));
@@ -45,47 +54,76 @@ class DecodeJSONOp : public OpKernel {
         errors::InvalidArgument("names should have same number as outputs: ",
                                 names_tensor->NumElements(), " vs. ",
                                 context->num_outputs()));
-    rapidjson::Document d;
-    d.Parse(input.c_str());
-    OP_REQUIRES(context, d.IsObject(),
-                errors::InvalidArgument("not a valid JSON object"));
+    std::vector<rapidjson::Document> documents(count);
+    for (int64 index = 0; index < count; index++) {
+      documents[index].Parse(input_tensor->flat<tstring>()(index).c_str());
+      OP_REQUIRES(context, documents[index].IsObject(),
+                  errors::InvalidArgument("not a valid JSON object"));
+    }
+    std::vector<rapidjson::Value*> entries(count);
     for (size_t i = 0; i < names_tensor->NumElements(); i++) {
-      rapidjson::Value* entry =
-          rapidjson::Pointer(names_tensor->flat<tstring>()(i).c_str()).Get(d);
-      OP_REQUIRES(context, (entry != nullptr),
-                  errors::InvalidArgument("no value for ",
-                                          names_tensor->flat<tstring>()(i)));
+      const tstring& name = names_tensor->flat<tstring>()(i);
+      // The shape of an entry, the largest of all entries for a batch.
+      std::vector<int64> entry_shape;
+      for (int64 index = 0; index < count; index++) {
+        rapidjson::Value* entry =
+            rapidjson::Pointer(name.c_str()).Get(documents[index]);
+        OP_REQUIRES(context, (entry != nullptr),
+                    errors::InvalidArgument("no value for ", name));
+        entries[index] = entry;
+        if (entry->IsArray()) {
+          getTensorShape(entry, 0, entry_shape);
+        } else {
+          if (entry_shape.empty()) entry_shape.push_back(0);
+          entry_shape[0] = std::max<int64>(entry_shape[0], 1);
+        }
+      }
 
-      Tensor* value_tensor;
       std::vector<int64> tensor_shape_vector;
-      if (entry->IsArray()) {
-        getTensorShape(entry, tensor_shape_vector);
-      } else {
-        tensor_shape_vector.push_back(1);
+      if (batch) {
+        tensor_shape_vector.push_back(count);
       }
+      tensor_shape_vector.insert(tensor_shape_vector.end(), entry_shape.begin(),
+                                 entry_shape.end());
+      Tensor* value_tensor = nullptr;
       OP_REQUIRES_OK(
           context, context->allocate_output(i, TensorShape(tensor_shape_vector),
                                             &value_tensor));
-      int64 flat_index;
-      flat_index = 0;
+      if (count == 0) {
+        // An empty batch.
+        continue;
+      }
+
+      Status status;
       switch (value_tensor->dtype()) {
         case DT_INT32:
-          writeToTensor(entry, value_tensor, flat_index, writeInt32);
+          value_tensor->flat<int32>().setZero();
+          status = writeEntries(name, entries, entry_shape, value_tensor,
+                                writeInt32);
           break;
         case DT_INT64:
-          writeToTensor(entry, value_tensor, flat_index, writeInt64);
+          value_tensor->flat<int64>().setZero();
+          status = writeEntries(name, entries, entry_shape, value_tensor,
+                                writeInt64);
           break;
         case DT_FLOAT:
-          writeToTensor(entry, value_tensor, flat_index, writeFloat);
+          value_tensor->flat<float>().setZero();
+          status = writeEntries(name, entries, entry_shape, value_tensor,
+                                writeFloat);
           break;
         case DT_DOUBLE:
-          writeToTensor(entry, value_tensor, flat_index, writeDouble);
+          value_tensor->flat<double>().setZero();
+          status = writeEntries(name, entries, entry_shape, value_tensor,
+                                writeDouble);
           break;
         case DT_STRING:
-          writeToTensor(entry, value_tensor, flat_index, writeString);
+          status = writeEntries(name, entries, entry_shape, value_tensor,
+                                writeString);
           break;
         case DT_BOOL:
-          writeToTensor(entry, value_tensor, flat_index, writeBool);
+          value_tensor->flat<bool>().setZero();
+          status =
+              writeEntries(name, entries, entry_shape, value_tensor, writeBool);
           break;
         default:
           OP_REQUIRES(
@@ -94,6 +132,7 @@ class DecodeJSONOp : public OpKernel {
                                       DataTypeString(value_tensor->dtype())));
           break;
       }
+      OP_REQUIRES_OK(context, status);
     }
   }
 
@@ -103,13 +142,18 @@ class DecodeJSONOp : public OpKernel {
 
   // Tensor Shape
 
-  static void getTensorShape(rapidjson::Value* entry,
+  // Grows `tensor_shape_vector` to the largest length at each level of nested
+  // arrays under `entry`, starting at dimension `dim`.
+  static void getTensorShape(rapidjson::Value* entry, size_t dim,
                              std::vector<int64>& tensor_shape_vector) {
-    if (entry->IsArray()) {
-      tensor_shape_vector.push_back(entry->Size());
-      if (entry->Size() != 0) {
-        getTensorShape(&(*entry)[0], tensor_shape_vector);
-      }
+    if (!entry->IsArray()) return;
+    if (tensor_shape_vector.size() <= dim) {
+      tensor_shape_vector.resize(dim + 1, 0);
+    }
+    tensor_shape_vector[dim] =
+        std::max<int64>(tensor_shape_vector[dim], entry->Size());
+    for (int64 i = 0; i < entry->Size(); i++) {
+      getTensorShape(&(*entry)[i], dim + 1, tensor_shape_vector);
     }
   }
 
@@ -147,17 +191,55 @@ class DecodeJSONOp : public OpKernel {
 
   // Full Tensor Write
 
+  // Writes each of `entries` into its slot of `entry_shape` in
+  // `value_tensor`, leaving the padding as is.
   template <class T>
-  static void writeToTensor(rapidjson::Value* entry, Tensor* value_tensor,
-                            int64& flat_index, T write_func) {
-    if (entry->IsArray()) {
-      for (int64 i = 0; i < entry->Size(); i++) {
-        writeToTensor(&(*entry)[i], value_tensor, flat_index, write_func);
+  static Status writeEntries(const tstring& name,
+                             const std::vector<rapidjson::Value*>& entries,
+                             const std::vector<int64>& entry_shape,
+                             Tensor* value_tensor, T write_func) {
+    std::vector<int64> strides(entry_shape.size());
+    int64 entry_size = 1;
+    for (size_t dim = entry_shape.size(); dim > 0; dim--) {
+      strides[dim - 1] = entry_size;
+      entry_size *= entry_shape[dim - 1];
+    }
+    for (size_t index = 0; index < entries.size(); index++) {
+      int64 flat_index = index * entry_size;
+      if (!entries[index]->IsArray()) {
+        if (entry_shape.size() != 1) {
+          return errors::InvalidArgument("entries have different ranks for ",
+                                         name);
+        }
+        write_func(entries[index], value_tensor, flat_index);
+        continue;
+      }
+      if (!writeToTensor(entries[index], value_tensor, strides, 0, flat_index,
+                         write_func)) {
+        return errors::InvalidArgument("entries have different ranks for ",
+                                       name);
       }
-    } else {
+    }
+    return OkStatus();
+  }
+
+  // Returns false if the nesting of `entry` does not match `strides`.
+  template <class T>
+  static bool writeToTensor(rapidjson::Value* entry, Tensor* value_tensor,
+                            const std::vector<int64>& strides, size_t dim,
+                            int64 flat_index, T write_func) {
+    if (entry->IsArray() != (dim < strides.size())) return false;
+    if (!entry->IsArray()) {
       write_func(entry, value_tensor, flat_index);
-      flat_index++;
+      return true;
+    }
+    for (int64 i = 0; i < entry->Size(); i++) {
+      if (!writeToTensor(&(*entry)[i], value_tensor, strides, dim + 1,
+                         flat_index + i * strides[dim], write_func)) {
+        return false;
+      }
     }
+    return true;
   }
 };
 
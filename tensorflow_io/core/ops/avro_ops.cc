@@ -86,6 +86,7 @@ REGISTER_OP("IO>ParseAvro")
     .Attr("avro_num_minibatches: int >= 0")
     .Attr("num_sparse: int >= 0")
     .Attr("reader_schema: string")
+    .Attr("skip_bytes: int >= 0 = 0")
     .Attr("sparse_keys: list(string) >= 0")
     .Attr("sparse_ranks: list(int) >= 0")
     .Attr("dense_keys: list(string) >= 0")
@@ -69,6 +69,20 @@ REGISTER_OP("IO>KafkaReadableSpec")
       return OkStatus();
     });
 
+REGISTER_OP("IO>KafkaReadableOffsetForTime")
+    .Input("input: resource")
+    .Input("timestamp: int64")
+    .Output("offset: int64")
+    .SetShapeFn(shape_inference::ScalarShape);
+
+REGISTER_OP("IO>KafkaReadablePartitions")
+    .Input("input: resource")
+    .Output("partitions: int32")
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      c->set_output(0, c->MakeShape({c->UnknownDim()}));
+      return OkStatus();
+    });
+
 REGISTER_OP("IO>KafkaIterableInit")
     .Input("topic: string")
     .Input("partition: int32")
@@ -99,6 +113,13 @@ REGISTER_OP("IO>LayerKafkaInit")
     .Attr("shared_name: string = ''")
     .SetShapeFn(shape_inference::ScalarShape);
 
+REGISTER_OP("IO>LayerKafkaWrite")
+    .Input("resource: resource")
+    .Input("message: string")
+    .Input("key: string")
+    .Output("count: int64")
+    .SetShapeFn(shape_inference::ScalarShape);
+
 REGISTER_OP("IO>LayerKafkaSync")
     .Input("resource: resource")
     .SetShapeFn(shape_inference::ScalarShape);
@@ -107,6 +128,11 @@ REGISTER_OP("IO>KafkaGroupReadableInit")
     .Input("topics: string")
     .Input("metadata: string")
     .Output("resource: resource")
+    .Attr("commit_mode: {'auto', 'async', 'checkpoint'} = 'auto'")
+    .Attr("commit_batches: int >= 0 = 0")
+    .Attr("commit_interval_ms: int >= 0 = 0")
+    .Attr("start_timestamp_ms: int = -1")
+    .Attr("stop_timestamp_ms: int = -1")
     .Attr("container: string = ''")
     .Attr("shared_name: string = ''")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -129,6 +155,10 @@ REGISTER_OP("IO>KafkaGroupReadableNext")
       return OkStatus();
     });
 
+REGISTER_OP("IO>KafkaGroupReadableCommit")
+    .Input("input: resource")
+    .SetShapeFn(shape_inference::NoOutputs);
+
 }  // namespace
 }  // namespace io
 }  // namespace tensorflow
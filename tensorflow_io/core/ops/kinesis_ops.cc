@@ -33,6 +33,15 @@ REGISTER_OP("IO>KinesisReadableInit")
       return OkStatus();
     });
 
+REGISTER_OP("IO>KinesisReadableShards")
+    .SetIsStateful()
+    .Input("input: string")
+    .Output("shards: string")
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      c->set_output(0, c->MakeShape({c->UnknownDim()}));
+      return OkStatus();
+    });
+
 REGISTER_OP("IO>KinesisReadableRead")
     .SetIsStateful()
     .Input("input: resource")
@@ -40,11 +49,13 @@ REGISTER_OP("IO>KinesisReadableRead")
     .Output("data: string")
     .Output("partition: string")
     .Output("sequence: string")
+    .Output("continue_fetch: int64")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
       c->set_output(0, c->MakeShape({c->UnknownDim()}));
       c->set_output(1, c->MakeShape({c->UnknownDim()}));
       c->set_output(2, c->MakeShape({c->UnknownDim()}));
       c->set_output(3, c->MakeShape({c->UnknownDim()}));
+      c->set_output(4, c->Scalar());
       return OkStatus();
     });
 
@@ -27,6 +27,10 @@ REGISTER_OP("IO>PulsarReadableInit")
     .Input("subscription: string")
     .Input("ack_grouping_time: int64")
     .Output("resource: resource")
+    .Attr("max_messages: int >= 1 = 1024")
+    .Attr("max_bytes: int >= 0 = 10485760")
+    .Attr("receive_timeout: int >= 1 = 100")
+    .Attr("ack_mode: {'individual', 'cumulative'} = 'individual'")
     .Attr("container: string = ''")
     .Attr("shared_name: string = ''")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -52,6 +56,10 @@ REGISTER_OP("IO>PulsarWritableInit")
     .Input("service_url: string")
     .Input("topic: string")
     .Output("resource: resource")
+    .Attr("batching_max_messages: int >= -1 = -1")
+    .Attr("batching_max_publish_delay_ms: int >= -1 = -1")
+    .Attr("compression: {'none', 'lz4', 'zlib', 'zstd', 'snappy'} = 'none'")
+    .Attr("max_pending_messages: int >= 0 = 0")
     .Attr("container: string = ''")
     .Attr("shared_name: string = ''")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -64,6 +72,13 @@ REGISTER_OP("IO>PulsarWritableWrite")
     .Input("value: string")
     .Input("key: string");
 
+REGISTER_OP("IO>PulsarWritableWriteBatch")
+    .Input("input: resource")
+    .Input("values: string")
+    .Input("keys: string")
+    .Output("count: int64")
+    .SetShapeFn(shape_inference::ScalarShape);
+
 REGISTER_OP("IO>PulsarWritableFlush").Input("input: resource");
 
 }  // namespace
@@ -27,11 +27,14 @@ REGISTER_OP("IO>DecodeJSON")
     .Output("value: dtypes")
     .Attr("dtypes: list(type)")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
-      // TODO: support batch (1-D) input
-      shape_inference::ShapeHandle unused;
-      TF_RETURN_IF_ERROR(c->WithRankAtMost(c->input(0), 0, &unused));
+      shape_inference::ShapeHandle input;
+      TF_RETURN_IF_ERROR(c->WithRankAtMost(c->input(0), 1, &input));
       for (size_t i = 0; i < c->num_outputs(); ++i) {
-        c->set_output(static_cast<int64>(i), c->MakeShape({c->UnknownDim()}));
+        if (c->RankKnown(input) && c->Rank(input) == 0) {
+          c->set_output(static_cast<int64>(i), c->MakeShape({c->UnknownDim()}));
+        } else {
+          c->set_output(static_cast<int64>(i), c->UnknownShape());
+        }
       }
       return OkStatus();
     });
@@ -16,4 +16,6 @@
 
 from tensorflow_io.python.experimental.filesystem_ops import (  # pylint: disable=unused-import
     set_configuration,
+    stats,
+    stats_summary,
 )
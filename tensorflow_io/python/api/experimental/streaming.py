@@ -20,9 +20,17 @@ from tensorflow_io.python.experimental.kafka_group_io_dataset_ops import (  # py
 from tensorflow_io.python.experimental.kafka_batch_io_dataset_ops import (  # pylint: disable=unused-import
     KafkaBatchIODataset,
 )
+from tensorflow_io.python.experimental.kafka_decoder_ops import (  # pylint: disable=unused-import
+    KafkaAvroDecoder,
+    KafkaJSONDecoder,
+)
+from tensorflow_io.python.experimental.kafka_writer_ops import (  # pylint: disable=unused-import
+    write_kafka,
+)
 from tensorflow_io.python.experimental.pulsar_dataset_ops import (  # pylint: disable=unused-import
     PulsarIODataset,
 )
 from tensorflow_io.python.experimental.pulsar_writer_ops import (  # pylint: disable=unused-import
     PulsarWriter,
+    write_pulsar,
 )
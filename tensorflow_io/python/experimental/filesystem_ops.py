@@ -14,13 +14,27 @@
 # ==============================================================================
 """filesystem"""
 
+import ctypes
+import json
+
+import tensorflow as tf
+
 from tensorflow_io.python.ops import core_ops
+from tensorflow_io.python.ops import load_plugin_library
 
 
 def set_configuration(scheme, key, value, name=None):
     """
     Set configuration of the file system.
 
+    The performance options of a file system take the name of the environment
+    variable they otherwise come from, e.g. `S3_MULTI_PART_UPLOAD_CHUNK_SIZE`,
+    `AZ_TRANSFER_CONCURRENCY`, `GCS_READ_CACHE_BLOCK_SIZE_MB`,
+    `HTTP_READ_CACHE_BLOCK_SIZE_MB`, `HDFS_READ_BUFFER_SIZE_KB`,
+    `OSS_READ_CACHE_MAX_SIZE_MB` or `S3_HEDGE_READS`, and a string value. The value overrides the
+    environment variable for the rest of the process, and applies to files
+    opened afterwards.
+
     Args:
       scheme: File system scheme.
       key: The name of the configuration option.
@@ -34,3 +48,76 @@ def set_configuration(scheme, key, value, name=None):
     return core_ops.io_file_system_set_configuration(
         scheme, key=key, value=value, name=name
     )
+
+
+def stats(scheme):
+    """
+    Returns the I/O metrics of the file system, accumulated since the process
+    started.
+
+    The metrics are kept per plugin, so `"http"` also covers `https` and
+    `"hdfs"` also covers `viewfs` and `har`. The result is a dict with the
+    counters `bytes_read`, `bytes_written`, `retries`, `cache_hits`,
+    `cache_misses`, `hedged_reads`, `hedge_wins` and `in_flight`, and with
+    `requests`, which maps each type of request sent to the store (e.g.
+    `"GetObject"` for s3) to a dict of its `count`, `errors`, `latency_ms_sum`
+    and `latency_ms_buckets`. The latter is a list of `(upper_bound_ms, count)`
+    histogram buckets, the last of which is unbounded (`float("inf")`).
+
+    Args:
+      scheme: File system scheme, one of `s3`, `az`, `http`, `hdfs` or `oss`.
+
+    Returns:
+      A dict of the metrics.
+    """
+    fn = load_plugin_library().TFIO_FilesystemStats
+    fn.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int64]
+    fn.restype = ctypes.c_int64
+    # The JSON may grow between the two calls as new request types show up.
+    size = fn(scheme.encode(), None, 0)
+    while True:
+        buffer = ctypes.create_string_buffer(size + 1)
+        length = fn(scheme.encode(), buffer, len(buffer))
+        if length < len(buffer):
+            break
+        size = length
+    metrics = json.loads(buffer.value.decode())
+    for request in metrics["requests"].values():
+        request["latency_ms_buckets"] = [
+            (float("inf") if bound is None else bound, count)
+            for bound, count in request["latency_ms_buckets"]
+        ]
+    return metrics
+
+
+def stats_summary(scheme, step=None):
+    """
+    Writes the I/O metrics of the file system as `tf.summary.scalar`s to the
+    default summary writer, e.g. to follow them in TensorBoard.
+
+    The counters of `stats` are written as `<scheme>/<counter>`, and the
+    `count`, `errors` and mean latency of each request type as
+    `<scheme>/requests/<type>/count`, `.../errors` and `.../latency_ms_mean`.
+
+    Args:
+      scheme: File system scheme, one of `s3`, `az`, `http`, `hdfs` or `oss`.
+      step: Step for the summaries, defaults to
+        `tf.summary.experimental.get_step()`.
+
+    Returns:
+      None.
+    """
+    metrics = stats(scheme)
+    for key, value in metrics.items():
+        if key != "requests":
+            tf.summary.scalar(f"{scheme}/{key}", value, step=step)
+    for request_type, request in metrics["requests"].items():
+        prefix = f"{scheme}/requests/{request_type}"
+        tf.summary.scalar(f"{prefix}/count", request["count"], step=step)
+        tf.summary.scalar(f"{prefix}/errors", request["errors"], step=step)
+        if request["count"] > 0:
+            tf.summary.scalar(
+                f"{prefix}/latency_ms_mean",
+                request["latency_ms_sum"] / request["count"],
+                step=step,
+            )
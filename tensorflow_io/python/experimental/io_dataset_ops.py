@@ -105,14 +105,25 @@ class IODataset(io_dataset.IODataset):
 
         Args:
           stream: A string, the stream name.
-          shard: A string, the shard of kinesis.
+          shard: A string, the shard of kinesis. A list of shards reads them
+            in parallel, and by default all shards of the stream are read.
+          limit: The most records fetched by one GetRecords call, up to 10000,
+            the default (optional).
+          num_parallel_reads: The number of shards fetched from in parallel
+            when reading several shards, by default all of them (optional).
           name: A name prefix for the IODataset (optional).
 
         Returns:
           A `IODataset`.
         """
         with tf.name_scope(kwargs.get("name", "IOFromKinesis")):
-            return kinesis_dataset_ops.KinesisIODataset(stream, shard, internal=True)
+            return kinesis_dataset_ops.KinesisIODataset(
+                stream,
+                shard,
+                limit=kwargs.get("limit", None),
+                num_parallel_reads=kwargs.get("num_parallel_reads", None),
+                internal=True,
+            )
 
     @classmethod
     def from_numpy(cls, a, **kwargs):
@@ -313,6 +324,12 @@ class StreamIODataset(tf.data.Dataset):
           subscription: A string, the subscription of the pubsub messages.
           endpoint: A string, the address of pubsub endpoint.
           timeout: An integer, the timeout of the pubsub pull.
+          max_messages: The most messages returned by one pull, by default
+            1000 (optional).
+          streaming: Whether the messages are received through a StreamingPull
+            rather than by unary pulls, by default False (optional).
+          ack_deadline: The ack deadline, in seconds, that the messages still
+            being read are kept extended to, by default 60 (optional).
           name: A name prefix for the IODataset (optional).
 
         Returns:
@@ -320,7 +337,13 @@ class StreamIODataset(tf.data.Dataset):
         """
         with tf.name_scope(kwargs.get("name", "IOFromPubSub")):
             return pubsub_dataset_ops.PubSubStreamIODataset(
-                subscription, endpoint=endpoint, timeout=timeout, internal=True
+                subscription,
+                endpoint=endpoint,
+                timeout=timeout,
+                max_messages=kwargs.get("max_messages", 1000),
+                streaming=kwargs.get("streaming", False),
+                ack_deadline=kwargs.get("ack_deadline", 60),
+                internal=True,
             )
 
     @classmethod
@@ -53,9 +53,23 @@ class IOLayer(tf.keras.layers.Layer):
     # =============================================================================
 
     @classmethod
-    def kafka(cls, topic, partition=0, servers=None, configuration=None):
+    def kafka(
+        cls,
+        topic,
+        partition=0,
+        servers=None,
+        configuration=None,
+        linger_ms=None,
+        batch_num_messages=None,
+        compression=None,
+    ):
         """Obtain a KafkaIOLayer to be used with tf.keras.
 
+        The outputs are produced as messages that librdkafka sends in batches,
+        without waiting for their delivery. A failed delivery is raised by a
+        later call of the layer or by `sync()`, which waits for all messages to
+        be delivered.
+
         Args:
           topic: A `tf.string` tensor containing topic.
           partition: A `tf.int32` tensor containing partition.
@@ -65,8 +79,23 @@ class IOLayer(tf.keras.layers.Layer):
             ["enable.auto.commit=false", "heartbeat.interval.ms=2000"],
             please refer to 'Global configuration properties'
             in librdkafka doc.
+          linger_ms: The time (in milliseconds) to wait for more messages to
+            fill a batch before sending it, `linger.ms` in librdkafka doc
+            (optional).
+          batch_num_messages: The most messages sent in one batch,
+            `batch.num.messages` in librdkafka doc (optional).
+          compression: The compression codec of the batches, one of "none",
+            "gzip", "snappy", "lz4" or "zstd" (optional).
 
         Returns:
           A class of `KafkaIOLayer`.
         """
-        return kafka_io_layer_ops.KafkaIOLayer(topic, partition, servers, configuration)
+        return kafka_io_layer_ops.KafkaIOLayer(
+            topic,
+            partition,
+            servers,
+            configuration,
+            linger_ms=linger_ms,
+            batch_num_messages=batch_num_messages,
+            compression=compression,
+        )
@@ -75,6 +75,7 @@ class KafkaBatchIODataset(tf.data.Dataset):
         stream_timeout=-1,
         message_poll_timeout=10000,
         configuration=None,
+        decoder=None,
         internal=True,
     ):
         """
@@ -101,6 +102,10 @@ class KafkaBatchIODataset(tf.data.Dataset):
               prefixed with `conf.topic.`. Examples include
               ["conf.topic.auto.offset.reset=earliest"]
             Reference: https://github.com/edenhill/librdkafka/blob/master/CONFIGURATION.md
+          decoder: An optional decoder of the messages, such as
+            `tfio.experimental.streaming.KafkaAvroDecoder`, applied to every
+            batch of messages read from kafka. The messages are then returned
+            decoded.
           internal: Whether the dataset is being created from within the named scope.
             Default: True
         """
@@ -147,7 +152,9 @@ class KafkaBatchIODataset(tf.data.Dataset):
             dataset = dataset.map(
                 lambda v: tf.data.Dataset.zip(
                     (
-                        tf.data.Dataset.from_tensor_slices(v.message),
+                        tf.data.Dataset.from_tensor_slices(
+                            decoder(v.message) if decoder else v.message
+                        ),
                         tf.data.Dataset.from_tensor_slices(v.key),
                     )
                 )
@@ -0,0 +1,153 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Kafka message decoders"""
+
+import json
+
+import tensorflow as tf
+from tensorflow_io.python.experimental import parse_avro_ops
+from tensorflow_io.python.experimental import serialization_ops
+
+# The Confluent Schema Registry wire format prefixes every message with a magic
+# byte and a 4 byte schema id.
+_SCHEMA_REGISTRY_PREFIX_BYTES = 5
+
+_AVRO_PRIMITIVE_DTYPES = {
+    "boolean": tf.bool,
+    "int": tf.int32,
+    "long": tf.int64,
+    "float": tf.float32,
+    "double": tf.float64,
+    "bytes": tf.string,
+    "string": tf.string,
+}
+
+
+def _features_from_schema(record, prefix=""):
+    """Returns a scalar feature, and its output name, for every primitive field
+    of an Avro record, nested records included."""
+    features = {}
+    for field in record["fields"]:
+        name = prefix + field["name"]
+        types = field["type"] if isinstance(field["type"], list) else [field["type"]]
+        nullable = "null" in types
+        types = [e for e in types if e != "null"]
+        if (
+            len(types) == 1
+            and isinstance(types[0], dict)
+            and types[0]["type"] == "record"
+            and not nullable
+        ):
+            features.update(_features_from_schema(types[0], name + "."))
+            continue
+        if len(types) != 1 or types[0] not in _AVRO_PRIMITIVE_DTYPES:
+            raise ValueError(
+                "field {} is not a primitive or a nullable primitive, "
+                "its features must be given explicitly".format(name)
+            )
+        dtype = _AVRO_PRIMITIVE_DTYPES[types[0]]
+        if nullable:
+            # A null decodes to the zero value of the type.
+            key = "{}:{}".format(name, types[0])
+            default_value = "" if dtype == tf.string else dtype.as_numpy_dtype(0)
+            features[key] = (name, tf.io.FixedLenFeature([], dtype, default_value))
+        else:
+            features[name] = (name, tf.io.FixedLenFeature([], dtype))
+    return features
+
+
+class KafkaAvroDecoder:
+    """Decodes Avro-encoded Kafka messages into feature tensors.
+
+    The messages of every batch polled from kafka are decoded together in a
+    single op, before the dataset is unbatched, with the same parser as
+    `tfio.experimental.columnar.parse_avro`:
+
+    >>> import tensorflow_io as tfio
+    >>> decoder = tfio.experimental.streaming.KafkaAvroDecoder(
+                        schema=schema,
+                        schema_registry=True,
+                    )
+    >>> dataset = tfio.experimental.streaming.KafkaGroupIODataset(
+                        topics=["topic1"],
+                        group_id="cg",
+                        servers="localhost:9092",
+                        decoder=decoder,
+                    )
+    >>> for (features, key) in dataset:
+    ...     print(features["f1"])
+    """
+
+    def __init__(self, schema, features=None, schema_registry=False):
+        """
+        Args:
+          schema: A string of the Avro schema the messages are decoded with.
+          features: An optional map of feature names to `tf.io.FixedLenFeature`,
+            `tf.io.SparseFeature` or `tfio.experimental.columnar.VarLenFeatureWithRank`,
+            as for `tfio.experimental.columnar.parse_avro`. By default every
+            primitive field of the schema is decoded into a scalar, with the
+            fields of nested records named `parent.child` and nulls decoded
+            into the zero value of their type.
+          schema_registry: Whether the messages are in the Confluent Schema
+            Registry wire format, whose 5 byte prefix is then skipped.
+            Default: False
+        """
+        self._schema = schema.decode() if isinstance(schema, bytes) else schema
+        if features is None:
+            features = _features_from_schema(json.loads(self._schema))
+            self._names = {k: v[0] for k, v in features.items()}
+            features = {k: v[1] for k, v in features.items()}
+        else:
+            self._names = {k: k for k in features}
+        self._features = features
+        self._skip_bytes = _SCHEMA_REGISTRY_PREFIX_BYTES if schema_registry else 0
+
+    def __call__(self, messages):
+        """Decodes a batch (1-D) of messages into a map of feature tensors."""
+        values = parse_avro_ops.parse_avro(
+            messages,
+            self._schema,
+            self._features,
+            skip_bytes=self._skip_bytes,
+        )
+        return {self._names[k]: v for k, v in values.items()}
+
+
+class KafkaJSONDecoder:
+    """Decodes JSON-encoded Kafka messages into tensors.
+
+    The messages of every batch polled from kafka are decoded together in a
+    single op, before the dataset is unbatched, as with
+    `tfio.experimental.serialization.decode_json`. Values of a variable-length
+    spec (e.g. `[None]`) are padded with zeros to the longest in their batch:
+
+    >>> import tensorflow_io as tfio
+    >>> decoder = tfio.experimental.streaming.KafkaJSONDecoder(
+                        specs={"f1": tf.TensorSpec([], tf.string)},
+                    )
+    >>> dataset = tfio.IODataset.from_kafka("topic1", decoder=decoder)
+    """
+
+    def __init__(self, specs):
+        """
+        Args:
+          specs: A structured TensorSpecs describing the signature of the
+            JSON messages.
+        """
+        self._specs = specs
+
+    def __call__(self, messages):
+        """Decodes a batch (1-D) of messages into structured tensors."""
+        return serialization_ops.decode_json(messages, self._specs)
@@ -14,6 +14,7 @@
 # ==============================================================================
 """KafkaGroupIODatasets"""
 
+import copy
 import sys
 import tensorflow as tf
 from tensorflow_io.python.ops import core_ops
@@ -108,6 +109,47 @@ class KafkaGroupIODataset(tf.data.Dataset):
     value comes in, where we can set the value to a very high timeout
     (i.e, block indefinitely) and keep on polling for new messages at
     `message_poll_timeout` intervals.
+
+    By default the offsets of the consumed messages are committed by librdkafka
+    as set by `enable.auto.commit`. With `commit_mode="async"` they are
+    committed asynchronously instead, every `commit_batches` batches and/or
+    `commit_interval` milliseconds, so that reading never waits on the broker:
+
+    >>> dataset = tfio.experimental.streaming.KafkaGroupIODataset(
+                        topics=["topic1"],
+                        group_id="cg",
+                        servers="localhost:9092",
+                        commit_mode="async",
+                        commit_interval=5000,
+                    )
+
+    With `commit_mode="checkpoint"` the offsets are only committed once a
+    checkpoint saved with `checkpoint_options()` is written, not on rebalances
+    either. A job restarted from that checkpoint then replays exactly the
+    messages read after it, as the consumer group resumes from the committed
+    offsets. Messages buffered in the input pipeline, e.g. by `prefetch`, count
+    as read.
+
+    >>> checkpoint_options = dataset.checkpoint_options()
+    >>> for step, (message, key) in enumerate(dataset):
+    ...     train_step(message, key)
+    ...     if step % 1000 == 0:
+    ...         checkpoint_manager.save(options=checkpoint_options)
+
+    The messages can also be bounded in time, e.g. to replay a window of a
+    topic. With `start_timestamp` every partition assigned to the consumer for
+    the first time starts at its earliest message at or after that timestamp,
+    rather than at the committed offset, and with `stop_timestamp` every
+    partition stops before its earliest message at or after that timestamp.
+    Both are in milliseconds since the epoch:
+
+    >>> dataset = tfio.experimental.streaming.KafkaGroupIODataset(
+                        topics=["topic1"],
+                        group_id="cg",
+                        servers="localhost:9092",
+                        start_timestamp=1600000000000,
+                        stop_timestamp=1600003600000,
+                    )
     """
 
     def __init__(
@@ -118,6 +160,12 @@ class KafkaGroupIODataset(tf.data.Dataset):
         stream_timeout=0,
         message_poll_timeout=10000,
         configuration=None,
+        decoder=None,
+        commit_mode="auto",
+        commit_batches=None,
+        commit_interval=None,
+        start_timestamp=None,
+        stop_timestamp=None,
         internal=True,
     ):
         """
@@ -145,6 +193,25 @@ class KafkaGroupIODataset(tf.data.Dataset):
               prefixed with `conf.topic.`. Examples include
               ["conf.topic.auto.offset.reset=earliest"]
             Reference: https://github.com/edenhill/librdkafka/blob/master/CONFIGURATION.md
+          decoder: An optional decoder of the messages, such as
+            `tfio.experimental.streaming.KafkaAvroDecoder`, applied to every
+            batch of messages read from kafka. The messages are then returned
+            decoded.
+          commit_mode: How the offsets of the consumed messages are committed,
+            one of "auto" (by librdkafka, as set by `enable.auto.commit`),
+            "async" (asynchronously, every `commit_batches` batches and/or
+            `commit_interval` milliseconds) or "checkpoint" (once a checkpoint
+            saved with `checkpoint_options()` is written).
+            Default: "auto"
+          commit_batches: An optional number of batches after which the offsets
+            are committed with `commit_mode="async"`. If neither this nor
+            `commit_interval` is set, the offsets are committed after every batch.
+          commit_interval: An optional interval (in milliseconds) after which the
+            offsets are committed with `commit_mode="async"`.
+          start_timestamp: An optional timestamp (in milliseconds since the
+            epoch) to start the partitions at, when first assigned.
+          stop_timestamp: An optional timestamp (in milliseconds since the
+            epoch) to stop the partitions at.
           internal: Whether the dataset is being created from within the named scope.
             Default: True
         """
@@ -164,13 +231,26 @@ class KafkaGroupIODataset(tf.data.Dataset):
                         stream_timeout
                     )
                 )
+            if commit_mode not in ("auto", "async", "checkpoint"):
+                raise ValueError(
+                    "Invalid commit_mode value: {}, it must be one of 'auto', "
+                    "'async' or 'checkpoint'.".format(commit_mode)
+                )
+            if commit_mode == "async" and not (commit_batches or commit_interval):
+                commit_batches = 1
             metadata = list(configuration or [])
             if group_id is not None:
                 metadata.append("group.id=%s" % group_id)
             if servers is not None:
                 metadata.append("bootstrap.servers=%s" % servers)
             resource = core_ops.io_kafka_group_readable_init(
-                topics=topics, metadata=metadata
+                topics=topics,
+                metadata=metadata,
+                commit_mode=commit_mode,
+                commit_batches=commit_batches or 0,
+                commit_interval_ms=commit_interval or 0,
+                start_timestamp_ms=-1 if start_timestamp is None else start_timestamp,
+                stop_timestamp_ms=-1 if stop_timestamp is None else stop_timestamp,
             )
 
             self._resource = resource
@@ -188,7 +268,9 @@ class KafkaGroupIODataset(tf.data.Dataset):
                     lambda v: tf.greater(v.continue_fetch, 0)
                 )
             )
-            dataset = dataset.map(lambda v: (v.message, v.key))
+            dataset = dataset.map(
+                lambda v: ((decoder(v.message) if decoder else v.message), v.key)
+            )
             dataset = dataset.unbatch()
 
             self._dataset = dataset
@@ -196,6 +278,28 @@ class KafkaGroupIODataset(tf.data.Dataset):
                 self._dataset._variant_tensor
             )  # pylint: disable=protected-access
 
+    def commit(self):
+        """Commits the offsets of the messages read so far, synchronously."""
+        return core_ops.io_kafka_group_readable_commit(self._resource)
+
+    def checkpoint_options(self, options=None):
+        """Returns `tf.train.CheckpointOptions` that commit the offsets of the
+        messages read so far once the checkpoint is written.
+
+        Args:
+          options: Optional `tf.train.CheckpointOptions` to add the commit to.
+        Returns:
+          A `tf.train.CheckpointOptions`, to pass to `tf.train.Checkpoint.save`
+          or `tf.train.CheckpointManager.save`.
+        """
+        options = (
+            copy.copy(options) if options is not None else tf.train.CheckpointOptions()
+        )
+        options.experimental_write_callbacks = list(
+            options.experimental_write_callbacks or []
+        ) + [self.commit]
+        return options
+
     def _inputs(self):
         return []
 
@@ -18,17 +18,42 @@ import tensorflow as tf
 from tensorflow_io.python.ops import core_ops
 
 
+def producer_metadata(
+    servers, configuration, linger_ms=None, batch_num_messages=None, compression=None
+):
+    """Returns the configuration of a batching kafka producer."""
+    metadata = list(configuration or [])
+    if servers is not None:
+        metadata.append("bootstrap.servers=%s" % servers)
+    if linger_ms is not None:
+        metadata.append("linger.ms=%d" % linger_ms)
+    if batch_num_messages is not None:
+        metadata.append("batch.num.messages=%d" % batch_num_messages)
+    if compression is not None:
+        metadata.append("compression.codec=%s" % compression)
+    return metadata
+
+
 class KafkaIOLayer(tf.keras.layers.Layer):
     """KafkaIOLayer"""
 
     # =============================================================================
     # KafkaIOLayer
     # =============================================================================
-    def __init__(self, topic, partition, servers, configurations):
+    def __init__(
+        self,
+        topic,
+        partition,
+        servers,
+        configurations,
+        linger_ms=None,
+        batch_num_messages=None,
+        compression=None,
+    ):
         """Obtain a Kafka IO layer to be used with tf.keras."""
-        metadata = list(configurations or [])
-        if servers is not None:
-            metadata.append("bootstrap.servers=%s" % servers)
+        metadata = producer_metadata(
+            servers, configurations, linger_ms, batch_num_messages, compression
+        )
         self._resource = core_ops.io_layer_kafka_init(topic, partition, metadata)
         super().__init__(trainable=False)
 
@@ -0,0 +1,96 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""write_kafka"""
+
+import tensorflow as tf
+from tensorflow_io.python.ops import core_ops
+from tensorflow_io.python.experimental import kafka_io_layer_ops
+from tensorflow_io.python.experimental import writer_ops
+
+
+def write_kafka(
+    dataset,
+    topic,
+    partition=-1,
+    servers=None,
+    configuration=None,
+    linger_ms=None,
+    batch_num_messages=None,
+    compression=None,
+    batch_size=1024,
+    name=None,
+):
+    """Writes the elements of a dataset to a kafka topic.
+
+    The dataset is consumed in the input pipeline, without returning to Python
+    for every element, and its messages are produced to kafka in batches by
+    librdkafka without waiting for their delivery. All messages are delivered
+    once `write_kafka` returns.
+
+    >>> import tensorflow_io as tfio
+    >>> dataset = tf.data.Dataset.from_tensor_slices(["D0", "D1", "D2"])
+    >>> tfio.experimental.streaming.write_kafka(
+                        dataset,
+                        topic="topic1",
+                        servers="localhost:9092",
+                        linger_ms=50,
+                        compression="lz4",
+                    )
+
+    Elements of `(message, key)` write keyed messages, which are partitioned
+    by their keys unless `partition` is given.
+
+    Args:
+      dataset: A `tf.data.Dataset` of `tf.string` messages, or of
+        `(message, key)` pairs of `tf.string`. The elements may be scalars or
+        batches of messages.
+      topic: A string, the topic to write to.
+      partition: The partition to write to. By default the partition is chosen
+        by the partitioner of librdkafka.
+      servers: An optional list of bootstrap servers.
+        For example: `localhost:9092`.
+      configuration: An optional list of producer configurations in
+        [Key=Value] format, please refer to 'Global configuration properties'
+        in librdkafka doc. Topic configurations are prefixed with `conf.topic.`.
+      linger_ms: The time (in milliseconds) to wait for more messages to fill
+        a batch before sending it, `linger.ms` in librdkafka doc (optional).
+      batch_num_messages: The most messages sent in one batch,
+        `batch.num.messages` in librdkafka doc (optional).
+      compression: The compression codec of the batches, one of "none",
+        "gzip", "snappy", "lz4" or "zstd" (optional).
+      batch_size: The number of scalar elements handed to the producer at
+        once. Default: 1024
+      name: A name for the operation (optional).
+
+    Returns:
+      The number of messages written, as a `tf.int64` tensor.
+    """
+    with tf.name_scope(name or "WriteKafka"):
+        metadata = kafka_io_layer_ops.producer_metadata(
+            servers, configuration, linger_ms, batch_num_messages, compression
+        )
+        resource = core_ops.io_layer_kafka_init(topic, partition, metadata)
+
+        def write_batch(messages, keys):
+            if keys is None:
+                keys = tf.constant([], tf.string)
+            return core_ops.io_layer_kafka_write(resource, messages, keys)
+
+        return writer_ops.write_dataset(
+            dataset,
+            write_batch,
+            lambda: core_ops.io_layer_kafka_sync(resource),
+            batch_size,
+        )
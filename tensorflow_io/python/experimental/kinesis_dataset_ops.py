@@ -14,10 +14,22 @@
 # ==============================================================================
 """Kinesis Dataset."""
 
+import collections
+import functools
+
 import tensorflow as tf
 
 from tensorflow_io.python.ops import core_ops
 
+# The records of a Kinesis shard.
+_KinesisRecords = collections.namedtuple(
+    "KinesisRecords", ["timestamp", "data", "partition", "sequence"]
+)
+
+# How long (in milliseconds) a reader of several shards waits for records of
+# one shard before moving on to the next one.
+_IDLE_TIMEOUT_MS = 1000
+
 
 class KinesisIODataset(tf.data.Dataset):
     """A Kinesis Dataset that consumes the message.
@@ -45,34 +57,107 @@ class KinesisIODataset(tf.data.Dataset):
     is `True`, then `KinesisIODataset` will keep retrying to retrieve data
     from the stream. If `read_indefinitely` is `False`, an `OutOfRangeError`
     is returned immediately instead.
+
+    Records are fetched in batches of up to `limit` records per GetRecords
+    call. When no shard is given, all shards of the stream are read, each by
+    its own reader, and their records are returned as soon as any shard has
+    them:
+
+    ```python
+    dataset = KinesisIODataset(
+        "kinesis_stream_name", limit=1000, num_parallel_reads=4)
+    ```
     """
 
-    def __init__(self, stream, shard="", internal=False):
+    def __init__(
+        self, stream, shard="", limit=None, num_parallel_reads=None, internal=False
+    ):
         """Create a KinesisIODataset.
 
         Args:
           stream: A `tf.string` tensor containing the name of the stream.
-          shard: A `tf.string` tensor containing the id of the shard.
+          shard: A `tf.string` tensor containing the id of the shard. A list of
+            shards reads them in parallel. By default all shards of the stream
+            are read (in eager mode; otherwise the stream must have a single
+            shard).
+          limit: The most records fetched by one GetRecords call, up to 10000,
+            the default.
+          num_parallel_reads: The number of shards fetched from in parallel
+            when reading several shards, by default all of them.
         """
         with tf.name_scope("KinesisIODataset"):
             assert internal
 
-            metadata = []
-            metadata.append("shard=%s" % shard)
-            resource = core_ops.io_kinesis_readable_init(stream, metadata)
+            def init(shard, idle_timeout=None):
+                metadata = []
+                metadata.append("shard=%s" % shard)
+                if limit is not None:
+                    metadata.append("limit=%d" % limit)
+                if idle_timeout is not None:
+                    metadata.append("idle_timeout=%d" % idle_timeout)
+                return core_ops.io_kinesis_readable_init(stream, metadata)
+
+            def batches(read):
+                dataset = tf.data.experimental.Counter()
+                dataset = dataset.map(lambda _: read())
+                dataset = dataset.apply(
+                    tf.data.experimental.take_while(
+                        lambda v: tf.greater(v.continue_fetch, 0)
+                    )
+                )
+                return dataset.map(
+                    lambda v: _KinesisRecords(
+                        v.timestamp, v.data, v.partition, v.sequence
+                    )
+                )
+
+            if isinstance(shard, str) and shard == "" and tf.executing_eagerly():
+                shard = [
+                    e.decode()
+                    for e in core_ops.io_kinesis_readable_shards(stream).numpy()
+                ]
+                if len(shard) == 1:
+                    shard = shard[0]
+
+            if not isinstance(shard, (list, tuple)):
+                resource = init(shard)
+
+                self._resource = resource
+
+                dataset = batches(
+                    lambda: core_ops.io_kinesis_readable_read(self._resource)
+                )
+                dataset = dataset.unbatch()
+            else:
+                if not shard:
+                    raise ValueError("no shard to read from stream")
+                self._resource = [init(e, _IDLE_TIMEOUT_MS) for e in shard]
 
-            self._resource = resource
+                # Every shard is read indefinitely, so all of them are kept in
+                # the cycle, and fetched from by `num_parallel_reads` workers.
+                # A shard without records returns an empty batch after
+                # `_IDLE_TIMEOUT_MS`, so its worker moves on to the others.
+                def read(index):
+                    return tf.switch_case(
+                        tf.cast(index, tf.int32),
+                        [
+                            functools.partial(
+                                core_ops.io_kinesis_readable_read, resource
+                            )
+                            for resource in self._resource
+                        ],
+                    )
 
-            dataset = tf.data.experimental.Counter()
-            dataset = dataset.map(
-                lambda _: core_ops.io_kinesis_readable_read(self._resource)
-            )
-            dataset = dataset.apply(
-                tf.data.experimental.take_while(
-                    lambda v: tf.greater(tf.shape(v.data)[0], 0)
+                num_parallel_reads = min(num_parallel_reads or len(shard), len(shard))
+                dataset = tf.data.Dataset.range(len(shard))
+                dataset = dataset.interleave(
+                    lambda index: batches(lambda: read(index)),
+                    cycle_length=len(shard),
+                    block_length=1,
+                    num_parallel_calls=num_parallel_reads,
+                    deterministic=False,
                 )
-            )
-            dataset = dataset.unbatch()
+                dataset = dataset.unbatch()
 
             self._dataset = dataset
             super().__init__(
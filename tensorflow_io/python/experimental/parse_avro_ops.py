@@ -27,7 +27,9 @@ from tensorflow_io.python.ops import core_ops
 # Only copied parts from `parse_example_v2` and `_parse_example_raw`
 
 
-def parse_avro(serialized, reader_schema, features, avro_names=None, name=None):
+def parse_avro(
+    serialized, reader_schema, features, avro_names=None, skip_bytes=0, name=None
+):
     """
     Parses `avro` records into a `dict` of tensors.
 
@@ -77,6 +79,10 @@ def parse_avro(serialized, reader_schema, features, avro_names=None, name=None):
         purposes, but they have no effect on the output. If not `None`,
         `avro_names` must be the same length as `serialized`.
 
+        skip_bytes: (Optional.) The number of bytes to skip at the start of
+        each serialized record, e.g. 5 for the Confluent Schema Registry wire
+        format.
+
         name: The name of the op.
 
     Returns:
@@ -114,6 +120,7 @@ def parse_avro(serialized, reader_schema, features, avro_names=None, name=None):
         dense_defaults,
         dense_shapes,
         name,
+        skip_bytes=skip_bytes,
     )
     return construct_tensors_for_composite_features(features, outputs)
 
@@ -131,6 +138,7 @@ def _parse_avro(
     dense_shapes=None,
     name=None,
     avro_num_minibatches=0,
+    skip_bytes=0,
 ):
     """Parses Avro records.
 
@@ -163,6 +171,7 @@ def _parse_avro(
         minibatch elements smaller than the maximum number of blocks for the
         given feature along this dimension.
         name: A name for this operation (optional).
+        skip_bytes: The number of bytes to skip at the start of each record.
     Returns:
         A `dict` mapping keys to `Tensor`s and `SparseTensor`s.
     """
@@ -198,6 +207,7 @@ def _parse_avro(
             dense_shapes=dense_shapes,
             name=name,
             avro_num_minibatches=avro_num_minibatches,
+            skip_bytes=skip_bytes,
         )
 
         (sparse_indices, sparse_values, sparse_shapes, dense_values) = outputs
@@ -19,9 +19,25 @@ from tensorflow_io.python.ops import core_ops
 
 
 class PubSubStreamIODataset(tf.data.Dataset):
-    """PubSubStreamGraphIODataset"""
+    """PubSubStreamGraphIODataset
 
-    def __init__(self, subscription, endpoint=None, timeout=10000, internal=True):
+    Messages are pulled in batches of up to `max_messages`, with unary pulls or
+    a StreamingPull. A batch is acknowledged once the next batch is pulled, as
+    it has then been handed to the input pipeline, and until then its ack
+    deadline is extended. Acknowledgements are sent in batches from a
+    background thread, so that reading never waits on them.
+    """
+
+    def __init__(
+        self,
+        subscription,
+        endpoint=None,
+        timeout=10000,
+        max_messages=1000,
+        streaming=False,
+        ack_deadline=60,
+        internal=True,
+    ):
         """PubSubStreamIODataset."""
         with tf.name_scope("PubSubStreamIODataset"):
             assert internal
@@ -30,6 +46,9 @@ class PubSubStreamIODataset(tf.data.Dataset):
             if endpoint is not None:
                 metadata.append("endpoint=%s" % endpoint)
             metadata.append("timeout=%d" % timeout)
+            metadata.append("max_messages=%d" % max_messages)
+            metadata.append("streaming=%s" % ("true" if streaming else "false"))
+            metadata.append("ack_deadline=%d" % ack_deadline)
             resource = core_ops.io_pub_sub_readable_init(subscription, metadata)
 
             self._resource = resource
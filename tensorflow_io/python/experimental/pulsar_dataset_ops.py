@@ -29,6 +29,9 @@ class PulsarIODataset(tf.data.Dataset):
         timeout,
         ack_grouping_time=-1,
         poll_timeout=100,
+        max_messages=1024,
+        max_bytes=10 * 1024 * 1024,
+        ack_mode="individual",
     ):
         """Creates a `PulsarIODataset` from pulsar server with a subscription
 
@@ -47,10 +50,19 @@ class PulsarIODataset(tf.data.Dataset):
             were received after `timeout` milliseconds, we can treat it as no more messages.
             `timeout` must be positive.
           poll_timeout: A `tf.int64` tensor containing the poll timeout in milliseconds. The
-            pulsar consumer would try to receive a single message with the poll timeout, if no
+            pulsar consumer would try to receive a batch of messages with the poll timeout, if no
             message was received, it would try again until `timeout` exceeds.
             `poll_timeout` must be positive and not larger than `timeout`.
             Default: 100
+          max_messages: The most messages received in one batch. A batch is returned once it
+            holds `max_messages` messages or `max_bytes` bytes, or after `poll_timeout`.
+            Default: 1024
+          max_bytes: The most bytes received in one batch, 0 for no limit.
+            Default: 10485760
+          ack_mode: How the received messages are acknowledged, asynchronously: "individual"
+            acknowledges every message of a batch, and "cumulative" acknowledges a batch
+            with its last message of every topic partition.
+            Default: "individual"
         """
         with tf.name_scope("PulsarIODataset"):
             if timeout <= 0:
@@ -68,8 +80,21 @@ class PulsarIODataset(tf.data.Dataset):
                     )
                 )
 
+            if ack_mode not in ("individual", "cumulative"):
+                raise ValueError(
+                    f"Invalid ack_mode value: {ack_mode}, "
+                    "must be 'individual' or 'cumulative'"
+                )
+
             resource = core_ops.io_pulsar_readable_init(
-                service_url, topic, subscription, ack_grouping_time
+                service_url,
+                topic,
+                subscription,
+                ack_grouping_time,
+                max_messages=max_messages,
+                max_bytes=max_bytes,
+                receive_timeout=poll_timeout,
+                ack_mode=ack_mode,
             )
             self._resource = resource
             dataset = tf.data.experimental.Counter()
@@ -16,21 +16,57 @@
 
 import tensorflow as tf
 from tensorflow_io.python.ops import core_ops
+from tensorflow_io.python.experimental import writer_ops
 
 
 class PulsarWriter:
     """PulsarWriter"""
 
-    def __init__(self, service_url, topic):
+    def __init__(
+        self,
+        service_url,
+        topic,
+        batching_max_messages=None,
+        batching_max_publish_delay=None,
+        compression=None,
+        max_pending_messages=None,
+    ):
         """Creates a `PulsarWriter` for writing messages to a pulsar topic
 
+        The producer options are left to the pulsar client unless given.
+
         Args:
           service_url: A `tf.string` tensor containing the service url of pulsar broker.
             For example: "pulsar://localhost:6650".
           topic: A `tf.string` tensor containing the topic name.
+          batching_max_messages: The most messages the producer sends in one batch,
+            0 or 1 to disable batching.
+            Default: None
+          batching_max_publish_delay: The time in milliseconds the producer waits for
+            more messages to fill a batch before sending it.
+            Default: None
+          compression: The compression codec of the messages, one of "none", "lz4",
+            "zlib", "zstd" or "snappy".
+            Default: None
+          max_pending_messages: The most messages waiting for their receipt from the
+            broker, after which writing blocks rather than fails.
+            Default: None
         """
         with tf.name_scope("PulsarWriter"):
-            resource = core_ops.io_pulsar_writable_init(service_url, topic)
+            resource = core_ops.io_pulsar_writable_init(
+                service_url,
+                topic,
+                batching_max_messages=(
+                    -1 if batching_max_messages is None else batching_max_messages
+                ),
+                batching_max_publish_delay_ms=(
+                    -1
+                    if batching_max_publish_delay is None
+                    else batching_max_publish_delay
+                ),
+                compression=compression or "none",
+                max_pending_messages=max_pending_messages or 0,
+            )
             self._resource = resource
 
     def write(self, value, key=""):
@@ -43,6 +79,82 @@ class PulsarWriter:
         """
         return core_ops.io_pulsar_writable_write(self._resource, value, key)
 
+    def write_batch(self, values, keys=None):
+        """Write a batch of messages to pulsar topic asynchronously, in one op call
+
+        Args:
+          values: A `tf.string` tensor containing the values of messages
+          keys: An optional `tf.string` tensor containing the keys of messages, with as
+            many elements as `values`. An empty key leaves its message without key.
+            Default: None
+
+        Returns:
+          The number of messages written, as a `tf.int64` tensor.
+        """
+        if keys is None:
+            keys = tf.constant([], tf.string)
+        return core_ops.io_pulsar_writable_write_batch(
+            self._resource, tf.reshape(values, [-1]), tf.reshape(keys, [-1])
+        )
+
     def flush(self):
         """Flush the queued messages, it will wait async write operations completed."""
         return core_ops.io_pulsar_writable_flush(self._resource)
+
+
+def write_pulsar(
+    dataset,
+    service_url,
+    topic,
+    batching_max_messages=1000,
+    batching_max_publish_delay=10,
+    compression=None,
+    max_pending_messages=1000,
+    batch_size=1024,
+    name=None,
+):
+    """Writes the elements of a dataset to a pulsar topic.
+
+    The dataset is consumed in the input pipeline, without returning to Python
+    for every element, and its messages are sent in batches by the producer
+    without waiting for their receipt. All messages are sent once
+    `write_pulsar` returns.
+
+    >>> import tensorflow_io as tfio
+    >>> dataset = tf.data.Dataset.from_tensor_slices(["D0", "D1", "D2"])
+    >>> tfio.experimental.streaming.write_pulsar(
+                        dataset,
+                        service_url="pulsar://localhost:6650",
+                        topic="topic1",
+                        compression="lz4",
+                    )
+
+    Args:
+      dataset: A `tf.data.Dataset` of `tf.string` messages, or of
+        `(message, key)` pairs of `tf.string`. The elements may be scalars or
+        batches of messages.
+      service_url: A string, the service url of pulsar broker.
+      topic: A string, the topic to write to.
+      batching_max_messages: As for `PulsarWriter`. Default: 1000
+      batching_max_publish_delay: As for `PulsarWriter`. Default: 10
+      compression: As for `PulsarWriter`.
+      max_pending_messages: As for `PulsarWriter`. Default: 1000
+      batch_size: The number of scalar elements handed to the producer at
+        once. Default: 1024
+      name: A name for the operation (optional).
+
+    Returns:
+      The number of messages written, as a `tf.int64` tensor.
+    """
+    with tf.name_scope(name or "WritePulsar"):
+        writer = PulsarWriter(
+            service_url,
+            topic,
+            batching_max_messages=batching_max_messages,
+            batching_max_publish_delay=batching_max_publish_delay,
+            compression=compression,
+            max_pending_messages=max_pending_messages,
+        )
+        return writer_ops.write_dataset(
+            dataset, writer.write_batch, writer.flush, batch_size
+        )
@@ -53,15 +53,17 @@ def decode_json(data, specs, name=None):
     Decode JSON string into Tensors.
 
     Args:
-        data: A String Tensor. The JSON strings to decode.
+        data: A String Tensor. The JSON strings to decode, a scalar or
+        a batch (1-D). The values of a batch are padded with zeros to the
+        longest in the batch.
         specs: A structured TensorSpecs describing the signature
         of the JSON elements.
         name: A name for the operation (optional).
 
     Returns:
-        A structured Tensors.
+        A structured Tensors, with a leading batch dimension for a batch.
     """
-    # TODO: support batch (1-D) input
+    data = tf.convert_to_tensor(data, tf.string)
     # Make a copy of specs to keep the original specs
     named = tf.nest.map_structure(lambda e: _NamedTensorSpec(e.shape, e.dtype), specs)
     named_spec(named)
@@ -71,6 +73,14 @@ def decode_json(data, specs, name=None):
         tf.constant([-1 if d is None else d for d in e.shape.as_list()], tf.int32)
         for e in named
     ]
+    if data.shape.rank == 1:
+        # A variable-length dimension (-1) cannot be inferred for an empty
+        # batch, which has no elements, so it is 0 then.
+        count = tf.size(data)
+        shapes = [
+            tf.concat([[count], tf.where(tf.equal(count, 0), tf.maximum(e, 0), e)], 0)
+            for e in shapes
+        ]
     dtypes = [e.dtype for e in named]
 
     values = core_ops.io_decode_json(data, names, dtypes, name=name)
@@ -0,0 +1,56 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""write_dataset"""
+
+import numpy as np
+import tensorflow as tf
+
+
+def write_dataset(dataset, write_batch, flush, batch_size):
+    """Writes the messages of a dataset with the ops of a sink.
+
+    The dataset is consumed with `reduce`, within the input pipeline, and
+    scalar elements are batched first so that the sink gets `batch_size`
+    messages per call.
+
+    Args:
+      dataset: A `tf.data.Dataset` of `tf.string` messages, or of
+        `(message, key)` pairs of `tf.string`. The elements may be scalars or
+        batches of messages.
+      write_batch: A function of a 1-D tensor of messages and a 1-D tensor of
+        their keys, or `None`, that returns the number of messages written.
+      flush: A function that returns the op waiting for the messages written.
+      batch_size: The number of scalar elements handed to `write_batch` at
+        once.
+
+    Returns:
+      The number of messages written, as a `tf.int64` tensor, once flushed.
+    """
+    keyed = isinstance(dataset.element_spec, tuple)
+    message_spec = dataset.element_spec[0] if keyed else dataset.element_spec
+    if message_spec.shape.rank == 0:
+        dataset = dataset.batch(batch_size)
+
+    def write(count, element):
+        message, key = element if keyed else (element, None)
+        if key is not None:
+            key = tf.reshape(key, [-1])
+        return count + write_batch(tf.reshape(message, [-1]), key)
+
+    count = dataset.reduce(np.int64(0), write)
+    with tf.control_dependencies([count]):
+        flushed = flush()
+    with tf.control_dependencies([flushed]):
+        return tf.identity(count)
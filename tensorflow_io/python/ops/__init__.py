@@ -52,6 +52,8 @@ def _load_library(filename, lib="op"):
         load_fn = tf.load_op_library
     elif lib == "dependency":
         load_fn = lambda f: ctypes.CDLL(f, mode=ctypes.RTLD_GLOBAL)
+    elif lib == "ctypes":
+        load_fn = ctypes.CDLL
     elif lib == "fs":
         load_fn = lambda f: tf.experimental.register_filesystem_plugin(f) is None
     else:
@@ -92,13 +94,21 @@ class LazyLoader(types.ModuleType):
 
 
 core_ops = LazyLoader("core_ops", "libtensorflow_io.so")
+plugin_library = "libtensorflow_io_plugins.so"
 try:
-    plugin_ops = _load_library("libtensorflow_io_plugins.so", "fs")
+    plugin_ops = _load_library(plugin_library, "fs")
 except NotImplementedError as e:
     warnings.warn(f"unable to load libtensorflow_io_plugins.so: {e}")
     # Note: load libtensorflow_io.so imperatively in case of statically linking
+    plugin_library = "libtensorflow_io.so"
     try:
         core_ops = _load_library("libtensorflow_io.so")
         plugin_ops = _load_library("libtensorflow_io.so", "fs")
     except NotImplementedError as e:
         warnings.warn(f"file system plugins are not loaded: {e}")
+
+
+def load_plugin_library():
+    """Returns the library holding the file system plugins as a `ctypes.CDLL`,
+    to call the C functions it exports."""
+    return _load_library(plugin_library, "ctypes")
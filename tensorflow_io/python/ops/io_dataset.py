@@ -133,6 +133,9 @@ class IODataset(io_dataset_ops._IODataset):  # pylint: disable=protected-access
         Args:
           topic: A `tf.string` tensor containing topic subscription.
           partition: A `tf.int64` tensor containing the partition, by default 0.
+            A list of partitions, or "all" for all partitions of the topic,
+            reads the partitions concurrently, each with its own consumer.
+            The offset range then applies to every partition.
           start: A `tf.int64` tensor containing the start offset, by default 0.
           stop: A `tf.int64` tensor containing the end offset, by default -1.
           servers: An optional list of bootstrap servers, by default
@@ -148,6 +151,19 @@ class IODataset(io_dataset_ops._IODataset):  # pylint: disable=protected-access
               prefixed with `conf.topic.`. Examples include
               ["conf.topic.auto.offset.reset=earliest"]
             Reference: https://github.com/edenhill/librdkafka/blob/master/CONFIGURATION.md
+          num_parallel_reads: The number of partitions read concurrently when
+            reading several partitions, by default all of them (optional).
+          deterministic: Whether messages of several partitions are
+            interleaved in a deterministic order, by default True (optional).
+          decoder: A decoder of the messages, such as
+            `tfio.experimental.streaming.KafkaAvroDecoder`, applied to every
+            batch of messages read from kafka (optional).
+          start_timestamp: A timestamp, in milliseconds since the epoch, to
+            start every partition at instead of `start`. Each partition starts
+            at the earliest message at or after it (optional).
+          stop_timestamp: A timestamp, in milliseconds since the epoch, to stop
+            every partition at instead of `stop`. Each partition stops before
+            the earliest message at or after it (optional).
           name: A name prefix for the IODataset (optional).
 
         Returns:
@@ -162,6 +178,11 @@ class IODataset(io_dataset_ops._IODataset):  # pylint: disable=protected-access
                 stop=stop,
                 servers=servers,
                 configuration=configuration,
+                num_parallel_reads=kwargs.get("num_parallel_reads", None),
+                deterministic=kwargs.get("deterministic", True),
+                decoder=kwargs.get("decoder", None),
+                start_timestamp=kwargs.get("start_timestamp", None),
+                stop_timestamp=kwargs.get("stop_timestamp", None),
                 internal=True,
             )
 
@@ -381,6 +402,9 @@ class StreamIODataset(
               prefixed with `conf.topic.`. Examples include
               ["conf.topic.auto.offset.reset=earliest"]
             Reference: https://github.com/edenhill/librdkafka/blob/master/CONFIGURATION.md
+          decoder: A decoder of the messages, such as
+            `tfio.experimental.streaming.KafkaAvroDecoder`, applied to every
+            batch of messages read from kafka (optional).
           name: A name prefix for the IODataset (optional).
 
         Returns:
@@ -394,6 +418,7 @@ class StreamIODataset(
                 offset=offset,
                 servers=servers,
                 configuration=configuration,
+                decoder=kwargs.get("decoder", None),
                 internal=True,
             )
 
@@ -14,6 +14,8 @@
 # ==============================================================================
 """KafkaDataset"""
 
+import functools
+
 import tensorflow as tf
 from tensorflow_io.python.ops import core_ops
 
@@ -22,13 +24,27 @@ class KafkaIODataset(tf.data.Dataset):
     """KafkaIODataset"""
 
     def __init__(
-        self, topic, partition, start, stop, servers, configuration, internal=True
+        self,
+        topic,
+        partition,
+        start,
+        stop,
+        servers,
+        configuration,
+        num_parallel_reads=None,
+        deterministic=True,
+        decoder=None,
+        start_timestamp=None,
+        stop_timestamp=None,
+        internal=True,
     ):
         """Creates a `KafkaIODataset` from kafka server with an offset range.
 
         Args:
           topic: A `tf.string` tensor containing topic subscription.
           partition: A `tf.int64` tensor containing the partition, by default 0.
+            A list of partitions, or "all" for all partitions of the topic,
+            reads the partitions concurrently, each with its own consumer.
           start: A `tf.int64` tensor containing the start offset, by default 0.
           stop: A `tf.int64` tensor containing the end offset, by default -1.
           servers: An optional list of bootstrap servers, by default
@@ -43,6 +59,23 @@ class KafkaIODataset(tf.data.Dataset):
               prefixed with `conf.topic.`. Examples include
               ["conf.topic.auto.offset.reset=earliest"]
             Reference: https://github.com/edenhill/librdkafka/blob/master/CONFIGURATION.md
+          num_parallel_reads: The number of partitions read concurrently when
+            reading several partitions, by default all of them.
+          deterministic: Whether messages of several partitions are
+            interleaved in a deterministic order. If False, messages are
+            returned as soon as any partition has them. Default: True
+          decoder: An optional decoder of the messages, such as
+            `tfio.experimental.streaming.KafkaAvroDecoder`, applied to every
+            batch of messages read from kafka. The messages are then returned
+            decoded.
+          start_timestamp: An optional `tf.int64` tensor containing a
+            timestamp, in milliseconds since the epoch, to start every
+            partition at instead of `start`: the offset of the earliest message
+            at or after it.
+          stop_timestamp: An optional `tf.int64` tensor containing a
+            timestamp, in milliseconds since the epoch, to stop every
+            partition at instead of `stop`: the offset of the earliest message
+            at or after it.
           internal: Whether the dataset is being created from within the named scope.
             Default: True
         """
@@ -52,28 +85,115 @@ class KafkaIODataset(tf.data.Dataset):
             metadata = list(configuration or [])
             if servers is not None:
                 metadata.append("bootstrap.servers=%s" % servers)
-            resource = core_ops.io_kafka_readable_init(
-                topic, partition, offset=0, metadata=metadata
-            )
-            start, stop = core_ops.io_kafka_readable_spec(resource, start, stop)
 
-            self._resource = resource
-            self._start, self._stop = start, stop
+            if isinstance(partition, str):
+                if partition != "all":
+                    raise ValueError(
+                        "partition must be a partition, a list of partitions "
+                        "or 'all', got %r" % partition
+                    )
+                if not tf.executing_eagerly():
+                    raise ValueError("partition='all' is only supported in eager mode")
+                resource = core_ops.io_kafka_readable_init(
+                    topic, 0, offset=0, metadata=metadata
+                )
+                partition = (
+                    core_ops.io_kafka_readable_partitions(resource).numpy().tolist()
+                )
+
+            # The offset range of a partition, with timestamps resolved into
+            # offsets of the partition.
+            def spec(resource):
+                p_start, p_stop = start, stop
+                if start_timestamp is not None:
+                    p_start = core_ops.io_kafka_readable_offset_for_time(
+                        resource, start_timestamp
+                    )
+                if stop_timestamp is not None:
+                    p_stop = core_ops.io_kafka_readable_offset_for_time(
+                        resource, stop_timestamp
+                    )
+                return core_ops.io_kafka_readable_spec(resource, p_start, p_stop)
 
             step = 1024
-            indices_start = tf.data.Dataset.range(0, stop, step)
-            indices_stop = indices_start.skip(1).concatenate(
-                tf.data.Dataset.from_tensor_slices([stop])
-            )
-            dataset = tf.data.Dataset.zip((indices_start, indices_stop))
 
-            def f(start, stop):
-                return core_ops.io_kafka_readable_read(
-                    self._resource, start=start, stop=stop
+            def chunks(start, stop):
+                indices_start = tf.data.Dataset.range(start, stop, step)
+                indices_stop = indices_start.skip(1).concatenate(
+                    tf.data.Dataset.from_tensor_slices([stop])
                 )
+                return tf.data.Dataset.zip((indices_start, indices_stop))
 
-            dataset = dataset.map(f)
-            dataset = dataset.unbatch()
+            if not isinstance(partition, (list, tuple)):
+                resource = core_ops.io_kafka_readable_init(
+                    topic, partition, offset=0, metadata=metadata
+                )
+                start, stop = spec(resource)
+
+                self._resource = resource
+                self._start, self._stop = start, stop
+
+                def f(start, stop):
+                    value = core_ops.io_kafka_readable_read(
+                        self._resource, start=start, stop=stop
+                    )
+                    if decoder is None:
+                        return value
+                    return decoder(value.message), value.key
+
+                dataset = chunks(start, stop)
+                dataset = dataset.map(f)
+                dataset = dataset.unbatch()
+            else:
+                if not partition:
+                    raise ValueError("no partition to read from topic")
+                resources, starts, stops = [], [], []
+                for p in partition:
+                    resource = core_ops.io_kafka_readable_init(
+                        topic, p, offset=0, metadata=metadata
+                    )
+                    p_start, p_stop = spec(resource)
+                    resources.append(resource)
+                    starts.append(p_start)
+                    stops.append(p_stop)
+
+                self._resource = resources
+                self._start, self._stop = tf.stack(starts), tf.stack(stops)
+
+                def f(index, start, stop):
+                    value = tf.switch_case(
+                        tf.cast(index, tf.int32),
+                        [
+                            functools.partial(
+                                core_ops.io_kafka_readable_read,
+                                resource,
+                                start=start,
+                                stop=stop,
+                            )
+                            for resource in self._resource
+                        ],
+                    )
+                    if decoder is None:
+                        return value
+                    return decoder(value.message), value.key
+
+                # Each partition is read in order by a single worker, which
+                # keeps its consumer positioned across chunks.
+                def g(index):
+                    dataset = chunks(self._start[index], self._stop[index])
+                    dataset = dataset.map(lambda start, stop: f(index, start, stop))
+                    return dataset.unbatch()
+
+                num_parallel_reads = min(
+                    num_parallel_reads or len(partition), len(partition)
+                )
+                dataset = tf.data.Dataset.range(len(partition))
+                dataset = dataset.interleave(
+                    g,
+                    cycle_length=num_parallel_reads,
+                    num_parallel_calls=num_parallel_reads,
+                    deterministic=deterministic,
+                )
 
             self._dataset = dataset
             super().__init__(
@@ -91,7 +211,16 @@ class KafkaIODataset(tf.data.Dataset):
 class KafkaStreamIODataset(tf.data.Dataset):
     """KafkaStreamIODataset"""
 
-    def __init__(self, topic, partition, offset, servers, configuration, internal=True):
+    def __init__(
+        self,
+        topic,
+        partition,
+        offset,
+        servers,
+        configuration,
+        decoder=None,
+        internal=True,
+    ):
         """Creates a `StreamIODataset` from kafka server with only a start offset.
 
         Args:
@@ -110,6 +239,10 @@ class KafkaStreamIODataset(tf.data.Dataset):
               prefixed with `conf.topic.`. Examples include
               ["conf.topic.auto.offset.reset=earliest"]
             Reference: https://github.com/edenhill/librdkafka/blob/master/CONFIGURATION.md
+          decoder: An optional decoder of the messages, such as
+            `tfio.experimental.streaming.KafkaAvroDecoder`, applied to every
+            batch of messages read from kafka. The messages are then returned
+            decoded.
           internal: Whether the dataset is being created from within the named scope.
             Default: True
         """
@@ -134,6 +267,8 @@ class KafkaStreamIODataset(tf.data.Dataset):
                     lambda v: tf.greater(tf.shape(v.message)[0], 0)
                 )
             )
+            if decoder is not None:
+                dataset = dataset.map(lambda v: (decoder(v.message), v.key))
             dataset = dataset.unbatch()
 
             self._dataset = dataset
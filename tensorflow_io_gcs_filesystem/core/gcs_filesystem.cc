@@ -16,6 +16,11 @@ limitations under the License.
 #include <stdlib.h>
 #include <string.h>
 
+#include <algorithm>
+#include <atomic>
+#include <thread>
+#include <unordered_map>
+
 #include "absl/strings/numbers.h"
 #include "absl/strings/str_cat.h"
 #include "absl/types/variant.h"
@@ -26,6 +31,7 @@ limitations under the License.
 #include "tensorflow_io_gcs_filesystem/core/file_system_plugin_gs.h"
 #include "tensorflow_io_gcs_filesystem/core/gcs_helper.h"
 #include "tensorflow_io_gcs_filesystem/core/ram_file_block_cache.h"
+#include "tensorflow_io_gcs_filesystem/core/read_hedging.h"
 
 namespace tensorflow {
 namespace io {
@@ -65,6 +71,62 @@ constexpr char kAppendMode[] = "GCS_APPEND_MODE";
 // objects.
 constexpr char kComposeAppend[] = "compose";
 
+// The environment variable that enables parallel composite uploads. Files
+// whose size is at least this threshold are uploaded as several temporary part
+// objects in parallel, which are then combined with `ComposeObject`. Specified
+// in MB. Disabled (0) by default, as a failed upload may strand temporary
+// objects in the bucket.
+constexpr char kParallelUploadThreshold[] = "GCS_PARALLEL_UPLOAD_THRESHOLD_MB";
+constexpr uint64_t kDefaultParallelUploadThreshold = 0;
+// The environment variable that overrides the size of each part object of a
+// parallel composite upload. Specified in MB.
+constexpr char kParallelUploadPartSize[] = "GCS_PARALLEL_UPLOAD_PART_SIZE_MB";
+constexpr uint64_t kDefaultParallelUploadPartSize = 64 * 1024 * 1024;
+// The environment variable that overrides the maximum number of part objects
+// uploaded or composed concurrently.
+constexpr char kParallelUploadMaxWorkers[] = "GCS_PARALLEL_UPLOAD_MAX_WORKERS";
+constexpr size_t kDefaultParallelUploadMaxWorkers = 16;
+// GCS allows at most 32 source objects in a single compose request.
+constexpr size_t kMaxComposeSources = 32;
+
+// The environment variable that enables hedged reads (1), disabled by default.
+// A read that has not completed within the recent p95 read latency is sent
+// again, and the first response wins.
+constexpr char kHedgeReads[] = "GCS_HEDGE_READS";
+// The environment variable that overrides the percentage of reads that may be
+// hedged.
+constexpr char kHedgeBudgetPercent[] = "GCS_HEDGE_BUDGET_PERCENT";
+constexpr uint64_t kDefaultHedgeBudgetPercent = 5;
+// The environment variable that overrides the least time to wait before
+// hedging a read, in milliseconds.
+constexpr char kHedgeMinDelay[] = "GCS_HEDGE_MIN_DELAY_MS";
+constexpr uint64_t kDefaultHedgeMinDelay = 20;
+
+// The read cache, parallel upload and hedging options above can also be set at
+// runtime with `SetConfiguration`, which overrides the environment variables
+// and applies to files opened afterwards.
+ABSL_CONST_INIT absl::Mutex configuration_lock(absl::kConstInit);
+
+static std::unordered_map<std::string, std::string>* GetConfigurations()
+    ABSL_EXCLUSIVE_LOCKS_REQUIRED(configuration_lock) {
+  static auto* configurations =
+      new std::unordered_map<std::string, std::string>();
+  return configurations;
+}
+
+// Reads the option `name` as set with `SetConfiguration`, or else from the
+// environment variable of the same name.
+static bool GetConfiguration(const char* name, uint64_t* value) {
+  {
+    absl::MutexLock l(&configuration_lock);
+    auto configurations = GetConfigurations();
+    auto it = configurations->find(name);
+    if (it != configurations->end()) return absl::SimpleAtoi(it->second, value);
+  }
+  const char* env = std::getenv(name);
+  return env != nullptr && absl::SimpleAtoi(env, value);
+}
+
 // We can cast `google::cloud::StatusCode` to `TF_Code` because they have the
 // same integer values. See
 // https://github.com/googleapis/google-cloud-cpp/blob/6c09cbfa0160bc046e5509b4dd2ab4b872648b4a/google/cloud/status.h#L32-L52
@@ -200,6 +262,14 @@ int64_t Read(const TF_RandomAccessFile* file, uint64_t offset, size_t n,
 // SECTION 2. Implementation for `TF_WritableFile`
 // ----------------------------------------------------------------------------
 namespace tf_writable_file {
+typedef struct ParallelUploadOptions {
+  // Files smaller than `threshold` bytes are uploaded as a single object. A
+  // `threshold` of 0 disables parallel composite uploads.
+  uint64_t threshold;
+  uint64_t part_size;
+  size_t max_workers;
+} ParallelUploadOptions;
+
 typedef struct GCSWritableFile {
   const std::string bucket;
   const std::string object;
@@ -209,18 +279,147 @@ typedef struct GCSWritableFile {
   // `offset` tells us how many bytes of this file are already uploaded to
   // server. If `offset == -1`, we always upload the entire temporary file.
   int64_t offset;
+  ParallelUploadOptions upload_options;
 } GCSWritableFile;
 
+// Runs `fn(0) ... fn(n - 1)` on at most `max_workers` threads and returns the
+// first error encountered, if any.
+static google::cloud::Status RunInParallel(
+    size_t n, size_t max_workers,
+    const std::function<google::cloud::Status(size_t)>& fn) {
+  std::atomic<size_t> next(0);
+  absl::Mutex mu;
+  google::cloud::Status result;
+  auto worker = [&]() {
+    for (size_t i = next++; i < n; i = next++) {
+      auto status = fn(i);
+      if (!status.ok()) {
+        absl::MutexLock l(&mu);
+        if (result.ok()) result = std::move(status);
+      }
+    }
+  };
+  std::vector<std::thread> threads;
+  size_t num_threads = (std::min)(n, (std::max)(max_workers, size_t{1}));
+  for (size_t i = 1; i < num_threads; i++) threads.emplace_back(worker);
+  worker();
+  for (auto& thread : threads) thread.join();
+  return result;
+}
+
+// Uploads `filename` as `object` by uploading `part_size` slices of the file to
+// temporary objects in parallel, and then composing them (at most 32 at a time,
+// recursively) into `object`. All temporary objects are deleted afterwards,
+// whether or not the upload succeeded.
+static google::cloud::StatusOr<gcs::ObjectMetadata> ParallelCompositeUpload(
+    const std::string& filename, uint64_t file_size, const std::string& bucket,
+    const std::string& object, gcs::Client* gcs_client,
+    const ParallelUploadOptions& options) {
+  const std::string prefix =
+      gcs::CreateRandomPrefixName("tf_parallel_upload_gcs");
+  const uint64_t part_size = (std::max)(options.part_size, uint64_t{1});
+  const size_t num_parts =
+      static_cast<size_t>((file_size + part_size - 1) / part_size);
+  TF_VLog(3, "ParallelCompositeUpload: gs://%s/%s with %u parts of size %u",
+          bucket.c_str(), object.c_str(), num_parts, part_size);
+
+  absl::Mutex temporary_mu;
+  std::vector<std::string> temporary_objects;
+  auto record_temporary = [&](const std::string& name) {
+    absl::MutexLock l(&temporary_mu);
+    temporary_objects.push_back(name);
+  };
+
+  std::vector<std::string> sources(num_parts);
+  for (size_t i = 0; i < num_parts; i++)
+    sources[i] = absl::StrCat(prefix, "_part_", i);
+  auto upload_status = RunInParallel(
+      num_parts, options.max_workers, [&](size_t i) -> google::cloud::Status {
+        const uint64_t part_offset = i * part_size;
+        const uint64_t length = (std::min)(part_size, file_size - part_offset);
+        record_temporary(sources[i]);
+        auto metadata = gcs_client->UploadFile(
+            filename, bucket, sources[i], gcs::UploadFromOffset(part_offset),
+            gcs::UploadLimit(length), gcs::Fields(""));
+        return metadata.status();
+      });
+
+  // Compose the parts level by level until at most `kMaxComposeSources`
+  // objects are left, which are then composed into the destination object.
+  for (int level = 0; upload_status.ok() && sources.size() > kMaxComposeSources;
+       level++) {
+    const size_t num_groups =
+        (sources.size() + kMaxComposeSources - 1) / kMaxComposeSources;
+    std::vector<std::string> composed(num_groups);
+    upload_status = RunInParallel(
+        num_groups, options.max_workers,
+        [&](size_t i) -> google::cloud::Status {
+          composed[i] = absl::StrCat(prefix, "_compose_", level, "_", i);
+          std::vector<gcs::ComposeSourceObject> source_objects;
+          for (size_t j = i * kMaxComposeSources;
+               j < (std::min)((i + 1) * kMaxComposeSources, sources.size());
+               j++)
+            source_objects.push_back({sources[j], {}, {}});
+          record_temporary(composed[i]);
+          auto metadata = gcs_client->ComposeObject(
+              bucket, source_objects, composed[i], gcs::Fields(""));
+          return metadata.status();
+        });
+    sources = std::move(composed);
+  }
+  std::vector<gcs::ComposeSourceObject> source_objects;
+  for (const auto& source : sources) source_objects.push_back({source, {}, {}});
+  auto result = upload_status.ok()
+                    ? gcs_client->ComposeObject(bucket, source_objects, object,
+                                                gcs::Fields("size"))
+                    : google::cloud::StatusOr<gcs::ObjectMetadata>(
+                          std::move(upload_status));
+
+  // Deleting the temporary objects is best effort: the upload itself has
+  // already succeeded or failed at this point.
+  RunInParallel(
+      temporary_objects.size(), options.max_workers,
+      [&](size_t i) -> google::cloud::Status {
+        auto delete_status =
+            gcs_client->DeleteObject(bucket, temporary_objects[i]);
+        if (!delete_status.ok() &&
+            delete_status.code() != google::cloud::StatusCode::kNotFound)
+          TF_Log(TF_WARNING, "Could not delete temporary object gs://%s/%s: %s",
+                 bucket.c_str(), temporary_objects[i].c_str(),
+                 delete_status.message().c_str());
+        return google::cloud::Status();
+      });
+  return result;
+}
+
+// Uploads the content of `outfile` to `object`, using a parallel composite
+// upload if the file is large enough.
+static google::cloud::StatusOr<gcs::ObjectMetadata> UploadTempFile(
+    TempFile* outfile, const std::string& bucket, const std::string& object,
+    gcs::Client* gcs_client, const ParallelUploadOptions& options) {
+  if (options.threshold > 0) {
+    std::ifstream infile(outfile->getName(), std::ios::binary | std::ios::ate);
+    int64_t file_size = infile ? static_cast<int64_t>(infile.tellg()) : -1;
+    if (file_size > 0 && static_cast<uint64_t>(file_size) >= options.threshold)
+      return ParallelCompositeUpload(outfile->getName(), file_size, bucket,
+                                     object, gcs_client, options);
+  }
+  // UploadFile will automatically switch to resumable upload based on Client
+  // configuration.
+  return gcs_client->UploadFile(outfile->getName(), bucket, object,
+                                gcs::Fields("size"));
+}
+
 static void SyncImpl(const std::string& bucket, const std::string& object,
                      int64_t* offset, TempFile* outfile,
-                     gcs::Client* gcs_client, TF_Status* status) {
+                     gcs::Client* gcs_client,
+                     const ParallelUploadOptions& upload_options,
+                     TF_Status* status) {
   outfile->flush();
   // `*offset == 0` means this file does not exist on the server.
   if (*offset == -1 || *offset == 0) {
-    // UploadFile will automatically switch to resumable upload based on Client
-    // configuration.
-    auto metadata = gcs_client->UploadFile(outfile->getName(), bucket, object,
-                                           gcs::Fields("size"));
+    auto metadata =
+        UploadTempFile(outfile, bucket, object, gcs_client, upload_options);
     if (!metadata) {
       TF_SetStatusFromGCSStatus(metadata.status(), status);
       return;
@@ -239,8 +438,8 @@ static void SyncImpl(const std::string& bucket, const std::string& object,
   } else {
     std::string temporary_object =
         gcs::CreateRandomPrefixName("tf_writable_file_gcs");
-    auto metadata = gcs_client->UploadFile(outfile->getName(), bucket,
-                                           temporary_object, gcs::Fields(""));
+    auto metadata = UploadTempFile(outfile, bucket, temporary_object,
+                                   gcs_client, upload_options);
     if (!metadata) {
       TF_SetStatusFromGCSStatus(metadata.status(), status);
       return;
@@ -320,7 +519,8 @@ void Flush(const TF_WritableFile* file, TF_Status* status) {
       return;
     }
     SyncImpl(gcs_file->bucket, gcs_file->object, &gcs_file->offset,
-             &gcs_file->outfile, gcs_file->gcs_client, status);
+             &gcs_file->outfile, gcs_file->gcs_client, gcs_file->upload_options,
+             status);
     TF_VLog(3, "Flush finished: gs://%s/%s", gcs_file->bucket.c_str(),
             gcs_file->object.c_str());
     if (TF_GetCode(status) != TF_OK) return;
@@ -386,12 +586,18 @@ typedef struct GcsFileSystemStat {
 typedef struct GCSFileSystemImplementation {
   google::cloud::storage::Client gcs_client;  // owned
   bool compose;
+  absl::Mutex upload_options_lock;
+  tf_writable_file::ParallelUploadOptions upload_options
+      ABSL_GUARDED_BY(upload_options_lock);
   absl::Mutex block_cache_lock;
   std::shared_ptr<RamFileBlockCache> file_block_cache
       ABSL_GUARDED_BY(block_cache_lock);
-  uint64_t block_size;  // Reads smaller than block_size will trigger a read
-                        // of block_size.
-  std::unique_ptr<ExpiringLRUCache<GcsFileSystemStat>> stat_cache;
+  // Reads smaller than block_size will trigger a read of block_size.
+  uint64_t block_size ABSL_GUARDED_BY(block_cache_lock);
+  // Shared with the hedged reads, which may outlive the filesystem.
+  std::shared_ptr<ExpiringLRUCache<GcsFileSystemStat>> stat_cache;
+  absl::Mutex hedging_lock;
+  ReadHedger::Options hedging ABSL_GUARDED_BY(hedging_lock);
   GCSFileSystemImplementation(google::cloud::storage::Client&& gcs_client);
   // This constructor is used for testing purpose only.
   GCSFileSystemImplementation(google::cloud::storage::Client&& gcs_client,
@@ -399,6 +605,16 @@ typedef struct GCSFileSystemImplementation {
                               size_t max_bytes, uint64_t max_staleness,
                               uint64_t stat_cache_max_age,
                               size_t stat_cache_max_entries);
+  // Replaces the block cache. Files opened before keep the previous one.
+  void ResetBlockCache(uint64_t block_size, size_t max_bytes,
+                       uint64_t max_staleness);
+  // Reads the read cache, parallel upload and hedging options, and applies
+  // them to files opened afterwards.
+  void Configure();
+  tf_writable_file::ParallelUploadOptions GetUploadOptions() {
+    absl::MutexLock l(&upload_options_lock);
+    return upload_options;
+  }
 } GCSFileSystemImplementation;
 
 typedef struct GCSFileSystem {
@@ -433,12 +649,14 @@ typedef struct GCSFileSystem {
 // A helper function to actually read the data from GCS.
 static int64_t LoadBufferFromGCS(
     const std::string& path, size_t offset, size_t buffer_size, char* buffer,
-    tf_gcs_filesystem::GCSFileSystemImplementation* gcs_file,
+    gcs::Client* gcs_client,
+    tf_gcs_filesystem::ExpiringLRUCache<tf_gcs_filesystem::GcsFileSystemStat>*
+        stat_cache,
     TF_Status* status) {
   std::string bucket, object;
   ParseGCSPath(path, false, &bucket, &object, status);
   if (TF_GetCode(status) != TF_OK) return -1;
-  auto stream = gcs_file->gcs_client.ReadObject(
+  auto stream = gcs_client->ReadObject(
       bucket, object, gcs::ReadRange(offset, offset + buffer_size));
   TF_SetStatusFromGCSStatus(stream.status(), status);
   if ((TF_GetCode(status) != TF_OK) &&
@@ -465,7 +683,7 @@ static int64_t LoadBufferFromGCS(
   if (read < buffer_size) {
     // Check stat cache to see if we encountered an interrupted read.
     tf_gcs_filesystem::GcsFileSystemStat stat;
-    if (gcs_file->stat_cache->Lookup(path, &stat)) {
+    if (stat_cache->Lookup(path, &stat)) {
       if (offset + read < stat.base.length) {
         TF_SetStatus(status, TF_INTERNAL,
                      absl::StrCat("File contents are inconsistent for file: ",
@@ -479,43 +697,47 @@ static int64_t LoadBufferFromGCS(
   return read;
 }
 
+static ReadHedger* GetReadHedger() {
+  static ReadHedger* hedger = new ReadHedger();
+  return hedger;
+}
+
+// Reads with `LoadBufferFromGCS`, hedged as set by the `GCS_HEDGE_*` options.
+static int64_t HedgedLoadBufferFromGCS(
+    const std::string& path, size_t offset, size_t buffer_size, char* buffer,
+    tf_gcs_filesystem::GCSFileSystemImplementation* gcs_file,
+    TF_Status* status) {
+  ReadHedger::Options hedging;
+  {
+    absl::MutexLock l(&gcs_file->hedging_lock);
+    hedging = gcs_file->hedging;
+  }
+  // A hedged attempt may outlive the file and the filesystem, so it reads
+  // with copies of the client and the stat cache rather than `gcs_file`.
+  return GetReadHedger()->Read(
+      hedging, buffer_size, buffer,
+      [path, offset, buffer_size, gcs_client = gcs_file->gcs_client,
+       stat_cache = gcs_file->stat_cache](char* buffer,
+                                          TF_Status* status) mutable {
+        return LoadBufferFromGCS(path, offset, buffer_size, buffer, &gcs_client,
+                                 stat_cache.get(), status);
+      },
+      status);
+}
+
 // TODO(vnvo2409): Use partial reponse for better performance.
 // TODO(vnvo2409): We could do some cleanups like `return TF_SetStatus`.
 // TODO(vnvo2409): Refactor the filesystem implementation when
 // https://github.com/googleapis/google-cloud-cpp/issues/4482 is done.
 GCSFileSystemImplementation::GCSFileSystemImplementation(
     google::cloud::storage::Client&& gcs_client)
-    : gcs_client(gcs_client), block_cache_lock() {
+    : gcs_client(gcs_client), upload_options_lock(), block_cache_lock() {
   const char* append_mode = std::getenv(kAppendMode);
   compose = (append_mode != nullptr) && (!strcmp(kComposeAppend, append_mode));
 
-  uint64_t value;
-  block_size = kDefaultBlockSize;
-  size_t max_bytes = kDefaultMaxCacheSize;
-  uint64_t max_staleness = kDefaultMaxStaleness;
-
-  // Apply the overrides for the block size (MB), max bytes (MB), and max
-  // staleness (seconds) if provided.
-  if (absl::SimpleAtoi(std::getenv(kBlockSize), &value)) {
-    block_size = value * 1024 * 1024;
-  }
-  if (absl::SimpleAtoi(std::getenv(kMaxCacheSize), &value)) {
-    max_bytes = static_cast<size_t>(value * 1024 * 1024);
-  }
-  if (absl::SimpleAtoi(std::getenv(kMaxStaleness), &value)) {
-    max_staleness = value;
-  }
-  TF_VLog(1, "GCS cache max size = %u ; block size = %u ; max staleness = %u",
-          max_bytes, block_size, max_staleness);
-
-  file_block_cache = std::make_unique<RamFileBlockCache>(
-      block_size, max_bytes, max_staleness,
-      [this](const std::string& filename, size_t offset, size_t buffer_size,
-             char* buffer, TF_Status* status) {
-        return LoadBufferFromGCS(filename, offset, buffer_size, buffer, this,
-                                 status);
-      });
+  Configure();
 
+  uint64_t value;
   uint64_t stat_cache_max_age = kStatCacheDefaultMaxAge;
   size_t stat_cache_max_entries = kStatCacheDefaultMaxEntries;
   if (absl::SimpleAtoi(std::getenv(kStatCacheMaxAge), &value)) {
@@ -524,7 +746,7 @@ GCSFileSystemImplementation::GCSFileSystemImplementation(
   if (absl::SimpleAtoi(std::getenv(kStatCacheMaxEntries), &value)) {
     stat_cache_max_entries = static_cast<size_t>(value);
   }
-  stat_cache = std::make_unique<ExpiringLRUCache<GcsFileSystemStat>>(
+  stat_cache = std::make_shared<ExpiringLRUCache<GcsFileSystemStat>>(
       stat_cache_max_age, stat_cache_max_entries);
 }
 
@@ -534,17 +756,85 @@ GCSFileSystemImplementation::GCSFileSystemImplementation(
     uint64_t stat_cache_max_age, size_t stat_cache_max_entries)
     : gcs_client(gcs_client),
       compose(compose),
-      block_cache_lock(),
-      block_size(block_size) {
-  file_block_cache = std::make_unique<RamFileBlockCache>(
+      upload_options_lock(),
+      upload_options({kDefaultParallelUploadThreshold,
+                      kDefaultParallelUploadPartSize,
+                      kDefaultParallelUploadMaxWorkers}),
+      block_cache_lock() {
+  ResetBlockCache(block_size, max_bytes, max_staleness);
+  stat_cache = std::make_shared<ExpiringLRUCache<GcsFileSystemStat>>(
+      stat_cache_max_age, stat_cache_max_entries);
+}
+
+void GCSFileSystemImplementation::ResetBlockCache(uint64_t block_size,
+                                                  size_t max_bytes,
+                                                  uint64_t max_staleness) {
+  auto cache = std::make_shared<RamFileBlockCache>(
       block_size, max_bytes, max_staleness,
       [this](const std::string& filename, size_t offset, size_t buffer_size,
              char* buffer, TF_Status* status) {
-        return LoadBufferFromGCS(filename, offset, buffer_size, buffer, this,
-                                 status);
+        return HedgedLoadBufferFromGCS(filename, offset, buffer_size, buffer,
+                                       this, status);
       });
-  stat_cache = std::make_unique<ExpiringLRUCache<GcsFileSystemStat>>(
-      stat_cache_max_age, stat_cache_max_entries);
+  absl::MutexLock l(&block_cache_lock);
+  this->block_size = block_size;
+  file_block_cache = std::move(cache);
+}
+
+void GCSFileSystemImplementation::Configure() {
+  uint64_t value;
+  uint64_t block_size = kDefaultBlockSize;
+  size_t max_bytes = kDefaultMaxCacheSize;
+  uint64_t max_staleness = kDefaultMaxStaleness;
+
+  // Apply the overrides for the block size (MB), max bytes (MB), and max
+  // staleness (seconds) if provided.
+  if (GetConfiguration(kBlockSize, &value)) {
+    block_size = value * 1024 * 1024;
+  }
+  if (GetConfiguration(kMaxCacheSize, &value)) {
+    max_bytes = static_cast<size_t>(value * 1024 * 1024);
+  }
+  if (GetConfiguration(kMaxStaleness, &value)) {
+    max_staleness = value;
+  }
+  TF_VLog(1, "GCS cache max size = %u ; block size = %u ; max staleness = %u",
+          max_bytes, block_size, max_staleness);
+  ResetBlockCache(block_size, max_bytes, max_staleness);
+
+  tf_writable_file::ParallelUploadOptions options = {
+      kDefaultParallelUploadThreshold, kDefaultParallelUploadPartSize,
+      kDefaultParallelUploadMaxWorkers};
+  if (GetConfiguration(kParallelUploadThreshold, &value)) {
+    options.threshold = value * 1024 * 1024;
+  }
+  if (GetConfiguration(kParallelUploadPartSize, &value) && value > 0) {
+    options.part_size = value * 1024 * 1024;
+  }
+  if (GetConfiguration(kParallelUploadMaxWorkers, &value) && value > 0) {
+    options.max_workers = static_cast<size_t>(value);
+  }
+  TF_VLog(1,
+          "GCS parallel upload threshold = %u ; part size = %u ; max workers "
+          "= %u",
+          options.threshold, options.part_size, options.max_workers);
+  {
+    absl::MutexLock l(&upload_options_lock);
+    upload_options = options;
+  }
+
+  ReadHedger::Options hedging;
+  hedging.enabled = GetConfiguration(kHedgeReads, &value) && value != 0;
+  hedging.budget_percent = kDefaultHedgeBudgetPercent;
+  if (GetConfiguration(kHedgeBudgetPercent, &value)) {
+    hedging.budget_percent = value;
+  }
+  hedging.min_delay_ms = kDefaultHedgeMinDelay;
+  if (GetConfiguration(kHedgeMinDelay, &value)) {
+    hedging.min_delay_ms = value;
+  }
+  absl::MutexLock l(&hedging_lock);
+  this->hedging = hedging;
 }
 
 void Init(TF_Filesystem* filesystem, TF_Status* status) {
@@ -588,17 +878,21 @@ void NewRandomAccessFile(const TF_Filesystem* filesystem, const char* path,
   if (TF_GetCode(status) != TF_OK) {
     return;
   }
-  bool is_cache_enabled;
+  // The file keeps reading through the block cache it was opened with, even
+  // if `SetConfiguration` replaces it.
+  std::shared_ptr<RamFileBlockCache> file_block_cache;
+  uint64_t block_size;
   {
     absl::MutexLock l(&gcs_file->block_cache_lock);
-    is_cache_enabled = gcs_file->file_block_cache->IsCacheEnabled();
+    file_block_cache = gcs_file->file_block_cache;
+    block_size = gcs_file->block_size;
   }
-  auto read_fn = [gcs_file, is_cache_enabled, bucket, object](
+  bool is_cache_enabled = file_block_cache->IsCacheEnabled();
+  auto read_fn = [gcs_file, file_block_cache, is_cache_enabled, bucket, object](
                      const std::string& path, uint64_t offset, size_t n,
                      char* buffer, TF_Status* status) -> int64_t {
     int64_t read = 0;
     if (is_cache_enabled) {
-      absl::ReaderMutexLock l(&gcs_file->block_cache_lock);
       GcsFileSystemStat stat;
       gcs_file->stat_cache->LookupOrCompute(
           path, &stat,
@@ -610,16 +904,16 @@ void NewRandomAccessFile(const TF_Filesystem* filesystem, const char* path,
           },
           status);
       if (TF_GetCode(status) != TF_OK) return -1;
-      if (!gcs_file->file_block_cache->ValidateAndUpdateFileSignature(
+      if (!file_block_cache->ValidateAndUpdateFileSignature(
               path, stat.generation_number)) {
         TF_VLog(
             1,
             "File signature has been changed. Refreshing the cache. Path: %s",
             path.c_str());
       }
-      read = gcs_file->file_block_cache->Read(path, offset, n, buffer, status);
+      read = file_block_cache->Read(path, offset, n, buffer, status);
     } else {
-      read = LoadBufferFromGCS(path, offset, n, buffer, gcs_file, status);
+      read = HedgedLoadBufferFromGCS(path, offset, n, buffer, gcs_file, status);
     }
     if (TF_GetCode(status) != TF_OK) return -1;
     if (read < n)
@@ -629,7 +923,7 @@ void NewRandomAccessFile(const TF_Filesystem* filesystem, const char* path,
     return read;
   };
   file->plugin_file = new tf_random_access_file::GCSRandomAccessFile(
-      std::move(path), is_cache_enabled, gcs_file->block_size, read_fn);
+      std::move(path), is_cache_enabled, block_size, read_fn);
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -648,7 +942,7 @@ void NewWritableFile(const TF_Filesystem* filesystem, const char* path,
   file->plugin_file = new tf_writable_file::GCSWritableFile(
       {std::move(bucket), std::move(object), &gcs_file->gcs_client,
        TempFile(temp_file_name, std::ios::binary | std::ios::out), true,
-       (gcs_file->compose ? 0 : -1)});
+       (gcs_file->compose ? 0 : -1), gcs_file->GetUploadOptions()});
   TF_VLog(3, "GcsWritableFile: %s", path);
   TF_SetStatus(status, TF_OK, "");
 }
@@ -677,7 +971,7 @@ void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
     file->plugin_file = new tf_writable_file::GCSWritableFile(
         {std::move(bucket), std::move(object), &gcs_file->gcs_client,
          TempFile(temp_file_name, std::ios::binary | std::ios::app), sync_need,
-         -1});
+         -1, gcs_file->GetUploadOptions()});
   } else {
     // If compose is true, we do not download anything.
     // Instead we only check if this file exists on server or not.
@@ -688,12 +982,13 @@ void NewAppendableFile(const TF_Filesystem* filesystem, const char* path,
       file->plugin_file = new tf_writable_file::GCSWritableFile(
           {std::move(bucket), std::move(object), &gcs_file->gcs_client,
            TempFile(temp_file_name, std::ios::binary | std::ios::trunc), false,
-           static_cast<int64_t>(metadata->size())});
+           static_cast<int64_t>(metadata->size()),
+           gcs_file->GetUploadOptions()});
     } else if (TF_GetCode(status) == TF_NOT_FOUND) {
       file->plugin_file = new tf_writable_file::GCSWritableFile(
           {std::move(bucket), std::move(object), &gcs_file->gcs_client,
            TempFile(temp_file_name, std::ios::binary | std::ios::trunc), true,
-           0});
+           0, gcs_file->GetUploadOptions()});
     } else {
       return;
     }
@@ -1238,6 +1533,16 @@ static void FlushCaches(const TF_Filesystem* filesystem) {
 static void SetConfiguration(const TF_Filesystem* filesystem,
                              const TF_Filesystem_Option* options,
                              int num_options, TF_Status* status) {
+  static const char* const kConfigurationNames[] = {kBlockSize,
+                                                    kMaxCacheSize,
+                                                    kMaxStaleness,
+                                                    kParallelUploadThreshold,
+                                                    kParallelUploadPartSize,
+                                                    kParallelUploadMaxWorkers,
+                                                    kHedgeReads,
+                                                    kHedgeBudgetPercent,
+                                                    kHedgeMinDelay};
+  // Validate all options first so that a bad option leaves all unchanged.
   for (int i = 0; i < num_options; i++) {
     if (options[i].value->type_tag != TF_Filesystem_Option_Type_Buffer) {
       TF_SetStatus(status, TF_INVALID_ARGUMENT,
@@ -1252,17 +1557,40 @@ static void SetConfiguration(const TF_Filesystem* filesystem,
       return;
     }
     std::string name = options[i].name;
-    std::string value =
-        std::string(options[i].value->values[0].buffer_val.buf,
-                    options[i].value->values[0].buffer_val.buf_length);
-    std::string message = absl::StrCat(
-        "SetConfiguration not implemented for gcs ('gs://') file system: name "
-        "= ",
-        name, ", value = ", value);
-
-    TF_SetStatus(status, TF_UNIMPLEMENTED, message.c_str());
-    return;
+    if (std::find(std::begin(kConfigurationNames),
+                  std::end(kConfigurationNames),
+                  name) == std::end(kConfigurationNames)) {
+      std::string value =
+          std::string(options[i].value->values[0].buffer_val.buf,
+                      options[i].value->values[0].buffer_val.buf_length);
+      std::string message = absl::StrCat(
+          "SetConfiguration not implemented for gcs ('gs://') file system: "
+          "name = ",
+          name, ", value = ", value);
+
+      TF_SetStatus(status, TF_UNIMPLEMENTED, message.c_str());
+      return;
+    }
+  }
+
+  {
+    absl::MutexLock l(&configuration_lock);
+    for (int i = 0; i < num_options; i++) {
+      (*GetConfigurations())[options[i].name] =
+          std::string(options[i].value->values[0].buffer_val.buf,
+                      options[i].value->values[0].buffer_val.buf_length);
+    }
+  }
+
+  // A filesystem that is not loaded yet reads the options when it is.
+  auto gcs_filesystem =
+      static_cast<GCSFileSystem*>(filesystem->plugin_filesystem);
+  GCSFileSystemImplementation* gcs_file;
+  {
+    absl::MutexLock l(&gcs_filesystem->mu);
+    gcs_file = gcs_filesystem->ptr.get();
   }
+  if (gcs_file != nullptr) gcs_file->Configure();
   TF_SetStatus(status, TF_OK, "");
 }
 
@@ -0,0 +1,99 @@
+/* Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_IO_GCS_FILESYSTEM_CORE_READ_HEDGING_H_
+#define TENSORFLOW_IO_GCS_FILESYSTEM_CORE_READ_HEDGING_H_
+
+#include <deque>
+#include <functional>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "absl/base/thread_annotations.h"
+#include "absl/synchronization/mutex.h"
+#include "tensorflow/c/tf_status.h"
+
+namespace tensorflow {
+namespace io {
+namespace gs {
+namespace tf_gcs_filesystem {
+
+/// \brief Hedges the ranged reads of an object store against stragglers.
+///
+/// A read that has not completed within the recent p95 read latency is sent
+/// again, and whichever of the two requests succeeds first is returned. The
+/// extra requests are capped by a budget, a percentage of all reads. Reads
+/// of more than 8 MB are never hedged. Reads that could not be hedged, before
+/// the latencies are known or while the budget is spent, run directly on the
+/// calling thread. The others run on a small pool of reused threads, and both
+/// requests read into buffers of their own, so the loser may keep running after
+/// `Read` returns; the read function must therefore not refer to state of the
+/// caller, and the hedger must live as long as the process.
+///
+/// This class is thread safe.
+class ReadHedger {
+ public:
+  /// Reads up to `n` bytes into `buffer`, as `TF_RandomAccessFile::read`.
+  typedef std::function<int64_t(char* buffer, TF_Status* status)> ReadFn;
+
+  struct Options {
+    bool enabled = false;
+    uint64_t budget_percent = 0;
+    uint64_t min_delay_ms = 0;
+  };
+
+  /// Reads `n` bytes into `buffer` with `read`, hedged as set by `options`.
+  int64_t Read(const Options& options, size_t n, char* buffer,
+               const ReadFn& read, TF_Status* status);
+
+ private:
+  struct HedgedRead;
+
+  // Returns false if no thread of the pool is free for the attempt.
+  bool StartAttempt(std::shared_ptr<HedgedRead> hedged_read, int attempt,
+                    const ReadFn& read);
+
+  // Runs `fn` on a thread of the pool, or returns false if all are busy.
+  bool Schedule(std::function<void()> fn);
+  void WorkerLoop();
+  bool HasTasks() const ABSL_EXCLUSIVE_LOCKS_REQUIRED(pool_mu_) {
+    return !tasks_.empty();
+  }
+
+  // Returns the delay after which to hedge a read, or false if the read
+  // cannot be hedged.
+  bool StartRead(const Options& options, uint64_t* delay_micros);
+  void AddLatency(uint64_t latency_micros);
+
+  absl::Mutex mu_;
+  std::vector<uint64_t> latencies_ ABSL_GUARDED_BY(mu_);
+  size_t next_latency_ ABSL_GUARDED_BY(mu_) = 0;
+  size_t latencies_since_refresh_ ABSL_GUARDED_BY(mu_) = 0;
+  uint64_t p95_micros_ ABSL_GUARDED_BY(mu_) = 0;
+  double hedge_tokens_ ABSL_GUARDED_BY(mu_) = 0;
+
+  absl::Mutex pool_mu_;
+  std::deque<std::function<void()>> tasks_ ABSL_GUARDED_BY(pool_mu_);
+  int workers_ ABSL_GUARDED_BY(pool_mu_) = 0;
+  int idle_workers_ ABSL_GUARDED_BY(pool_mu_) = 0;
+};
+
+}  // namespace tf_gcs_filesystem
+}  // namespace gs
+}  // namespace io
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_IO_GCS_FILESYSTEM_CORE_READ_HEDGING_H_
@@ -14,6 +14,8 @@
 # ==============================================================================
 """Tests for file system configuration API"""
 
+import os
+
 import pytest
 
 import tensorflow as tf
@@ -29,3 +31,31 @@ def test_filesystem_configuration():
         "SetConfiguration not implemented for gcs ('gs://') file system: name = 123, value = 456"
         in str(e.value)
     )
+
+
+def test_filesystem_configuration_performance_options():
+    """Test case for runtime performance options"""
+    # The options last for the rest of the process, so restore the environment
+    # variables they override, or else the defaults, for the tests that follow.
+    defaults = {
+        ("http", "HTTP_READ_CACHE_BLOCK_SIZE_MB"): "16",
+        ("s3", "S3_MULTI_PART_UPLOAD_CHUNK_SIZE"): str(50 * 1024 * 1024),
+    }
+    try:
+        tfio.experimental.filesystem.set_configuration(
+            "http", "HTTP_READ_CACHE_BLOCK_SIZE_MB", "16"
+        )
+        tfio.experimental.filesystem.set_configuration(
+            "s3", "S3_MULTI_PART_UPLOAD_CHUNK_SIZE", str(64 * 1024 * 1024)
+        )
+        with pytest.raises(tf.errors.UnimplementedError) as e:
+            tfio.experimental.filesystem.set_configuration("s3", "S3_ENDPOINT", "abc")
+        assert (
+            "SetConfiguration not implemented for s3 file system: name = S3_ENDPOINT, value = abc"
+            in str(e.value)
+        )
+    finally:
+        for (scheme, key), value in defaults.items():
+            tfio.experimental.filesystem.set_configuration(
+                scheme, key, os.environ.get(key, value)
+            )
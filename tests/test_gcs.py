@@ -55,3 +55,34 @@ def test_read_file():
 
     content = tf.io.read_file(f"gs://{bucket_name}/{key_name}")
     assert content == body
+
+
+@pytest.mark.skip("TODO GCS emulator not setup properly")
+def test_write_file_parallel_composite_upload():
+    """Test case for writing a large file to GCS with parallel composite upload"""
+
+    from google.cloud import storage
+
+    client = storage.Client(
+        project="[PROJECT]",
+        _http=requests.Session(),
+        client_options={"api_endpoint": "http://localhost:9099"},
+    )
+
+    bucket_name = f"gs{int(time.time())}p"
+    bucket = client.create_bucket(bucket_name)
+
+    os.environ["CLOUD_STORAGE_TESTBENCH_ENDPOINT"] = "http://localhost:9099"
+    # 40 parts of 1MB, which requires a two-level compose.
+    os.environ["GCS_PARALLEL_UPLOAD_THRESHOLD_MB"] = "1"
+    os.environ["GCS_PARALLEL_UPLOAD_PART_SIZE_MB"] = "1"
+
+    body = os.urandom(40 * 1024 * 1024 + 7)
+    key_name = "LARGE"
+    tf.io.write_file(f"gs://{bucket_name}/{key_name}", body)
+
+    content = tf.io.read_file(f"gs://{bucket_name}/{key_name}")
+    assert content == body
+
+    # Temporary part objects are cleaned up after compose.
+    assert [blob.name for blob in bucket.list_blobs()] == [key_name]
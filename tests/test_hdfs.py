@@ -42,6 +42,36 @@ def test_read_file():
     assert content == body
 
 
+@pytest.mark.skipif(
+    sys.platform in ("win32", "darwin"),
+    reason="TODO HDFS not setup properly on macOS/Windows yet",
+)
+def test_read_file_buffered():
+    """Test case for small sequential reads through the HDFS read buffer"""
+
+    address = socket.gethostbyname(socket.gethostname())
+    print(f"ADDRESS: {address}")
+
+    body = os.urandom(300 * 1024 + 7)
+    filepath = f"hdfs://{address}:9000/buffered.bin"
+    tf.io.write_file(filepath, body)
+
+    os.environ["HDFS_READ_BUFFER_SIZE_KB"] = "64"
+    os.environ["HDFS_READ_PREFETCH"] = "1"
+    try:
+        chunks = []
+        with tf.io.gfile.GFile(filepath, "rb") as f:
+            while True:
+                chunk = f.read(4096)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    finally:
+        del os.environ["HDFS_READ_BUFFER_SIZE_KB"]
+        del os.environ["HDFS_READ_PREFETCH"]
+    assert b"".join(chunks) == body
+
+
 @pytest.mark.skipif(
     sys.platform in ("win32", "darwin"),
     reason="TODO HDFS not setup properly on macOS/Windows yet",
@@ -106,6 +106,20 @@ def test_gfile_tell(local_content, remote_filename):
     assert remote_gfile.tell() == 100
 
 
+@pytest.mark.skipif(
+    sys.platform in ("darwin", "win32"), reason="macOS/Windows fails now"
+)
+def test_gfile_read_repeated(local_content, remote_filename):
+    """Test case to read the same ranges repeatedly over pooled connections"""
+
+    remote_gfile = tf.io.gfile.GFile(remote_filename)
+    for _ in range(3):
+        for start in (500, 0, 5000, 100):
+            remote_gfile.seek(start)
+            assert remote_gfile.read(200) == local_content[start : start + 200]
+        assert remote_gfile.size() == len(local_content)
+
+
 @pytest.mark.skipif(
     sys.platform in ("darwin", "win32"), reason="macOS/Windows fails now"
 )
@@ -118,5 +132,21 @@ def test_gfile_isdir(remote_filename):
     assert not tf.io.gfile.isdir("https://not-a-valid-domain/tfio-test")
 
 
+@pytest.mark.skipif(
+    sys.platform in ("darwin", "win32"), reason="macOS/Windows fails now"
+)
+def test_read_remote_file_cached(local_content, remote_filename):
+    """Test case for reading the http file through the local disk cache"""
+
+    cached_filename = "tfiocache." + remote_filename
+    assert tf.io.gfile.exists(cached_filename)
+    # The second read is served from the cache directory.
+    for _ in range(2):
+        assert tf.io.read_file(cached_filename) == local_content
+    remote_gfile = tf.io.gfile.GFile(cached_filename)
+    remote_gfile.seek(5000)
+    assert remote_gfile.read(200) == local_content[5000:5200]
+
+
 if __name__ == "__main__":
     tf.test.main()
@@ -356,6 +356,41 @@ def fixture_kinesis(request):
     return args, func, expected
 
 
+@pytest.fixture(name="kinesis_shards")
+def fixture_kinesis_shards(request):
+    """fixture_kinesis_shards"""
+    import boto3  # pylint: disable=import-outside-toplevel
+
+    os.environ["AWS_ACCESS_KEY_ID"] = "ACCESS_KEY"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "SECRET_KEY"
+    os.environ["KINESIS_USE_HTTPS"] = "0"
+    os.environ["KINESIS_ENDPOINT"] = "localhost:4566"
+
+    client = boto3.client(
+        "kinesis", region_name="us-east-1", endpoint_url="http://localhost:4566"
+    )
+
+    # Setup the Kinesis with 2 shards.
+    stream_name = f"kinesis_s{time.time()}s"
+    client.create_stream(StreamName=stream_name, ShardCount=2)
+    client.get_waiter("stream_exists").wait(StreamName=stream_name)
+    client.put_records(
+        StreamName=stream_name,
+        Records=[
+            {"Data": "D" + str(i), "PartitionKey": "TensorFlow" + str(i)}
+            for i in range(100)
+        ],
+    )
+
+    def fin():
+        client.delete_stream(StreamName=stream_name)
+        client.get_waiter("stream_not_exists").wait(StreamName=stream_name)
+
+    request.addfinalizer(fin)
+
+    return stream_name
+
+
 # Source of audio are based on the following:
 #   https://commons.wikimedia.org/wiki/File:ZASFX_ADSR_no_sustain.ogg
 # OGG: ZASFX_ADSR_no_sustain.ogg.
@@ -1155,6 +1190,54 @@ def test_io_dataset_basic(fixture_lookup, io_dataset_fixture):
     assert all([element_equal(a, b) for (a, b) in zip(entries, expected)])
 
 
+@pytest.mark.skipif(
+    sys.platform in ("win32", "darwin"),
+    reason="TODO Localstack not setup properly on macOS/Windows yet",
+)
+def test_kinesis_io_dataset_shards(kinesis_shards):
+    """Read all shards of a stream in parallel, in batches of records."""
+    dataset = tfio.experimental.IODataset.from_kinesis(kinesis_shards, limit=7)
+    dataset = dataset.map(lambda e: e.data).take(100)
+    assert sorted(dataset.as_numpy_iterator()) == sorted(
+        ("D" + str(i)).encode() for i in range(100)
+    )
+
+
+@pytest.mark.skipif(
+    sys.platform in ("win32", "darwin"),
+    reason="TODO Localstack not setup properly on macOS/Windows yet",
+)
+def test_kinesis_io_dataset_shards_idle(kinesis_shards):
+    """Read all shards of a stream with one worker, which moves on to the
+    other shard once the one it reads has no more records."""
+    dataset = tfio.experimental.IODataset.from_kinesis(
+        kinesis_shards, num_parallel_reads=1
+    )
+    dataset = dataset.map(lambda e: e.data).take(100)
+    assert sorted(dataset.as_numpy_iterator()) == sorted(
+        ("D" + str(i)).encode() for i in range(100)
+    )
+
+
+@pytest.mark.skipif(
+    sys.platform in ("win32", "darwin"),
+    reason="TODO pubsub face issues on macOS/Windows",
+)
+@pytest.mark.parametrize(("streaming"), [False, True])
+def test_pubsub_io_dataset_batches(pubsub, streaming):
+    """Pull the messages in batches, acknowledged in the background."""
+    args, _, expected = pubsub
+    dataset = tfio.experimental.IODataset.stream().from_pubsub(
+        args,
+        endpoint="http://localhost:8085",
+        timeout=5000,
+        max_messages=3,
+        streaming=streaming,
+    )
+    dataset = dataset.map(lambda e: e.data)
+    assert sorted(dataset.as_numpy_iterator()) == sorted(expected)
+
+
 # This test makes sure basic dataset operations (take, batch) work.
 @pytest.mark.parametrize(
     ("io_dataset_fixture"),
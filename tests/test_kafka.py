@@ -131,6 +131,25 @@ def test_avro_kafka_dataset():
     assert np.all(entries == [("value1", 1, ""), ("value2", 2, "2"), ("value3", 3, "")])
 
 
+def test_kafka_io_dataset_avro_decoder():
+    """Decode the Schema Registry framed Avro messages of 'avro-test' while
+    reading them."""
+    schema = (
+        '{"type":"record","name":"myrecord","fields":['
+        '{"name":"f1","type":"string"},'
+        '{"name":"f2","type":"long"},'
+        '{"name":"f3","type":["null","string"],"default":null}'
+        "]}"
+    )
+    decoder = tfio.experimental.streaming.KafkaAvroDecoder(schema, schema_registry=True)
+    dataset = tfio.IODataset.from_kafka("avro-test", decoder=decoder)
+    entries = [
+        (e["f1"].numpy().decode(), e["f2"].numpy(), e["f3"].numpy().decode())
+        for (e, _) in dataset
+    ]
+    assert entries == [("value1", 1, ""), ("value2", 2, "2"), ("value3", 3, "")]
+
+
 def test_kafka_stream_dataset():
     dataset = tfio.IODataset.stream().from_kafka("test").batch(2)
     assert np.all(
@@ -151,6 +170,85 @@ def test_kafka_io_dataset():
         )
 
 
+def test_kafka_io_dataset_partial_iterations():
+    """Each iteration starts over away from where the consumer stopped, so
+    reads that are not sequential have to seek."""
+    dataset = tfio.IODataset.from_kafka("test")
+    expected = [("D" + str(i)).encode() for i in range(10)]
+    for n in (3, 10, 1, 10):
+        assert [k.numpy() for (k, _) in dataset.take(n)] == expected[:n]
+
+
+def test_kafka_io_dataset_partitions():
+    """Read all partitions of 'key-partition-test' concurrently. D0, D2, D4,
+    D6 and D8 are in partition 0 and the rest in partition 1, so with a
+    deterministic interleave of one message per partition they alternate."""
+    dataset = tfio.IODataset.from_kafka("key-partition-test", partition="all")
+    assert [k.numpy() for (k, _) in dataset] == [
+        ("D" + str(i)).encode() for i in range(10)
+    ]
+
+    dataset = tfio.IODataset.from_kafka(
+        "key-partition-test", partition=[1], start=2, stop=4
+    )
+    assert [k.numpy() for (k, _) in dataset] == [b"D5", b"D7"]
+
+    dataset = tfio.IODataset.from_kafka(
+        "key-partition-test", partition=[0, 1], deterministic=False
+    )
+    assert sorted(k.numpy() for (k, _) in dataset) == sorted(
+        ("D" + str(i)).encode() for i in range(10)
+    )
+
+
+def test_kafka_io_dataset_timestamps():
+    """Bound the offsets of 'test' with timestamps, which are resolved into the
+    offsets of the earliest messages at or after them."""
+    future = 1 << 50
+    dataset = tfio.IODataset.from_kafka("test", start_timestamp=0)
+    assert [m.numpy() for (m, _) in dataset] == [
+        ("D" + str(i)).encode() for i in range(10)
+    ]
+
+    dataset = tfio.IODataset.from_kafka("test", start_timestamp=future)
+    assert [m.numpy() for (m, _) in dataset] == []
+
+    dataset = tfio.IODataset.from_kafka("test", stop_timestamp=0)
+    assert [m.numpy() for (m, _) in dataset] == []
+
+    dataset = tfio.experimental.streaming.KafkaGroupIODataset(
+        topics=["key-partition-test"],
+        group_id="cgtimestamp",
+        servers="localhost:9092",
+        start_timestamp=0,
+        stop_timestamp=future,
+        configuration=["session.timeout.ms=7000", "max.poll.interval.ms=8000"],
+    )
+    assert sorted(m.numpy() for (m, _) in dataset) == sorted(
+        ("D" + str(i)).encode() for i in range(10)
+    )
+
+
+def test_kafka_write_dataset():
+    """Write a dataset of keyed messages to a topic and read them back."""
+    messages = [("D" + str(i)).encode() for i in range(100)]
+    keys = [("K" + str(i % 2)).encode() for i in range(100)]
+    dataset = tf.data.Dataset.from_tensor_slices((messages, keys))
+    count = tfio.experimental.streaming.write_kafka(
+        dataset,
+        topic="sink-test",
+        servers="localhost:9092",
+        linger_ms=50,
+        compression="lz4",
+        batch_size=32,
+    )
+    assert count.numpy() == 100
+
+    dataset = tfio.IODataset.from_kafka("sink-test")
+    entries = [(m.numpy(), k.numpy()) for (m, k) in dataset]
+    assert entries == list(zip(messages, keys))
+
+
 def test_avro_encode_decode():
     """test_avro_encode_decode"""
     schema = (
@@ -324,6 +422,38 @@ def test_kafka_group_io_dataset_tertiary_cg_multiple_topics():
     )
 
 
+def test_kafka_group_io_dataset_checkpoint_commit(tmp_path):
+    """Test the functionality of the KafkaGroupIODataset when the offsets are
+    only committed once a checkpoint is written. Until then, a new dataset of
+    the same consumer group replays the messages.
+    """
+
+    def make_dataset():
+        return tfio.experimental.streaming.KafkaGroupIODataset(
+            topics=["key-test"],
+            group_id="cgcheckpoint",
+            servers="localhost:9092",
+            commit_mode="checkpoint",
+            configuration=[
+                "session.timeout.ms=7000",
+                "max.poll.interval.ms=8000",
+                "auto.offset.reset=earliest",
+            ],
+        )
+
+    dataset = make_dataset()
+    messages = [k.numpy() for (k, _) in dataset]
+    assert len(messages) >= 10
+
+    dataset = make_dataset()
+    assert [k.numpy() for (k, _) in dataset] == messages
+    checkpoint = tf.train.Checkpoint(step=tf.Variable(0))
+    checkpoint.save(str(tmp_path / "ckpt"), options=dataset.checkpoint_options())
+
+    dataset = make_dataset()
+    assert [k.numpy() for (k, _) in dataset] == []
+
+
 def test_kafka_group_io_dataset_auto_offset_reset():
     """Test the functionality of the `auto.offset.reset` configuration
     at global and topic level"""
@@ -61,6 +61,9 @@ echo "Creating and populating 'offset-test' topic with sample non-keyed messages
 sudo confluent-$VERSION/bin/kafka-topics --create --zookeeper localhost:2181 --replication-factor 1 --partitions 1 --topic offset-test
 sudo confluent-$VERSION/bin/kafka-console-producer --topic offset-test --broker-list 127.0.0.1:9092 < confluent-$VERSION/offset-test
 
+echo "Creating the empty 'sink-test' topic that is written to by the tests"
+sudo confluent-$VERSION/bin/kafka-topics --create --zookeeper localhost:2181 --replication-factor 1 --partitions 1 --topic sink-test
+
 
 echo "Creating and populating 'avro-test' topic with sample messages."
 sudo confluent-$VERSION/bin/kafka-topics --create --zookeeper localhost:2181 --replication-factor 1 --partitions 1 --topic avro-test
@@ -221,6 +221,39 @@ class OSSFSTest(test.TestCase):
         gfile.Remove(file_path)
         self.assertFalse(gfile.Exists(file_path))
 
+    def test_block_cache(self):
+        file_path = file_io.join(self._base_dir, "temp_file")
+        content = bytes(range(256)) * 4096 * 3
+        with gfile.Open(file_path, mode="wb") as f:
+            f.write(content)
+
+        tfio.experimental.filesystem.set_configuration(
+            "oss", "OSS_READ_CACHE_BLOCK_SIZE_MB", "1"
+        )
+        tfio.experimental.filesystem.set_configuration(
+            "oss", "OSS_READ_CACHE_MAX_SIZE_MB", "16"
+        )
+        try:
+            # Sequential reads are served from the cache and read ahead.
+            with gfile.Open(file_path, mode="rb") as f:
+                chunks = []
+                while True:
+                    chunk = f.read(100000)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            self.assertEqual(content, b"".join(chunks))
+
+            # A rewritten file has a new ETag, so its blocks are refreshed.
+            with gfile.Open(file_path, mode="wb") as f:
+                f.write(content[::-1])
+            with gfile.Open(file_path, mode="rb") as f:
+                self.assertEqual(content[::-1], f.read())
+        finally:
+            tfio.experimental.filesystem.set_configuration(
+                "oss", "OSS_READ_CACHE_MAX_SIZE_MB", "0"
+            )
+
     def test_create_recursive_dir(self):
         dir_path = file_io.join(self._base_dir, "temp_dir/temp_dir1/temp_dir2")
         gfile.MakeDirs(dir_path)
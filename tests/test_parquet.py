@@ -271,6 +271,19 @@ def test_parquet_data():
         i += 1
 
 
+def test_parquet_multiple_row_groups(tmp_path):
+    """Test case for reading columns spanning several row groups"""
+    df = pd.DataFrame({"a": np.arange(1000), "b": 0.5 * np.arange(1000)})
+    filename = str(tmp_path / "row_groups.parquet")
+    df.to_parquet(filename, row_group_size=64)
+
+    dataset = tfio.IODataset.from_parquet(filename).batch(300)
+    a = np.concatenate([columns[b"a"].numpy() for columns in dataset])
+    b = np.concatenate([columns[b"b"].numpy() for columns in dataset])
+    assert np.array_equal(a, df["a"].values)
+    assert np.array_equal(b, df["b"].values)
+
+
 def test_parquet_dataset_from_file_pattern():
     """Test the parquet dataset creation process using a file pattern"""
     df = pd.DataFrame({"pred_0": 0.1 * np.arange(100), "pred_1": -0.1 * np.arange(100)})
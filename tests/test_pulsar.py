@@ -119,6 +119,36 @@ def test_pulsar_resubscribe():
     )
 
 
+@pytest.mark.skipif(
+    sys.platform in ("win32",),
+    reason="TODO Pulsar not setup properly on Windows yet",
+)
+@pytest.mark.parametrize(("ack_mode"), ["individual", "cumulative"])
+def test_pulsar_batch_receive(ack_mode):
+    """Test receiving messages in batches, acknowledged individually or
+    cumulatively."""
+
+    topic = "batch-test-" + ack_mode
+    writer = tfio.experimental.streaming.PulsarWriter(
+        service_url="pulsar://localhost:6650", topic=topic
+    )
+    for i in range(100):
+        writer.write("D" + str(i))
+    writer.flush()
+
+    dataset = tfio.experimental.streaming.PulsarIODataset(
+        service_url="pulsar://localhost:6650",
+        topic=topic,
+        subscription="subscription-0",
+        timeout=default_pulsar_timeout,
+        max_messages=16,
+        ack_mode=ack_mode,
+    )
+    assert [k.numpy() for (k, _) in dataset] == [
+        ("D" + str(i)).encode() for i in range(100)
+    ]
+
+
 @pytest.mark.skipif(
     sys.platform in ("win32",),
     reason="TODO Pulsar not setup properly on Windows yet",
@@ -239,5 +269,51 @@ def test_pulsar_write_keyed_messages():
     assert kv["2"] == [("msg-" + str(i)).encode() for i in range(2, 10, 3)]
 
 
+@pytest.mark.skipif(
+    sys.platform in ("win32",),
+    reason="TODO Pulsar not setup properly on Windows yet",
+)
+def test_pulsar_write_batch():
+    """Test writing batches of messages with PulsarWriter and write_pulsar"""
+
+    topic = "test-write-batch"
+    writer = tfio.experimental.streaming.PulsarWriter(
+        service_url="pulsar://localhost:6650",
+        topic=topic,
+        compression="lz4",
+    )
+    # 1. Write 10 keyed messages in one batch, the key set is 0,1,0,1,...
+    count = writer.write_batch(
+        ["msg-" + str(i) for i in range(10)], [str(i % 2) for i in range(10)]
+    )
+    assert count.numpy() == 10
+    writer.flush()
+
+    # 2. Write 90 messages from a dataset
+    dataset = tf.data.Dataset.from_tensor_slices(
+        ["msg-" + str(i) for i in range(10, 100)]
+    )
+    count = tfio.experimental.streaming.write_pulsar(
+        dataset,
+        service_url="pulsar://localhost:6650",
+        topic=topic,
+        batch_size=32,
+    )
+    assert count.numpy() == 90
+
+    # 3. Consume messages and verify
+    dataset = tfio.experimental.streaming.PulsarIODataset(
+        service_url="pulsar://localhost:6650",
+        topic=topic,
+        subscription="subscription-0",
+        timeout=default_pulsar_timeout,
+    )
+    entries = [(msg.numpy(), key.numpy()) for (msg, key) in dataset]
+    assert entries == [
+        (("msg-" + str(i)).encode(), str(i % 2).encode() if i < 10 else b"")
+        for i in range(100)
+    ]
+
+
 if __name__ == "__main__":
     test.main()
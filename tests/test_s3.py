@@ -18,6 +18,11 @@ import os
 import sys
 import time
 import tempfile
+import textwrap
+import threading
+import subprocess
+import http.client
+import http.server
 import tensorflow as tf
 import tensorflow_io as tfio
 import pytest
@@ -56,3 +61,95 @@ def test_read_file():
 
     content = tf.io.read_file(f"s3://{bucket_name}/{key_name}")
     assert content == body
+
+
+@pytest.mark.skipif(
+    sys.platform in ("win32", "darwin"),
+    reason="TODO Localstack not setup properly on macOS/Windows yet",
+)
+def test_hedged_read():
+    """Test case for hedging a stalled read from S3"""
+    import boto3
+
+    client = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        endpoint_url="http://localhost:4566",
+        aws_access_key_id="ACCESS_KEY",
+        aws_secret_access_key="SECRET_KEY",
+    )
+    body = b"1234567"
+    key_name = "TEST"
+    bucket_name = f"s3e{time.time()}e"
+    client.create_bucket(Bucket=bucket_name)
+    client.put_object(Bucket=bucket_name, Key=key_name, Body=body)
+
+    # A proxy in front of localstack that stalls a single ranged read, once
+    # enough reads have been seen to know the usual latency.
+    stall_at, stall_seconds = 150, 10
+    lock = threading.Lock()
+    reads = [0]
+
+    class LatencyInjectingProxy(http.server.BaseHTTPRequestHandler):
+        def forward(self):
+            if self.command == "GET" and "Range" in self.headers:
+                with lock:
+                    reads[0] += 1
+                    stall = reads[0] == stall_at
+                if stall:
+                    time.sleep(stall_seconds)
+            length = int(self.headers.get("Content-Length", 0))
+            request_body = self.rfile.read(length) if length else None
+            connection = http.client.HTTPConnection("localhost", 4566)
+            connection.request(
+                self.command, self.path, request_body, dict(self.headers)
+            )
+            response = connection.getresponse()
+            response_body = response.read()
+            self.send_response(response.status)
+            for name, value in response.getheaders():
+                if name.lower() not in ("connection", "transfer-encoding"):
+                    self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(response_body)
+
+        do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = forward
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    proxy = http.server.ThreadingHTTPServer(("localhost", 0), LatencyInjectingProxy)
+    proxy.daemon_threads = True
+    threading.Thread(target=proxy.serve_forever, daemon=True).start()
+
+    # The S3 client, and so its endpoint, is created once per process.
+    script = textwrap.dedent(f"""
+        import time
+        import tensorflow as tf
+        import tensorflow_io as tfio
+
+        path = "s3://{bucket_name}/{key_name}"
+        for _ in range({stall_at + 20}):
+            start = time.time()
+            assert tf.io.read_file(path) == {body!r}
+            assert time.time() - start < {stall_seconds / 2}
+        stats = tfio.experimental.filesystem.stats("s3")
+        assert stats["hedged_reads"] >= 1, stats
+        assert stats["hedge_wins"] >= 1, stats
+        """)
+    env = dict(
+        os.environ,
+        AWS_REGION="us-east-1",
+        AWS_ACCESS_KEY_ID="ACCESS_KEY",
+        AWS_SECRET_ACCESS_KEY="SECRET_KEY",
+        S3_VERIFY_SSL="0",
+        S3_ENDPOINT=f"http://localhost:{proxy.server_port}",
+        S3_DISABLE_MULTI_PART_DOWNLOAD="1",
+        S3_HEDGE_READS="1",
+        S3_HEDGE_MIN_DELAY_MS="200",
+    )
+    try:
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+    finally:
+        proxy.shutdown()
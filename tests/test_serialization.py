@@ -214,3 +214,41 @@ def test_decode_json_partial_shape():
 
     v = parse_json(r)
     assert np.array_equal(v, [1, 2, 3, 4, 5])
+
+
+def test_decode_json_batch():
+    """Test case for decoding a batch of JSON strings in one op."""
+    specs = {
+        "foo": tf.TensorSpec(tf.TensorShape([None]), tf.int32),
+        "bar": tf.TensorSpec(tf.TensorShape([]), tf.string),
+    }
+    data = [
+        json.dumps({"foo": [1, 2], "bar": "a"}),
+        json.dumps({"foo": [3, 4], "bar": "b"}),
+    ]
+    parsed = tfio.experimental.serialization.decode_json(data, specs)
+    assert np.array_equal(parsed["foo"], [[1, 2], [3, 4]])
+    assert np.array_equal(parsed["bar"], [b"a", b"b"])
+
+
+def test_decode_json_batch_variable_length():
+    """Test case for decoding a batch of JSON arrays of different lengths."""
+    specs = {"foo": tf.TensorSpec(tf.TensorShape([None]), tf.int32)}
+    data = [
+        json.dumps({"foo": [1, 2, 3]}),
+        json.dumps({"foo": [4]}),
+    ]
+    parsed = tfio.experimental.serialization.decode_json(data, specs)
+    assert np.array_equal(parsed["foo"], [[1, 2, 3], [4, 0, 0]])
+
+
+def test_decode_json_batch_empty():
+    """Test case for decoding an empty batch of JSON strings."""
+    specs = {
+        "foo": tf.TensorSpec(tf.TensorShape([None]), tf.int32),
+        "bar": tf.TensorSpec(tf.TensorShape([2]), tf.float32),
+    }
+    data = tf.constant([], tf.string)
+    parsed = tfio.experimental.serialization.decode_json(data, specs)
+    assert parsed["foo"].shape == [0, 0]
+    assert parsed["bar"].shape == [0, 2]
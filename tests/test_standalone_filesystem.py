@@ -689,6 +689,57 @@ def test_gfile_rmtree(fs, patchs, monkeypatch):
     assert [tf.io.gfile.exists(entry) for entry in trees] == [False] * num_entries
 
 
+@pytest.mark.parametrize(
+    "fs, patchs",
+    [(S3_URI, None), (AZ_URI, None)],
+    indirect=["fs"],
+)
+def test_gfile_rmtree_many_files(fs, patchs, monkeypatch):
+    _, path_to, _, write, _, join, _ = fs
+    mock_patchs(monkeypatch, patchs)
+
+    root = path_to("test_gfile_rmtree_many_files")
+    sibling = root + "_sibling"
+    fnames = [join(root, f"subdir_{i % 3}", f"fname_{i}") for i in range(30)] + [
+        join(root, "fname")
+    ]
+    for fname in fnames:
+        write(fname, b"123456789")
+    write(join(sibling, "fname"), b"123456789")
+
+    tf.io.gfile.rmtree(root)
+
+    assert not any(tf.io.gfile.exists(fname) for fname in fnames)
+    assert tf.io.gfile.exists(join(sibling, "fname"))
+
+
+@pytest.mark.parametrize(
+    "fs, patchs",
+    [(S3_URI, None), (AZ_URI, None)],
+    indirect=["fs"],
+)
+def test_gfile_stat_cache_invalidation(fs, patchs, monkeypatch):
+    _, path_to, _, _, _, join, _ = fs
+    mock_patchs(monkeypatch, patchs)
+
+    dname = path_to("test_gfile_stat_cache_invalidation")
+    fname = join(dname, "fname")
+    assert tf.io.gfile.exists(fname) is False
+
+    with tf.io.gfile.GFile(fname, "wb") as f:
+        f.write(b"123456789")
+    assert tf.io.gfile.exists(fname) is True
+    assert tf.io.gfile.stat(fname).length == 9
+    assert tf.io.gfile.isdir(dname) is True
+
+    with tf.io.gfile.GFile(fname, "wb") as f:
+        f.write(b"123456789" * 2)
+    assert tf.io.gfile.stat(fname).length == 18
+
+    tf.io.gfile.remove(fname)
+    assert tf.io.gfile.exists(fname) is False
+
+
 # TODO(vnvo2409): `az` copy operations causes an infinite loop.
 @pytest.mark.parametrize(
     "fs, patchs", [(S3_URI, None), (GCS_URI, None), (HDFS_URI, None)], indirect=["fs"]
@@ -767,3 +818,61 @@ def test_gfile_glob(fs, patchs, monkeypatch):
 
     txt_files = tf.io.gfile.glob(join(dname, "*.txt"))
     assert sorted(txt_files) == sorted(childs)
+
+
+@pytest.mark.parametrize(
+    "fs, patchs",
+    [(S3_URI, None), (AZ_URI, None)],
+    indirect=["fs"],
+)
+def test_gfile_glob_nested(fs, patchs, monkeypatch):
+    _, path_to, _, write, _, join, _ = fs
+    mock_patchs(monkeypatch, patchs)
+
+    dname = path_to("test_gfile_glob_nested/")
+
+    shards = []
+    for shard_dir in ["a", "b", "c"]:
+        for i in range(2):
+            fname = join(dname, shard_dir, f"part-{i}.tfrecord")
+            shards.append(fname)
+            write(fname, b"123456789")
+        write(join(dname, shard_dir, "_SUCCESS"), b"")
+
+    pattern = join(dname, "[ab]", "part-?.tfrecord")
+    assert tf.io.gfile.glob(pattern) == sorted(shards[:4])
+    assert tf.io.gfile.glob(join(dname, "*", "part-*")) == sorted(shards)
+
+    # Listings are cached, but writes through the filesystem are visible.
+    fname = join(dname, "a", "part-2.tfrecord")
+    write(fname, b"123456789")
+    assert fname in tf.io.gfile.glob(pattern)
+
+
+@pytest.mark.parametrize(
+    "fs, patchs",
+    [(S3_URI, None), (AZ_URI, None)],
+    indirect=["fs"],
+)
+def test_filesystem_stats(fs, patchs, monkeypatch):
+    uri, path_to, _, _, _, _, _ = fs
+    mock_patchs(monkeypatch, patchs)
+
+    before = tfio.experimental.filesystem.stats(uri)
+
+    fname = path_to("test_filesystem_stats")
+    body = b"abcdefghijklmn"
+    tf.io.write_file(fname, body)
+    assert tf.io.read_file(fname) == body
+
+    after = tfio.experimental.filesystem.stats(uri)
+    assert after["bytes_written"] >= before["bytes_written"] + len(body)
+    assert after["bytes_read"] >= before["bytes_read"] + len(body)
+    assert after["in_flight"] == 0
+
+    count = lambda metrics: sum(r["count"] for r in metrics["requests"].values())
+    assert count(after) > count(before)
+    for request in after["requests"].values():
+        buckets = request["latency_ms_buckets"]
+        assert buckets[-1][0] == float("inf")
+        assert sum(n for _, n in buckets) == request["count"]